@@ -36,23 +36,21 @@ from solutions.cache_manager import get_cache_manager
 
 from solutions.walls import get_genie_clip_wall, get_m20_wall, get_independent_wall, get_resilient_bar_wall
 from solutions.ceilings import get_genie_clip_ceiling, get_independent_ceiling, get_resilient_bar_ceiling
-from solutions.walls.GenieClipWall import load_genieclipwall_solutions
-from solutions.walls.M20Wall import load_m20wall_solutions
-from solutions.walls.Independentwall import load_independentwall_solutions
-from solutions.walls.resilientbarwall import load_resilientbarwall_solutions
-from solutions.ceilings.genieclipceiling import load_genieclipceiling_solutions
-from solutions.ceilings.lb3genieclipceiling import load_lb3genieclipceiling_solutions
-from solutions.ceilings.independentceiling import load_independentceiling_solutions
-from solutions.ceilings.resilientbarceiling import load_resilientbarceiling_solutions
 
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 import re
 from datetime import datetime, timedelta
 
 from solutions.solutions import get_solutions_manager
-from solutions.recommendation_engine import rank_solutions, RoomInputs, NoiseProfile
-from solutions.database import get_all_materials_from_db, get_solution_by_id
+from solutions.recommendation_engine import RoomInputs, NoiseProfile, prepare_ranking_candidates, rank_prepared_solutions
+from solutions.cache_keys import build_cache_key
+from solutions.recommendation_pipeline import get_recommendation_pipeline
+from solutions.database import get_solution_by_id
+from solutions.catalog_loader import initialize_all_solutions
+from solutions.materials_repository import get_materials_repository
+from solutions.building_quote import Building
 
 # Add before Flask app initialization
 @dataclass
@@ -187,118 +185,8 @@ limiter = Limiter(
 )
 
 def initialize_all_solutions_with_debug():
-    """Initialize all solutions from MongoDB and register them with the solutions manager."""
-    logger.info("Loading and caching all wall and ceiling solutions with debug info...")
-    debug_results = []
-    
-    # Get solutions manager and cache manager
-    solutions_manager = get_solutions_manager()
-    cache_manager = get_cache_manager()
-    
-    if not solutions_manager or not cache_manager:
-        logger.error("Failed to get solutions manager or cache manager")
-        return debug_results
-    
-    # Define solution loaders with their MongoDB document IDs
-    solution_loaders = {
-        'walls': [
-            (load_genieclipwall_solutions, 'GenieClipWall'),
-            (load_m20wall_solutions, 'M20Wall'),
-            (load_independentwall_solutions, 'IndependentWall'),
-            (load_resilientbarwall_solutions, 'ResilientBarWall'),
-        ],
-        'ceilings': [
-            (load_genieclipceiling_solutions, 'GenieClipCeiling'),
-            (load_lb3genieclipceiling_solutions, 'LB3GenieClipCeiling'),
-            (load_independentceiling_solutions, 'IndependentCeiling'),
-            (load_resilientbarceiling_solutions, 'ResilientBarCeiling'),
-        ]
-    }
-    
-    # Load solutions by surface type
-    for surface_type, loaders in solution_loaders.items():
-        surface_solutions = []
-        
-        for loader, name in loaders:
-            try:
-                std, pro = loader()
-                std_loaded = std is not None and getattr(std, '_solution_data', None) is not None
-                pro_loaded = pro is not None and getattr(pro, '_solution_data', None) is not None
-                
-                logger.info(f"Loaded {name} Standard: {std_loaded}")
-                logger.info(f"Loaded {name} SP15: {pro_loaded}")
-                
-                debug_results.append({f'{name}_Standard': std_loaded})
-                debug_results.append({f'{name}_SP15': pro_loaded})
-                
-                # Register solutions with solutions manager if they have data
-                if std_loaded and std:
-                    solution_id = f"{name.lower()}_standard"
-                    solutions_manager.register_solution_with_characteristics(solution_id, std)
-                    surface_solutions.append(std)
-                    logger.info(f"Registered {solution_id} with solutions manager")
-                
-                if pro_loaded and pro:
-                    solution_id = f"{name.lower()}_sp15"
-                    solutions_manager.register_solution_with_characteristics(solution_id, pro)
-                    surface_solutions.append(pro)
-                    logger.info(f"Registered {solution_id} with solutions manager")
-                
-            except Exception as e:
-                logger.error(f"Error loading {name} solutions: {e}")
-                debug_results.append({f'{name}_error': str(e)})
-        
-        # Cache solutions by surface type
-        if surface_solutions:
-            # Convert solutions to serializable format for caching
-            serializable_solutions = []
-            logger.info(f"[DEBUG] Processing {len(surface_solutions)} {surface_type} solutions for serialization")
-            for solution in surface_solutions:
-                try:
-                    if hasattr(solution, 'get_characteristics'):
-                        characteristics = solution.get_characteristics()
-                        logger.info(f"[DEBUG] Solution {getattr(solution, 'CODE_NAME', 'Unknown')} characteristics: {len(characteristics) if characteristics else 0} items")
-                        if characteristics:
-                            # Add solution identifier
-                            characteristics['solution_id'] = getattr(solution, 'CODE_NAME', 'Unknown')
-                            characteristics['surface_type'] = surface_type
-                            characteristics['variant'] = 'SP15' if hasattr(solution, 'IS_SP15') and solution.IS_SP15 else 'Standard'
-                            serializable_solutions.append(characteristics)
-                            logger.info(f"[DEBUG] Added solution {getattr(solution, 'CODE_NAME', 'Unknown')} to serializable list")
-                        else:
-                            logger.warning(f"[DEBUG] Solution {getattr(solution, 'CODE_NAME', 'Unknown')} returned empty characteristics")
-                    else:
-                        logger.warning(f"[DEBUG] Solution {getattr(solution, 'CODE_NAME', 'Unknown')} has no get_characteristics method")
-                except Exception as e:
-                    logger.error(f"Error serializing solution {getattr(solution, 'CODE_NAME', 'Unknown')}: {e}")
-            
-            logger.info(f"[DEBUG] Created {len(serializable_solutions)} serializable solutions for {surface_type}")
-            
-            # Cache solutions by surface type
-            cache_key = f"{surface_type.rstrip('s')}_solutions"  # Use singular form
-            cache_manager.set(cache_key, serializable_solutions, 3600)
-            logger.info(f"Cached {len(serializable_solutions)} {surface_type} solutions for recommendation engine")
-            
-            # Debug: Check what's actually in the cache
-            cached_data = cache_manager.get(cache_key)
-            logger.info(f"[DEBUG] Cache key '{cache_key}' contains {len(cached_data) if cached_data else 0} items")
-            if cached_data:
-                logger.info(f"[DEBUG] First cached solution: {cached_data[0] if len(cached_data) > 0 else 'None'}")
-            
-            # Also cache individual solutions for backward compatibility
-            for solution in surface_solutions:
-                try:
-                    cache_key = f"{getattr(solution, 'CODE_NAME', 'Unknown').lower().replace(' ', '').replace('(', '').replace(')', '')}_{'sp15' if hasattr(solution, 'IS_SP15') and solution.IS_SP15 else 'standard'}"
-                    cache_manager.set(cache_key, solution, 3600)
-                except Exception as e:
-                    logger.error(f"Error caching individual solution: {e}")
-        else:
-            logger.warning(f"[DEBUG] No {surface_type} solutions to cache")
-    
-    logger.info(f"Solution loading debug summary: {debug_results}")
-    logger.info(f"Total solutions registered with manager: {len(solutions_manager.get_all_solutions())}")
-    
-    return debug_results
+    """Initialize all solutions from the catalog snapshot or MongoDB and register them with the solutions manager."""
+    return initialize_all_solutions()
 
 # Call this at startup
 initialize_all_solutions_with_debug()
@@ -339,7 +227,7 @@ def get_all_solutions():
 def get_all_materials():
     """Get all materials from the MongoDB database."""
     try:
-        materials = get_all_materials_from_db()
+        materials = get_materials_repository().all()
         logger.info(f"[MATERIALS] Found {len(materials)} materials in MongoDB.")
         if materials:
             logger.info(f"[MATERIALS] Sample material: {materials[0]}")
@@ -522,6 +410,114 @@ def calculate_acoustic_properties():
         logger.error(f"Error calculating acoustic properties: {e}")
         return jsonify({'error': str(e)}), 500
 
+RECOMMENDATION_REQUIRED_FIELDS = [
+    "room_type", "noise_type", "noise_level", "room_dimensions",
+    "surface_areas", "existing_construction", "noise_profile"
+]
+
+def parse_recommendation_payload(payload):
+    """Validate a recommendation payload and build its RoomInputs and NoiseProfile.
+
+    Raises ValueError with a message suitable for the client.
+    """
+    if not isinstance(payload, dict):
+        logger.warning("Invalid payload format: not a dict")
+        raise ValueError('Invalid payload format.')
+    # Extract and validate required fields
+    missing_fields = [f for f in RECOMMENDATION_REQUIRED_FIELDS if f not in payload]
+    if missing_fields:
+        logger.warning(f"Missing required fields: {missing_fields}")
+        raise ValueError(f"Missing required fields: {missing_fields}")
+    if not isinstance(payload["noise_profile"], dict):
+        logger.warning("Malformed noise_profile field")
+        raise ValueError('Malformed noise_profile field.')
+    # Validate types of other fields
+    for field in ("room_dimensions", "surface_areas", "existing_construction"):
+        if not isinstance(payload[field], dict):
+            logger.warning(f"Malformed {field} field")
+            raise ValueError(f'Malformed {field} field.')
+    try:
+        room_inputs = RoomInputs(
+            room_type=payload["room_type"],
+            noise_type=payload["noise_type"],
+            noise_level=payload["noise_level"],
+            room_dimensions=payload["room_dimensions"],
+            surface_areas=payload["surface_areas"],
+            existing_construction=payload["existing_construction"],
+            budget_constraints=payload.get("budget_constraints"),
+            priority_surfaces=payload.get("priority_surfaces"),
+            special_requirements=payload.get("special_requirements"),
+            blockages=payload.get("blockages")
+        )
+        noise_profile = NoiseProfile(
+            type=payload["noise_profile"].get("type"),
+            intensity=payload["noise_profile"].get("intensity"),
+            direction=payload["noise_profile"].get("direction", []),
+            time=payload["noise_profile"].get("time"),
+            frequency=payload["noise_profile"].get("frequency"),
+            is_impact=payload["noise_profile"].get("is_impact", False)
+        )
+    except Exception as e:
+        logger.error(f"Invalid input data: {e}")
+        raise ValueError(f"Invalid input data: {e}")
+    return room_inputs, noise_profile
+
+def parse_recommendation_top_k(payload):
+    """Optional "top_k" of a recommendation payload: a positive int, or None to rank everything.
+
+    Raises ValueError with a message suitable for the client.
+    """
+    top_k = payload.get('top_k')
+    if top_k is None:
+        return None
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+        logger.warning(f"Invalid top_k: {top_k}")
+        raise ValueError('top_k must be a positive integer.')
+    return top_k
+
+def gather_recommendation_candidates(solutions_manager):
+    """Collect every solution, for all surface types, as a characteristics dict for ranking"""
+    all_solutions = []
+    solution_types = getattr(solutions_manager, "SOLUTION_TYPES", None)
+    if not solution_types:
+        solution_types = ['wall', 'ceiling', 'floor']
+    for surface_type in solution_types:
+        surface_solutions = solutions_manager.get_solutions_by_type(surface_type)
+        logger.info(f"[DEBUG] {surface_type} solutions found: {len(surface_solutions) if surface_solutions else 0}")
+        if surface_solutions:
+            # Convert solution instances to dictionaries for ranking
+            for solution in surface_solutions:
+                if isinstance(solution, dict):
+                    # Solution is already in dictionary format
+                    all_solutions.append(solution)
+                elif hasattr(solution, 'get_characteristics'):
+                    # Convert solution instance to dictionary
+                    characteristics = solution.get_characteristics()
+                    if characteristics:
+                        # Copy so the cached characteristics are not modified
+                        characteristics = dict(characteristics)
+                        # Add solution identifier
+                        characteristics['solution_id'] = getattr(solution, 'CODE_NAME', 'Unknown')
+                        characteristics['surface_type'] = surface_type
+                        characteristics['variant'] = 'SP15' if hasattr(solution, 'IS_SP15') and solution.IS_SP15 else 'Standard'
+                        all_solutions.append(characteristics)
+                else:
+                    logger.warning(f"Solution {solution} has no get_characteristics method")
+    logger.info(f"[DEBUG] Total solutions gathered for ranking: {len(all_solutions)}")
+    return all_solutions
+
+def get_recommendation_candidates(solutions_manager):
+    """Ranking candidates for every surface type, from the solutions manager's feature store.
+
+    Falls back to gathering and preparing the cached solutions when nothing
+    has been registered with the manager.
+    """
+    feature_store = solutions_manager.get_feature_store()
+    if len(feature_store):
+        return feature_store.ranking_candidates()
+    logger.warning("Solution feature store is empty; preparing ranking candidates from the solution cache")
+    return prepare_ranking_candidates(gather_recommendation_candidates(solutions_manager), solutions_manager)
+
 @csrf.exempt
 @app.route('/api/recommendations', methods=['POST'])
 def get_recommendations_flask():
@@ -529,89 +525,23 @@ def get_recommendations_flask():
     try:
         payload = request.get_json()
         logger.info(f"[DEBUG] Incoming /api/recommendations payload: {payload}")
-        if not isinstance(payload, dict):
-            logger.warning("Invalid payload format: not a dict")
-            return jsonify({'error': 'Invalid payload format.'}), 400
-        # Extract and validate required fields
-        required_fields = [
-            "room_type", "noise_type", "noise_level", "room_dimensions",
-            "surface_areas", "existing_construction", "noise_profile"
-        ]
-        missing_fields = [f for f in required_fields if f not in payload]
-        if missing_fields:
-            logger.warning(f"Missing required fields: {missing_fields}")
-            return jsonify({'error': f"Missing required fields: {missing_fields}"}), 400
-        if not isinstance(payload["noise_profile"], dict):
-            logger.warning("Malformed noise_profile field")
-            return jsonify({'error': 'Malformed noise_profile field.'}), 400
-        # Validate types of other fields
-        if not isinstance(payload["room_dimensions"], dict):
-            logger.warning("Malformed room_dimensions field")
-            return jsonify({'error': 'Malformed room_dimensions field.'}), 400
-        if not isinstance(payload["surface_areas"], dict):
-            logger.warning("Malformed surface_areas field")
-            return jsonify({'error': 'Malformed surface_areas field.'}), 400
-        if not isinstance(payload["existing_construction"], dict):
-            logger.warning("Malformed existing_construction field")
-            return jsonify({'error': 'Malformed existing_construction field.'}), 400
         try:
-            room_inputs = RoomInputs(
-                room_type=payload["room_type"],
-                noise_type=payload["noise_type"],
-                noise_level=payload["noise_level"],
-                room_dimensions=payload["room_dimensions"],
-                surface_areas=payload["surface_areas"],
-                existing_construction=payload["existing_construction"],
-                budget_constraints=payload.get("budget_constraints"),
-                priority_surfaces=payload.get("priority_surfaces"),
-                special_requirements=payload.get("special_requirements")
-            )
-            noise_profile = NoiseProfile(
-                type=payload["noise_profile"].get("type"),
-                intensity=payload["noise_profile"].get("intensity"),
-                direction=payload["noise_profile"].get("direction", []),
-                time=payload["noise_profile"].get("time"),
-                frequency=payload["noise_profile"].get("frequency"),
-                is_impact=payload["noise_profile"].get("is_impact", False)
-            )
-        except Exception as e:
-            logger.error(f"Invalid input data: {e}")
-            return jsonify({'error': f"Invalid input data: {e}"}), 400
+            room_inputs, noise_profile = parse_recommendation_payload(payload)
+            top_k = parse_recommendation_top_k(payload)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         try:
             solutions_manager = get_solutions_manager()
             if not solutions_manager:
                 logger.error("Failed to initialize solutions manager.")
                 return jsonify({'error': 'Failed to initialize solutions manager.'}), 500
-            # Gather all possible solutions (for all surface types)
-            all_solutions = []
-            solution_types = getattr(solutions_manager, "SOLUTION_TYPES", None)
-            if not solution_types:
-                solution_types = ['wall', 'ceiling', 'floor']
-            for surface_type in solution_types:
-                surface_solutions = solutions_manager.get_solutions_by_type(surface_type)
-                logger.info(f"[DEBUG] {surface_type} solutions found: {len(surface_solutions) if surface_solutions else 0}")
-                if surface_solutions:
-                    # Convert solution instances to dictionaries for rank_solutions
-                    for solution in surface_solutions:
-                        if isinstance(solution, dict):
-                            # Solution is already in dictionary format
-                            all_solutions.append(solution)
-                        elif hasattr(solution, 'get_characteristics'):
-                            # Convert solution instance to dictionary
-                            characteristics = solution.get_characteristics()
-                            if characteristics:
-                                # Add solution identifier
-                                characteristics['solution_id'] = getattr(solution, 'CODE_NAME', 'Unknown')
-                                characteristics['surface_type'] = surface_type
-                                characteristics['variant'] = 'SP15' if hasattr(solution, 'IS_SP15') and solution.IS_SP15 else 'Standard'
-                                all_solutions.append(characteristics)
-                        else:
-                            logger.warning(f"Solution {solution} has no get_characteristics method")
-            logger.info(f"[DEBUG] Total solutions passed to rank_solutions: {len(all_solutions)}")
-            logger.debug(f"[DEBUG] all_solutions sample: {all_solutions[:2] if all_solutions else '[]'}")
+            # All possible solutions (for all surface types), precomputed at registration
+            candidates = get_recommendation_candidates(solutions_manager)
+            logger.debug(f"[DEBUG] {len(candidates)} ranking candidates")
             logger.debug(f"[DEBUG] room_inputs: {room_inputs}")
             logger.debug(f"[DEBUG] noise_profile: {noise_profile}")
-            recommendations = rank_solutions(all_solutions, room_inputs, noise_profile)
+            recommendations = rank_prepared_solutions(candidates, room_inputs, noise_profile, top_k=top_k,
+                                                      pipeline=get_recommendation_pipeline())
             logger.info(f"Generated {len(recommendations) if recommendations else 0} recommendations.")
         except Exception as e:
             logger.error(f"Recommendation engine error: {e}")
@@ -633,6 +563,111 @@ def get_recommendations_flask():
         logger.error(f"[FATAL] Unhandled exception in /api/recommendations: {e}")
         return jsonify({'error': f'Unhandled exception: {e}'}), 400
 
+def _rank_batch_entry(candidates, room_inputs, noise_profile, top_k=None):
+    """Rank one distinct room of a batch, returning (recommendations, error)"""
+    try:
+        return rank_prepared_solutions(candidates, room_inputs, noise_profile, top_k=top_k,
+                                       pipeline=get_recommendation_pipeline()), None
+    except Exception as e:
+        logger.error(f"Recommendation engine error in batch item: {e}")
+        return None, f"Recommendation engine error: {e}"
+
+@csrf.exempt
+@app.route('/api/recommendations/batch', methods=['POST'])
+def get_recommendations_batch_flask():
+    """Generate recommendations for many rooms in one request.
+
+    Body: {"items": [</api/recommendations payload>, ...], "parallel": false}.
+    Ranking candidates come from the solution feature store, shared by the
+    whole batch, and identical rooms are ranked once. Returns one result per item,
+    in order, holding either "recommendations" or "error".
+    """
+    try:
+        payload = request.get_json(silent=True)
+        items = payload.get('items') if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'Expected a non-empty "items" list.'}), 400
+        max_items = int(os.getenv('RECOMMENDATIONS_BATCH_MAX_ITEMS', 100))
+        if len(items) > max_items:
+            return jsonify({'error': f'Too many items: {len(items)} (maximum {max_items}).'}), 400
+        logger.info(f"Incoming /api/recommendations/batch with {len(items)} items")
+        
+        results = [None] * len(items)
+        # Identical rooms share one ranking: key -> (room_inputs, noise_profile, top_k, item indexes)
+        distinct = {}
+        for index, item in enumerate(items):
+            try:
+                room_inputs, noise_profile = parse_recommendation_payload(item)
+                top_k = parse_recommendation_top_k(item)
+            except ValueError as e:
+                results[index] = {'index': index, 'error': str(e)}
+                continue
+            key = build_cache_key("recommendation_item", room_inputs, noise_profile, top_k)
+            distinct.setdefault(key, (room_inputs, noise_profile, top_k, []))[3].append(index)
+        
+        if distinct:
+            solutions_manager = get_solutions_manager()
+            if not solutions_manager:
+                logger.error("Failed to initialize solutions manager.")
+                return jsonify({'error': 'Failed to initialize solutions manager.'}), 500
+            candidates = get_recommendation_candidates(solutions_manager)
+            
+            entries = list(distinct.values())
+            workers = int(os.getenv('RECOMMENDATIONS_BATCH_WORKERS', 4))
+            if isinstance(payload, dict) and payload.get('parallel') and workers > 1 and len(entries) > 1:
+                with ThreadPoolExecutor(max_workers=min(workers, len(entries)),
+                                        thread_name_prefix='recommendations-batch') as pool:
+                    outcomes = list(pool.map(lambda entry: _rank_batch_entry(candidates, *entry[:3]), entries))
+            else:
+                outcomes = [_rank_batch_entry(candidates, *entry[:3]) for entry in entries]
+            
+            for (_, _, _, indexes), (recommendations, error) in zip(entries, outcomes):
+                for index in indexes:
+                    if error is not None:
+                        results[index] = {'index': index, 'error': error}
+                    else:
+                        results[index] = {'index': index, 'recommendations': recommendations or []}
+        
+        logger.info(f"Ranked {len(distinct)} distinct rooms for {len(items)} batch items")
+        return jsonify({'results': results, 'distinct_rooms': len(distinct)})
+    except Exception as e:
+        logger.error(f"[FATAL] Unhandled exception in /api/recommendations/batch: {e}")
+        return jsonify({'error': f'Unhandled exception: {e}'}), 500
+
+@csrf.exempt
+@app.route('/api/quote/building', methods=['POST'])
+def get_building_quote_flask():
+    """Quote every room of a building in one request.
+
+    Body: {"name": ..., "rooms": [{"name", "length", "width", "height",
+    "solutions": {"walls"|<direction>|"ceiling"|"floor": <solution id>},
+    "blockages": {<surface>: [...]}}, ...]}. Returns per-room costs, building-wide
+    material quantities and the time spent in each stage, or 400 listing any
+    solution ids the catalogue cannot price.
+    """
+    try:
+        payload = request.get_json()
+        if not isinstance(payload, dict) or not isinstance(payload.get('rooms'), list) or not payload['rooms']:
+            return jsonify({'error': '"rooms" must be a non-empty list'}), 400
+        max_rooms = int(os.getenv('BUILDING_QUOTE_MAX_ROOMS', 500))
+        if len(payload['rooms']) > max_rooms:
+            return jsonify({'error': f'At most {max_rooms} rooms per quote'}), 400
+        try:
+            building = Building.from_dict(payload)
+        except (ValueError, TypeError, AttributeError) as e:
+            return jsonify({'error': str(e)}), 400
+        quote = building.quote()
+        if quote.unpriced_surfaces:
+            unknown = quote.unpriced_solutions
+            logger.warning(f"Building quote rejected, no catalogue materials for {unknown}")
+            return jsonify({'error': f"Unknown solution ids: {', '.join(unknown)}",
+                            'unknownSolutions': unknown,
+                            'unpricedSurfaces': quote.unpriced_surfaces}), 400
+        return jsonify(quote.to_dict())
+    except Exception as e:
+        logger.error(f"[FATAL] Unhandled exception in /api/quote/building: {e}")
+        return jsonify({'error': f'Unhandled exception: {e}'}), 500
+
 # Utility function for detailed material breakdown
 
 def get_solution_material_breakdown(solution_id, dimensions):
@@ -0,0 +1,48 @@
+"""
+Per-hit cost of CacheManager.get().
+
+Logging is configured the way app.py configures it (root logger at INFO)
+with output sent to a null stream, so the numbers include building and
+emitting whatever the cache logs on each hit.
+
+Usage:
+    python -m benchmarks.bench_cache_get [--iterations 200000]
+"""
+
+import argparse
+import io
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.cache_manager import CacheManager
+
+KEYS = {
+    'solution key': 'solution_walls_Genie Clip wall (Standard)',
+    'plain key': 'acoustic_props_GenieClipWallStandard_5.0_4.0_2.4',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=io.StringIO())
+    logging.getLogger().handlers[0].stream = open(os.devnull, 'w')
+
+    cache = CacheManager()
+    for key in KEYS.values():
+        cache.set(key, {'stc_rating': 55})
+
+    print(f"{'workload':>14} {'ns per get()':>14}")
+    for label, key in KEYS.items():
+        seconds = min(timeit.repeat(lambda: cache.get(key), number=args.iterations, repeat=3))
+        print(f"{label:>14} {seconds / args.iterations * 1e9:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Throughput benchmark for CacheManager under concurrent access.
+
+Runs a mixed get/set workload (80% get, 20% set over a fixed key space) from
+1 to 16 threads and reports total operations per second, comparing a single
+lock with lock striping over --shards shards.
+
+On CPython with the GIL both stay flat within run-to-run noise (roughly
+150-300k ops/s here for 1 to 16 threads): the critical sections are short dict
+operations that never release the GIL, so there is no lock contention to
+remove. That is why CacheManager defaults to one shard; rerun this on a
+free-threaded build before raising CACHE_SHARDS.
+
+Usage:
+    python -m benchmarks.bench_cache_manager [--ops 20000] [--keys 1000] [--shards 16]
+"""
+
+import argparse
+import random
+import threading
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.cache_manager import CacheManager
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def run_workload(cache: CacheManager, threads: int, ops_per_thread: int, key_count: int) -> float:
+    """Run the mixed workload and return operations per second"""
+    keys = [f'acoustic_props_{i}' for i in range(key_count)]
+    for key in keys:
+        cache.set(key, {'stc': 50, 'key': key})
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        barrier.wait()
+        for _ in range(ops_per_thread):
+            key = keys[rng.randrange(key_count)]
+            if rng.random() < 0.8:
+                cache.get(key)
+            else:
+                cache.set(key, {'stc': 50, 'key': key})
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * ops_per_thread / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ops', type=int, default=20000, help='operations per thread')
+    parser.add_argument('--keys', type=int, default=1000, help='size of the key space')
+    parser.add_argument('--shards', type=int, default=16, help='shard count to compare with a single lock')
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'1 shard ops/s':>15} {f'{args.shards} shards ops/s':>17}")
+    for threads in THREAD_COUNTS:
+        results = []
+        for shards in (1, args.shards):
+            cache = CacheManager(shards=shards)
+            results.append(run_workload(cache, threads, args.ops, args.keys))
+        print(f"{threads:>8} {results[0]:>15,.0f} {results[1]:>17,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Cost of scoring a catalogue with the ranking kernel.
+
+Scores random catalogues of increasing size with score_features() and with
+the equivalent per-solution Python loop, and reports microseconds per call.
+
+Usage:
+    python -m benchmarks.bench_ranking [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import RoomProfile, NoiseProfile
+from solutions.ranking_kernel import FEATURES, build_ranking_context, score_features
+
+CATALOGUE_SIZES = (16, 160, 1600, 16000)
+
+
+def score_loop(rows, context, areas, meets):
+    """The per-solution scoring the kernel replaces"""
+    scores = []
+    for (stc, low, mid, high, damping, _, complexity, cost_per_m2), area, meets_req in zip(rows, areas, meets):
+        score = 0
+        if stc > 0 and context.needed_reduction > 0:
+            score += min(30, (stc / context.needed_reduction) * 30)
+        if damping and context.has_room_profile:
+            absorption_score = ((low + mid + high) / 3) * context.room_factor * 15
+            score += min(25, absorption_score + damping * 10 * context.resonance_factor)
+        if context.budget:
+            cost = cost_per_m2 * area
+            if cost <= context.budget:
+                score += ((context.budget - cost) / context.budget) * 10
+        score += (10 - complexity) / 10 * 8 + (2 if meets_req else 0)
+        scores.append(round(score, 2))
+    return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+
+
+def score_kernel(matrix, context, areas, meets):
+    scores = np.round(score_features(matrix, context, areas, meets)["score"], 2)
+    return np.argsort(-scores, kind="stable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    noise = NoiseProfile(typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+    context = build_ranking_context(7, RoomProfile(resonance=[90, 210]), noise, {'budget': 5000}, ['fire_rated'])
+
+    print(f"{'solutions':>10} {'loop µs':>12} {'kernel µs':>12}")
+    for n in CATALOGUE_SIZES:
+        rows = [[rng.random() * 60 for _ in FEATURES] for _ in range(n)]
+        areas = [rng.uniform(5, 60) for _ in range(n)]
+        meets = [rng.random() < 0.5 for _ in range(n)]
+        matrix, area_vec, meets_vec = np.array(rows), np.array(areas), np.array(meets)
+
+        number = max(1, args.repeat * 16 // n)
+        loop = min(timeit.repeat(lambda: score_loop(rows, context, areas, meets), number=number, repeat=3)) / number
+        kernel = min(timeit.repeat(lambda: score_kernel(matrix, context, area_vec, meets_vec),
+                                   number=number, repeat=3)) / number
+        print(f"{n:>10} {loop * 1e6:>12,.1f} {kernel * 1e6:>12,.1f}")
+
+
+if __name__ == '__main__':
+    main()
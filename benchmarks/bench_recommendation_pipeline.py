@@ -0,0 +1,97 @@
+"""
+Latency of ranking every surface of a room, sequentially and on the pipeline.
+
+Each surface gets a catalogue of candidate solutions and each candidate's
+acoustic profile lookup is a cache miss that waits a fixed latency, standing
+in for the MongoDB round trip behind AcousticCalculator.calculate_properties().
+The surfaces are ranked the way RecommendationEngine does it, once with
+single-worker pools (the old one-after-another behaviour) and once with
+the default pool sizes, and the milliseconds per room are reported.
+
+Usage:
+    python -m benchmarks.bench_recommendation_pipeline [--solutions 8] [--rooms 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import RoomProfile, NoiseProfile as AcousticNoiseProfile
+from solutions.cache_manager import CacheManager
+from solutions.ranking_kernel import FEATURES, RankingCandidates
+from solutions.recommendation_engine import rank_prepared_solutions, RoomInputs, NoiseProfile
+from solutions.recommendation_pipeline import RecommendationPipeline
+
+SURFACES = ('walls', 'ceiling', 'floor')
+LATENCIES_MS = (0, 1, 5)
+
+
+class SlowCalculator:
+    """Acoustic calculator whose profile lookups all miss the cache and wait on the database"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get_room_profile(self, room_type):
+        return RoomProfile(reflectivity=0.5)
+
+    def get_noise_profile(self, noise_type):
+        return AcousticNoiseProfile(typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+
+    def calculate_properties(self, solution_id, dimensions):
+        time.sleep(self.latency)
+        return {'stc_rating': 50}
+
+
+def rank_room(surface_candidates, inputs, noise, calculator, pipeline, cache):
+    return pipeline.map_surfaces(
+        lambda surface: rank_prepared_solutions(surface_candidates[surface], inputs, noise, calculator,
+                                                pipeline=pipeline, cache_manager=cache),
+        SURFACES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--solutions', type=int, default=8, help='candidate solutions per surface')
+    parser.add_argument('--rooms', type=int, default=5, help='rooms ranked per measurement')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    surface_candidates = {}
+    for surface in SURFACES:
+        solutions = [{'solution_id': f'{surface}{i}', 'surface_type': surface} for i in range(args.solutions)]
+        features = np.array([[rng.random() * 60 for _ in FEATURES] for _ in solutions])
+        surface_candidates[surface] = RankingCandidates(solutions, solutions, features)
+    inputs = RoomInputs(room_type='bedroom', noise_type='speech', noise_level=7,
+                        room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+                        surface_areas={}, existing_construction={})
+    noise = NoiseProfile(type='speech', intensity=6, direction=['north', 'above', 'below'])
+
+    sequential = RecommendationPipeline(surface_workers=1, solution_workers=1)
+    parallel = RecommendationPipeline()
+    print(f"{args.solutions} solutions per surface, {len(SURFACES)} surfaces, "
+          f"{parallel.surface_workers} surface / {parallel.solution_workers} solution workers")
+    print(f"{'miss ms':>8} {'sequential ms':>14} {'pipeline ms':>12} {'speed-up':>9}")
+    for latency_ms in LATENCIES_MS:
+        calculator = SlowCalculator(latency_ms / 1000)
+        timings = []
+        for pipeline in (sequential, parallel):
+            rank_room(surface_candidates, inputs, noise, calculator, pipeline, CacheManager())  # warm up the pools
+            # A fresh cache per room, so every acoustic stage is computed
+            caches = [CacheManager() for _ in range(args.rooms)]
+            start = time.perf_counter()
+            for cache in caches:
+                rank_room(surface_candidates, inputs, noise, calculator, pipeline, cache)
+            timings.append((time.perf_counter() - start) / args.rooms * 1000)
+        print(f"{latency_ms:>8} {timings[0]:>14,.2f} {timings[1]:>12,.2f} {timings[0] / timings[1]:>8.1f}x")
+    parallel.shutdown()
+
+
+if __name__ == '__main__':
+    main()
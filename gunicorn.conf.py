@@ -0,0 +1,10 @@
+"""Gunicorn configuration.
+
+Picked up automatically by `gunicorn app:app` when run from the project root.
+"""
+
+
+def post_fork(server, worker):
+    """Drop any MongoClient inherited from the master so each worker gets its own pool"""
+    from solutions.db_init import post_fork as reset_db_after_fork
+    reset_db_after_fork(server, worker)
@@ -7,107 +7,29 @@ to provide more consistent and accurate calculations from the server.
 """
 
 from typing import Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass
 import math
 import logging
 import threading
-from functools import lru_cache
 import numpy as np
 from solutions.material_properties import get_material_properties
 from solutions.solution_calculator import get_solutions_manager
 from solutions.cache_manager import get_cache_manager
-from solutions.database import get_db
+from solutions.cache_keys import build_cache_key
+from solutions.db_init import get_db
+from solutions.profile_registry import MaterialProperties, NoiseProfile, RoomProfile, get_profile_registry
+from solutions.spectrum import Spectrum
+from solutions.material_table import MaterialTable, get_material_table
 from solutions.logger import get_logger
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class MaterialProperties:
-    """Data class for material acoustic properties"""
-    stc: float = 0.0
-    density: float = 0.0
-    thickness: float = 0.0
-    absorption: Dict[str, float] = None
-    damping: float = 0.0
-    decoupling: float = 0.0
-    
-    def __post_init__(self):
-        if self.absorption is None:
-            self.absorption = {"low": 0.0, "mid": 0.0, "high": 0.0}
-
-@dataclass
-class NoiseProfile:
-    """Data class for noise profiles"""
-    typical_frequency: List[float]
-    peak_frequency: float
-    critical_bands: Dict[str, List[float]]
-    description: str = ""
-
-@dataclass
-class RoomProfile:
-    """Data class for room acoustic properties"""
-    reflectivity: float = 0.5
-    absorption: float = 0.5
-    resonance: List[float] = None
-    reverberation: float = 0.5
-    
-    def __post_init__(self):
-        if self.resonance is None:
-            self.resonance = [0.0, 0.0]
-
 class AcousticCalculator:
     """
     Performs acoustic calculations for soundproofing solutions
     """
-    def _calculate_material_properties(self, materials: List[Dict]) -> Dict:
-        """Calculate combined material properties"""
-        total_stc = 0.0
-        total_density = 0.0
-        total_thickness = 0.0
-        total_absorption = {"low": 0.0, "mid": 0.0, "high": 0.0}
-        total_damping = 0.0
-        total_decoupling = 0.0
-        total_coverage = 0.0
-        
-        for material in materials:
-            material_name = material.get('name', '')
-            coverage = float(material.get('coverage', 100))
-            
-            if not material_name:
-                continue
-                
-            props = self.get_material_properties(material_name)
-            
-            # Weight properties by coverage
-            total_stc += props.stc * coverage
-            total_density += props.density * coverage
-            total_thickness += props.thickness * coverage
-            total_absorption["low"] += props.absorption["low"] * coverage
-            total_absorption["mid"] += props.absorption["mid"] * coverage
-            total_absorption["high"] += props.absorption["high"] * coverage
-            total_damping += props.damping * coverage
-            total_decoupling += props.decoupling * coverage
-            total_coverage += coverage
-        
-        # Normalize by total coverage
-        if total_coverage > 0:
-            return {
-                "stc": total_stc / total_coverage,
-                "density": total_density / total_coverage,
-                "thickness": total_thickness / total_coverage,
-                "absorption": {
-                    k: v / total_coverage for k, v in total_absorption.items()
-                },
-                "damping": total_damping / total_coverage,
-                "decoupling": total_decoupling / total_coverage
-            }
-            
-        return self._get_empty_properties()
-    
     def __init__(self):
         """Initialize the acoustic calculator with empty data structures"""
         self.logger = get_logger()
-        self.db = None
         self.cache_manager = get_cache_manager()
         self.solutions_manager = None
         
@@ -117,77 +39,23 @@ class AcousticCalculator:
         self.room_profiles = {}
         self.logger.info("Acoustic calculator initialized with empty data structures")
     
-    @lru_cache(maxsize=100)
+    @property
+    def db(self):
+        """The worker's pooled database, resolved on use so no connection is made before fork"""
+        return get_db()
+    
     def get_material_properties(self, material_name: str) -> MaterialProperties:
-        """Get material properties with caching"""
+        """Get material properties from the profile registry"""
         try:
-            # Try cache first
-            if self.cache_manager is not None:
-                cached = self.cache_manager.get(f"material_props_{material_name}")
-                if cached:
-                    return MaterialProperties(**cached)
-            
-            # Try database
-            if self.db is not None:
-                material = self.db.materials.find_one({"name": material_name})
-                if material:
-                    props = MaterialProperties(
-                        stc=float(material.get("stc_rating", 0)),
-                        density=float(material.get("density", 0)),
-                        thickness=float(material.get("thickness", 0)),
-                        absorption=material.get("absorption", {"low": 0, "mid": 0, "high": 0}),
-                        damping=float(material.get("damping", 0)),
-                        decoupling=float(material.get("decoupling", 0))
-                    )
-                    
-                    # Cache the result
-                    if self.cache_manager is not None:
-                        self.cache_manager.set(f"material_props_{material_name}", props.__dict__)
-                    
-                    return props
-            
-            # Return empty properties if not found
-            self.logger.warning(f"No material properties found for {material_name}")
-            return MaterialProperties()
-            
+            return get_profile_registry().material_properties(material_name)
         except Exception as e:
             self.logger.error(f"Error getting material properties for {material_name}: {e}")
             return MaterialProperties()
     
-    @lru_cache(maxsize=50)
     def get_noise_profile(self, noise_type: str) -> NoiseProfile:
-        """Get noise profile with caching"""
+        """Get noise profile from the profile registry"""
         try:
-            # Try cache first
-            if self.cache_manager is not None:
-                cached = self.cache_manager.get(f"noise_profile_{noise_type}")
-                if cached:
-                    return NoiseProfile(**cached)
-            
-            # Try database
-            if self.db is not None:
-                profile = self.db.noise.find_one({"type": "profile", "profile_id": noise_type})
-                if profile:
-                    return NoiseProfile(
-                        typical_frequency=profile.get("typical_frequency", [100, 8000]),
-                        peak_frequency=float(profile.get("peak_frequency", 1000)),
-                        critical_bands=profile.get("critical_bands", {
-                            "low": [100, 500],
-                            "mid": [500, 2000],
-                            "high": [2000, 8000]
-                        }),
-                        description=profile.get("description", "")
-                    )
-            
-            # Return default noise profile if not found
-            self.logger.warning(f"No noise profile found for {noise_type}")
-            return NoiseProfile(
-                typical_frequency=[100, 1000],
-                peak_frequency=500,
-                critical_bands={"low": [100, 250], "mid": [500, 1000], "high": [2000, 4000]},
-                description=f"Default profile for {noise_type} noise"
-            )
-            
+            return get_profile_registry().noise_profile(noise_type)
         except Exception as e:
             self.logger.error(f"Error getting noise profile for {noise_type}: {e}")
             return NoiseProfile(
@@ -196,122 +64,45 @@ class AcousticCalculator:
                 critical_bands={"low": [100, 500], "mid": [500, 2000], "high": [2000, 8000]}
             )
     
-    @lru_cache(maxsize=50)
     def get_room_profile(self, room_type: str) -> RoomProfile:
-        """Get room profile with caching"""
+        """Get room profile from the profile registry"""
         try:
-            # Try cache first
-            if self.cache_manager is not None:
-                cached = self.cache_manager.get(f"room_profile_{room_type}")
-                if cached:
-                    return RoomProfile(**cached)
-            
-            # Try database
-            if self.db is not None:
-                room = self.db.noise.find_one({"type": "room", "room_type": room_type})
-                if room:
-                    return RoomProfile(
-                        reflectivity=float(room.get("reflectivity", 0.5)),
-                        absorption=float(room.get("absorption", 0.5)),
-                        resonance=room.get("resonance", [100, 200]),
-                        reverberation=float(room.get("reverberation", 0.5))
-                    )
-            
-            # Fall back to static data
-            return self.room_profiles.get(room_type, RoomProfile())
-            
+            return get_profile_registry().room_profile(room_type)
         except Exception as e:
             self.logger.error(f"Error getting room profile for {room_type}: {e}")
             return RoomProfile()
     
     def calculate_material_properties(self, materials: List[Dict]) -> Dict:
-        """Calculate combined material properties with caching"""
+        """Calculate combined material properties with caching
+        
+        Cached per material names, coverages and material table version.
+        """
         if not materials:
             return self._get_empty_properties()
             
-        # Create cache key
-        cache_key = f"material_props_{'_'.join(sorted(m.get('name', '') for m in materials))}"
+        table = get_material_table()
+        cache_key = table.cache_key(materials)
         
-        # Try cache first
-        if self.cache_manager:
-            cached = self.cache_manager.get(cache_key)
-            if cached:
-                return cached
-        
-        # Calculate properties
-        properties = self._calculate_material_properties(materials)
-        
-        # Cache result
         if self.cache_manager is not None:
-            self.cache_manager.set(cache_key, properties)
-        
-        return properties
+            return self.cache_manager.get_or_compute(cache_key, lambda: self._calculate_material_properties(materials, table))
+        return self._calculate_material_properties(materials, table)
     
-    def _calculate_material_properties(self, materials: List[Dict]) -> Dict:
-        """Calculate combined material properties"""
-        total_stc = 0.0
-        total_density = 0.0
-        total_thickness = 0.0
-        total_absorption = {"low": 0.0, "mid": 0.0, "high": 0.0}
-        total_damping = 0.0
-        total_decoupling = 0.0
-        total_coverage = 0.0
-        
-        for material in materials:
-            material_name = material.get('name', '')
-            coverage = float(material.get('coverage', 100))
-            
-            if not material_name:
-                continue
-                
-            props = self.get_material_properties(material_name)
-            
-            # Weight properties by coverage
-            total_stc += props.stc * coverage
-            total_density += props.density * coverage
-            total_thickness += props.thickness * coverage
-            total_absorption["low"] += props.absorption["low"] * coverage
-            total_absorption["mid"] += props.absorption["mid"] * coverage
-            total_absorption["high"] += props.absorption["high"] * coverage
-            total_damping += props.damping * coverage
-            total_decoupling += props.decoupling * coverage
-            total_coverage += coverage
-        
-        # Normalize by total coverage
-        if total_coverage > 0:
-            return {
-                "stc": total_stc / total_coverage,
-                "density": total_density / total_coverage,
-                "thickness": total_thickness / total_coverage,
-                "absorption": {
-                    k: v / total_coverage for k, v in total_absorption.items()
-                },
-                "damping": total_damping / total_coverage,
-                "decoupling": total_decoupling / total_coverage
-            }
-            
-        return self._get_empty_properties()
+    def _calculate_material_properties(self, materials: List[Dict], table: Optional[MaterialTable] = None) -> Dict:
+        """Calculate combined material properties, weighted by coverage"""
+        table = table or get_material_table()
+        properties = table.aggregate(materials)
+        return properties if properties is not None else self._get_empty_properties()
     
     def estimate_stc_rating(self, solution_id: str, intensity: int) -> int:
         """Estimate STC rating for a solution with caching"""
         try:
             # Create cache key
-            cache_key = f"stc_rating_{solution_id}_{intensity}"
-            
-            # Try cache first
-            if self.cache_manager is not None:
-                cached = self.cache_manager.get(cache_key)
-                if cached:
-                    return int(cached)
-            
-            # Calculate STC rating
-            stc_rating = self._calculate_stc_rating(solution_id, intensity)
+            cache_key = build_cache_key("stc_rating", solution_id, intensity)
             
-            # Cache result
             if self.cache_manager is not None:
-                self.cache_manager.set(cache_key, stc_rating)
-            
-            return stc_rating
+                return int(self.cache_manager.get_or_compute(
+                    cache_key, lambda: self._calculate_stc_rating(solution_id, intensity)))
+            return self._calculate_stc_rating(solution_id, intensity)
             
         except Exception as e:
             self.logger.error(f"Error estimating STC rating for {solution_id}: {e}")
@@ -337,8 +128,11 @@ class AcousticCalculator:
                 self.logger.warning(f"No characteristics found for solution: {solution_id}")
                 return 0
             
-            # Get base STC rating
+            # Base STC: fitted to the solution's measured TL curve, else the stored rating
             base_stc = characteristics.get('stc_rating', 0)
+            store = self.solutions_manager.get_feature_store()
+            if store.has_measured_transmission_loss(solution_id):
+                base_stc = store.sound_ratings(solution_id).stc
             
             # Adjust for intensity
             intensity_factor = min(intensity / 10.0, 1.0)
@@ -368,7 +162,7 @@ class AcousticCalculator:
         """Calculate surface areas with caching"""
         try:
             # Create cache key
-            cache_key = f"surface_areas_{'_'.join(str(v) for v in dimensions.values())}"
+            cache_key = build_cache_key("surface_areas", dimensions)
             
             # Try cache first
             if self.cache_manager is not None:
@@ -401,7 +195,7 @@ class AcousticCalculator:
         """Adjust solution for room acoustics with caching"""
         try:
             # Create cache key
-            cache_key = f"room_adjustment_{solution.get('solution', '')}_{room_type}_{noise_type}"
+            cache_key = build_cache_key("room_adjustment", solution.get('solution', ''), room_type, noise_type)
             
             # Try cache first
             if self.cache_manager is not None:
@@ -455,184 +249,107 @@ class AcousticCalculator:
             
         return room_resonance[0] <= noise_frequency <= room_resonance[1]
         
-    @lru_cache(maxsize=50)
-    def get_frequency_response(self, solution_name: str) -> Dict[str, float]:
-        """Get frequency response data for a solution with caching"""
+    def _find_cached_solution(self, solution_name: str) -> Optional[Dict]:
+        """Find a solution in the per-surface solution caches"""
+        if not self.cache_manager:
+            return None
+        for surface_type in ['wall', 'ceiling', 'floor']:
+            cached_solutions = self.cache_manager.get(f"{surface_type}_solutions")
+            for cached_solution in cached_solutions or []:
+                if isinstance(cached_solution, dict) and cached_solution.get('solution_id') == solution_name:
+                    return cached_solution
+        return None
+    
+    def _find_stored_spectrum(self, solution_name: str, field: str) -> Optional[Spectrum]:
+        """Band data stored under acoustic_properties for a material or solution in MongoDB"""
+        if self.db is None:
+            return None
+        # Materials collection first, then the solutions collections
+        lookups = [("materials", {"name": solution_name})]
+        lookups += [(collection, {"solution": solution_name})
+                    for collection in ["wallsolutions", "ceilingsolutions", "floorsolutions"]]
+        for collection, query in lookups:
+            document = self.db[collection].find_one(query)
+            data = ((document or {}).get("acoustic_properties") or {}).get(field)
+            if isinstance(data, dict):
+                spectrum = Spectrum.from_mapping(data)
+                if spectrum.max() > 0:
+                    return spectrum
+        return None
+    
+    def get_frequency_response(self, solution_name: str) -> Spectrum:
+        """Get the 1/3-octave frequency response of a solution with caching"""
         try:
-            # Try cache first
+            cache_key = build_cache_key("freq_response", solution_name)
             if self.cache_manager:
-                cached = self.cache_manager.get(f"freq_response_{solution_name}")
-                if cached:
+                cached = self.cache_manager.get(cache_key)
+                if isinstance(cached, Spectrum):
                     return cached
             
-            # Try to find solution in cached solutions
-            solution_data = None
-            for surface_type in ['wall', 'ceiling', 'floor']:
-                cache_key_surface = f"{surface_type}_solutions"
-                cached_solutions = self.cache_manager.get(cache_key_surface) if self.cache_manager else None
-                if cached_solutions:
-                    for cached_solution in cached_solutions:
-                        if isinstance(cached_solution, dict) and cached_solution.get('solution_id') == solution_name:
-                            solution_data = cached_solution
-                            break
-                    if solution_data:
-                        break
+            solution_data = self._find_cached_solution(solution_name)
+            response = None if solution_data else self._find_stored_spectrum(solution_name, "frequency_response")
             
-            # Try database if not found in cache
-            if not solution_data and self.db is not None:
-                # Try to find in materials collection first
-                material = self.db.materials.find_one({"name": solution_name})
-                if material and "acoustic_properties" in material and "frequency_response" in material["acoustic_properties"]:
-                    response = material["acoustic_properties"]["frequency_response"]
-                    
-                    # Cache the result
-                    if self.cache_manager:
-                        self.cache_manager.set(f"freq_response_{solution_name}", response)
-                    
-                    return response
-                
-                # Try to find in solutions collections
-                for collection in ["wallsolutions", "ceilingsolutions", "floorsolutions"]:
-                    solution = self.db[collection].find_one({"solution": solution_name})
-                    if solution and "acoustic_properties" in solution and "frequency_response" in solution["acoustic_properties"]:
-                        response = solution["acoustic_properties"]["frequency_response"]
-                        
-                        # Cache the result
-                        if self.cache_manager:
-                            self.cache_manager.set(f"freq_response_{solution_name}", response)
-                        
-                        return response
+            if response is None:
+                # Estimate the response from the STC rating: higher STC, better response in every band
+                if solution_data:
+                    stc_rating = solution_data.get('stc_rating', 0)
+                else:
+                    stc_rating = self.estimate_stc_rating(solution_name, 5)
+                response = Spectrum.response_from_stc(stc_rating)
             
-            # Generate realistic frequency response based on STC rating
-            stc_rating = 0
-            if solution_data:
-                stc_rating = solution_data.get('stc_rating', 0)
-            else:
-                # Try to estimate STC rating
-                stc_rating = self.estimate_stc_rating(solution_name, 5)
-            
-            # Generate frequency response based on STC
-            # Higher STC = better response across all frequencies
-            base_response = min(stc_rating / 100.0, 1.0)  # Normalize to 0-1
-            response = {
-                "125": base_response * 0.7,   # Lower response at low frequencies
-                "250": base_response * 0.8,
-                "500": base_response * 0.9,
-                "1000": base_response,        # Best response at mid frequencies
-                "2000": base_response * 0.95,
-                "4000": base_response * 0.9   # Slightly lower at high frequencies
-            }
-            
-            # Cache the result
             if self.cache_manager:
-                self.cache_manager.set(f"freq_response_{solution_name}", response)
+                self.cache_manager.set(cache_key, response)
             
             return response
             
         except Exception as e:
             self.logger.error(f"Error getting frequency response for {solution_name}: {e}")
-            return {
-                "125": 0.0,
-                "250": 0.0,
-                "500": 0.0,
-                "1000": 0.0,
-                "2000": 0.0,
-                "4000": 0.0
-            }
+            return Spectrum.zeros()
     
-    @lru_cache(maxsize=50)
-    def get_transmission_loss(self, solution_name: str) -> Dict[str, float]:
-        """Get transmission loss data for a solution with caching"""
+    def get_transmission_loss(self, solution_name: str) -> Spectrum:
+        """Get the 1/3-octave transmission loss curve of a solution with caching
+        
+        Registered solutions use the curve precomputed in the feature store
+        for the current catalogue version.
+        """
         try:
-            # Try cache first
+            if self.solutions_manager is not None:
+                trans_loss = self.solutions_manager.get_feature_store().transmission_loss(solution_name)
+                if isinstance(trans_loss, Spectrum):
+                    return trans_loss
+            
+            cache_key = build_cache_key("trans_loss", solution_name)
             if self.cache_manager:
-                cached = self.cache_manager.get(f"trans_loss_{solution_name}")
-                if cached:
+                cached = self.cache_manager.get(cache_key)
+                if isinstance(cached, Spectrum):
                     return cached
             
-            # Try to find solution in cached solutions
-            solution_data = None
-            for surface_type in ['wall', 'ceiling', 'floor']:
-                cache_key_surface = f"{surface_type}_solutions"
-                cached_solutions = self.cache_manager.get(cache_key_surface) if self.cache_manager else None
-                if cached_solutions:
-                    for cached_solution in cached_solutions:
-                        if isinstance(cached_solution, dict) and cached_solution.get('solution_id') == solution_name:
-                            solution_data = cached_solution
-                            break
-                    if solution_data:
-                        break
-            
-            # Try database if not found in cache
-            if not solution_data and self.db is not None:
-                # Try to find in materials collection first
-                material = self.db.materials.find_one({"name": solution_name})
-                if material and "acoustic_properties" in material and "transmission_loss" in material["acoustic_properties"]:
-                    trans_loss = material["acoustic_properties"]["transmission_loss"]
-                    
-                    # Cache the result
-                    if self.cache_manager:
-                        self.cache_manager.set(f"trans_loss_{solution_name}", trans_loss)
-                    
-                    return trans_loss
-                
-                # Try to find in solutions collections
-                for collection in ["wallsolutions", "ceilingsolutions", "floorsolutions"]:
-                    solution = self.db[collection].find_one({"solution": solution_name})
-                    if solution and "acoustic_properties" in solution and "transmission_loss" in solution["acoustic_properties"]:
-                        trans_loss = solution["acoustic_properties"]["transmission_loss"]
-                        
-                        # Cache the result
-                        if self.cache_manager:
-                            self.cache_manager.set(f"trans_loss_{solution_name}", trans_loss)
-                        
-                        return trans_loss
-            
-            # Generate realistic transmission loss based on STC rating
-            stc_rating = 0
-            if solution_data:
-                stc_rating = solution_data.get('stc_rating', 0)
-            else:
-                # Try to estimate STC rating
-                stc_rating = self.estimate_stc_rating(solution_name, 5)
+            solution_data = self._find_cached_solution(solution_name)
+            trans_loss = None if solution_data else self._find_stored_spectrum(solution_name, "transmission_loss")
             
-            # Use the existing method to estimate transmission loss from STC
-            trans_loss = self._estimate_transmission_loss_from_stc(stc_rating)
+            if trans_loss is None:
+                if solution_data:
+                    stc_rating = solution_data.get('stc_rating', 0)
+                else:
+                    stc_rating = self.estimate_stc_rating(solution_name, 5)
+                trans_loss = self._estimate_transmission_loss_from_stc(stc_rating)
             
-            # Cache the result
             if self.cache_manager:
-                self.cache_manager.set(f"trans_loss_{solution_name}", trans_loss)
+                self.cache_manager.set(cache_key, trans_loss)
             
             return trans_loss
             
         except Exception as e:
             self.logger.error(f"Error getting transmission loss for {solution_name}: {e}")
-            return {
-                "125": 0.0,
-                "250": 0.0,
-                "500": 0.0,
-                "1000": 0.0,
-                "2000": 0.0,
-                "4000": 0.0
-            }
+            return Spectrum.zeros()
     
-    def _estimate_transmission_loss_from_stc(self, stc: int) -> Dict[str, float]:
+    def _estimate_transmission_loss_from_stc(self, stc: int) -> Spectrum:
         """Estimate transmission loss values based on STC rating"""
         # Simple model: STC roughly equals TL at 500 Hz
-        # TL increases ~5dB per octave above 500 Hz
-        # TL decreases ~5dB per octave below 500 Hz
+        # TL increases ~5dB per octave above 500 Hz and decreases ~5dB per octave below
         # This is a standard acoustic engineering approximation
-        base_tl = float(stc)
-        return {
-            "125": max(0, base_tl - 10),
-            "250": max(0, base_tl - 5),
-            "500": base_tl,
-            "1000": base_tl + 5,
-            "2000": base_tl + 10,
-            "4000": base_tl + 15
-        }
+        return Spectrum.from_stc(stc)
     
-    @lru_cache(maxsize=50)
     def calculate_compatibility(self, solution_name: str, room_type: str = None, noise_type: str = None) -> float:
         """Calculate compatibility score for a solution with caching
         
@@ -646,11 +363,7 @@ class AcousticCalculator:
         """
         try:
             # Create cache key based on parameters
-            cache_key = f"compatibility_{solution_name}"
-            if room_type:
-                cache_key += f"_{room_type}"
-            if noise_type:
-                cache_key += f"_{noise_type}"
+            cache_key = build_cache_key("compatibility", solution_name, room_type=room_type, noise_type=noise_type)
             
             # Try cache first
             if self.cache_manager:
@@ -739,16 +452,10 @@ class AcousticCalculator:
                         low_freq, high_freq = noise_profile.typical_frequency
                         
                         # Check if solution has good response in noise frequency range
-                        low_match = False
-                        high_match = False
-                        
-                        for freq_str, response in freq_response.items():
-                            freq = float(freq_str)
-                            if low_freq <= freq <= high_freq and response > 0.5:
-                                if freq < 500:
-                                    low_match = True
-                                else:
-                                    high_match = True
+                        response = Spectrum.from_mapping(freq_response)
+                        good = response.band_mask(low_freq, high_freq) & (response.values > 0.5)
+                        low_match = bool((good & (response.bands < 500)).any())
+                        high_match = bool((good & (response.bands >= 500)).any())
                         
                         if low_match and high_match:
                             compatibility += 0.1  # Good frequency match
@@ -782,106 +489,93 @@ class AcousticCalculator:
         """
         try:
             # Create cache key
-            cache_key = f"acoustic_props_{solution_id}_{'_'.join(str(v) for v in dimensions.values())}"
+            cache_key = build_cache_key("acoustic_props", solution_id, dimensions)
             
-            # Try cache first
+            # Concurrent misses for the same key share one computation
             if self.cache_manager is not None:
-                cached = self.cache_manager.get(cache_key)
-                if cached:
-                    return cached
-            
-            # Get solution data from solutions manager
-            if self.solutions_manager is None:
-                self.logger.warning(f"Solutions manager not available for properties calculation: {solution_id}")
-                return self._get_empty_acoustic_properties()
-            
-            # Try to get solution from solutions manager
-            solution = self.solutions_manager.get_solution(solution_id)
-            solution_data = None
-            
-            if solution and hasattr(solution, '_solution_data') and solution._solution_data:
-                solution_data = solution._solution_data
-            elif solution and hasattr(solution, 'get_characteristics'):
-                # Use characteristics if no _solution_data
-                solution_data = solution.get_characteristics()
+                properties = self.cache_manager.get_or_compute(
+                    cache_key, lambda: self._compute_properties(solution_id, dimensions))
             else:
-                # Try to find solution in cache by surface type
-                for surface_type in ['wall', 'ceiling', 'floor']:
-                    cache_key_surface = f"{surface_type}_solutions"
-                    cached_solutions = self.cache_manager.get(cache_key_surface) if self.cache_manager else None
-                    if cached_solutions:
-                        for cached_solution in cached_solutions:
-                            if isinstance(cached_solution, dict) and cached_solution.get('solution_id') == solution_id:
-                                solution_data = cached_solution
-                                break
-                        if solution_data:
-                            break
+                properties = self._compute_properties(solution_id, dimensions)
             
-            if not solution_data:
-                self.logger.warning(f"No solution data found for {solution_id}")
-                return self._get_empty_acoustic_properties()
-            
-            # Calculate surface areas
-            surface_areas = self.calculate_surface_areas(dimensions)
-            
-            # Get STC rating
-            stc_rating = solution_data.get('stc_rating', 0)
-            if not stc_rating and 'materials' in solution_data:
-                # Calculate STC from materials
-                materials = solution_data['materials']
-                material_props = self.calculate_material_properties(materials)
-                stc_rating = material_props.get('stc', 0)
-            
-            # Get frequency response
-            frequency_response = self.get_frequency_response(solution_id)
-            
-            # Get transmission loss
-            transmission_loss = self.get_transmission_loss(solution_id)
-            
-            # Compile properties
-            properties = {
-                "solution_id": solution_id,
-                "stc_rating": stc_rating,
-                "surface_areas": surface_areas,
-                "frequency_response": frequency_response,
-                "transmission_loss": transmission_loss,
-                "materials": solution_data.get('materials', []),
-                "thickness": solution_data.get('thickness', 0),
-                "weight": solution_data.get('weight', 0)
-            }
-            
-            # Cache result
-            if self.cache_manager is not None:
-                self.cache_manager.set(cache_key, properties)
-            
-            return properties
+            return properties if properties is not None else self._get_empty_acoustic_properties()
             
         except Exception as e:
             self.logger.error(f"Error calculating acoustic properties for {solution_id}: {e}")
             return self._get_empty_acoustic_properties()
 
+    def _compute_properties(self, solution_id: str, dimensions: Dict) -> Optional[Dict]:
+        """Compute acoustic properties for a solution, or None if it has no data"""
+        # Get solution data from solutions manager
+        if self.solutions_manager is None:
+            self.logger.warning(f"Solutions manager not available for properties calculation: {solution_id}")
+            return None
+        
+        # Try to get solution from solutions manager
+        solution = self.solutions_manager.get_solution(solution_id)
+        solution_data = None
+        
+        if solution and hasattr(solution, '_solution_data') and solution._solution_data:
+            solution_data = solution._solution_data
+        elif solution and hasattr(solution, 'get_characteristics'):
+            # Use characteristics if no _solution_data
+            solution_data = solution.get_characteristics()
+        else:
+            # Try to find solution in cache by surface type
+            for surface_type in ['wall', 'ceiling', 'floor']:
+                cache_key_surface = f"{surface_type}_solutions"
+                cached_solutions = self.cache_manager.get(cache_key_surface) if self.cache_manager else None
+                if cached_solutions:
+                    for cached_solution in cached_solutions:
+                        if isinstance(cached_solution, dict) and cached_solution.get('solution_id') == solution_id:
+                            solution_data = cached_solution
+                            break
+                    if solution_data:
+                        break
+        
+        if not solution_data:
+            self.logger.warning(f"No solution data found for {solution_id}")
+            return None
+        
+        # Calculate surface areas
+        surface_areas = self.calculate_surface_areas(dimensions)
+        
+        # Get STC rating
+        stc_rating = solution_data.get('stc_rating', 0)
+        if not stc_rating and 'materials' in solution_data:
+            # Calculate STC from materials
+            materials = solution_data['materials']
+            material_props = self.calculate_material_properties(materials)
+            stc_rating = material_props.get('stc', 0)
+        
+        # Get frequency response
+        frequency_response = self.get_frequency_response(solution_id)
+        
+        # Get transmission loss
+        transmission_loss = self.get_transmission_loss(solution_id)
+        
+        # Compile properties
+        properties = {
+            "solution_id": solution_id,
+            "stc_rating": stc_rating,
+            "surface_areas": surface_areas,
+            # Spectra stay internal; callers get the string-keyed form, ready for JSON
+            "frequency_response": frequency_response.to_dict(),
+            "transmission_loss": transmission_loss.to_dict(),
+            "materials": solution_data.get('materials', []),
+            "thickness": solution_data.get('thickness', 0),
+            "weight": solution_data.get('weight', 0)
+        }
+        return properties
+
     def _get_empty_acoustic_properties(self) -> Dict:
         """Get empty acoustic properties structure"""
         return {
             "solution_id": "",
             "stc_rating": 0,
             "surface_areas": {"floor": 0.0, "ceiling": 0.0, "walls": 0.0},
-            "frequency_response": {
-                "125": 0.0,
-                "250": 0.0,
-                "500": 0.0,
-                "1000": 0.0,
-                "2000": 0.0,
-                "4000": 0.0
-            },
-            "transmission_loss": {
-                "125": 0.0,
-                "250": 0.0,
-                "500": 0.0,
-                "1000": 0.0,
-                "2000": 0.0,
-                "4000": 0.0
-            },
+            "frequency_response": Spectrum.zeros().to_dict(),
+            "transmission_loss": Spectrum.zeros().to_dict(),
             "materials": [],
             "thickness": 0,
             "weight": 0
@@ -890,10 +584,6 @@ class AcousticCalculator:
     def cleanup(self):
         """Cleanup resources and clear caches"""
         try:
-            # Clear LRU cache
-            if hasattr(self.get_material_properties, 'cache_clear'):
-                self.get_material_properties.cache_clear()
-            
             # Clear internal caches
             self.material_properties.clear()
             self.noise_profiles.clear()
@@ -934,9 +624,6 @@ def cleanup_acoustic_calculator():
     with _acoustic_calculator_lock:
         if _acoustic_calculator_instance is not None:
             try:
-                # Clear caches
-                if hasattr(_acoustic_calculator_instance, 'get_material_properties'):
-                    _acoustic_calculator_instance.get_material_properties.cache_clear()
                 # Cleanup any other resources
                 if hasattr(_acoustic_calculator_instance, 'cleanup'):
                     _acoustic_calculator_instance.cleanup()
@@ -5,13 +5,17 @@ import math
 import logging
 from dataclasses import dataclass
 from solutions.config import WASTAGE_MATERIALS, SPECIAL_MATERIALS, MATERIAL_COVERAGE, LABOR_COST_PERCENTAGE
+from solutions.quantity_engine import material_quantity
 from solutions.cache_manager import get_cache_manager
 from datetime import datetime
-from solutions.database import get_db
+from solutions.db_init import get_db
 
 class BaseCalculator:
     """Base calculator for all sound insulation solutions."""
     
+    WASTAGE_MATERIALS = WASTAGE_MATERIALS
+    SPECIAL_MATERIALS = SPECIAL_MATERIALS
+    
     def __init__(self, length, height):
         self.length = float(length)
         self.height = float(height)
@@ -26,30 +30,17 @@ class BaseCalculator:
             'calculations': {'cached': False, 'last_updated': None}
         }
 
-    def calculate_material_quantity(self, material: Dict) -> float:
-        """Calculate quantity needed for a material with support for special cases"""
+    def calculate_material_quantity(self, material: Dict, area: Optional[float] = None,
+                                    perimeter: Optional[float] = None) -> float:
+        """Calculate quantity needed for a material with support for special cases
+
+        The rules live in solutions.quantity_engine; area and perimeter
+        default to the calculator's own surface.
+        """
         try:
-            name = material.get('name', '')
-            
-            # Check for special material handling
-            if name in self.SPECIAL_MATERIALS:
-                special = self.SPECIAL_MATERIALS[name]
-                if "perimeter_based" in special:
-                    return math.ceil(self.calculate_perimeter())
-                elif "spacing" in special:
-                    return math.ceil(self.area / special["spacing"])
-                elif "min_quantity" in special:
-                    base_quantity = self.area * material.get('unitsPerM2', 1.0)
-                    return max(special["min_quantity"], math.ceil(base_quantity))
-            
-            # Standard material calculation
-            base_quantity = self.area * material.get('unitsPerM2', 1.0)
-            
-            # Add wastage if needed
-            if name in self.WASTAGE_MATERIALS:
-                base_quantity *= 1.1  # Add 10% wastage
-                
-            return math.ceil(base_quantity)
+            area = self.area if area is None else area
+            perimeter = self.calculate_perimeter() if perimeter is None else perimeter
+            return material_quantity(material, area, perimeter)
             
         except Exception as e:
             self.logger.error(f"Error calculating material quantity: {str(e)}")
@@ -122,8 +113,12 @@ class BaseCalculator:
             self._update_cache_status('solution_data', False)
             return None
 
-    def calculate_costs(self, area):
-        """Calculate costs for both single and multi-material solutions"""
+    def calculate_costs(self, area, materials: Optional[List[Dict]] = None, perimeter: Optional[float] = None):
+        """Calculate costs for both single and multi-material solutions
+
+        materials defaults to the solution's own materials; perimeter to the
+        calculator's surface.
+        """
         costs = {
             "materials": [],
             "breakdown": {
@@ -145,11 +140,14 @@ class BaseCalculator:
             "totalCost": 0
         }
 
+        if materials is None:
+            materials = characteristics.get("materials")
+
         try:
-            if "materials" in characteristics:
+            if materials is not None:
                 # Multi-material solution
-                for material in characteristics["materials"]:
-                    quantity = self.calculate_material_quantity(material)
+                for material in materials:
+                    quantity = self.calculate_material_quantity(material, area, perimeter)
                     material_cost = quantity * material["baseCost"]
                     
                     material_data = {
@@ -3,6 +3,8 @@
 from typing import Dict, List, Optional, Any
 from solutions.base_solution import BaseSolution
 from solutions.config import CLIP_SPACING
+from solutions.quantity_engine import (
+    CHANNEL_SPACING, channel_length, extra_count, grid_count, line_count, sealant_length, sheet_count)
 import math
 import logging
 
@@ -53,18 +55,16 @@ class BaseGenieClipSolution(BaseSolution):
             
             area = width * height
             
-            # Calculate clips needed based on standard spacing
-            clips_per_sqm = 1 / (self.CLIP_SPACING * self.CLIP_SPACING)  # Convert to m²
-            clips_needed = math.ceil(area * clips_per_sqm)
-            extra_clips = math.ceil(clips_needed * 0.1)  # 10% extra for corners and edges
+            # Calculate clips needed based on standard spacing, 10% extra for corners and edges
+            clips_needed = grid_count(area, self.CLIP_SPACING)
+            extra_clips = extra_count(clips_needed)
             
             # Calculate channel quantities
-            channel_spacing = 0.4  # 400mm spacing for channels
-            channels_needed = math.ceil(width / channel_spacing)
-            extra_channels = math.ceil(channels_needed * 0.1)  # 10% extra
+            channels_needed = line_count(width, CHANNEL_SPACING)
+            extra_channels = extra_count(channels_needed)
             
             # Calculate material quantities
-            material_quantities = self.calculate_material_quantities(area)
+            material_quantities = self.calculate_material_quantities(area, width, height)
             
             return {
                 'clip_spacing': self.CLIP_SPACING,
@@ -90,21 +90,19 @@ class BaseGenieClipSolution(BaseSolution):
             self.plasterboard_layers = 1  # SP15 variant uses 1 layer plus SP15
         self.validate_surface_type()
         
-    def calculate_material_quantities(self, area: float) -> Dict[str, float]:
-        """Calculate material quantities for GenieClip solutions"""
+    def calculate_material_quantities(self, area: float, width: Optional[float] = None,
+                                      height: Optional[float] = None) -> Dict[str, float]:
+        """Calculate material quantities for GenieClip solutions
+
+        width and height default to the calculator's own surface.
+        """
         try:
-            # Calculate plasterboard quantity with 10% waste
-            plasterboard_quantity = area * self.plasterboard_layers * 1.1
-            
-            # Calculate channel length with 10% extra
-            channel_spacing = 0.4  # 400mm spacing
-            channel_rows = math.ceil(self.height / channel_spacing)
-            channel_length = channel_rows * self.length * 1.1  # 10% extra
-            
+            width = self.length if width is None else width
+            height = self.height if height is None else height
             return {
-                'plasterboard_sheets': math.ceil(plasterboard_quantity / 2.88),  # Standard 1.2m x 2.4m sheet
-                'channel_length': math.ceil(channel_length),
-                'acoustic_sealant': math.ceil((self.length + self.height) * 2 * 1.1)  # Perimeter x2 for both sides + 10%
+                'plasterboard_sheets': sheet_count(area, self.plasterboard_layers),
+                'channel_length': channel_length(width, height),
+                'acoustic_sealant': sealant_length(width, height)
             }
         except Exception as e:
             self.logger.error(f"Error calculating material quantities: {e}")
@@ -128,9 +126,8 @@ class BaseGenieClipSolution(BaseSolution):
             if not clip_data:
                 return None
                 
-            # Calculate material quantities
+            # Material quantities were calculated for the same surface as the clips
             area = clip_data['area']
-            material_quantities = self.calculate_material_quantities(area)
             
             # Calculate installation time (days)
             install_time = math.ceil(area / 20) + 1  # rough estimate: 20 sqm per day + 1 prep day
@@ -139,7 +136,6 @@ class BaseGenieClipSolution(BaseSolution):
             result = base_result.copy()
             result['additional_info'] = {
                 **clip_data,
-                **material_quantities,
                 'install_time': f"{install_time} days",
                 'skill_level': self.SKILL_LEVEL,
                 'surface_type': self.SURFACE_TYPE,
@@ -158,7 +154,7 @@ class BaseGenieClipSolution(BaseSolution):
                 f"GenieClip calculation successful: "
                 f"area={area:.2f}m², "
                 f"clips={clip_data['clips_needed']}, "
-                f"plasterboard={material_quantities.get('plasterboard_sheets', 0)} sheets, "
+                f"plasterboard={clip_data.get('plasterboard_sheets', 0)} sheets, "
                 f"variant={'SP15' if self.IS_SP15 else 'Standard'}"
             )
             return result
@@ -4,9 +4,41 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 from solutions.base_calculator import BaseCalculator
 from solutions.cache_manager import get_cache_manager
+from solutions.cache_keys import build_cache_key, KEY_FLOAT_DIGITS
+from solutions.quantity_engine import clip_spacing_for, grid_count, extra_count
 import logging
+import threading
 from datetime import datetime
 
+# Cached calculation results are shared between requests, users and workers
+CALCULATION_CACHE_TTL = 3600
+
+_calculation_stats: Dict[str, Dict[str, int]] = {}
+_calculation_stats_lock = threading.Lock()
+
+
+def _count_calculation(solution_class: str, hit: bool) -> None:
+    with _calculation_stats_lock:
+        stats = _calculation_stats.setdefault(solution_class, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+
+def get_calculation_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Calculation cache hits, misses and hit ratio per solution class"""
+    with _calculation_stats_lock:
+        snapshot = {name: dict(stats) for name, stats in _calculation_stats.items()}
+    for stats in snapshot.values():
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 2) if lookups > 0 else 0
+    return snapshot
+
+
+def reset_calculation_cache_stats() -> None:
+    """Reset the calculation cache counters for testing purposes"""
+    with _calculation_stats_lock:
+        _calculation_stats.clear()
+
+
 class BaseSolution(BaseCalculator):
     """Enhanced base class that maintains compatibility with existing solutions"""
     
@@ -15,29 +47,44 @@ class BaseSolution(BaseCalculator):
         self._solution_data = None
         self._material_properties = None
         self.plasterboard_layers = 2  # Default number of layers
-        # Load data in constructor to ensure it's available
-        try:
-            self._solution_data = self._load_solution_data(self.CODE_NAME)
-        except Exception as e:
-            # Handle any errors loading solution data
-            self.logger.warning(f"Error loading solution data for {self.CODE_NAME}: {e}")
-            self._solution_data = None
+        # A document passed to from_document() saves the query by solution code
+        prefetched = getattr(self, '_prefetched_solution_data', None)
+        if prefetched is not None:
+            self._solution_data = prefetched
+        else:
+            # Load data in constructor to ensure it's available
+            try:
+                self._solution_data = self._load_solution_data(self.CODE_NAME)
+            except Exception as e:
+                # Handle any errors loading solution data
+                self.logger.warning(f"Error loading solution data for {self.CODE_NAME}: {e}")
+                self._solution_data = None
         self._load_material_properties()
 
+    @classmethod
+    def from_document(cls, document: Dict[str, Any], length: float = 0, height: float = 0) -> 'BaseSolution':
+        """Create a solution from its already loaded variant document, without querying MongoDB
+
+        The loaders use this with the documents bulk-loaded at startup (or read
+        from the catalog snapshot), so a cold start makes no per-class queries.
+        """
+        solution = cls.__new__(cls)
+        solution._prefetched_solution_data = document
+        solution.__init__(length, height)
+        return solution
+
     def calculate_clip_spacing(self, dimensions: Optional[Dict] = None) -> Dict[str, Any]:
         """Calculate clip spacing and quantities for clip-based solutions"""
         try:
-            from solutions.config import CLIP_SPACING
-            clip_spacing = CLIP_SPACING.get(self.CODE_NAME.lower().replace(' ', '_'), 600)
+            clip_spacing = clip_spacing_for(self.CODE_NAME)
             
             length = dimensions.get('width', self.length) if dimensions else self.length
             height = dimensions.get('height', self.height) if dimensions else self.height
             area = length * height
             
-            # Calculate clips needed
-            clips_per_sqm = 1 / (clip_spacing * clip_spacing / 1e6)  # Convert mm² to m²
-            clips_needed = math.ceil(area * clips_per_sqm)
-            extra_clips = math.ceil(clips_needed * 0.1)  # 10% extra
+            # Calculate clips needed, plus 10% extra
+            clips_needed = grid_count(area, clip_spacing)
+            extra_clips = extra_count(clips_needed)
             
             return {
                 'clip_spacing': clip_spacing,
@@ -104,41 +151,51 @@ class BaseSolution(BaseCalculator):
                 except TypeError as e:
                     self.logger.warning(f"Error loading solution data for material properties: {e}")
                     solution_data = {'materials': []}
-            
-            self._material_properties = solution_data.get('materials', [])
+
+            # Without MongoDB or a prefetched document there is no solution data yet
+            self._material_properties = (solution_data or {}).get('materials', [])
             self._update_cache_status('material_properties', True)
         return self._material_properties
             
     def calculate(self, dimensions: Optional[Dict] = None, materials: Optional[List] = None) -> Dict[str, Any]:
-        """Calculate solution properties with caching"""
+        """Calculate solution properties with caching
+
+        Results are cached per solution class, dimensions (quantised to
+        KEY_FLOAT_DIGITS decimals, which the calculation then uses) and
+        material set, so identical surfaces share one result across requests.
+        The returned dict is a copy that callers may extend.
+        """
         try:
             # Handle both direct dimensions and dict format
             length = dimensions.get('width', self.length) if dimensions else self.length
             height = dimensions.get('height', self.height) if dimensions else self.height
+            length = round(float(length), KEY_FLOAT_DIGITS)
+            height = round(float(height), KEY_FLOAT_DIGITS)
             
-            # Create cache parameters
-            cache_params = {
-                'length': length,
-                'height': height,
-                'materials': sorted([m.get('name', '') for m in (materials or [])])
-            }
-            
-            # Try to get from cache
-            cache_key = f"{self.CODE_NAME}_calculation"
-            cached = self.cache_manager.get(cache_key)
-            if cached:
-                self._update_cache_status('calculations', True)
-                return cached
-                
-            # Calculate if not cached
             characteristics = self.get_characteristics()
             if not characteristics:
                 self._update_cache_status('calculations', False)
                 return None
+            material_list = materials or characteristics.get('materials', [])
+            
+            solution_class = type(self).__name__
+            cache_key = build_cache_key(
+                f"{self.CODE_NAME}_calculation",
+                solution_class=solution_class,
+                length=length,
+                height=height,
+                materials=sorted(material_list, key=lambda m: str(m.get('name', ''))),
+                characteristics=characteristics
+            )
+            cached = self.cache_manager.get(cache_key)
+            _count_calculation(solution_class, cached is not None)
+            if cached is not None:
+                self._update_cache_status('calculations', True)
+                return dict(cached)
                 
             # Calculate area and costs
             area = length * height
-            costs = super().calculate(materials or characteristics.get('materials', []))
+            costs = self.calculate_costs(area, material_list, perimeter=2 * (length + height))
             
             result = {
                 'area': area,
@@ -147,10 +204,10 @@ class BaseSolution(BaseCalculator):
             }
             
             # Cache the result
-            self.cache_manager.set(cache_key, result, 3600)  # Cache for 1 hour
+            self.cache_manager.set(cache_key, result, CALCULATION_CACHE_TTL)
             self._update_cache_status('calculations', True)
             
-            return result
+            return dict(result)
             
         except Exception as e:
             self.logger.error(f"Error calculating solution: {e}")
@@ -165,7 +222,7 @@ class BaseSolution(BaseCalculator):
             cached = self.cache_manager.get(cache_key)
             if cached:
                 self._update_cache_status('characteristics', True)
-                self.logger.info(f"[SOLUTION DATA] {self.CODE_NAME}: Characteristics loaded from CACHE")
+                self.logger.debug("[SOLUTION DATA] %s: Characteristics loaded from CACHE", self.CODE_NAME)
                 # Add source information if not present
                 if '_source' not in cached:
                     cached['_source'] = 'cache'
@@ -201,11 +258,10 @@ class BaseSolution(BaseCalculator):
             self._update_cache_status('characteristics', True)
                 
             # Log characteristics details
-            self.logger.info(f"[SOLUTION DATA] {self.CODE_NAME} details: "
-                           f"Source: {characteristics.get('_source', 'unknown')}, "
-                           f"STC Rating: {characteristics.get('stc_rating', 'N/A')}, "
-                           f"Sound Reduction: {characteristics.get('sound_reduction', 'N/A')}, "
-                           f"Materials: {len(characteristics.get('materials', []))}")
+            self.logger.debug("[SOLUTION DATA] %s details: Source: %s, STC Rating: %s, "
+                              "Sound Reduction: %s, Materials: %d",
+                              self.CODE_NAME, characteristics['_source'], characteristics['stc_rating'],
+                              characteristics['sound_reduction'], len(characteristics['materials']))
             
             return characteristics
             
@@ -0,0 +1,242 @@
+"""
+Whole-building quotes over many rooms and surfaces.
+
+A Building holds any number of rooms, each with its dimensions, the
+solution chosen for each surface and the blockages (doors, windows,
+fittings) on each wall, the ceiling and the floor. Building.quote() prices
+the whole building in three batched stages:
+
+1. surfaces: every treated surface becomes a row in flat arrays of
+   width, height, perimeter and net area (gross area minus blockages).
+2. quantities: the surfaces are grouped by solution and each group goes
+   through quantity_engine.bill_of_materials() once, with each solution's
+   materials looked up once per quote instead of once per room.
+3. rollup: fractional material demand is summed per room and over the
+   whole building before rounding, so whole sheets and packs are bought
+   for the building rather than rounded up room by room.
+
+Each stage is timed, and the quote reports the timings with the result.
+Surfaces whose solution has no catalogue materials cannot be priced; the
+quote lists them under unpriced_surfaces instead of costing them at zero.
+
+Walls run along the room: north and south walls span its length, east and
+west walls its width. A "walls" entry in a room's solutions applies to all
+four walls; a direction entry overrides it for that wall.
+"""
+
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from solutions.blockage_calculator import calculate_blockage_area, safe_float
+from solutions.config import LABOR_COST_PERCENTAGE
+from solutions.quantity_engine import bill_of_materials, round_up
+
+logger = logging.getLogger(__name__)
+
+WALL_DIRECTIONS = ('north', 'south', 'east', 'west')
+# Room dimension each wall runs along
+WALL_SPANS = {'north': 'length', 'south': 'length', 'east': 'width', 'west': 'width'}
+HORIZONTAL_SURFACES = ('ceiling', 'floor')
+
+
+def catalog_materials(solution_id: str) -> List[Dict[str, Any]]:
+    """Materials of a registered solution, from the solution feature store"""
+    from solutions.feature_store import thaw
+    from solutions.solutions import get_solutions_manager
+
+    record = get_solutions_manager().get_feature_store().get(solution_id)
+    if record is None:
+        return []
+    return thaw(record.characteristics).get('materials', [])
+
+
+@dataclass
+class BuildingRoom:
+    """One room of a building and the solutions chosen for its surfaces"""
+    name: str
+    length: float
+    width: float
+    height: float
+    solutions: Dict[str, str]
+    blockages: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], index: int = 0) -> 'BuildingRoom':
+        """Build a room from request data, with dimensions flat or under "dimensions"."""
+        dimensions = data.get('dimensions', data)
+        room = cls(
+            name=str(data.get('name') or f"Room {index + 1}"),
+            length=safe_float(dimensions.get('length')),
+            width=safe_float(dimensions.get('width')),
+            height=safe_float(dimensions.get('height')),
+            solutions=dict(data.get('solutions') or {}),
+            blockages=dict(data.get('blockages') or {}),
+        )
+        if not all(d > 0 for d in (room.length, room.width, room.height)):
+            raise ValueError(f"All dimensions of {room.name} must be positive")
+        return room
+
+    def surfaces(self) -> List[Tuple[str, str, float, float]]:
+        """(surface, solution, width, height) for every treated surface"""
+        surfaces = []
+        for direction in WALL_DIRECTIONS:
+            solution = self.solutions.get(direction) or self.solutions.get('walls')
+            if solution:
+                span = self.length if WALL_SPANS[direction] == 'length' else self.width
+                surfaces.append((direction, solution, span, self.height))
+        for surface in HORIZONTAL_SURFACES:
+            solution = self.solutions.get(surface)
+            if solution:
+                surfaces.append((surface, solution, self.length, self.width))
+        return surfaces
+
+    def blockage_area(self, surface: str) -> float:
+        """Area of the blockages on one surface"""
+        blockages = self.blockages.get(surface) or []
+        kind = 'wall' if surface in WALL_DIRECTIONS else surface
+        return sum(calculate_blockage_area(b, kind) for b in blockages if isinstance(b, dict))
+
+
+@dataclass
+class BuildingQuote:
+    """Quantities and costs for a whole building"""
+    rooms: List[Dict[str, Any]]
+    materials: List[Dict[str, Any]]
+    materials_cost: float
+    labor_cost: float
+    total_cost: float
+    timings_ms: Dict[str, float]
+    # Surfaces left out of the costs because their solution has no catalogue materials
+    unpriced_surfaces: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def unpriced_solutions(self) -> List[str]:
+        """Distinct solution ids that could not be priced, in order of first use"""
+        return list(dict.fromkeys(surface['solution'] for surface in self.unpriced_surfaces))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rooms': self.rooms,
+            'materials': self.materials,
+            'materialsCost': self.materials_cost,
+            'laborCost': self.labor_cost,
+            'totalCost': self.total_cost,
+            'unpricedSurfaces': self.unpriced_surfaces,
+            'timings_ms': self.timings_ms,
+        }
+
+
+class Building:
+    """A project of many rooms quoted together"""
+
+    def __init__(self, rooms: List[BuildingRoom], name: str = ""):
+        self.name = name
+        self.rooms = rooms
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Building':
+        rooms = [BuildingRoom.from_dict(room, i) for i, room in enumerate(data.get('rooms') or [])]
+        return cls(rooms, name=data.get('name', ''))
+
+    def quote(self, solution_materials: Optional[Callable[[str], List[Dict[str, Any]]]] = None) -> BuildingQuote:
+        """Price every surface of every room and roll up purchase quantities
+
+        Args:
+            solution_materials: Returns the material records of a solution id,
+                defaults to the registered solution catalogue
+        """
+        solution_materials = solution_materials or catalog_materials
+        timings = {}
+
+        start = time.perf_counter()
+        room_index, surfaces, solution_ids, widths, heights, net_areas, perimeters = [], [], [], [], [], [], []
+        for i, room in enumerate(self.rooms):
+            for surface, solution, width, height in room.surfaces():
+                room_index.append(i)
+                surfaces.append(surface)
+                solution_ids.append(solution)
+                widths.append(width)
+                heights.append(height)
+                net_areas.append(max(0.0, width * height - room.blockage_area(surface)))
+                perimeters.append(2 * (width + height))
+        room_index = np.array(room_index, dtype=np.int64)
+        widths, heights = np.array(widths, dtype=float), np.array(heights, dtype=float)
+        net_areas, perimeters = np.array(net_areas, dtype=float), np.array(perimeters, dtype=float)
+        timings['surfaces'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        material_rows: Dict[str, int] = {}
+        names, units, unit_costs, minimum = [], [], [], []
+        # Fractional demand of each material per room
+        demand_rows: List[np.ndarray] = []
+        groups: Dict[str, List[int]] = {}
+        unpriced: List[int] = []
+        for k, solution in enumerate(solution_ids):
+            groups.setdefault(solution, []).append(k)
+        for solution, rows in groups.items():
+            materials = solution_materials(solution)
+            if not materials:
+                logger.warning(f"No materials found for solution {solution}; its surfaces are not priced")
+                unpriced.extend(rows)
+                continue
+            rows = np.array(rows, dtype=np.int64)
+            bill = bill_of_materials(materials, widths[rows], heights[rows], perimeters[rows], areas=net_areas[rows])
+            for m, name in enumerate(bill.names):
+                if name not in material_rows:
+                    material_rows[name] = len(names)
+                    names.append(name)
+                    units.append(bill.units[m])
+                    unit_costs.append(bill.unit_costs[m])
+                    minimum.append(bill.minimum[m])
+                    demand_rows.append(np.zeros(len(self.rooms)))
+                np.add.at(demand_rows[material_rows[name]], room_index[rows], bill.demand[m])
+        timings['quantities'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        demand = np.array(demand_rows) if demand_rows else np.zeros((0, len(self.rooms)))
+        unit_costs = np.array(unit_costs, dtype=float)
+        minimum = np.array(minimum, dtype=np.int64)
+        room_units = np.where(demand > 0, np.maximum(round_up(demand), minimum[:, None]), 0)
+        building_demand = demand.sum(axis=1)
+        purchase_units = np.where(building_demand > 0, np.maximum(round_up(building_demand), minimum), 0)
+
+        room_material_costs = (room_units * unit_costs[:, None]).sum(axis=0)
+        rooms = [{
+            'name': room.name,
+            'materialsCost': round(float(room_material_costs[i]), 2),
+            'laborCost': round(float(room_material_costs[i]) * LABOR_COST_PERCENTAGE, 2),
+            'totalCost': round(float(room_material_costs[i]) * (1 + LABOR_COST_PERCENTAGE), 2),
+        } for i, room in enumerate(self.rooms)]
+
+        purchase_costs = purchase_units * unit_costs
+        room_rounded_units = room_units.sum(axis=1)
+        materials = [{
+            'name': name,
+            'unit': units[m],
+            'unitCost': round(float(unit_costs[m]), 2),
+            'quantity': int(purchase_units[m]),
+            'perRoomQuantity': int(room_rounded_units[m]),
+            'cost': round(float(purchase_costs[m]), 2),
+        } for m, name in enumerate(names)]
+
+        materials_cost = round(float(purchase_costs.sum()), 2)
+        labor_cost = round(materials_cost * LABOR_COST_PERCENTAGE, 2)
+        timings['rollup'] = (time.perf_counter() - start) * 1000
+        timings['total'] = sum(timings.values())
+
+        logger.info(f"Quoted {len(self.rooms)} rooms, {len(solution_ids)} surfaces and {len(names)} materials "
+                    f"in {timings['total']:.1f}ms")
+        return BuildingQuote(
+            rooms=rooms,
+            materials=materials,
+            materials_cost=materials_cost,
+            labor_cost=labor_cost,
+            total_cost=round(materials_cost + labor_cost, 2),
+            timings_ms={stage: round(ms, 3) for stage, ms in timings.items()},
+            unpriced_surfaces=[{'room': self.rooms[room_index[k]].name, 'surface': surfaces[k],
+                                'solution': solution_ids[k]} for k in sorted(unpriced)],
+        )
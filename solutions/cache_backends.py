@@ -0,0 +1,164 @@
+"""
+Shared (L2) backends for CacheManager.
+
+CacheManager keeps hot entries in process memory; a backend lets every
+gunicorn worker see entries computed by the others. Values are stored as
+pickles, zlib-compressed above COMPRESS_THRESHOLD bytes, under keys of the
+form "<namespace>:v<version>:<key>". Bumping CACHE_VERSION on deploy makes
+old entries unreachable without flushing Redis.
+
+Only put the cache in a Redis instance you trust: values are unpickled.
+
+Environment variables:
+    CACHE_L2_URL          Redis URL for the shared cache (default: REDIS_URL)
+    CACHE_L2              Set to "0" to disable the shared cache
+    CACHE_L2_TIMEOUT      Redis socket timeout in seconds (default: 0.1)
+    CACHE_NAMESPACE       Key namespace (default: soundproofing)
+    CACHE_VERSION         Key version prefix (default: 1)
+"""
+
+import os
+import pickle
+import zlib
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_THRESHOLD = 1024
+
+# One-byte header saying how the rest of the payload is encoded
+_RAW = b'p'
+_COMPRESSED = b'z'
+
+
+def serialize(value: Any) -> bytes:
+    """Encode a value for the shared cache"""
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) > COMPRESS_THRESHOLD:
+        return _COMPRESSED + zlib.compress(data)
+    return _RAW + data
+
+
+def deserialize(data: bytes) -> Any:
+    """Decode a value written by serialize()"""
+    header, payload = data[:1], data[1:]
+    if header == _COMPRESSED:
+        payload = zlib.decompress(payload)
+    elif header != _RAW:
+        raise ValueError(f"Unknown cache payload header {header!r}")
+    return pickle.loads(payload)
+
+
+def key_prefix(namespace: Optional[str] = None, version: Optional[str] = None) -> str:
+    """Prefix applied to every key in the shared cache"""
+    namespace = namespace if namespace is not None else os.getenv('CACHE_NAMESPACE', 'soundproofing')
+    version = version if version is not None else os.getenv('CACHE_VERSION', '1')
+    return f"{namespace}:v{version}:"
+
+
+class CacheBackend(ABC):
+    """
+    Interface for a shared cache store.
+
+    Backends deal in already-prefixed keys and serialized bytes; CacheManager
+    does the prefixing and serialization. Errors are raised to the caller.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def get_with_ttl(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        """Data and remaining seconds to live of a key; None seconds means no expiry"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, data: bytes, ttl: int) -> None:
+        """Store data; ttl <= 0 means no expiry"""
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a key. Returns True if it existed."""
+        pass
+
+    @abstractmethod
+    def clear(self, prefix: str) -> int:
+        """Delete every key starting with prefix. Returns the number deleted."""
+        pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache in Redis. Pass a client (e.g. fakeredis in tests) or a URL."""
+
+    name = "redis"
+
+    def __init__(self, client=None, url: Optional[str] = None, timeout: Optional[float] = None):
+        if client is None:
+            import redis
+            timeout = timeout if timeout is not None else float(os.getenv('CACHE_L2_TIMEOUT', 0.1))
+            client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.client = client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        # One round trip; PTTL is -1 for a key without expiry, -2 for a missing key
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.get(key)
+        pipeline.pttl(key)
+        data, pttl = pipeline.execute()
+        return data, (pttl / 1000 if pttl is not None and pttl > 0 else None)
+
+    def set(self, key: str, data: bytes, ttl: int) -> None:
+        if ttl > 0:
+            self.client.set(key, data, ex=int(ttl))
+        else:
+            self.client.set(key, data)
+
+    def exists(self, key: str) -> bool:
+        return bool(self.client.exists(key))
+
+    def delete(self, key: str) -> bool:
+        return bool(self.client.delete(key))
+
+    def clear(self, prefix: str) -> int:
+        deleted = 0
+        batch = []
+        for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += self.client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += self.client.delete(*batch)
+        return deleted
+
+
+def get_cache_backend() -> Optional[CacheBackend]:
+    """Build the shared cache backend from the environment, or None if not configured"""
+    if os.getenv('CACHE_L2', '1') == '0':
+        return None
+    url = os.getenv('CACHE_L2_URL') or os.getenv('REDIS_URL')
+    if not url:
+        return None
+    try:
+        backend = RedisCacheBackend(url=url)
+        logger.info("Using Redis as shared cache backend")
+        return backend
+    except ImportError:
+        logger.warning("CACHE_L2_URL/REDIS_URL is set but the redis package is not installed; "
+                       "using the in-process cache only")
+    except Exception as e:
+        logger.warning(f"Failed to create Redis cache backend, using the in-process cache only: {e}")
+    return None
@@ -0,0 +1,54 @@
+"""
+Canonical cache keys for calculations.
+
+Keys are "<prefix>_<digest>", where the digest is a BLAKE2b hash of the
+inputs after normalisation: mapping keys are sorted, sets are ordered,
+floats are rounded to KEY_FLOAT_DIGITS decimals (so 5, 5.0 and
+5.0000001 give the same key), and anything else is reduced to its string
+form. Unlike hash(), the digest is the same in every process, so keys can
+be shared between workers through the L2 cache.
+"""
+
+import json
+import hashlib
+import dataclasses
+from enum import Enum
+from typing import Any
+
+# Dimensions are in metres; millimetre precision is more than any calculation uses
+KEY_FLOAT_DIGITS = 3
+
+
+def normalize_key_value(value: Any, digits: int = KEY_FLOAT_DIGITS) -> Any:
+    """Reduce a value to JSON-serializable data that is equal for equivalent inputs"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Enum):
+        return normalize_key_value(value.value, digits)
+    if isinstance(value, (int, float)):
+        number = round(float(value), digits)
+        if number.is_integer():
+            # 5 and 5.0 share a key; this also folds -0.0 into 0
+            return int(number)
+        return number
+    if isinstance(value, dict):
+        return {str(k): normalize_key_value(v, digits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_key_value(item, digits) for item in value]
+    if isinstance(value, (set, frozenset)):
+        items = [normalize_key_value(item, digits) for item in value]
+        return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return normalize_key_value(dataclasses.asdict(value), digits)
+    if hasattr(value, 'tolist'):
+        # numpy scalars and arrays
+        return normalize_key_value(value.tolist(), digits)
+    return str(value)
+
+
+def build_cache_key(prefix: str, *parts: Any, **named: Any) -> str:
+    """Build a stable cache key from a readable prefix and the inputs of a calculation"""
+    payload = json.dumps([normalize_key_value(list(parts)), normalize_key_value(named)],
+                         sort_keys=True, separators=(',', ':'))
+    digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{prefix}_{digest}"
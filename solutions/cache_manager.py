@@ -2,11 +2,44 @@
 Cache manager for storing and retrieving solution data.
 """
 
+import os
+import sys
+import itertools
 import logging
 import time
 import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import Future
+from typing import Callable
 from typing import Dict, Optional, Any, List
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+from solutions.cache_backends import CacheBackend, get_cache_backend, key_prefix, serialize, deserialize
+from solutions.cache_keys import build_cache_key
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_SWEEP_INTERVAL = 60
+# One lock: under the GIL nothing held by a shard lock releases it, so more
+# shards measured no faster (benchmarks/bench_cache_manager.py). CACHE_SHARDS
+# can raise it, e.g. on a free-threaded build.
+DEFAULT_SHARDS = 1
+DEFAULT_TRACE_SAMPLE_EVERY = 100
+DEFAULT_L1_TTL = 30
+DEFAULT_L2_RETRY_INTERVAL = 30
+
+_MISSING = object()
+
+# Map common solution types in cache keys to standardized categories
+SOLUTION_TYPE_MAP = {
+    'wall': 'wall',
+    'walls': 'wall',
+    'ceiling': 'ceiling',
+    'ceilings': 'ceiling',
+    'floor': 'floor',
+    'floors': 'floor'
+}
 
 
 _cache_manager = None
@@ -19,7 +52,7 @@ def get_cache_manager():
         with _cache_manager_lock:
             # Double-check locking pattern
             if _cache_manager is None:
-                _cache_manager = CacheManager()
+                _cache_manager = CacheManager(backend=get_cache_backend())
     return _cache_manager
 
 def reset_cache_manager():
@@ -44,32 +77,256 @@ def cleanup_cache_manager():
             finally:
                 _cache_manager = None
 
+@lru_cache(maxsize=4096)
+def _solution_type_for_key(key: str) -> Optional[str]:
+    """Solution type tracked in stats for a key, or None for non-solution keys.
+
+    Memoised because it runs on every get() and set().
+    """
+    if not key.startswith("solution_"):
+        return None
+    # Expected format: solution_<type>_<name>
+    solution_type = key.split('_', 2)[1].lower()
+    return SOLUTION_TYPE_MAP.get(solution_type, solution_type)
+
+def _estimate_size(value: Any, depth: int = 3) -> int:
+    """Approximate the memory held by a cached value.
+
+    Follows dicts, lists, tuples and sets, and the __dict__ of plain objects,
+    down to a few levels; deeper data is counted by its shallow size only.
+    """
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k, depth - 1) + _estimate_size(v, depth - 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, depth - 1) for item in value)
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        size += _estimate_size(vars(value), depth - 1)
+    return size
+
+def _new_stats() -> Dict[str, Any]:
+    return {
+        "hits": 0,
+        "misses": 0,
+        "added": 0,
+        "removed": 0,
+        "evicted": 0,  # Removed to stay within max_entries/max_bytes
+        "expired_removed": 0,  # Removed because their TTL passed
+        "solution_types": {}  # Track hits/misses by solution type
+    }
+
+class _CacheShard:
+    """
+    One lock-protected slice of the cache.
+
+    Holds its own LRU-ordered entries, expiry times, sizes and counters
+    behind its own lock. All methods take the shard lock themselves.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # Ordered from least to most recently used
+        self.expiry = {}  # Track when cache entries expire
+        self.stale_after = {}  # Soft expiry for stale-while-revalidate entries
+        self.sizes = {}  # Approximate size in bytes of each entry
+        self.total_bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = _new_stats()
+
+    def _count(self, solution_type: Optional[str], field: str) -> None:
+        self.stats[field] += 1
+        if solution_type is not None:
+            type_stats = self.stats["solution_types"].get(solution_type)
+            if type_stats is None:
+                type_stats = self.stats["solution_types"][solution_type] = {"hits": 0, "misses": 0, "added": 0}
+            type_stats[field] += 1
+
+    def _remove(self, key: str) -> None:
+        self.cache.pop(key, None)
+        self.expiry.pop(key, None)
+        self.stale_after.pop(key, None)
+        self.total_bytes -= self.sizes.pop(key, 0)
+
+    def _evict(self) -> None:
+        while self.cache and (len(self.cache) > self.max_entries or self.total_bytes > self.max_bytes):
+            self._remove(next(iter(self.cache)))
+            self.stats["evicted"] += 1
+
+    def _state(self, key: str, now: float) -> str:
+        """Classify a key as 'fresh', 'stale' or 'missing'; expired keys are removed"""
+        if key not in self.cache:
+            return "missing"
+        exp_time = self.expiry.get(key)
+        if exp_time is not None and exp_time <= now:
+            self._remove(key)
+            self.stats["expired_removed"] += 1
+            return "missing"
+        stale_time = self.stale_after.get(key)
+        if stale_time is not None and stale_time <= now:
+            return "stale"
+        return "fresh"
+
+    def get(self, key: str, solution_type: Optional[str], allow_stale: bool = False):
+        """Return (state, value), updating LRU order and counters.
+
+        Stale entries count as misses and are only returned with allow_stale.
+        """
+        with self.lock:
+            # Fast path for a fresh hit, inlined because it runs on every get()
+            value = self.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                now = time.time()
+                exp_time = self.expiry.get(key)
+                stale_time = self.stale_after.get(key)
+                if (exp_time is None or exp_time > now) and (stale_time is None or stale_time > now):
+                    self.cache.move_to_end(key)
+                    self._count(solution_type, "hits")
+                    return "fresh", value
+            state = self._state(key, time.time())
+            self._count(solution_type, "misses")
+            if state == "stale" and allow_stale:
+                self.cache.move_to_end(key)
+                return state, self.cache[key]
+            return state, None
+
+    def peek(self, key: str):
+        """Return (found, value) for a fresh entry without touching counters or LRU order"""
+        with self.lock:
+            if self._state(key, time.time()) == "fresh":
+                return True, self.cache[key]
+            return False, None
+
+    def set(self, key: str, value: Any, size: int, ttl: int, solution_type: Optional[str],
+            stale_ttl: int = 0) -> None:
+        with self.lock:
+            self._remove(key)
+            self.cache[key] = value
+            self.sizes[key] = size
+            self.total_bytes += size
+            if ttl > 0:
+                now = time.time()
+                self.expiry[key] = now + ttl + stale_ttl
+                if stale_ttl > 0:
+                    self.stale_after[key] = now + ttl
+            self._evict()
+            self._count(solution_type, "added")
+
+    def has(self, key: str) -> bool:
+        with self.lock:
+            return self._state(key, time.time()) == "fresh"
+
+    def delete(self, key: str) -> bool:
+        with self.lock:
+            if key not in self.cache:
+                return False
+            self._remove(key)
+            self.stats["removed"] += 1
+            return True
+
+    def sweep_expired(self, now: float) -> int:
+        with self.lock:
+            expired_keys = [key for key, exp_time in self.expiry.items() if exp_time <= now]
+            for key in expired_keys:
+                self._remove(key)
+            self.stats["expired_removed"] += len(expired_keys)
+            return len(expired_keys)
+
+    def clear(self, reset_stats: bool = False) -> None:
+        with self.lock:
+            self.cache = OrderedDict()
+            self.expiry = {}
+            self.stale_after = {}
+            self.sizes = {}
+            self.total_bytes = 0
+            if reset_stats:
+                self.stats = _new_stats()
+
 class CacheManager:
     """
     Manages caching of solution calculations and other expensive operations
+
+    All operations are thread-safe. Entries can be spread over CACHE_SHARDS
+    lock-striped shards by key hash (one by default). The cache is bounded: once a shard holds more than its share of max_entries items
+    or about its share of max_bytes, its least recently used entries are
+    evicted. Expired entries are swept every sweep_interval seconds as a side
+    effect of set(). Limits default to CACHE_MAX_ENTRIES, CACHE_MAX_BYTES,
+    CACHE_SWEEP_INTERVAL and CACHE_SHARDS from the environment.
+
+    Operations are not logged individually. Hits, misses, additions and
+    evictions are counted (see get_stats()), and when DEBUG logging is
+    enabled every CACHE_TRACE_SAMPLE_EVERY-th operation is traced; 0
+    disables the trace.
+
+    With a shared backend (see solutions.cache_backends) the shards act as
+    an L1 in front of it: writes go to both, L1 entries live at most l1_ttl
+    seconds (CACHE_L1_TTL), and an L1 miss is looked up in the backend before
+    it counts as a miss, so a value computed by one worker is reused by all
+    of them. If the backend errors it is bypassed for CACHE_L2_RETRY_INTERVAL
+    seconds rather than slowing down every miss.
     """
     
-    def __init__(self, cache_type="simple"):
+    def __init__(self, cache_type="simple", max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, sweep_interval: Optional[float] = None,
+                 shards: Optional[int] = None, trace_sample_every: Optional[int] = None,
+                 backend: Optional[CacheBackend] = None, l1_ttl: Optional[int] = None,
+                 namespace: Optional[str] = None, version: Optional[str] = None):
         """Initialize the cache manager with a specific cache type"""
         self.logger = logging.getLogger(__name__)
         self.cache_type = cache_type
-        self.cache = {}
-        self.expiry = {}  # Track when cache entries expire
-        self.stats = {
-            "hits": 0,
-            "misses": 0,
-            "added": 0,
-            "removed": 0,
-            "solution_types": {}  # Track hits/misses by solution type
-        }
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.sweep_interval = sweep_interval if sweep_interval is not None else float(os.getenv('CACHE_SWEEP_INTERVAL', DEFAULT_SWEEP_INTERVAL))
+        shard_count = max(1, shards if shards is not None else int(os.getenv('CACHE_SHARDS', DEFAULT_SHARDS)))
+        self._shards = [
+            _CacheShard(max(1, self.max_entries // shard_count), max(1, self.max_bytes // shard_count))
+            for _ in range(shard_count)
+        ]
+        self._last_sweep = time.time()
+        self._sweep_lock = threading.Lock()
+        # Sampled debug trace of cache operations; counters in get_stats() are always on
+        self.trace_sample_every = trace_sample_every if trace_sample_every is not None else int(os.getenv('CACHE_TRACE_SAMPLE_EVERY', DEFAULT_TRACE_SAMPLE_EVERY))
+        self._trace_counter = itertools.count()
+        # Single-flight: key -> Future of the computation in progress
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Shared L2 backend, keyed under "<namespace>:v<version>:"
+        self.backend = backend
+        self.l1_ttl = l1_ttl if l1_ttl is not None else int(os.getenv('CACHE_L1_TTL', DEFAULT_L1_TTL))
+        self.l2_retry_interval = float(os.getenv('CACHE_L2_RETRY_INTERVAL', DEFAULT_L2_RETRY_INTERVAL))
+        self._l2_prefix = key_prefix(namespace, version)
+        self._l2_retry_at = 0.0
+        self._l2_stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._l2_lock = threading.Lock()
         # Initialize database connection
         self.db = None
         self.cache_timeout = timedelta(hours=1)
         
-        self.logger.info(f"Initialized {cache_type} cache manager")
+        self.logger.info(f"Initialized {cache_type} cache manager "
+                         f"(max {self.max_entries} entries, {self.max_bytes} bytes, {shard_count} shards"
+                         f"{f', {backend.name} L2 under {self._l2_prefix}' if backend is not None else ''})")
 
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
 
+    def sweep_expired(self) -> int:
+        """Remove all expired entries. Returns the number removed."""
+        now = time.time()
+        self._last_sweep = now
+        return sum(shard.sweep_expired(now) for shard in self._shards)
 
+    def _maybe_sweep(self) -> None:
+        """Sweep expired entries if sweep_interval has passed since the last sweep"""
+        if time.time() - self._last_sweep < self.sweep_interval:
+            return
+        # Only one thread sweeps; the others carry on
+        if self._sweep_lock.acquire(blocking=False):
+            try:
+                self.sweep_expired()
+            finally:
+                self._sweep_lock.release()
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get an item from cache with optional default"""
@@ -78,95 +335,68 @@ class CacheManager:
                 self.logger.warning("Attempted cache get with empty key")
                 return default
                 
-            # Check if key exists and is not expired
-            if key in self.cache and (key not in self.expiry or self.expiry[key] > time.time()):
-                self.stats["hits"] += 1
-                
-                # Track solution type hits if this is a solution cache
-                if key.startswith("solution_"):
-                    solution_type = self._extract_solution_type(key)
-                    if solution_type not in self.stats["solution_types"]:
-                        self.stats["solution_types"][solution_type] = {"hits": 0, "misses": 0, "added": 0}
-                    self.stats["solution_types"][solution_type]["hits"] += 1
-                    
-                    # Log detailed cache hit information with file path if available
-                    solution_name = key.split('_', 2)[-1] if len(key.split('_')) > 2 else 'unknown'
-                    file_path = self._get_solution_file_path(solution_name)
-                    
-                    if file_path:
-                        self.logger.info(f"[CACHE HIT] Type: {solution_type}, Key: {key}, Location: Memory Cache, Source File: {file_path}")
-                    else:
-                        self.logger.info(f"[CACHE HIT] Type: {solution_type}, Key: {key}, Location: Memory Cache")
-                        
-
-                else:
-                    self.logger.info(f"[CACHE HIT] Key: {key}, Location: Memory Cache")
-                    
-                return self.cache[key]
+            solution_type = _solution_type_for_key(key)
+            state, value = self._shard(key).get(key, solution_type)
             
-            # Handle cache miss or expired item
-            if key in self.cache:
-                # Expired item
-                self.logger.debug(f"Cache expired for {key}")
-                del self.cache[key]
-                if key in self.expiry:
-                    del self.expiry[key]
+            if state == "fresh":
+                if self._should_trace():
+                    self._trace("HIT", key, solution_type)
+                return value
             
-            self.stats["misses"] += 1
+            if self.backend is not None:
+                found, value = self._l2_get(key)
+                if found:
+                    return value
             
-            # Track solution type misses if this is a solution cache
-            if key.startswith("solution_"):
-                solution_type = self._extract_solution_type(key)
-                if solution_type not in self.stats["solution_types"]:
-                    self.stats["solution_types"][solution_type] = {"hits": 0, "misses": 0, "added": 0}
-                self.stats["solution_types"][solution_type]["misses"] += 1
-            
-            self.logger.debug(f"Cache miss for {key}")
+            if self._should_trace():
+                self._trace("MISS", key, solution_type)
             return default
             
         except Exception as e:
             self.logger.error(f"Error getting from cache: {str(e)}")
             return default
     
-    def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
+    def set(self, key: str, value: Any, ttl: int = 3600, stale_ttl: int = 0) -> bool:
         """
         Set an item in cache with optional TTL (in seconds)
+        With stale_ttl, the entry is kept that much longer past its TTL so
+        get_or_compute() can serve it while it is recomputed.
         Returns True if successful, False otherwise
         """
         try:
             if not key:
                 self.logger.warning("Attempted cache set with empty key")
                 return False
-                
-            self.cache[key] = value
-            if ttl > 0:
-                self.expiry[key] = time.time() + ttl
             
-            self.stats["added"] += 1
+            if self.backend is None:
+                return self._set_local(key, value, ttl, stale_ttl)
+            # L1 copies are kept briefly so updates from other workers show up
+            local_ttl = ttl
+            if self.l1_ttl > 0 and (ttl <= 0 or ttl > self.l1_ttl):
+                local_ttl = self.l1_ttl
+            stored = self._set_local(key, value, local_ttl, stale_ttl)
+            shared = self._l2_set(key, value, ttl)
+            return stored or shared
             
-            # Track solution type additions with detailed logging
-            if key.startswith("solution_"):
-                solution_type = self._extract_solution_type(key)
-                if solution_type not in self.stats["solution_types"]:
-                    self.stats["solution_types"][solution_type] = {"hits": 0, "misses": 0, "added": 0}
-                self.stats["solution_types"][solution_type]["added"] += 1
-                
-                # Log detailed cache set information with file path if available
-                solution_name = key.split('_', 2)[-1] if len(key.split('_')) > 2 else 'unknown'
-                file_path = self._get_solution_file_path(solution_name)
-                
-                if file_path:
-                    self.logger.info(f"[CACHE SET] Type: {solution_type}, Key: {key}, Location: Memory Cache, Source File: {file_path}")
-                else:
-                    self.logger.info(f"[CACHE SET] Type: {solution_type}, Key: {key}, Location: Memory Cache")
-                    
-                if self.db:
-                    self.logger.info(f"[CACHE BACKUP] Storing {key} in MongoDB")
-            else:
-                self.logger.info(f"[CACHE SET] Key: {key}, Location: Memory Cache")
+        except Exception as e:
+            self.logger.error(f"Error setting cache: {str(e)}")
+            return False
+    
+    def _set_local(self, key: str, value: Any, ttl: int, stale_ttl: int) -> bool:
+        """Store an item in the in-process shards"""
+        try:
+            shard = self._shard(key)
+            size = _estimate_size(value)
+            if size > shard.max_bytes:
+                self.logger.warning(f"Not caching {key}: about {size} bytes exceeds shard limit of {shard.max_bytes}")
+                return False
             
-            if ttl > 0:
-                self.logger.info(f"[CACHE TTL] Key: {key}, Expires: {datetime.fromtimestamp(time.time() + ttl)}")
+            self._maybe_sweep()
+            solution_type = _solution_type_for_key(key)
+            shard.set(key, value, size, ttl, solution_type, stale_ttl)
+            
+            if self._should_trace():
+                self._trace("SET", key, solution_type, ttl)
             
             return True
             
@@ -174,21 +404,158 @@ class CacheManager:
             self.logger.error(f"Error setting cache: {str(e)}")
             return False
     
+    def _l2_available(self) -> bool:
+        return self.backend is not None and time.time() >= self._l2_retry_at
+    
+    def _l2_count(self, field: str) -> None:
+        with self._l2_lock:
+            self._l2_stats[field] += 1
+    
+    def _l2_failed(self, operation: str, key: str, error: Exception) -> None:
+        """Record a backend error and bypass the backend for a while"""
+        self._l2_count("errors")
+        self._l2_retry_at = time.time() + self.l2_retry_interval
+        self.logger.warning(f"Shared cache {operation} failed for {key}, "
+                            f"bypassing it for {self.l2_retry_interval:.0f}s: {error}")
+    
+    def _l2_get(self, key: str):
+        """Return (found, value) from the shared backend, copying a hit into L1
+
+        The L1 copy never outlives the L2 entry, so a value that expires in
+        the backend is not served on from process memory.
+        """
+        if not self._l2_available():
+            return False, None
+        try:
+            data, remaining = self.backend.get_with_ttl(self._l2_prefix + key)
+        except Exception as e:
+            self._l2_failed("get", key, e)
+            return False, None
+        if data is None:
+            self._l2_count("misses")
+            return False, None
+        try:
+            value = deserialize(data)
+        except Exception as e:
+            self.logger.warning(f"Ignoring undecodable shared cache entry {key}: {e}")
+            self._l2_count("misses")
+            return False, None
+        self._l2_count("hits")
+        local_ttl = self.l1_ttl
+        if remaining is not None and (local_ttl <= 0 or remaining < local_ttl):
+            local_ttl = remaining
+        self._set_local(key, value, local_ttl, 0)
+        return True, value
+    
+    def _l2_set(self, key: str, value: Any, ttl: int) -> bool:
+        """Write an item to the shared backend. Values that cannot be pickled stay local."""
+        if not self._l2_available():
+            return False
+        try:
+            data = serialize(value)
+        except Exception as e:
+            self.logger.debug("Not sharing %s, value cannot be serialized: %s", key, e)
+            return False
+        try:
+            self.backend.set(self._l2_prefix + key, data, ttl)
+            return True
+        except Exception as e:
+            self._l2_failed("set", key, e)
+            return False
+    
+    def _should_trace(self) -> bool:
+        """Whether to emit a debug trace for this operation.
+
+        Cheap enough for the hit path: a level check, then every
+        trace_sample_every-th operation is traced.
+        """
+        if self.trace_sample_every <= 0 or not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        return next(self._trace_counter) % self.trace_sample_every == 0
+    
+    def _trace(self, event: str, key: str, solution_type: Optional[str], ttl: Optional[int] = None) -> None:
+        """Log one sampled cache operation at DEBUG"""
+        if solution_type is not None:
+            solution_name = key.split('_', 2)[-1] if len(key.split('_')) > 2 else 'unknown'
+            self.logger.debug("[CACHE %s] Type: %s, Key: %s, Source File: %s, TTL: %s",
+                              event, solution_type, key, self._get_solution_file_path(solution_name), ttl)
+        else:
+            self.logger.debug("[CACHE %s] Key: %s, TTL: %s", event, key, ttl)
+    
+    def get_or_compute(self, key: str, compute_fn: Callable[[], Any], ttl: int = 3600,
+                       stale_ttl: int = 0) -> Any:
+        """
+        Get an item from cache, computing and caching it on a miss.
+
+        Concurrent misses on the same key are coalesced: one caller runs
+        compute_fn and the others wait for its result (or its exception).
+        With stale_ttl > 0, an entry up to stale_ttl seconds past its TTL is
+        returned immediately while a background thread recomputes it.
+        None results are returned but not cached.
+        """
+        if not key:
+            self.logger.warning("Attempted cache get_or_compute with empty key")
+            return compute_fn()
+        
+        shard = self._shard(key)
+        solution_type = _solution_type_for_key(key)
+        state, value = shard.get(key, solution_type, allow_stale=stale_ttl > 0)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            future, leader = self._join_flight(key)
+            if leader:
+                threading.Thread(target=self._run_flight, args=(key, future, compute_fn, ttl, stale_ttl),
+                                 name=f"cache-revalidate-{key}", daemon=True).start()
+            return value
+        
+        future, leader = self._join_flight(key)
+        if leader:
+            self._run_flight(key, future, compute_fn, ttl, stale_ttl)
+        return future.result()
+    
+    def _join_flight(self, key: str):
+        """Return (future, is_leader) for the computation of key"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+    
+    def _run_flight(self, key: str, future: Future, compute_fn: Callable[[], Any], ttl: int, stale_ttl: int) -> None:
+        """Compute a value as flight leader, cache it and publish it to waiters"""
+        try:
+            # Another leader may have finished between our miss and joining the flight
+            found, value = self._shard(key).peek(key)
+            if not found and self.backend is not None:
+                # ...or another worker may have computed it
+                found, value = self._l2_get(key)
+            if not found:
+                value = compute_fn()
+                if value is not None:
+                    self.set(key, value, ttl, stale_ttl)
+            future.set_result(value)
+        except BaseException as e:
+            self.logger.error(f"Error computing cache value for {key}: {e}")
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
     def has(self, key: str) -> bool:
         """Check if a key exists in the cache and is not expired"""
         try:
             if not key:
                 return False
-                
-            # Check if key exists and is not expired
-            if key in self.cache and (key not in self.expiry or self.expiry[key] > time.time()):
+            if self._shard(key).has(key):
                 return True
-            
-            # Clean up expired item if needed
-            if key in self.cache and key in self.expiry and self.expiry[key] <= time.time():
-                del self.cache[key]
-                del self.expiry[key]
-            
+            if self._l2_available():
+                try:
+                    return self.backend.exists(self._l2_prefix + key)
+                except Exception as e:
+                    self._l2_failed("exists", key, e)
             return False
             
         except Exception as e:
@@ -198,14 +565,16 @@ class CacheManager:
     def delete(self, key: str) -> bool:
         """Delete an item from cache"""
         try:
-            if not key or key not in self.cache:
+            if not key:
+                return False
+            deleted = self._shard(key).delete(key)
+            if self._l2_available():
+                try:
+                    deleted = self.backend.delete(self._l2_prefix + key) or deleted
+                except Exception as e:
+                    self._l2_failed("delete", key, e)
+            if not deleted:
                 return False
-                
-            del self.cache[key]
-            if key in self.expiry:
-                del self.expiry[key]
-            
-            self.stats["removed"] += 1
             self.logger.debug(f"Removed {key} from cache")
             return True
             
@@ -216,8 +585,14 @@ class CacheManager:
     def clear(self) -> bool:
         """Clear all items from cache"""
         try:
-            self.cache = {}
-            self.expiry = {}
+            for shard in self._shards:
+                shard.clear()
+            if self._l2_available():
+                try:
+                    removed = self.backend.clear(self._l2_prefix)
+                    self.logger.info(f"Removed {removed} shared cache entries under {self._l2_prefix}")
+                except Exception as e:
+                    self._l2_failed("clear", self._l2_prefix, e)
             self.logger.info("Cache cleared")
             return True
             
@@ -228,16 +603,29 @@ class CacheManager:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
-            # Calculate hit/miss ratio if any requests have been made
-            total_requests = self.stats["hits"] + self.stats["misses"]
-            hit_ratio = self.stats["hits"] / total_requests if total_requests > 0 else 0
+            totals = _new_stats()
+            type_totals = {}
+            cache_size = 0
+            total_bytes = 0
+            expired = 0
+            now = time.time()
             
-            # Get current size
-            cache_size = len(self.cache)
+            # Take each shard's counters under its lock so they are consistent
+            for shard in self._shards:
+                with shard.lock:
+                    for field in ("hits", "misses", "added", "removed", "evicted", "expired_removed"):
+                        totals[field] += shard.stats[field]
+                    for solution_type, stats in shard.stats["solution_types"].items():
+                        merged = type_totals.setdefault(solution_type, {"hits": 0, "misses": 0, "added": 0})
+                        for field, count in stats.items():
+                            merged[field] += count
+                    cache_size += len(shard.cache)
+                    total_bytes += shard.total_bytes
+                    expired += sum(1 for exp_time in shard.expiry.values() if exp_time <= now)
             
-            # Count expired items
-            now = time.time()
-            expired = sum(1 for exp_time in self.expiry.values() if exp_time <= now)
+            # Calculate hit/miss ratio if any requests have been made
+            total_requests = totals["hits"] + totals["misses"]
+            hit_ratio = totals["hits"] / total_requests if total_requests > 0 else 0
             
             # Get solution-specific stats
             solution_stats = {
@@ -247,18 +635,25 @@ class CacheManager:
                     "added": stats["added"],
                     "hit_ratio": stats["hits"] / (stats["hits"] + stats["misses"]) if (stats["hits"] + stats["misses"]) > 0 else 0
                 }
-                for solution_type, stats in self.stats["solution_types"].items()
+                for solution_type, stats in type_totals.items()
             }
             
             return {
                 "type": self.cache_type,
                 "size": cache_size,
-                "hits": self.stats["hits"],
-                "misses": self.stats["misses"],
+                "hits": totals["hits"],
+                "misses": totals["misses"],
                 "hit_ratio": round(hit_ratio, 2),
-                "added": self.stats["added"],
-                "removed": self.stats["removed"],
+                "added": totals["added"],
+                "removed": totals["removed"],
+                "evicted": totals["evicted"],
+                "expired_removed": totals["expired_removed"],
                 "expired": expired,
+                "bytes": total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "shards": len(self._shards),
+                "l2": self._l2_stats_snapshot(),
                 "solution_stats": solution_stats,
                 "timestamp": time.time()
             }
@@ -267,23 +662,27 @@ class CacheManager:
             self.logger.error(f"Error getting cache stats: {str(e)}")
             return {"error": str(e)}
     
+    def _l2_stats_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Shared backend counters, or None without a backend"""
+        if self.backend is None:
+            return None
+        with self._l2_lock:
+            stats = dict(self._l2_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 2) if lookups > 0 else 0
+        stats["backend"] = self.backend.name
+        stats["prefix"] = self._l2_prefix
+        stats["bypassed"] = not self._l2_available()
+        return stats
+    
     def _extract_solution_type(self, key: str) -> str:
         """Extract solution type from cache key"""
         try:
             # Expected format: solution_<type>_<name>
-            parts = key.split('_')
+            parts = key.split('_', 2)
             if len(parts) >= 2:
-                # Map common solution types to standardized categories
-                type_map = {
-                    'wall': 'wall',
-                    'walls': 'wall',
-                    'ceiling': 'ceiling',
-                    'ceilings': 'ceiling',
-                    'floor': 'floor',
-                    'floors': 'floor'
-                }
                 solution_type = parts[1].lower()
-                return type_map.get(solution_type, solution_type)
+                return SOLUTION_TYPE_MAP.get(solution_type, solution_type)
             return 'unknown'
         except Exception:
             return 'unknown'
@@ -403,40 +802,21 @@ class CacheManager:
         return None
         
     def get_cached_calculation(self, key: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Get cached calculation result with solution-specific handling"""
+        """Get a calculation result cached by set_cached_calculation()"""
         try:
-            # Create composite key from base key and parameters
-            cache_key = f"{key}_{hash(frozenset(params.items()))}"
-            
-            # Special handling for solution data
-            if key.startswith('solution_'):
-                # Get from cache first
-                cached = self.get(cache_key)
-                if cached:
-                    return cached
-                    
-
-            
-            return self.get(cache_key)
-            
+            return self.get(build_cache_key(key, **params))
         except Exception as e:
             self.logger.error(f"Error getting cached calculation: {str(e)}")
             return None
-            
 
-            
-
-            
-
-            
+    def set_cached_calculation(self, key: str, params: Dict[str, Any], value: Any, ttl: int = 3600) -> bool:
+        """Cache a calculation result under the key get_cached_calculation() looks up"""
+        return self.set(build_cache_key(key, **params), value, ttl)
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         return self.get_stats()
 
-
-            
-
-
     def get_all_keys(self):
         """Get all keys in the cache, or an empty list if not supported by the cache implementation
         
@@ -444,16 +824,11 @@ class CacheManager:
             list: List of all keys in the cache
         """
         try:
-            # For SimpleCache or Redis, try to access internal cache keys
-            if hasattr(self.cache, 'cache') and hasattr(self.cache.cache, 'keys'):
-                return list(self.cache.cache.keys())
-            elif hasattr(self.cache, 'redis') and hasattr(self.cache.redis, 'keys'):
-                return [k.decode('utf-8') for k in self.cache.redis.keys('*')]
-            
-
-                
-            # Return empty list if keys cannot be accessed
-            return []
+            keys = []
+            for shard in self._shards:
+                with shard.lock:
+                    keys.extend(shard.cache.keys())
+            return keys
         except Exception as e:
             self.logger.error(f"Error getting all cache keys: {e}")
             return []
@@ -461,18 +836,11 @@ class CacheManager:
     def cleanup(self):
         """Cleanup cache resources and clear all data"""
         try:
-            # Clear in-memory cache
-            self.cache.clear()
-            self.expiry.clear()
-            
-            # Reset stats
-            self.stats = {
-                "hits": 0,
-                "misses": 0,
-                "added": 0,
-                "removed": 0,
-                "solution_types": {}
-            }
+            # Clear in-memory cache and reset stats; the shared backend is left alone
+            for shard in self._shards:
+                shard.clear(reset_stats=True)
+            with self._l2_lock:
+                self._l2_stats = {"hits": 0, "misses": 0, "errors": 0}
             
             self.logger.info("CacheManager cleanup completed")
         except Exception as e:
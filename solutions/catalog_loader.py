@@ -0,0 +1,168 @@
+"""
+Loading the solution catalogue into the solutions manager.
+
+initialize_all_solutions() builds every wall and ceiling solution from its
+variant document and registers it. The documents come from the on-disk
+catalog snapshot when there is one (so a worker boots with MongoDB down),
+otherwise from one bulk query per collection, which is then snapshotted.
+
+Solutions are registered into a staging SoundproofingSolutions and swapped
+into the shared manager in one step, so request threads see either the old
+catalogue or the new one. Initializations are serialized: the background
+snapshot refresh re-runs this function from its own thread when the
+catalogue in MongoDB has changed.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from solutions.cache_manager import get_cache_manager
+from solutions.catalog_snapshot import get_catalog_snapshot, start_background_refresh, write_catalog_snapshot
+from solutions.database import get_all_materials_from_db, load_solution_variant_documents
+from solutions.feature_store import thaw
+from solutions.material_table import get_material_table
+from solutions.solutions import SoundproofingSolutions, get_solutions_manager
+from solutions.walls.GenieClipWall import load_genieclipwall_solutions
+from solutions.walls.M20Wall import load_m20wall_solutions
+from solutions.walls.Independentwall import load_independentwall_solutions
+from solutions.walls.resilientbarwall import load_resilientbarwall_solutions
+from solutions.ceilings.genieclipceiling import load_genieclipceiling_solutions
+from solutions.ceilings.lb3genieclipceiling import load_lb3genieclipceiling_solutions
+from solutions.ceilings.independentceiling import load_independentceiling_solutions
+from solutions.ceilings.resilientbarceiling import load_resilientbarceiling_solutions
+
+logger = logging.getLogger(__name__)
+
+# Seconds the per-surface and per-solution cache entries live
+SOLUTION_CACHE_TTL = 3600
+
+# Loader and name of each solution family, per surface collection
+SOLUTION_LOADERS = {
+    'walls': [
+        (load_genieclipwall_solutions, 'GenieClipWall'),
+        (load_m20wall_solutions, 'M20Wall'),
+        (load_independentwall_solutions, 'IndependentWall'),
+        (load_resilientbarwall_solutions, 'ResilientBarWall'),
+    ],
+    'ceilings': [
+        (load_genieclipceiling_solutions, 'GenieClipCeiling'),
+        (load_lb3genieclipceiling_solutions, 'LB3GenieClipCeiling'),
+        (load_independentceiling_solutions, 'IndependentCeiling'),
+        (load_resilientbarceiling_solutions, 'ResilientBarCeiling'),
+    ]
+}
+
+_initialize_lock = threading.Lock()
+
+
+def load_catalog_documents(refresh_in_background: bool = True) -> Dict[str, Dict[str, dict]]:
+    """Variant documents per surface collection, from the snapshot or MongoDB
+
+    With a snapshot, MongoDB is checked in the background and the catalogue
+    is re-initialized if it has changed.
+    """
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        logger.info(f"Loading solutions from catalog snapshot created {snapshot['created_at']}")
+        if refresh_in_background:
+            start_background_refresh(on_change=lambda: initialize_all_solutions(refresh_in_background=False))
+        return {
+            surface_type: {variant: dict(doc) for variant, doc in docs.items()}
+            for surface_type, docs in snapshot['solutions'].items()
+        }
+    try:
+        # One $in query per collection, snapshotted for the next boot
+        variant_docs = load_solution_variant_documents()
+        if any(variant_docs.values()):
+            write_catalog_snapshot(variant_docs, get_all_materials_from_db())
+        return variant_docs
+    except Exception as e:
+        logger.error(f"Error bulk loading solution documents, falling back to per-variant lookups: {e}")
+        return {}
+
+
+def _register_surface(staging: SoundproofingSolutions, surface_type: str, surface_docs: Optional[Dict[str, dict]],
+                      debug_results: List[Dict[str, Any]]) -> List[Any]:
+    surface_solutions = []
+    for loader, name in SOLUTION_LOADERS[surface_type]:
+        try:
+            std, pro = loader(surface_docs)
+            std_loaded = std is not None and getattr(std, '_solution_data', None) is not None
+            pro_loaded = pro is not None and getattr(pro, '_solution_data', None) is not None
+            logger.info(f"Loaded {name} Standard: {std_loaded}")
+            logger.info(f"Loaded {name} SP15: {pro_loaded}")
+            debug_results.append({f'{name}_Standard': std_loaded})
+            debug_results.append({f'{name}_SP15': pro_loaded})
+
+            for solution, loaded, variant in ((std, std_loaded, 'standard'), (pro, pro_loaded, 'sp15')):
+                if loaded:
+                    solution_id = f"{name.lower()}_{variant}"
+                    staging.register_solution_with_characteristics(solution_id, solution, surface_type)
+                    surface_solutions.append(solution)
+                    logger.info(f"Registered {solution_id} with solutions manager")
+        except Exception as e:
+            logger.error(f"Error loading {name} solutions: {e}")
+            debug_results.append({f'{name}_error': str(e)})
+    return surface_solutions
+
+
+def _cache_surface(cache_manager, solutions_manager: SoundproofingSolutions, surface_type: str,
+                   surface_solutions: List[Any]) -> None:
+    # Serializable copies of the feature records built at registration;
+    # the records themselves are shared and read-only
+    feature_store = solutions_manager.get_feature_store()
+    serializable_solutions = [thaw(record.characteristics) for record in feature_store.records(surface_type)]
+    cache_key = f"{surface_type.rstrip('s')}_solutions"  # Use singular form
+    cache_manager.set(cache_key, serializable_solutions, SOLUTION_CACHE_TTL)
+    logger.info(f"Cached {len(serializable_solutions)} {surface_type} solutions for recommendation engine")
+
+    # Also cache individual solutions for backward compatibility
+    for solution in surface_solutions:
+        try:
+            code_name = getattr(solution, 'CODE_NAME', 'Unknown').lower().replace(' ', '').replace('(', '').replace(')', '')
+            cache_manager.set(f"{code_name}_{'sp15' if getattr(solution, 'IS_SP15', False) else 'standard'}",
+                              solution, SOLUTION_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Error caching individual solution: {e}")
+
+
+def initialize_all_solutions(solutions_manager: Optional[SoundproofingSolutions] = None, cache_manager=None,
+                             refresh_in_background: bool = True) -> List[Dict[str, Any]]:
+    """Load every solution and register it with the solutions manager
+
+    Returns the per-family load results for the debug log and endpoints.
+    """
+    solutions_manager = solutions_manager or get_solutions_manager()
+    cache_manager = cache_manager or get_cache_manager()
+    if not solutions_manager or not cache_manager:
+        logger.error("Failed to get solutions manager or cache manager")
+        return []
+
+    with _initialize_lock:
+        logger.info("Loading and caching all wall and ceiling solutions...")
+        debug_results: List[Dict[str, Any]] = []
+        variant_docs = load_catalog_documents(refresh_in_background)
+
+        # Build the material property table in one pass before registration aggregates it per solution
+        try:
+            get_material_table()
+        except Exception as e:
+            logger.error(f"Error building material property table: {e}")
+
+        staging = SoundproofingSolutions()
+        surface_solutions = {
+            surface_type: _register_surface(staging, surface_type, variant_docs.get(surface_type), debug_results)
+            for surface_type in SOLUTION_LOADERS
+        }
+        solutions_manager.replace_catalog(staging)
+
+        for surface_type, solutions in surface_solutions.items():
+            if solutions:
+                _cache_surface(cache_manager, solutions_manager, surface_type, solutions)
+            else:
+                logger.warning(f"No {surface_type} solutions to cache")
+
+        logger.info(f"Solution loading debug summary: {debug_results}")
+        logger.info(f"Total solutions registered with manager: {len(solutions_manager.get_all_solutions())}")
+        return debug_results
@@ -0,0 +1,199 @@
+"""
+On-disk snapshot of the solution and materials catalog.
+
+After a successful load from MongoDB the variant documents and the materials
+collection are written to a single BSON file. On boot the snapshot is read
+first, so workers can serve in milliseconds and keep serving while MongoDB is
+unreachable; a background thread then re-reads MongoDB and rewrites the
+snapshot if the catalog has changed.
+
+BSON (shipped with pymongo) is used instead of msgpack so ObjectIds and
+datetimes round-trip without an extra dependency.
+
+Environment variables:
+    CATALOG_SNAPSHOT_PATH   Snapshot file (default: <project>/cache/catalog_snapshot.bson)
+    CATALOG_SNAPSHOT        Set to "0" to disable reading and writing the snapshot
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import bson
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+_snapshot = None
+_snapshot_loaded = False
+_snapshot_lock = threading.Lock()
+_refresh_thread = None
+
+
+def snapshot_enabled() -> bool:
+    """Whether the catalog snapshot is enabled"""
+    return os.getenv('CATALOG_SNAPSHOT', '1') != '0'
+
+
+def get_snapshot_path() -> str:
+    """Get the path of the snapshot file"""
+    default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'cache', 'catalog_snapshot.bson')
+    return os.getenv('CATALOG_SNAPSHOT_PATH', default_path)
+
+
+def catalog_fingerprint(solutions: Dict[str, Dict[str, dict]], materials: List[dict]) -> str:
+    """Hash the catalog contents so snapshots can be compared cheaply
+
+    The catalog is canonicalized first (keys sorted, materials ordered by
+    id), so the same documents returned in another order hash the same.
+    """
+    ordered_materials = sorted(materials, key=lambda material: str(material.get('_id', material.get('name', ''))))
+    payload = json.dumps({'solutions': solutions, 'materials': ordered_materials}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def write_catalog_snapshot(solutions: Dict[str, Dict[str, dict]], materials: List[dict],
+                           path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Write the catalog to disk atomically and make it the current snapshot.
+
+    Returns the snapshot that was written, or None on failure.
+    """
+    global _snapshot, _snapshot_loaded
+    if not snapshot_enabled():
+        return None
+    path = path or get_snapshot_path()
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.utcnow(),
+        'fingerprint': catalog_fingerprint(solutions, materials),
+        'solutions': solutions,
+        'materials': materials,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(bson.encode(snapshot))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Error writing catalog snapshot to {path}: {e}")
+        return None
+
+    with _snapshot_lock:
+        _snapshot = snapshot
+        _snapshot_loaded = True
+    logger.info(f"Wrote catalog snapshot {snapshot['fingerprint'][:12]} to {path}")
+    return snapshot
+
+
+def read_catalog_snapshot(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Read a snapshot file, or None if it is missing, unreadable or of another version"""
+    path = path or get_snapshot_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            snapshot = bson.decode(f.read())
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring catalog snapshot {path} with version {snapshot.get('version')}")
+        return None
+    return snapshot
+
+
+def get_catalog_snapshot() -> Optional[Dict[str, Any]]:
+    """Get the current snapshot, reading it from disk on first use"""
+    global _snapshot, _snapshot_loaded
+    if _snapshot_loaded:
+        return _snapshot
+    if not snapshot_enabled():
+        return None
+    with _snapshot_lock:
+        if not _snapshot_loaded:
+            _snapshot = read_catalog_snapshot()
+            _snapshot_loaded = True
+            if _snapshot is not None:
+                logger.info(f"Loaded catalog snapshot {_snapshot['fingerprint'][:12]} "
+                            f"from {_snapshot['created_at']}")
+    return _snapshot
+
+
+def get_snapshot_solution_documents(surface_type: str) -> Optional[Dict[str, dict]]:
+    """Get the snapshot's variant documents for a surface type, or None without a snapshot"""
+    snapshot = get_catalog_snapshot()
+    if snapshot is None:
+        return None
+    return snapshot['solutions'].get(surface_type)
+
+
+def get_snapshot_materials() -> Optional[List[dict]]:
+    """Get the snapshot's materials, or None without a snapshot"""
+    snapshot = get_catalog_snapshot()
+    if snapshot is None:
+        return None
+    return snapshot['materials']
+
+
+def refresh_catalog_snapshot() -> bool:
+    """Re-read the catalog from MongoDB and rewrite the snapshot if it changed.
+
+    Returns True if a new snapshot was written.
+    """
+    from solutions.db_init import get_db
+    from solutions.database import load_solution_variant_documents, get_all_materials_from_db
+
+    if get_db() is None:
+        logger.warning("MongoDB unavailable, keeping current catalog snapshot")
+        return False
+
+    solutions = load_solution_variant_documents()
+    materials = get_all_materials_from_db()
+    if not any(solutions.values()):
+        logger.warning("No solution documents found in MongoDB, keeping current catalog snapshot")
+        return False
+
+    current = get_catalog_snapshot()
+    if current is not None and current['fingerprint'] == catalog_fingerprint(solutions, materials):
+        logger.info("Catalog snapshot is up to date")
+        return False
+
+    return write_catalog_snapshot(solutions, materials) is not None
+
+
+def start_background_refresh(on_change: Optional[Callable[[], None]] = None) -> Optional[threading.Thread]:
+    """Check the snapshot against MongoDB in a daemon thread.
+
+    Does nothing if a check is already running. on_change is called after a
+    newer snapshot has been written.
+    """
+    global _refresh_thread
+
+    def run():
+        try:
+            if refresh_catalog_snapshot() and on_change is not None:
+                on_change()
+        except Exception as e:
+            logger.error(f"Error refreshing catalog snapshot: {e}")
+
+    with _snapshot_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return _refresh_thread
+        _refresh_thread = threading.Thread(target=run, name='catalog-snapshot-refresh', daemon=True)
+        _refresh_thread.start()
+        return _refresh_thread
+
+
+def reset_catalog_snapshot():
+    """Forget the in-process snapshot so the next access re-reads the file"""
+    global _snapshot, _snapshot_loaded
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_loaded = False
@@ -10,7 +10,7 @@ from solutions.solutions import get_solutions_manager
 from typing import Dict, List, Optional, Any
 import math
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from solutions.cache_manager import get_cache_manager
 from solutions.base_sp15 import BaseSP15Solution
 
@@ -251,8 +251,12 @@ class GenieClipCeilingSP15(BaseSP15Solution, GenieClipCeilingStandard):
                 'error': str(e)
             }
 
-def load_genieclipceiling_solutions():
-    """Load GenieClip Ceiling solutions (Standard and SP15) from MongoDB and cache them."""
+def load_genieclipceiling_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load GenieClip Ceiling solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['ceilings']
@@ -260,8 +264,8 @@ def load_genieclipceiling_solutions():
     sp15_id = ids['GenieClipCeilingSP15']
     
     # Get documents from database
-    standard_doc = get_solution_by_id('ceilingsolutions', standard_id)
-    sp15_doc = get_solution_by_id('ceilingsolutions', sp15_id)
+    standard_doc = get_variant_document(docs, 'ceilingsolutions', 'GenieClipCeilingStandard', standard_id)
+    sp15_doc = get_variant_document(docs, 'ceilingsolutions', 'GenieClipCeilingSP15', sp15_id)
     
     # Create solution objects only if documents exist
     standard = None
@@ -269,8 +273,7 @@ def load_genieclipceiling_solutions():
     
     if standard_doc:
         try:
-            standard = GenieClipCeilingStandard()
-            standard._solution_data = standard_doc
+            standard = GenieClipCeilingStandard.from_document(standard_doc)
             cache_manager.set('genieclipceiling_standard', standard, 3600)
             logger.info(f"Successfully loaded GenieClipCeilingStandard with {len(standard_doc.get('materials', []))} materials")
         except Exception as e:
@@ -281,8 +284,7 @@ def load_genieclipceiling_solutions():
     
     if sp15_doc:
         try:
-            sp15 = GenieClipCeilingSP15()
-            sp15._solution_data = sp15_doc
+            sp15 = GenieClipCeilingSP15.from_document(sp15_doc)
             cache_manager.set('genieclipceiling_sp15', sp15, 3600)
             logger.info(f"Successfully loaded GenieClipCeilingSP15 with {len(sp15_doc.get('materials', []))} materials")
         except Exception as e:
@@ -28,10 +28,10 @@ from solutions.base_solution import BaseSolution
 from solutions.material_properties import get_material_properties
 from solutions.solutions import get_solutions_manager
 from typing import Dict, List, Optional, Any
-import math
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from solutions.cache_manager import get_cache_manager
+from solutions.quantity_engine import board_area, extra_count, line_count
 from solutions.base_sp15 import BaseSP15Solution
 
 logger = logging.getLogger(__name__)
@@ -54,6 +54,7 @@ class IndependentCeilingStandard(BaseSolution):
     
     CODE_NAME = "Independent Ceiling (Standard)"
     JOIST_SPACING = 0.4  # 400mm spacing for ceiling joists
+    HANGER_SPACING = 1.2  # One hanger every 1.2m along each joist
     
     def __init__(self, length: float = 0, height: float = 0):
         super().__init__(length, height)
@@ -73,15 +74,15 @@ class IndependentCeilingStandard(BaseSolution):
             
             # Calculate area and joist quantities
             area = length * height
-            joists_needed = math.ceil(length / self.JOIST_SPACING)
-            extra_joists = math.ceil(joists_needed * 0.1)  # 10% extra for cuts
+            joists_needed = line_count(length, self.JOIST_SPACING)
+            extra_joists = extra_count(joists_needed)  # 10% extra for cuts
             
             # Calculate hanger quantities
-            hangers_per_joist = math.ceil(height / 1.2)  # One hanger every 1.2m
+            hangers_per_joist = line_count(height, self.HANGER_SPACING)
             total_hangers = (joists_needed + extra_joists) * hangers_per_joist
             
             # Calculate plasterboard quantities
-            plasterboard_quantity = area * self.plasterboard_layers * 1.1  # 10% waste
+            plasterboard_quantity = board_area(area, self.plasterboard_layers)  # 10% waste
             
             # Log cache status
             cache_status = self.get_cache_status()
@@ -206,8 +207,12 @@ class IndependentCeilingSP15(BaseSP15Solution, IndependentCeilingStandard):
             logger.error(f"Error getting SP15 characteristics: {e}")
             return {}
 
-def load_independentceiling_solutions():
-    """Load Independent Ceiling solutions (Standard and SP15) from MongoDB and cache them."""
+def load_independentceiling_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load Independent Ceiling solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['ceilings']
@@ -215,8 +220,8 @@ def load_independentceiling_solutions():
     sp15_id = ids['IndependentCeilingSP15']
     
     # Get documents from database
-    standard_doc = get_solution_by_id('ceilingsolutions', standard_id)
-    sp15_doc = get_solution_by_id('ceilingsolutions', sp15_id)
+    standard_doc = get_variant_document(docs, 'ceilingsolutions', 'IndependentCeilingStandard', standard_id)
+    sp15_doc = get_variant_document(docs, 'ceilingsolutions', 'IndependentCeilingSP15', sp15_id)
     
     # Create solution objects only if documents exist
     standard = None
@@ -224,8 +229,7 @@ def load_independentceiling_solutions():
     
     if standard_doc:
         try:
-            standard = IndependentCeilingStandard()
-            standard._solution_data = standard_doc
+            standard = IndependentCeilingStandard.from_document(standard_doc)
             cache_manager.set('independentceiling_standard', standard, 3600)
             logger.info(f"Successfully loaded IndependentCeilingStandard with {len(standard_doc.get('materials', []))} materials")
         except Exception as e:
@@ -236,8 +240,7 @@ def load_independentceiling_solutions():
     
     if sp15_doc:
         try:
-            sp15 = IndependentCeilingSP15()
-            sp15._solution_data = sp15_doc
+            sp15 = IndependentCeilingSP15.from_document(sp15_doc)
             cache_manager.set('independentceiling_sp15', sp15, 3600)
             logger.info(f"Successfully loaded IndependentCeilingSP15 with {len(sp15_doc.get('materials', []))} materials")
         except Exception as e:
@@ -5,12 +5,12 @@ LB3 genie clip ceiling solution implementation.
 import logging
 from solutions.base_calculator import BaseCalculator
 from solutions.base_solution import BaseSolution
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from typing import Dict, List, Optional, Any
 from solutions.material_properties import get_material_properties
 from solutions.solutions import get_solutions_manager
-import math
 from solutions.config import CLIP_SPACING, SOLUTION_VARIANT_MONGO_IDS
+from solutions.quantity_engine import CHANNEL_SPACING, extra_count, grid_count, line_count
 from solutions.cache_manager import get_cache_manager
 from solutions.base_sp15 import BaseSP15Solution
 
@@ -27,7 +27,6 @@ class LB3GenieClipCeilingStandard(BaseSolution):
         super().__init__(length, height)
         self.logger = logging.getLogger(__name__)
         self.solution_name = "LB3GenieClipCeilingStandard"
-        self._load_solution_data(self.CODE_NAME)
         self._load_material_properties()
         self.plasterboard_layers = 2  # Two layers by default
         
@@ -45,14 +44,12 @@ class LB3GenieClipCeilingStandard(BaseSolution):
             
             # Calculate area and clip quantities
             area = length * height
-            clips_per_sqm = 1 / (self.CLIP_SPACING * self.CLIP_SPACING)
-            clips_needed = math.ceil(area * clips_per_sqm)
-            extra_clips = math.ceil(clips_needed * 0.1)  # 10% extra for corners and edges
+            clips_needed = grid_count(area, self.CLIP_SPACING)
+            extra_clips = extra_count(clips_needed)  # 10% extra for corners and edges
             
             # Calculate channel quantities
-            channel_spacing = 0.4  # 400mm spacing for channels
-            channels_needed = math.ceil(length / channel_spacing)
-            extra_channels = math.ceil(channels_needed * 0.1)  # 10% extra
+            channels_needed = line_count(length, CHANNEL_SPACING)
+            extra_channels = extra_count(channels_needed)  # 10% extra
             
             # Calculate LB3 bracket quantities
             brackets_per_clip = 1  # One bracket per clip
@@ -111,7 +108,6 @@ class LB3GenieClipCeilingSP15(LB3GenieClipCeilingStandard):
         super().__init__(length, height)
         self.logger = logging.getLogger(__name__)
         self.solution_name = "LB3GenieClipCeilingSP15"
-        self._load_solution_data(self.CODE_NAME)
         self._load_material_properties()
         self.plasterboard_layers = 1  # Single layer for SP15
         
@@ -173,8 +169,12 @@ class LB3GenieClipCeilingSP15(LB3GenieClipCeilingStandard):
             logger.error(f"Error getting SP15 characteristics: {e}")
             return {}
 
-def load_lb3genieclipceiling_solutions():
-    """Load LB3 GenieClip Ceiling solutions (Standard and SP15) from MongoDB and cache them."""
+def load_lb3genieclipceiling_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load LB3 GenieClip Ceiling solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['ceilings']
@@ -182,8 +182,8 @@ def load_lb3genieclipceiling_solutions():
     sp15_id = ids['LB3GenieClipCeilingSP15']
     
     # Get documents from database
-    standard_doc = get_solution_by_id('ceilingsolutions', standard_id)
-    sp15_doc = get_solution_by_id('ceilingsolutions', sp15_id)
+    standard_doc = get_variant_document(docs, 'ceilingsolutions', 'LB3GenieClipCeilingStandard', standard_id)
+    sp15_doc = get_variant_document(docs, 'ceilingsolutions', 'LB3GenieClipCeilingSP15', sp15_id)
     
     # Create solution objects only if documents exist
     standard = None
@@ -191,8 +191,7 @@ def load_lb3genieclipceiling_solutions():
     
     if standard_doc:
         try:
-            standard = LB3GenieClipCeilingStandard()
-            standard._solution_data = standard_doc
+            standard = LB3GenieClipCeilingStandard.from_document(standard_doc)
             cache_manager.set('lb3genieclipceiling_standard', standard, 3600)
             logger.info(f"Successfully loaded LB3GenieClipCeilingStandard with {len(standard_doc.get('materials', []))} materials")
         except Exception as e:
@@ -203,8 +202,7 @@ def load_lb3genieclipceiling_solutions():
     
     if sp15_doc:
         try:
-            sp15 = LB3GenieClipCeilingSP15()
-            sp15._solution_data = sp15_doc
+            sp15 = LB3GenieClipCeilingSP15.from_document(sp15_doc)
             cache_manager.set('lb3genieclipceiling_sp15', sp15, 3600)
             logger.info(f"Successfully loaded LB3GenieClipCeilingSP15 with {len(sp15_doc.get('materials', []))} materials")
         except Exception as e:
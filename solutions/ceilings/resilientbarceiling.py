@@ -9,7 +9,7 @@ from solutions.base_calculator import BaseCalculator
 from solutions.base_solution import BaseSolution
 from solutions.material_properties import get_material_properties
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id
+from solutions.database import get_variant_document
 from solutions.cache_manager import get_cache_manager
 
 logger = logging.getLogger(__name__)
@@ -74,8 +74,12 @@ class ResilientBarCeilingSP15(ResilientBarCeilingStandard):
             'stc_rating': 65
         }
 
-def load_resilientbarceiling_solutions():
-    """Load Resilient Bar Ceiling solutions (Standard and SP15) from MongoDB and cache them."""
+def load_resilientbarceiling_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load Resilient Bar Ceiling solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['ceilings']
@@ -83,8 +87,8 @@ def load_resilientbarceiling_solutions():
     sp15_id = ids['ResilientBarCeilingSP15']
     
     # Get documents from database
-    standard_doc = get_solution_by_id('ceilingsolutions', standard_id)
-    sp15_doc = get_solution_by_id('ceilingsolutions', sp15_id)
+    standard_doc = get_variant_document(docs, 'ceilingsolutions', 'ResilientBarCeilingStandard', standard_id)
+    sp15_doc = get_variant_document(docs, 'ceilingsolutions', 'ResilientBarCeilingSP15', sp15_id)
     
     # Create solution objects only if documents exist
     standard = None
@@ -92,8 +96,7 @@ def load_resilientbarceiling_solutions():
     
     if standard_doc:
         try:
-            standard = ResilientBarCeilingStandard(0, 0)
-            standard._solution_data = standard_doc
+            standard = ResilientBarCeilingStandard.from_document(standard_doc)
             cache_manager.set('resilientbarceiling_standard', standard, 3600)
             logger.info(f"Successfully loaded ResilientBarCeilingStandard with {len(standard_doc.get('materials', []))} materials")
         except Exception as e:
@@ -104,8 +107,7 @@ def load_resilientbarceiling_solutions():
     
     if sp15_doc:
         try:
-            sp15 = ResilientBarCeilingSP15(0, 0)
-            sp15._solution_data = sp15_doc
+            sp15 = ResilientBarCeilingSP15.from_document(sp15_doc)
             cache_manager.set('resilientbarceiling_sp15', sp15, 3600)
             logger.info(f"Successfully loaded ResilientBarCeilingSP15 with {len(sp15_doc.get('materials', []))} materials")
         except Exception as e:
@@ -0,0 +1,175 @@
+"""
+Composite transmission loss of surfaces with openings.
+
+A wall is only as good as its weakest part: a door or window in it lets
+through far more sound per m² than the treated wall around it. The
+composite TL of a surface combines the area-weighted transmission
+coefficients, tau = 10^(-TL/10), of the treated area and of each opening,
+band by band:
+
+    tau_c = ((1 - sum f_j) * tau_solution + sum f_j * tau_opening_j)
+    TL_c  = -10 * log10(tau_c)
+
+where f_j is the fraction of the surface taken up by openings of type j.
+
+Blockages from the room input (doors, windows, sockets, vents, ...) are
+reduced to an opening mix: the fraction of the surface per opening type.
+composite_results() rates every surface of a room in one NumPy pass and
+caches each result per (solution TL curve, opening mix), so the same
+solution with the same openings is never combined twice.
+
+Each opening type has a typical STC, turned into a TL curve with the same
+estimate as solution curves. A blockage can give its own "stc" instead.
+
+Environment variables:
+    COMPOSITE_TL_CACHE_TTL   Seconds a composite result stays cached (default: 3600)
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from solutions.blockage_calculator import calculate_blockage_area, safe_float
+from solutions.cache_keys import build_cache_key
+from solutions.sound_ratings import stc_ratings
+from solutions.spectrum import Spectrum
+
+logger = logging.getLogger(__name__)
+
+COMPOSITE_TL_CACHE_TTL = int(os.getenv('COMPOSITE_TL_CACHE_TTL', 3600))
+
+# Typical STC of common openings, as installed (with their gaps and seals)
+OPENING_STC = {
+    'door': 20,
+    'solid_door': 28,
+    'fire_door': 30,
+    'window': 28,
+    'double_glazed_window': 32,
+    'socket': 35,
+    'switch': 35,
+    'light': 30,
+    'vent': 10,
+    'hatch': 25,
+}
+DEFAULT_OPENING_STC = 20
+
+# Room input keys holding wall blockages
+WALL_BLOCKAGE_KEYS = ('walls', 'wall', 'north', 'south', 'east', 'west')
+
+# Opening fractions are kept to this many decimals: a socket is ~0.0002 of a wall
+FRACTION_DIGITS = 6
+
+# (opening STC, fraction of the surface), sorted
+OpeningMix = Tuple[Tuple[float, float], ...]
+
+
+@dataclass(frozen=True)
+class CompositeResult:
+    """Transmission loss of a treated surface including its openings"""
+    transmission_loss: Spectrum
+    stc: int
+    # STC the openings cost compared with the treated surface alone
+    stc_loss: int
+
+
+def opening_stc(blockage: Dict[str, Any]) -> float:
+    """STC of one blockage: its own rating, or the typical rating of its type"""
+    if blockage.get('stc') is not None:
+        return safe_float(blockage.get('stc'), DEFAULT_OPENING_STC)
+    kind = str(blockage.get('type') or '').lower().replace(' ', '_')
+    return float(OPENING_STC.get(kind, DEFAULT_OPENING_STC))
+
+
+def _blockage_area(blockage: Dict[str, Any], surface: str) -> float:
+    if blockage.get('area') is not None:
+        return safe_float(blockage.get('area'))
+    # The frontend nests width/height under "dimensions"
+    dimensions = blockage.get('dimensions') if isinstance(blockage.get('dimensions'), dict) else blockage
+    return calculate_blockage_area(dimensions, surface)
+
+
+def surface_blockages(blockages: Optional[Dict[str, Any]], surface_type: str) -> List[Dict[str, Any]]:
+    """Blockages on a surface type; wall blockages may be listed per direction"""
+    if not isinstance(blockages, dict):
+        return []
+    surface = (surface_type or '').lower().rstrip('s')
+    keys = WALL_BLOCKAGE_KEYS if surface == 'wall' else (surface, f"{surface}s")
+    found = []
+    for key in keys:
+        value = blockages.get(key)
+        if isinstance(value, dict):
+            value = [value]
+        found.extend(b for b in value or [] if isinstance(b, dict))
+    return found
+
+
+def opening_mix(blockages: Sequence[Dict[str, Any]], surface_type: str, surface_area: float) -> OpeningMix:
+    """Fraction of the surface taken by each opening STC, capped at the whole surface"""
+    if surface_area <= 0:
+        return ()
+    kind = 'wall' if (surface_type or '').lower().startswith('wall') else surface_type
+    areas: Dict[float, float] = {}
+    for blockage in blockages:
+        area = _blockage_area(blockage, kind)
+        if area > 0:
+            stc = opening_stc(blockage)
+            areas[stc] = areas.get(stc, 0.0) + area
+    total = sum(areas.values())
+    scale = surface_area / total if total > surface_area else 1.0
+    return tuple(sorted((stc, round(area * scale / surface_area, FRACTION_DIGITS))
+                        for stc, area in areas.items()))
+
+
+def composite_transmission_loss(solution_tl: np.ndarray, fractions: np.ndarray, opening_tl: np.ndarray) -> np.ndarray:
+    """Composite TL of many surfaces in one pass
+
+    Args:
+        solution_tl: (surfaces, bands) TL of the treated area
+        fractions: (surfaces, openings) fraction of each surface per opening type
+        opening_tl: (openings, bands) TL of each opening type
+    """
+    solid = np.clip(1.0 - fractions.sum(axis=1), 0.0, 1.0)[:, None]
+    tau = solid * 10 ** (-solution_tl / 10) + fractions @ 10 ** (-opening_tl / 10)
+    return -10 * np.log10(np.maximum(tau, 1e-30))
+
+
+def composite_results(surfaces: Sequence[Tuple[Spectrum, OpeningMix]], cache_manager=None) -> List[CompositeResult]:
+    """Composite TL and STC of each (solution TL, opening mix), cached per pair"""
+    # Fractions go into the key as whole millionths, finer than the key's float rounding
+    keys = [build_cache_key("composite_tl", tl.values.tolist(),
+                            [(stc, int(round(fraction * 10 ** FRACTION_DIGITS))) for stc, fraction in mix])
+            for tl, mix in surfaces]
+    results: List[Optional[CompositeResult]] = [None] * len(surfaces)
+    if cache_manager is not None:
+        results = [cache_manager.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if not isinstance(result, CompositeResult)]
+    if not missing:
+        return results
+
+    opening_stcs = sorted({stc for i in missing for stc, _ in surfaces[i][1]})
+    columns = {stc: j for j, stc in enumerate(opening_stcs)}
+    solution_tl = np.array([surfaces[i][0].values for i in missing], dtype=float)
+    fractions = np.zeros((len(missing), len(opening_stcs)))
+    for row, i in enumerate(missing):
+        for stc, fraction in surfaces[i][1]:
+            fractions[row, columns[stc]] = fraction
+    opening_tl = np.array([Spectrum.from_stc(stc).values for stc in opening_stcs], dtype=float).reshape(
+        len(opening_stcs), solution_tl.shape[1])
+
+    composite = composite_transmission_loss(solution_tl, fractions, opening_tl)
+    # The treated surfaces and their composites are rated together
+    ratings = stc_ratings(np.vstack([solution_tl, composite]))
+    solid_stc, composite_stc = ratings[:len(missing)], ratings[len(missing):]
+    for row, i in enumerate(missing):
+        result = CompositeResult(
+            transmission_loss=Spectrum(composite[row]),
+            stc=int(composite_stc[row]),
+            stc_loss=max(0, int(solid_stc[row] - composite_stc[row])),
+        )
+        results[i] = result
+        if cache_manager is not None:
+            cache_manager.set(keys[i], result, COMPOSITE_TL_CACHE_TTL)
+    return results
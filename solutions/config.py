@@ -10,6 +10,7 @@ import json
 import math
 from .material_properties import get_material_characteristics
 from .acoustic_calculator import get_acoustic_calculator
+from .spectrum import Spectrum
 
 
 # ========== NOISE PROFILES ==========
@@ -119,9 +120,9 @@ NOISE_PROFILES = {
 @dataclass
 class AcousticProfile:
     stc_rating: int
-    frequency_response: Dict[str, float]
+    frequency_response: Spectrum
     absorption_coefficient: float
-    transmission_loss: Dict[str, float]
+    transmission_loss: Spectrum
 
 @dataclass
 class SolutionProfile:
@@ -6,7 +6,8 @@ from typing import Dict, List, Any, Optional
 from .base_calculator import BaseCalculator
 from .cache_manager import get_cache_manager
 from .logger import get_logger
-from solutions.database import get_solution_by_id, get_all_materials_from_db
+from solutions.database import get_solution_by_id
+from solutions.materials_repository import get_materials_repository
 
 # Set up logging
 logger = get_logger()
@@ -32,6 +33,7 @@ def calculate_material_cost(solution_id: str, dimensions: Dict[str, float]) -> f
         if not costs:
             return 0.0
         total_cost = costs['breakdown']['totalCost']
+        cache_manager.set_cached_calculation('material_cost', cache_params, total_cost)
         return total_cost
     except Exception as e:
         logger.error(f"Error calculating material cost: {str(e)}")
@@ -40,8 +42,7 @@ def calculate_material_cost(solution_id: str, dimensions: Dict[str, float]) -> f
 def get_material_cost(material_name: str) -> Optional[float]:
     """Get cost for a specific material using new loader."""
     try:
-        materials = get_all_materials_from_db()
-        material = next((m for m in materials if m.get('name') == material_name), None)
+        material = get_materials_repository().get(material_name)
         if material and "cost" in material:
             return float(material["cost"])
         return None
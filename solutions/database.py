@@ -1,21 +1,18 @@
-import os
+from typing import Dict, Iterable
 from bson import ObjectId
-from pymongo import MongoClient
-from dotenv import load_dotenv
-
-def get_db():
-    """Get a connected MongoDB database object using environment variables."""
-    load_dotenv()
-    mongo_uri = os.getenv('MONGODB_URI')
-    if not mongo_uri:
-        raise ValueError("MONGODB_URI not found in environment variables")
-    client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-    db_name = os.getenv('MONGODB_DB', 'guyrazor')
-    return client.get_database(db_name)
+from solutions.db_init import get_db
+from solutions.catalog_snapshot import get_snapshot_solution_documents, get_snapshot_materials
+
+SOLUTION_COLLECTIONS = {
+    'walls': 'wallsolutions',
+    'ceilings': 'ceilingsolutions',
+}
 
 def get_solution_by_id(collection_name: str, object_id: str):
     """Fetch a solution document by ObjectId or string from the specified collection. Auto-detects type."""
     db = get_db()
+    if db is None:
+        return None
     collection = db.get_collection(collection_name)
     # Print collection name and sample IDs for debugging
     sample_ids = [str(doc['_id']) for doc in collection.find({}, {'_id': 1}).limit(5)]
@@ -28,24 +25,92 @@ def get_solution_by_id(collection_name: str, object_id: str):
         pass
     if not doc:
         doc = collection.find_one({'_id': object_id})
-    db.client.close()
     return doc
 
+def get_solutions_by_ids(collection_name: str, object_ids: Iterable[str]) -> Dict[str, dict]:
+    """Fetch several solution documents with a single $in query.
+
+    Ids are deduplicated and matched both as ObjectId and as plain string,
+    like get_solution_by_id. Returns a dict keyed by the string form of each
+    id that was found.
+    """
+    unique_ids = list(dict.fromkeys(str(object_id) for object_id in object_ids))
+    if not unique_ids:
+        return {}
+    db = get_db()
+    if db is None:
+        return {}
+    query_ids = []
+    for object_id in unique_ids:
+        if ObjectId.is_valid(object_id):
+            query_ids.append(ObjectId(object_id))
+        query_ids.append(object_id)
+    collection = db.get_collection(collection_name)
+    docs = {str(doc['_id']): doc for doc in collection.find({'_id': {'$in': query_ids}})}
+    print(f"[DATABASE] Loaded {len(docs)}/{len(unique_ids)} documents from '{collection_name}' in one query")
+    return docs
+
+def load_solution_variant_documents() -> Dict[str, Dict[str, dict]]:
+    """Fetch every document in SOLUTION_VARIANT_MONGO_IDS, one query per collection.
+
+    Returns {'walls': {variant_name: doc}, 'ceilings': {...}}. Variants that
+    share an id each get their own copy of the document; variants whose
+    document is missing are left out.
+    """
+    from solutions.config import SOLUTION_VARIANT_MONGO_IDS
+
+    variant_docs = {}
+    for surface_type, variant_ids in SOLUTION_VARIANT_MONGO_IDS.items():
+        collection_name = SOLUTION_COLLECTIONS[surface_type]
+        docs = get_solutions_by_ids(collection_name, variant_ids.values())
+        variant_docs[surface_type] = {
+            variant: dict(docs[object_id])
+            for variant, object_id in variant_ids.items()
+            if object_id in docs
+        }
+    return variant_docs
+
+def get_variant_document(docs, collection_name: str, variant: str, object_id: str):
+    """Return a variant's document from a prefetched map, the catalog snapshot, or by id"""
+    if docs is not None:
+        return docs.get(variant)
+    surface_type = next((s for s, c in SOLUTION_COLLECTIONS.items() if c == collection_name), None)
+    snapshot_docs = get_snapshot_solution_documents(surface_type) if surface_type else None
+    if snapshot_docs and variant in snapshot_docs:
+        return dict(snapshot_docs[variant])
+    return get_solution_by_id(collection_name, object_id)
+
 def get_all_materials_from_db():
     """Fetch all materials from the 'materials' collection in MongoDB."""
     db = get_db()
+    if db is None:
+        return _snapshot_materials_fallback()
     collection = db.get_collection('materials')
-    materials = list(collection.find({}))
+    try:
+        materials = list(collection.find({}))
+    except Exception as e:
+        print(f"[MATERIALS] Error reading materials from MongoDB: {e}")
+        return _snapshot_materials_fallback()
     print(f"[MATERIALS] Found {len(materials)} materials in MongoDB.")
     if materials:
         print(f"[MATERIALS] Sample material: {materials[0]}")
-    db.client.close()
     return materials
 
+def _snapshot_materials_fallback():
+    """Materials from the catalog snapshot, used while MongoDB is unreachable."""
+    materials = get_snapshot_materials()
+    if materials is None:
+        return []
+    print(f"[MATERIALS] MongoDB unavailable, using {len(materials)} materials from catalog snapshot.")
+    return [dict(material) for material in materials]
+
 def diagnose_missing_document(collection_name: str, object_id: str, max_sample: int = 5):
     """Prints a summary diagnostic if a document is missing in the given collection."""
     try:
         db = get_db()
+        if db is None:
+            print(f"[DIAGNOSTIC] No database connection available for '{collection_name}'")
+            return
         collection = db.get_collection(collection_name)
         count = collection.count_documents({})
         print(f"[DIAGNOSTIC] Collection '{collection_name}' has {count} documents.")
@@ -55,6 +120,5 @@ def diagnose_missing_document(collection_name: str, object_id: str, max_sample:
         else:
             print(f"[DIAGNOSTIC] Collection '{collection_name}' is empty.")
         print(f"[DIAGNOSTIC] Attempted to find document with _id: {object_id}")
-        db.client.close()
     except Exception as e:
         print(f"[DIAGNOSTIC] Error during diagnostic for collection '{collection_name}': {e}") 
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+MongoDB connection management.
+
+Holds a single pooled MongoClient per worker process. The client is created
+lazily on first use and shared by database.py, the calculators and the
+recommendation engine, so a lookup no longer pays for a fresh TLS/SRV
+handshake. After a fork (gunicorn worker, multiprocessing) the inherited
+client is dropped and the child builds its own on next use.
+
+Environment variables:
+    MONGODB_URI                  Connection string (required)
+    MONGODB_DB                   Database name (default: guyrazor)
+    MONGODB_MAX_POOL_SIZE        Max sockets per worker process (default: 20)
+    MONGODB_MIN_POOL_SIZE        Sockets kept warm per worker (default: 0)
+    MONGODB_MAX_IDLE_TIME_MS     Close idle sockets after this long (default: 300000)
+    MONGODB_RECONNECT_INTERVAL   Seconds to wait after a failed connect (default: 30)
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Optional
+
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_NAME = 'guyrazor'
+
+_db_connection = None
+_db_connection_pid = None
+_db_connection_lock = threading.Lock()
+_last_failed_attempt = 0.0
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+class DBConnection:
+    """Wraps the process-wide MongoClient and the selected database"""
+
+    def __init__(self, client: MongoClient, db_name: str):
+        self.client = client
+        self.database = client[db_name]
+        self.db_name = db_name
+        self.pid = os.getpid()
+
+    def get_collection(self, collection_name: str):
+        """Get a collection from the selected database"""
+        return self.database.get_collection(collection_name)
+
+    def close(self):
+        """Close the underlying client and its connection pool"""
+        try:
+            self.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing MongoDB client: {e}")
+
+    def cleanup(self):
+        """Release resources held by this connection"""
+        self.close()
+
+
+def _create_connection() -> Optional[DBConnection]:
+    """Create a new pooled connection, or None if MongoDB is unavailable"""
+    load_dotenv()
+    mongo_uri = os.getenv('MONGODB_URI')
+    if not mongo_uri:
+        logger.warning("MONGODB_URI not found in environment variables")
+        return None
+
+    db_name = os.getenv('MONGODB_DB', DEFAULT_DB_NAME)
+    client = MongoClient(
+        mongo_uri,
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=_env_int('MONGODB_MAX_POOL_SIZE', 20),
+        minPoolSize=_env_int('MONGODB_MIN_POOL_SIZE', 0),
+        maxIdleTimeMS=_env_int('MONGODB_MAX_IDLE_TIME_MS', 300000),
+        retryReads=True,
+    )
+    try:
+        client.admin.command('ping')
+    except Exception:
+        client.close()
+        raise
+
+    logger.info(f"Connected to MongoDB database '{db_name}' (pid {os.getpid()})")
+    return DBConnection(client, db_name)
+
+
+def get_db_connection() -> Optional[DBConnection]:
+    """Get the pooled connection for this process, creating it on first use.
+
+    Returns None while MongoDB is unreachable. After a failed attempt no new
+    connection is tried until MONGODB_RECONNECT_INTERVAL seconds have passed,
+    so callers fall back to cached data instead of blocking on every request.
+    """
+    global _db_connection, _db_connection_pid, _last_failed_attempt
+
+    connection = _db_connection
+    if connection is not None and _db_connection_pid == os.getpid():
+        return connection
+
+    with _db_connection_lock:
+        # Inherited from the parent process: never reuse its sockets
+        if _db_connection is not None and _db_connection_pid != os.getpid():
+            _db_connection = None
+            _db_connection_pid = None
+
+        if _db_connection is not None:
+            return _db_connection
+
+        reconnect_interval = _env_int('MONGODB_RECONNECT_INTERVAL', 30)
+        if _last_failed_attempt and time.time() - _last_failed_attempt < reconnect_interval:
+            return None
+
+        try:
+            _db_connection = _create_connection()
+        except Exception as e:
+            logger.error(f"Error connecting to MongoDB: {e}")
+            _db_connection = None
+
+        if _db_connection is None:
+            _last_failed_attempt = time.time()
+            return None
+
+        _db_connection_pid = os.getpid()
+        _last_failed_attempt = 0.0
+        return _db_connection
+
+
+def get_db():
+    """Get the shared MongoDB database object, or None if unavailable"""
+    connection = get_db_connection()
+    if connection is None:
+        return None
+    return connection.database
+
+
+def reset_db_connection(close: bool = True):
+    """Drop the pooled connection so the next get_db() reconnects.
+
+    Pass close=False from a post-fork hook: the sockets belong to the parent
+    process and must not be shut down from the child.
+    """
+    global _db_connection, _db_connection_pid, _last_failed_attempt
+    with _db_connection_lock:
+        if _db_connection is not None and close:
+            _db_connection.close()
+        _db_connection = None
+        _db_connection_pid = None
+        _last_failed_attempt = 0.0
+
+
+def cleanup_db_connection():
+    """Close the pooled connection and release its resources"""
+    reset_db_connection(close=True)
+
+
+def post_fork(server=None, worker=None):
+    """Gunicorn post_fork hook: give each worker its own client.
+
+    The lock is replaced rather than acquired, since another thread of the
+    parent may have held it at the moment of the fork.
+    """
+    global _db_connection, _db_connection_pid, _db_connection_lock, _last_failed_attempt
+    _db_connection_lock = threading.Lock()
+    _db_connection = None
+    _db_connection_pid = None
+    _last_failed_attempt = 0.0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=post_fork)
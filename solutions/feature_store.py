@@ -0,0 +1,191 @@
+"""
+Precomputed, read-only features of the registered solutions.
+
+When a solution is registered with the solutions manager its
+characteristics, combined material properties and ranking feature row are
+captured once in a frozen SolutionFeatureRecord. The records are grouped
+into a SolutionFeatureStore indexed by surface type, which also holds the
+feature matrices and ranking candidates. Ranking reads the store instead of
+calling get_characteristics() and recomputing material properties per
+request. A new store is built only when the catalogue version changes,
+i.e. when solutions are registered again. Each store also holds the
+1/3-octave transmission loss curve of every solution, computed once when
+the store is built, and fits the single-number ratings of all the curves
+in one batch on first use.
+
+Records are shared between requests: their mappings are read-only views
+and their matrices are not writeable. Copy before modifying.
+"""
+
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from solutions.ranking_kernel import FEATURES, FEATURE_INDEX, RankingCandidates, feature_row
+from solutions.sound_ratings import SoundRatings, rate_batch
+from solutions.spectrum import BAND_COUNT, Spectrum, measured_transmission_loss
+
+logger = logging.getLogger(__name__)
+
+ABSORPTION_BANDS = ("low", "mid", "high")
+
+
+def normalize_surface_type(surface_type: Optional[str]) -> str:
+    """'walls' / 'Wall' -> 'wall', the form used by the solution cache keys"""
+    return (surface_type or '').lower().rstrip('s')
+
+
+def _freeze(value: Any) -> Any:
+    """Deep read-only copy of characteristics data"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Plain (JSON-serializable) copy of frozen data"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class SolutionFeatureRecord:
+    """Everything ranking and costing need to know about one registered solution"""
+    registry_id: str
+    solution_id: str
+    surface_type: str
+    variant: str
+    characteristics: Mapping[str, Any]
+    material_properties: Mapping[str, Any]
+    absorption: Tuple[float, ...]
+    features: Tuple[float, ...]
+
+    @property
+    def stc(self) -> float:
+        return self.features[FEATURE_INDEX["stc"]]
+
+    @property
+    def cost_per_m2(self) -> float:
+        return self.features[FEATURE_INDEX["cost_per_m2"]]
+
+
+def build_feature_record(registry_id: str, solution_instance, surface_type: Optional[str] = None,
+                         acoustic_calculator=None) -> Optional[SolutionFeatureRecord]:
+    """Build the feature record for a solution instance, or None if it has no usable characteristics"""
+    characteristics = solution_instance.get_characteristics() if hasattr(solution_instance, 'get_characteristics') else None
+    if not characteristics:
+        return None
+    if acoustic_calculator is None:
+        from solutions.acoustic_calculator import get_acoustic_calculator
+        acoustic_calculator = get_acoustic_calculator()
+
+    surface_type = surface_type or characteristics.get('surface_type') or getattr(solution_instance, '_collection', '')
+    characteristics = dict(characteristics)
+    characteristics['solution_id'] = getattr(solution_instance, 'CODE_NAME', registry_id)
+    characteristics['surface_type'] = surface_type
+    characteristics['variant'] = 'SP15' if getattr(solution_instance, 'IS_SP15', False) else 'Standard'
+
+    material_props = acoustic_calculator.calculate_material_properties(characteristics.get('materials', []))
+    absorption = (material_props or {}).get('absorption') or {}
+    return SolutionFeatureRecord(
+        registry_id=registry_id,
+        solution_id=characteristics['solution_id'],
+        surface_type=surface_type,
+        variant=characteristics['variant'],
+        characteristics=_freeze(characteristics),
+        material_properties=_freeze(material_props or {}),
+        absorption=tuple(float(absorption.get(band, 0)) for band in ABSORPTION_BANDS),
+        features=tuple(feature_row(characteristics, material_props or {})),
+    )
+
+
+class SolutionFeatureStore:
+    """Immutable set of feature records for one catalogue version, indexed by surface type"""
+
+    def __init__(self, records: Iterable[SolutionFeatureRecord], version: int = 0):
+        self.version = version
+        self._records: Tuple[SolutionFeatureRecord, ...] = tuple(records)
+        self._by_id = {record.registry_id: record for record in self._records}
+        by_surface: Dict[str, List[SolutionFeatureRecord]] = {}
+        for record in self._records:
+            by_surface.setdefault(normalize_surface_type(record.surface_type), []).append(record)
+        self._by_surface = {surface: tuple(records) for surface, records in by_surface.items()}
+        # TL curves are fixed for the catalogue version, so they are computed here once
+        self._transmission_loss: Dict[str, Spectrum] = {}
+        self._measured = set()
+        for record in self._records:
+            curve = measured_transmission_loss(record.characteristics)
+            if curve is not None:
+                self._measured.add(record.registry_id)
+            self._transmission_loss[record.registry_id] = curve if curve is not None else Spectrum.from_stc(record.stc)
+        self._ratings: Optional[Dict[str, SoundRatings]] = None
+        # Ranking candidates are built on first use per surface and then shared
+        self._candidates: Dict[Optional[str], RankingCandidates] = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, registry_id: str) -> Optional[SolutionFeatureRecord]:
+        return self._by_id.get(registry_id)
+
+    def records(self, surface_type: Optional[str] = None) -> Tuple[SolutionFeatureRecord, ...]:
+        """All records, or those for one surface type ('walls', 'wall', 'ceiling', ...)"""
+        if surface_type is None:
+            return self._records
+        return self._by_surface.get(normalize_surface_type(surface_type), ())
+
+    def transmission_loss(self, registry_id: str) -> Optional[Spectrum]:
+        """Precomputed 1/3-octave transmission loss curve of a solution"""
+        return self._transmission_loss.get(registry_id)
+
+    def has_measured_transmission_loss(self, registry_id: str) -> bool:
+        """Whether a solution's TL curve is measured data rather than estimated from its STC"""
+        return registry_id in self._measured
+
+    def sound_ratings(self, registry_id: str) -> Optional[SoundRatings]:
+        """STC, Rw, C and Ctr fitted to a solution's TL curve, rated for the whole store at once"""
+        ratings = self._ratings
+        if ratings is None:
+            batch = rate_batch(self.transmission_loss_matrix())
+            ratings = {record.registry_id: SoundRatings(*(int(batch[name][i]) for name in ('stc', 'rw', 'c', 'ctr')))
+                       for i, record in enumerate(self._records)}
+            # Benign race, as for the ranking candidates
+            self._ratings = ratings
+        return ratings.get(registry_id)
+
+    def transmission_loss_matrix(self, surface_type: Optional[str] = None) -> np.ndarray:
+        """Read-only (n, BAND_COUNT) matrix of TL curves in records() order"""
+        records = self.records(surface_type)
+        matrix = np.array([self._transmission_loss[record.registry_id].values for record in records],
+                          dtype=float).reshape(len(records), BAND_COUNT)
+        matrix.flags.writeable = False
+        return matrix
+
+    def surface_types(self) -> List[str]:
+        return list(self._by_surface)
+
+    def feature_matrix(self, surface_type: Optional[str] = None) -> np.ndarray:
+        """Read-only (n, len(FEATURES)) matrix in records() order"""
+        return self.ranking_candidates(surface_type).features
+
+    def ranking_candidates(self, surface_type: Optional[str] = None) -> RankingCandidates:
+        """Candidates for rank_prepared_solutions(), built once per surface type"""
+        key = normalize_surface_type(surface_type) if surface_type is not None else None
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            records = self.records(surface_type)
+            solutions = [thaw(record.characteristics) for record in records]
+            features = np.array([record.features for record in records], dtype=float).reshape(len(records), len(FEATURES))
+            features.flags.writeable = False
+            candidates = RankingCandidates(solutions, solutions, features)
+            # Benign race: two threads may build the same candidates; either result is equivalent
+            self._candidates[key] = candidates
+        return candidates
@@ -5,42 +5,46 @@ Material properties module for soundproofing solutions.
 from typing import Dict, List, Any, Optional
 import time
 from .logger import get_logger
-from solutions.database import get_all_materials_from_db, get_solution_by_id
+from solutions.database import get_solution_by_id
+from solutions.materials_repository import get_materials_repository
+from solutions.sound_ratings import mass_law_transmission_loss, stc_ratings
 
 # Set up logging
 logger = get_logger()
 
+def _material_record_properties(material: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the properties exposed for a material record"""
+    return {
+        'density': material.get('density', 0),
+        'thickness': material.get('thickness', 0),
+        'stc_rating': material.get('stc_rating', 0),
+        'stc_improvement': material.get('stc_improvement', 0),
+        'acoustic_properties': material.get('acoustic_properties', {}),
+        'cost': material.get('cost', 0),
+        'description': material.get('description', ''),
+        'category': material.get('category', 'unknown')
+    }
+
 def get_material_properties(material_names: List[str] = None) -> Dict[str, Any]:
     """
     Get material properties from MongoDB using new utility.
     If material_names is None or empty, returns all available properties.
     """
     try:
-        materials = get_all_materials_from_db()
-        if not materials:
-            logger.warning("No materials found in database")
-            return {}
-        all_properties = {}
-        for material in materials:
-            material_name = material.get('name')
-            if material_name:
-                properties = {
-                    'density': material.get('density', 0),
-                    'thickness': material.get('thickness', 0),
-                    'stc_rating': material.get('stc_rating', 0),
-                    'stc_improvement': material.get('stc_improvement', 0),
-                    'acoustic_properties': material.get('acoustic_properties', {}),
-                    'cost': material.get('cost', 0),
-                    'description': material.get('description', ''),
-                    'category': material.get('category', 'unknown')
-                }
-                all_properties[material_name] = properties
+        repository = get_materials_repository()
         if material_names is None or len(material_names) == 0:
-            return all_properties
+            materials = repository.all()
+            if not materials:
+                logger.warning("No materials found in database")
+            return {
+                material['name']: _material_record_properties(material)
+                for material in materials if material.get('name')
+            }
         properties = {}
         for name in material_names:
-            if name in all_properties:
-                properties[name] = all_properties[name]
+            material = repository.get(name)
+            if material is not None:
+                properties[name] = _material_record_properties(material)
             else:
                 logger.debug(f"Requested material not found: {name}")
         return properties
@@ -49,7 +53,12 @@ def get_material_properties(material_names: List[str] = None) -> Dict[str, Any]:
         return {}
 
 def calculate_solution_stc(solution_name: str) -> Optional[int]:
-    """Calculate total STC rating for a solution based on its materials using new loader."""
+    """Estimate the STC rating of a solution from its materials using new loader.
+
+    Materials with density and thickness are rated together by the mass law,
+    materials with only an STC rating contribute the best of those ratings,
+    and STC improvements (decoupling, damping) are added on top.
+    """
     try:
         solution = get_solution_by_id(solution_name)
         if not solution or 'materials' not in solution:
@@ -62,16 +71,26 @@ def calculate_solution_stc(solution_name: str) -> Optional[int]:
             elif isinstance(material, str):
                 material_names.append(material)
         material_properties = get_material_properties(material_names)
-        total_stc = 0
+        # The layers act as one leaf: rate the mass law TL of their combined surface mass
+        surface_mass = 0.0
+        best_stc = 0
+        improvement = 0
         for material in solution['materials']:
             name = material['name'] if isinstance(material, dict) else material
-            if name in material_properties:
-                props = material_properties[name]
-                if 'stc_rating' in props and props['stc_rating']:
-                    total_stc += props['stc_rating']
-                elif 'stc_improvement' in props and props['stc_improvement']:
-                    total_stc += props['stc_improvement']
-        return total_stc
+            props = material_properties.get(name)
+            if not props:
+                continue
+            density, thickness = float(props.get('density') or 0), float(props.get('thickness') or 0)
+            if density > 0 and thickness > 0:
+                # kg/m³ x mm -> kg/m²
+                surface_mass += density * thickness / 1000
+            elif props.get('stc_rating'):
+                best_stc = max(best_stc, props['stc_rating'])
+            if props.get('stc_improvement'):
+                improvement += props['stc_improvement']
+        if surface_mass > 0:
+            best_stc = max(best_stc, int(stc_ratings(mass_law_transmission_loss(surface_mass))[0]))
+        return best_stc + improvement
     except Exception as e:
         logger.error(f"Error calculating STC for {solution_name}: {e}")
         return None
@@ -79,8 +98,7 @@ def calculate_solution_stc(solution_name: str) -> Optional[int]:
 def get_material_frequency_response(material_name: str) -> Optional[Dict[str, float]]:
     """Get frequency response data for a material using new loader."""
     try:
-        materials = get_all_materials_from_db()
-        material = next((m for m in materials if m.get('name') == material_name), None)
+        material = get_materials_repository().get(material_name)
         if not material or 'acoustic_properties' not in material:
             logger.warning(f"No acoustic properties found for material: {material_name}")
             return None
@@ -95,21 +113,10 @@ def get_material_frequency_response(material_name: str) -> Optional[Dict[str, fl
 def get_material_characteristics(material_name: str) -> Optional[Dict[str, Any]]:
     """Get all acoustic characteristics for a material using new loader."""
     try:
-        materials = get_all_materials_from_db()
-        material = next((m for m in materials if m.get('name') == material_name), None)
+        material = get_materials_repository().get(material_name)
         if not material:
             return None
-        characteristics = {
-            'density': material.get('density', 0),
-            'thickness': material.get('thickness', 0),
-            'stc_rating': material.get('stc_rating', 0),
-            'stc_improvement': material.get('stc_improvement', 0),
-            'acoustic_properties': material.get('acoustic_properties', {}),
-            'cost': material.get('cost', 0),
-            'description': material.get('description', ''),
-            'category': material.get('category', 'unknown')
-        }
-        return characteristics
+        return _material_record_properties(material)
     except Exception as e:
         logger.error(f"Error getting material characteristics for {material_name}: {e}")
         return None
\ No newline at end of file
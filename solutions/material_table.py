@@ -0,0 +1,172 @@
+"""
+Dense table of material acoustic properties.
+
+Every material in the MaterialsRepository gets an interned integer id and
+one row of a read-only float matrix (STC, density, thickness, band
+absorption, damping, decoupling). The table is built in one pass over the
+repository when the catalogue is loaded and rebuilt only when the
+repository reloads its materials.
+
+The combined properties of a solution's materials are a coverage-weighted
+average of their rows, computed as a single dot product, and
+aggregate_batch() does the same for many material lists at once with one
+matrix product. cache_key() identifies a material list by its names *and*
+coverages plus the table fingerprint, so solutions that share material
+names but not coverages never collide, and cached aggregates are not
+reused after the materials change.
+
+Unknown materials count towards the total coverage with zero properties,
+like the per-material lookups this table replaces.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from solutions.cache_keys import build_cache_key
+from solutions.materials_repository import get_materials_repository
+
+logger = logging.getLogger(__name__)
+
+PROPERTY_COLUMNS = ("stc", "density", "thickness", "absorption_low", "absorption_mid", "absorption_high",
+                    "damping", "decoupling")
+ABSORPTION_BANDS = ("low", "mid", "high")
+DEFAULT_COVERAGE = 100.0
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def material_row(material: Dict[str, Any]) -> List[float]:
+    """Property row of a material record, in PROPERTY_COLUMNS order"""
+    absorption = material.get("absorption") or {}
+    return [
+        _float(material.get("stc_rating")),
+        _float(material.get("density")),
+        _float(material.get("thickness")),
+        *(_float(absorption.get(band)) for band in ABSORPTION_BANDS),
+        _float(material.get("damping")),
+        _float(material.get("decoupling")),
+    ]
+
+
+def material_coverages(materials: Sequence[Dict[str, Any]]) -> List[Tuple[str, float]]:
+    """(name, coverage) of each named material in a solution's material list"""
+    return [(material.get('name', ''), _float(material.get('coverage', DEFAULT_COVERAGE)))
+            for material in materials if material.get('name')]
+
+
+class MaterialTable:
+    """Read-only property rows of every material, indexed by interned material id"""
+
+    def __init__(self, materials: Sequence[Dict[str, Any]]):
+        self.source = materials
+        self.ids: Dict[str, int] = {}
+        rows = []
+        for material in materials:
+            name = material.get('name')
+            if name and name not in self.ids:
+                self.ids[name] = len(rows)
+                rows.append(material_row(material))
+        self.matrix = np.array(rows, dtype=float).reshape(len(rows), len(PROPERTY_COLUMNS))
+        self.matrix.flags.writeable = False
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update('\0'.join(self.ids).encode())
+        digest.update(self.matrix.tobytes())
+        self.fingerprint = digest.hexdigest()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def material_id(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+    def cache_key(self, materials: Sequence[Dict[str, Any]]) -> str:
+        """Cache key of a material list's aggregate: names, coverages and the table version"""
+        return build_cache_key("material_props", self.fingerprint, sorted(material_coverages(materials)))
+
+    def weights(self, materials: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, float]:
+        """Coverage per material id of a material list, and its total coverage"""
+        weights = np.zeros(len(self.ids))
+        total = 0.0
+        for name, coverage in material_coverages(materials):
+            material_id = self.ids.get(name)
+            if material_id is not None:
+                weights[material_id] += coverage
+            total += coverage
+        return weights, total
+
+    def aggregate_row(self, materials: Sequence[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Coverage-weighted property row of a material list, or None without coverage"""
+        weights, total = self.weights(materials)
+        if total <= 0:
+            return None
+        return weights @ self.matrix / total
+
+    def aggregate(self, materials: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Combined properties of a material list, as AcousticCalculator returns them"""
+        row = self.aggregate_row(materials)
+        return None if row is None else properties_dict(row)
+
+    def aggregate_batch(self, material_lists: Sequence[Sequence[Dict[str, Any]]]) -> np.ndarray:
+        """(lists, PROPERTY_COLUMNS) aggregates of many material lists in one matrix product
+
+        Rows without coverage are zero.
+        """
+        weights = np.zeros((len(material_lists), len(self.ids)))
+        totals = np.zeros(len(material_lists))
+        for i, materials in enumerate(material_lists):
+            weights[i], totals[i] = self.weights(materials)
+        aggregates = weights @ self.matrix
+        return np.divide(aggregates, totals[:, None], out=np.zeros_like(aggregates), where=totals[:, None] > 0)
+
+
+def properties_dict(row: np.ndarray) -> Dict[str, Any]:
+    """Aggregate row as the nested properties dict"""
+    values = dict(zip(PROPERTY_COLUMNS, (float(v) for v in row)))
+    return {
+        "stc": values["stc"],
+        "density": values["density"],
+        "thickness": values["thickness"],
+        "absorption": {band: values[f"absorption_{band}"] for band in ABSORPTION_BANDS},
+        "damping": values["damping"],
+        "decoupling": values["decoupling"],
+    }
+
+
+_material_table = None
+_material_table_lock = threading.Lock()
+
+
+def get_material_table() -> MaterialTable:
+    """Get the material table for the repository's current materials
+
+    The repository swaps in a new list when it reloads, so the table is
+    rebuilt exactly when the materials change.
+    """
+    global _material_table
+    materials = get_materials_repository().all()
+    table = _material_table
+    if table is None or table.source is not materials:
+        with _material_table_lock:
+            # Double-check locking pattern
+            table = _material_table
+            if table is None or table.source is not materials:
+                table = MaterialTable(materials)
+                _material_table = table
+                logger.info(f"Built material property table with {len(table)} materials")
+    return table
+
+
+def reset_material_table():
+    """Reset the material table for testing purposes"""
+    global _material_table
+    with _material_table_lock:
+        _material_table = None
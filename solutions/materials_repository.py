@@ -0,0 +1,161 @@
+"""
+In-memory materials table with hash indexes.
+
+The materials collection is loaded once per process and indexed by name,
+category and surface type, so lookups are dictionary hits with no network
+I/O. The table is reloaded when its TTL expires, when invalidate() bumps the
+version, or when the catalog snapshot is replaced with a newer one.
+
+Environment variables:
+    MATERIALS_REPOSITORY_TTL   Seconds before the table is reloaded (default: 3600)
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from solutions.database import get_all_materials_from_db, SOLUTION_COLLECTIONS
+from solutions.catalog_snapshot import get_catalog_snapshot
+
+logger = logging.getLogger(__name__)
+
+_materials_repository = None
+_materials_repository_lock = threading.Lock()
+
+
+def get_materials_repository():
+    """Get the global materials repository instance with thread safety"""
+    global _materials_repository
+    if _materials_repository is None:
+        with _materials_repository_lock:
+            # Double-check locking pattern
+            if _materials_repository is None:
+                _materials_repository = MaterialsRepository()
+    return _materials_repository
+
+
+def reset_materials_repository():
+    """Reset the materials repository instance for testing purposes"""
+    global _materials_repository
+    with _materials_repository_lock:
+        _materials_repository = None
+
+
+class MaterialsRepository:
+    """
+    Indexed, read-only view of the materials collection.
+
+    Records are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else int(os.getenv('MATERIALS_REPOSITORY_TTL', 3600))
+        self.version = 0
+        self._lock = threading.RLock()
+        self._loaded_version = None
+        self._loaded_at = 0.0
+        self._snapshot_fingerprint = None
+        self._materials: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_surface: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _current_snapshot_fingerprint(self) -> Optional[str]:
+        snapshot = get_catalog_snapshot()
+        return snapshot['fingerprint'] if snapshot else None
+
+    def _is_stale(self) -> bool:
+        if self._loaded_version != self.version:
+            return True
+        if self.ttl > 0 and time.time() - self._loaded_at >= self.ttl:
+            return True
+        return self._current_snapshot_fingerprint() != self._snapshot_fingerprint
+
+    def _ensure_loaded(self):
+        if self._is_stale():
+            with self._lock:
+                # Another thread may have reloaded while we waited
+                if self._is_stale():
+                    self.refresh()
+
+    def refresh(self) -> int:
+        """Reload the materials and rebuild all indexes. Returns the number of materials."""
+        with self._lock:
+            version = self.version
+            fingerprint = self._current_snapshot_fingerprint()
+            materials = get_all_materials_from_db()
+
+            by_name = {}
+            by_category = {}
+            for material in materials:
+                name = material.get('name')
+                if not name:
+                    continue
+                by_name[name] = material
+                by_category.setdefault(material.get('category', 'unknown'), []).append(material)
+
+            by_surface = self._build_surface_index(by_name)
+
+            # Swap in the new tables in one go so readers never see a partial index
+            self._materials, self._by_name = materials, by_name
+            self._by_category, self._by_surface = by_category, by_surface
+            # An empty load (e.g. MongoDB down with no snapshot) is retried on the next lookup
+            self._loaded_version = version if materials else None
+            self._loaded_at = time.time()
+            self._snapshot_fingerprint = fingerprint
+            logger.info(f"Indexed {len(by_name)} materials in {len(by_category)} categories")
+            return len(by_name)
+
+    def _build_surface_index(self, by_name: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Map surface type to the materials used by that surface's solutions"""
+        surface_names = {surface_type: set() for surface_type in SOLUTION_COLLECTIONS}
+
+        snapshot = get_catalog_snapshot()
+        if snapshot is not None:
+            for surface_type, docs in snapshot['solutions'].items():
+                for doc in docs.values():
+                    for material in doc.get('materials', []):
+                        name = material.get('name') if isinstance(material, dict) else material
+                        if name:
+                            surface_names.setdefault(surface_type, set()).add(name)
+
+        for name, material in by_name.items():
+            surface_type = material.get('surface_type')
+            if surface_type:
+                surface_names.setdefault(surface_type, set()).add(name)
+
+        return {
+            surface_type: [by_name[name] for name in sorted(names) if name in by_name]
+            for surface_type, names in surface_names.items()
+        }
+
+    def invalidate(self):
+        """Bump the version so the next lookup reloads the table"""
+        self.version += 1
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a material record by name"""
+        self._ensure_loaded()
+        return self._by_name.get(name)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get all material records in collection order"""
+        self._ensure_loaded()
+        return self._materials
+
+    def names(self) -> List[str]:
+        """Get the names of all materials"""
+        self._ensure_loaded()
+        return list(self._by_name)
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Get all materials in a category"""
+        self._ensure_loaded()
+        return self._by_category.get(category, [])
+
+    def by_surface(self, surface_type: str) -> List[Dict[str, Any]]:
+        """Get all materials used on a surface type ('walls' or 'ceilings')"""
+        self._ensure_loaded()
+        return self._by_surface.get(surface_type, [])
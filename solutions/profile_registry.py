@@ -0,0 +1,254 @@
+"""
+Registry of noise, room and material acoustic profiles.
+
+Noise profiles are preloaded from config.NOISE_PROFILES and overlaid with
+the MongoDB `noise` collection (documents with type "profile"), room
+profiles come from the same collection (type "room"), and material
+properties are read from the indexed MaterialsRepository. Lookups are
+dictionary hits; unknown types get a default profile that is not stored,
+and a failed load is retried instead of being kept for the process
+lifetime.
+
+The registry replaces per-method lru_cache memoisation on the acoustic
+calculator, which keyed on the calculator instance, outlived
+reset_acoustic_calculator() and cached error fallbacks forever.
+
+Environment variables:
+    PROFILE_REGISTRY_TTL   Seconds before the profiles are reloaded (default: 3600)
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from solutions.db_init import get_db
+from solutions.materials_repository import get_materials_repository
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a load that could not reach MongoDB is retried
+LOAD_RETRY_INTERVAL = 30
+
+DEFAULT_CRITICAL_BANDS = {"low": [100, 500], "mid": [500, 2000], "high": [2000, 8000]}
+
+
+@dataclass
+class MaterialProperties:
+    """Data class for material acoustic properties"""
+    stc: float = 0.0
+    density: float = 0.0
+    thickness: float = 0.0
+    absorption: Dict[str, float] = None
+    damping: float = 0.0
+    decoupling: float = 0.0
+
+    def __post_init__(self):
+        if self.absorption is None:
+            self.absorption = {"low": 0.0, "mid": 0.0, "high": 0.0}
+
+
+@dataclass
+class NoiseProfile:
+    """Data class for noise profiles"""
+    typical_frequency: List[float]
+    peak_frequency: float
+    critical_bands: Dict[str, List[float]]
+    description: str = ""
+
+
+@dataclass
+class RoomProfile:
+    """Data class for room acoustic properties"""
+    reflectivity: float = 0.5
+    absorption: float = 0.5
+    resonance: List[float] = None
+    reverberation: float = 0.5
+
+    def __post_init__(self):
+        if self.resonance is None:
+            self.resonance = [0.0, 0.0]
+
+
+def _noise_profile_from_config(noise_type: str, config: Dict[str, Any]) -> NoiseProfile:
+    typical = [float(f) for f in config.get("typical_frequency", [100, 1000])]
+    # The config gives a frequency range; its geometric centre stands in for the peak
+    peak = config.get("peak_frequency") or (math.sqrt(typical[0] * typical[-1]) if typical and min(typical) > 0 else 1000)
+    return NoiseProfile(
+        typical_frequency=typical,
+        peak_frequency=float(round(peak)),
+        critical_bands=config.get("critical_bands", DEFAULT_CRITICAL_BANDS),
+        description=config.get("description", ""),
+    )
+
+
+def _noise_profile_from_document(doc: Dict[str, Any]) -> NoiseProfile:
+    return NoiseProfile(
+        typical_frequency=doc.get("typical_frequency", [100, 8000]),
+        peak_frequency=float(doc.get("peak_frequency", 1000)),
+        critical_bands=doc.get("critical_bands", DEFAULT_CRITICAL_BANDS),
+        description=doc.get("description", ""),
+    )
+
+
+def _room_profile_from_document(doc: Dict[str, Any]) -> RoomProfile:
+    return RoomProfile(
+        reflectivity=float(doc.get("reflectivity", 0.5)),
+        absorption=float(doc.get("absorption", 0.5)),
+        resonance=doc.get("resonance", [100, 200]),
+        reverberation=float(doc.get("reverberation", 0.5)),
+    )
+
+
+def _material_properties_from_record(material: Dict[str, Any]) -> MaterialProperties:
+    return MaterialProperties(
+        stc=float(material.get("stc_rating", 0)),
+        density=float(material.get("density", 0)),
+        thickness=float(material.get("thickness", 0)),
+        absorption=dict(material.get("absorption") or {"low": 0, "mid": 0, "high": 0}),
+        damping=float(material.get("damping", 0)),
+        decoupling=float(material.get("decoupling", 0)),
+    )
+
+
+class ProfileRegistry:
+    """
+    Noise and room profiles keyed by type, plus material properties by name.
+
+    Profiles are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else int(os.getenv('PROFILE_REGISTRY_TTL', 3600))
+        self.version = 0
+        self._lock = threading.RLock()
+        self._loaded_version = None
+        self._expires_at = 0.0
+        self._noise: Dict[str, NoiseProfile] = {}
+        self._rooms: Dict[str, RoomProfile] = {}
+        self._warned = set()
+        self._stats_lock = threading.Lock()
+        self._stats = {kind: {"hits": 0, "misses": 0} for kind in ("noise", "room", "material")}
+
+    def _is_stale(self) -> bool:
+        if self._loaded_version != self.version:
+            return True
+        return self.ttl > 0 and time.time() >= self._expires_at
+
+    def _ensure_loaded(self):
+        if self._is_stale():
+            with self._lock:
+                # Another thread may have reloaded while we waited
+                if self._is_stale():
+                    self.refresh()
+
+    def refresh(self) -> int:
+        """Reload the profiles from the config and MongoDB. Returns the number of profiles."""
+        # solutions.config imports the acoustic calculator, which imports this module
+        from solutions.config import NOISE_PROFILES
+
+        with self._lock:
+            version = self.version
+            noise = {noise_type: _noise_profile_from_config(noise_type, config)
+                     for noise_type, config in NOISE_PROFILES.items()}
+            rooms = {}
+            retry = False
+            try:
+                db = get_db()
+                if db is not None:
+                    for doc in db.noise.find({"type": {"$in": ["profile", "room"]}}):
+                        if doc.get("type") == "profile" and doc.get("profile_id"):
+                            noise[doc["profile_id"]] = _noise_profile_from_document(doc)
+                        elif doc.get("type") == "room" and doc.get("room_type"):
+                            rooms[doc["room_type"]] = _room_profile_from_document(doc)
+                else:
+                    retry = True
+            except Exception as e:
+                logger.error(f"Error loading noise and room profiles from MongoDB: {e}")
+                retry = True
+
+            # Swap in the new tables in one go so readers never see a partial registry
+            self._noise, self._rooms = noise, rooms
+            self._warned = set()
+            self._loaded_version = version
+            # Without MongoDB the config profiles are served and the load retried soon
+            interval = min(self.ttl, LOAD_RETRY_INTERVAL) if retry and self.ttl > 0 else self.ttl
+            self._expires_at = time.time() + interval
+            logger.info(f"Loaded {len(noise)} noise profiles and {len(rooms)} room profiles")
+            return len(noise) + len(rooms)
+
+    def invalidate(self):
+        """Bump the version so the next lookup reloads the profiles"""
+        self.version += 1
+
+    def _count(self, kind: str, hit: bool):
+        with self._stats_lock:
+            self._stats[kind]["hits" if hit else "misses"] += 1
+
+    def _warn_once(self, key: str, message: str):
+        if key not in self._warned:
+            self._warned.add(key)
+            logger.warning(message)
+
+    def noise_profile(self, noise_type: str) -> NoiseProfile:
+        """Noise profile for a noise type, or a default profile for unknown types"""
+        self._ensure_loaded()
+        profile = self._noise.get(noise_type)
+        self._count("noise", profile is not None)
+        if profile is None:
+            self._warn_once(f"noise:{noise_type}", f"No noise profile found for {noise_type}")
+            return NoiseProfile(
+                typical_frequency=[100, 1000],
+                peak_frequency=500,
+                critical_bands={"low": [100, 250], "mid": [500, 1000], "high": [2000, 4000]},
+                description=f"Default profile for {noise_type} noise"
+            )
+        return profile
+
+    def room_profile(self, room_type: str) -> RoomProfile:
+        """Room profile for a room type, or the default profile for unknown types"""
+        self._ensure_loaded()
+        profile = self._rooms.get(room_type)
+        self._count("room", profile is not None)
+        return profile if profile is not None else RoomProfile()
+
+    def material_properties(self, material_name: str) -> MaterialProperties:
+        """Acoustic properties of a material, empty if it is unknown"""
+        material = get_materials_repository().get(material_name)
+        self._count("material", material is not None)
+        if material is None:
+            self._warn_once(f"material:{material_name}", f"No material properties found for {material_name}")
+            return MaterialProperties()
+        return _material_properties_from_record(material)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts per profile kind and the size of the registry"""
+        with self._stats_lock:
+            stats = {kind: dict(counts) for kind, counts in self._stats.items()}
+        stats.update(version=self.version, noise_profiles=len(self._noise), room_profiles=len(self._rooms))
+        return stats
+
+
+_profile_registry = None
+_profile_registry_lock = threading.Lock()
+
+
+def get_profile_registry() -> ProfileRegistry:
+    """Get the global profile registry instance with thread safety"""
+    global _profile_registry
+    if _profile_registry is None:
+        with _profile_registry_lock:
+            # Double-check locking pattern
+            if _profile_registry is None:
+                _profile_registry = ProfileRegistry()
+    return _profile_registry
+
+
+def reset_profile_registry():
+    """Reset the profile registry instance for testing purposes"""
+    global _profile_registry
+    with _profile_registry_lock:
+        _profile_registry = None
@@ -0,0 +1,209 @@
+"""
+Closed-form material quantities for wall and ceiling surfaces.
+
+Every solution class used to repeat the same ceil/spacing/wastage arithmetic
+on its own. This module holds that arithmetic once:
+
+1. Counting primitives (line_count, grid_count, extra_count, sheet_count,
+   channel_length, sealant_length) take scalars or numpy arrays of surface
+   dimensions in metres and return ints or int64 arrays.
+2. Material rules are read from config.SPECIAL_MATERIALS, WASTAGE_MATERIALS
+   and MATERIAL_COVERAGE: spacing-based materials are counted per spacing,
+   perimeter-based ones per metre of perimeter, minimum-quantity ones are
+   rounded up to their minimum, and everything else is area times units per
+   m², with 10% wastage for the wastage materials.
+3. bill_of_materials() applies the rules of a material list to many surfaces
+   at once and returns one quantity matrix, without per-surface dicts.
+
+Quantities are rounded up after discarding floating point noise, so an area
+of exactly ten clip spacings is ten clips and not eleven.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from solutions.config import CLIP_SPACING, MATERIAL_COVERAGE, SPECIAL_MATERIALS, WASTAGE_MATERIALS
+
+# 10% extra for cuts, corners and edges
+EXTRA_FACTOR = 0.1
+# 10% wastage on boards, insulation and sealant runs
+WASTAGE_FACTOR = 1.1
+# Furring channel rows are 400mm apart
+CHANNEL_SPACING = 0.4
+# Standard 1.2m x 2.4m plasterboard sheet
+SHEET_AREA = 2.88
+# Spacing used when a solution has no entry in CLIP_SPACING
+DEFAULT_CLIP_SPACING = CLIP_SPACING['genie_clip']
+# Quantities within this of a whole number are not rounded up past it
+QUANTITY_TOLERANCE = 1e-9
+
+RULE_PER_AREA = 0
+RULE_SPACING = 1
+RULE_PERIMETER = 2
+RULE_MINIMUM = 3
+
+
+def round_up(values):
+    """Round quantities up to whole units, as an int or an int64 array"""
+    counts = np.ceil(np.asarray(values, dtype=float) - QUANTITY_TOLERANCE)
+    if counts.ndim == 0:
+        return int(counts)
+    return counts.astype(np.int64)
+
+
+def perimeter(width, height):
+    """Perimeter of rectangular surfaces"""
+    total = 2 * (np.asarray(width, dtype=float) + np.asarray(height, dtype=float))
+    return float(total) if total.ndim == 0 else total
+
+
+def line_count(span, spacing: float):
+    """Parallel members (studs, bars, joists, channels) across a span"""
+    return round_up(np.asarray(span, dtype=float) / spacing)
+
+
+def grid_count(area, spacing: float):
+    """Fixings on a square grid of the given spacing (clips, panels)"""
+    return round_up(np.asarray(area, dtype=float) / (spacing * spacing))
+
+
+def extra_count(count, factor: float = EXTRA_FACTOR):
+    """Spare units ordered on top of a count"""
+    return round_up(np.asarray(count, dtype=float) * factor)
+
+
+def board_area(area, layers: int, wastage: float = WASTAGE_FACTOR):
+    """Board area in m² for a number of layers, including wastage"""
+    return area * layers * wastage
+
+
+def sheet_count(area, layers: int, sheet_area: float = SHEET_AREA):
+    """Whole plasterboard sheets for a number of layers, including wastage"""
+    return round_up(board_area(np.asarray(area, dtype=float), layers) / sheet_area)
+
+
+def channel_length(width, height, spacing: float = CHANNEL_SPACING):
+    """Metres of furring channel run across the width in rows up the height"""
+    rows = line_count(height, spacing)
+    return round_up(rows * np.asarray(width, dtype=float) * WASTAGE_FACTOR)
+
+
+def sealant_length(width, height):
+    """Metres of acoustic sealant around the perimeter, including wastage"""
+    return round_up(perimeter(width, height) * WASTAGE_FACTOR)
+
+
+def clip_spacing_for(code_name: str) -> float:
+    """Clip spacing in metres for a solution code name"""
+    return CLIP_SPACING.get(code_name.lower().replace(' ', '_'), DEFAULT_CLIP_SPACING)
+
+
+@dataclass(frozen=True)
+class MaterialRule:
+    """How the quantity of one material follows from a surface"""
+    kind: int
+    # Units per m² for per-area and minimum rules, spacing in metres for spacing rules
+    rate: float
+    wastage: float = 1.0
+    minimum: float = 0.0
+
+
+@lru_cache(maxsize=1024)
+def _material_rule(name: str, units_per_m2: Optional[float]) -> MaterialRule:
+    if units_per_m2 is None:
+        # MATERIAL_COVERAGE is the default when the solution data has no rate
+        coverage = MATERIAL_COVERAGE.get(name)
+        units_per_m2 = 1.0 / coverage if coverage else 1.0
+    special = SPECIAL_MATERIALS.get(name)
+    if special:
+        if "perimeter_based" in special:
+            return MaterialRule(RULE_PERIMETER, 1.0)
+        if "spacing" in special:
+            return MaterialRule(RULE_SPACING, float(special["spacing"]))
+        if "min_quantity" in special:
+            return MaterialRule(RULE_MINIMUM, float(units_per_m2), minimum=float(special["min_quantity"]))
+    wastage = WASTAGE_FACTOR if name in WASTAGE_MATERIALS else 1.0
+    return MaterialRule(RULE_PER_AREA, float(units_per_m2), wastage)
+
+
+def material_rule(material: Dict[str, Any]) -> MaterialRule:
+    """Quantity rule for a material record"""
+    units_per_m2 = material.get('unitsPerM2')
+    return _material_rule(material.get('name', ''), None if units_per_m2 is None else float(units_per_m2))
+
+
+def material_quantity(material: Dict[str, Any], area: float, surface_perimeter: float) -> int:
+    """Units of a material needed for one surface"""
+    rule = material_rule(material)
+    if rule.kind == RULE_PERIMETER:
+        return round_up(surface_perimeter)
+    if rule.kind == RULE_SPACING:
+        return round_up(area / rule.rate) if rule.rate > 0 else 0
+    quantity = round_up(area * rule.rate * rule.wastage)
+    return max(int(rule.minimum), quantity) if rule.kind == RULE_MINIMUM else quantity
+
+
+@dataclass
+class BillOfMaterials:
+    """Quantities of each material (rows) for each surface (columns)
+
+    quantities are whole units per surface; demand is the same before
+    rounding, for callers that round over several surfaces at once.
+    """
+    names: List[str]
+    units: List[Optional[str]]
+    unit_costs: np.ndarray
+    quantities: np.ndarray
+    demand: np.ndarray
+    minimum: np.ndarray
+
+    @property
+    def costs(self) -> np.ndarray:
+        """Cost of each material on each surface"""
+        return self.quantities * self.unit_costs[:, None]
+
+    def totals(self) -> Dict[str, int]:
+        """Units of each material over all surfaces"""
+        return dict(zip(self.names, self.quantities.sum(axis=1).tolist()))
+
+
+def bill_of_materials(materials: Sequence[Dict[str, Any]], widths, heights, perimeters=None,
+                      areas=None) -> BillOfMaterials:
+    """Quantities of every material for many surfaces in one pass
+
+    Args:
+        materials: Material records with name, unitsPerM2, unit and baseCost
+        widths: Surface widths in metres
+        heights: Surface heights in metres
+        perimeters: Perimeters to seal, defaults to the rectangle perimeters
+        areas: Areas to cover, defaults to width times height; pass net
+            areas for surfaces with openings
+    """
+    widths = np.atleast_1d(np.asarray(widths, dtype=float))
+    heights = np.atleast_1d(np.asarray(heights, dtype=float))
+    areas = widths * heights if areas is None else np.atleast_1d(np.asarray(areas, dtype=float))
+    perimeters = perimeter(widths, heights) if perimeters is None else np.atleast_1d(np.asarray(perimeters, dtype=float))
+
+    rules = [material_rule(material) for material in materials]
+    kinds = np.array([rule.kind for rule in rules], dtype=np.int64)[:, None]
+    rates = np.array([rule.rate for rule in rules], dtype=float)[:, None]
+    wastage = np.array([rule.wastage for rule in rules], dtype=float)[:, None]
+    minimum = np.array([rule.minimum for rule in rules], dtype=float)[:, None]
+
+    per_area = areas * rates * wastage
+    per_spacing = areas / np.where(rates > 0, rates, np.inf)
+    demand = np.where(kinds == RULE_PERIMETER, perimeters, np.where(kinds == RULE_SPACING, per_spacing, per_area))
+    demand = demand.reshape(len(rules), len(areas))
+    quantities = np.maximum(round_up(demand), minimum.astype(np.int64))
+
+    return BillOfMaterials(
+        names=[material.get('name', '') for material in materials],
+        units=[material.get('unit') for material in materials],
+        unit_costs=np.array([float(material.get('baseCost', 0)) for material in materials], dtype=float),
+        quantities=quantities,
+        demand=demand,
+        minimum=minimum[:, 0],
+    )
@@ -0,0 +1,265 @@
+"""
+Vectorised scoring kernel for rank_solutions.
+
+Each candidate solution becomes one row of a feature matrix (STC, band
+absorption, damping, decoupling, installation complexity, cost per m²),
+and all rows are scored against the noise/room context in a single NumPy
+pass. The scoring rules are the same as the per-solution loop they
+replace:
+
+    sound reduction   0-30   min(30, stc / needed_reduction * 30)
+    room acoustics    0-25   min(25, mean absorption * room factor * 15
+                                     + damping * 10 * resonance factor)
+    budget            0-10   (budget - cost) / budget * 10 when within budget
+    complexity        0-10   (10 - complexity) / 10 * 8, +2 if requirements are met
+
+The room acoustics term needs a room profile and non-zero damping. With the
+room's dimensions the resonance factor is 1 + 0.5 x the share of the noise's
+frequency range that falls on sparse room modes (room_acoustics); without
+them, 1.5 if a typical noise frequency lies in the profile's static
+resonance band.
+
+The first two terms depend only on the room and the noise (score_acoustics),
+the last two on the user's constraints (score_constraints), so a change of
+budget or requirements can re-weight cached acoustic scores.
+
+score_upper_bounds() gives, without the room areas or the requirement
+check, a score no candidate can exceed; rankers that only need the top k
+use it to skip candidates that cannot make the cut.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FEATURES = (
+    "stc",
+    "absorption_low",
+    "absorption_mid",
+    "absorption_high",
+    "damping",
+    "decoupling",
+    "complexity",
+    "cost_per_m2",
+)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURES)}
+ABSORPTION_COLUMNS = [FEATURE_INDEX[f"absorption_{band}"] for band in ("low", "mid", "high")]
+
+DEFAULT_COMPLEXITY = 5
+
+# Maximum of each score component; complexity is 8 for the simplest
+# installation plus REQUIREMENTS_BONUS
+SCORE_CAPS = {
+    "reduction": 30.0,
+    "room_acoustics": 25.0,
+    "budget": 10.0,
+    "complexity": 10.0,
+}
+REQUIREMENTS_BONUS = 2.0
+
+
+@dataclass
+class RankingContext:
+    """The noise/room side of the scoring, shared by every candidate"""
+    needed_reduction: float
+    room_factor: float = 1.0
+    resonance_factor: float = 1.0
+    has_room_profile: bool = False
+    budget: Optional[float] = None
+    special_requirements: List[str] = field(default_factory=list)
+    # RoomAcousticsModel.to_dict() of the room, when its dimensions are known
+    room_acoustics: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class RankingCandidates:
+    """Solutions resolved to their characteristics and dimension-independent feature rows.
+
+    Built once (by prepare_ranking_candidates() or the solution feature
+    store) and reusable across any number of rooms with
+    rank_prepared_solutions().
+    """
+    solutions: List[Any]
+    solution_data: List[Dict[str, Any]]
+    features: np.ndarray
+    _fingerprint: Optional[str] = field(default=None, repr=False, compare=False)
+
+    def __len__(self):
+        return len(self.solutions)
+
+    def fingerprint(self) -> str:
+        """Digest of the solution ids and feature rows, identifying these candidates in cache keys"""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for data in self.solution_data:
+                digest.update(str(data.get('solution_id', data.get('solution', ''))).encode())
+                digest.update(b'\0')
+            digest.update(np.ascontiguousarray(self.features, dtype=np.float64).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+
+def build_ranking_context(needed_reduction: float, room_profile=None, noise_characteristics=None,
+                          budget_constraints: Optional[Dict[str, float]] = None,
+                          special_requirements: Optional[List[str]] = None,
+                          room_acoustics=None) -> RankingContext:
+    """Reduce the room profile, noise profile and budget to the scalars the kernel needs
+
+    room_acoustics is the room's RoomAcousticsModel; without it the room
+    profile's static resonance band is used.
+    """
+    room_factor = 1.0
+    resonance_factor = 1.0
+    if room_profile is not None:
+        room_factor = 1 + (room_profile.reflectivity * 0.5)
+        frequencies = np.asarray(noise_characteristics.typical_frequency if noise_characteristics is not None else [],
+                                 dtype=float)
+        if room_acoustics is not None and frequencies.size:
+            # Damping counts for more the more of the noise falls on sparse room modes
+            resonance_factor = 1 + 0.5 * room_acoustics.modal_exposure(frequencies.min(), frequencies.max())
+        elif room_profile.resonance and frequencies.size:
+            # A noise frequency inside the room's resonance band makes damping count for more
+            low, high = int(room_profile.resonance[0]), int(room_profile.resonance[1])
+            if np.any((frequencies >= low) & (frequencies < high)):
+                resonance_factor = 1.5
+    budget = None
+    if budget_constraints and budget_constraints.get('budget'):
+        budget = float(budget_constraints['budget'])
+    return RankingContext(
+        needed_reduction=float(needed_reduction or 0),
+        room_factor=room_factor,
+        resonance_factor=resonance_factor,
+        has_room_profile=room_profile is not None,
+        budget=budget,
+        special_requirements=list(special_requirements or []),
+        room_acoustics=room_acoustics.to_dict() if room_acoustics is not None and room_profile is not None else None,
+    )
+
+
+def _material_cost_per_m2(materials: List[Any]) -> float:
+    """Cost per m² of a solution: material costs weighted by their coverage (percent)"""
+    total = 0.0
+    for material in materials:
+        if not isinstance(material, dict):
+            continue
+        try:
+            cost = float(material.get('cost_per_m2', material.get('cost', 0)) or 0)
+            coverage = float(material.get('coverage', 100))
+        except (TypeError, ValueError):
+            continue
+        total += cost * coverage / 100
+    return total
+
+
+def feature_row(solution_data: Dict[str, Any], material_props: Dict[str, Any]) -> List[float]:
+    """Build one feature row from a solution's characteristics and combined material properties.
+
+    Raises ValueError if the STC rating is missing or invalid.
+    """
+    stc = material_props.get('stc', 0)
+    if isinstance(stc, bool) or not isinstance(stc, (int, float)) or stc < 0:
+        raise ValueError(f"Invalid STC rating: {stc}")
+    absorption = material_props.get('absorption') or {}
+    if 'cost_per_m2' in solution_data:
+        cost_per_m2 = float(solution_data['cost_per_m2'])
+    else:
+        cost_per_m2 = _material_cost_per_m2(solution_data.get('materials', []))
+    return [
+        float(stc),
+        float(absorption.get('low', 0)),
+        float(absorption.get('mid', 0)),
+        float(absorption.get('high', 0)),
+        float(material_props.get('damping', 0) or 0),
+        float(material_props.get('decoupling', 0) or 0),
+        float(solution_data.get('installation_complexity', DEFAULT_COMPLEXITY)),
+        cost_per_m2,
+    ]
+
+
+def score_acoustics(features: np.ndarray, context: RankingContext) -> Dict[str, np.ndarray]:
+    """The room-dependent, constraint-independent components: sound reduction and room acoustics"""
+    n = features.shape[0]
+    stc = features[:, FEATURE_INDEX["stc"]]
+    damping = features[:, FEATURE_INDEX["damping"]]
+
+    if context.needed_reduction > 0:
+        reduction = np.where(stc > 0, np.minimum(SCORE_CAPS["reduction"], stc / context.needed_reduction * SCORE_CAPS["reduction"]), 0.0)
+    else:
+        reduction = np.zeros(n)
+
+    if context.has_room_profile:
+        absorption_score = features[:, ABSORPTION_COLUMNS].mean(axis=1) * context.room_factor * 15.0
+        damping_score = damping * 10.0 * context.resonance_factor
+        room_acoustics = np.where(damping != 0, np.minimum(SCORE_CAPS["room_acoustics"], absorption_score + damping_score), 0.0)
+    else:
+        room_acoustics = np.zeros(n)
+
+    return {"reduction": reduction, "room_acoustics": room_acoustics}
+
+
+def score_constraints(features: np.ndarray, context: RankingContext, areas: Optional[np.ndarray] = None,
+                      meets_requirements: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """The components driven by the user's constraints: budget, complexity and special requirements"""
+    n = features.shape[0]
+    estimated_cost = features[:, FEATURE_INDEX["cost_per_m2"]] * (areas if areas is not None else 0.0)
+    if context.budget:
+        budget_score = np.where(estimated_cost <= context.budget,
+                                (context.budget - estimated_cost) / context.budget * SCORE_CAPS["budget"], 0.0)
+    else:
+        budget_score = np.zeros(n)
+
+    complexity = (10.0 - features[:, FEATURE_INDEX["complexity"]]) / 10.0 * 8.0
+    if context.special_requirements and meets_requirements is not None:
+        complexity = complexity + np.where(meets_requirements, REQUIREMENTS_BONUS, 0.0)
+
+    return {"budget": budget_score, "complexity": complexity, "estimated_cost": estimated_cost}
+
+
+def combine_scores(acoustics: Dict[str, np.ndarray], constraints: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Merge the two stages into the components plus the total 'score'"""
+    return {
+        **acoustics,
+        **constraints,
+        "score": acoustics["reduction"] + acoustics["room_acoustics"] + constraints["budget"] + constraints["complexity"],
+    }
+
+
+def score_features(features: np.ndarray, context: RankingContext, areas: Optional[np.ndarray] = None,
+                   meets_requirements: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Score every row of a feature matrix against the context.
+
+    Args:
+        features: (n, len(FEATURES)) matrix built from feature_row()
+        context: Scalars from build_ranking_context()
+        areas: Treated area in m² per row, used to estimate cost against the budget
+        meets_requirements: Boolean per row, True if the solution has every special requirement
+
+    Returns:
+        Dict of per-row arrays: the score components, 'estimated_cost' and 'score'
+    """
+    return combine_scores(score_acoustics(features, context),
+                          score_constraints(features, context, areas, meets_requirements))
+
+
+def score_upper_bounds(features: np.ndarray, context: RankingContext) -> np.ndarray:
+    """Highest score each row can reach in any room, without areas or requirements.
+
+    The reduction, room acoustics and complexity base terms do not depend on
+    the room's areas, so they are exact; the budget term is taken at its cap
+    (zero cost) and the requirements bonus is assumed met.
+    """
+    # With no areas the estimated cost is zero, which scores the budget cap
+    bounds = score_features(features, context)["score"]
+    if context.special_requirements:
+        bounds = bounds + REQUIREMENTS_BONUS
+    return bounds
+
+
+def rank_order(scores: np.ndarray) -> np.ndarray:
+    """Row indices from highest to lowest score; ties keep their input order"""
+    return np.argsort(-scores, kind="stable")
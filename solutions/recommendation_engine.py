@@ -1,12 +1,23 @@
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
+import heapq
 import logging
+from datetime import datetime
+import numpy as np
 from solutions.solution_mapping_new import SolutionMapping
-from solutions.cost_calculator import calculate_solution_costs
 from solutions.cache_manager import get_cache_manager, CacheManager
+from solutions.cache_keys import build_cache_key
+from solutions.ranking_kernel import (
+    FEATURES, FEATURE_INDEX, RankingCandidates, RankingContext, build_ranking_context, feature_row, score_features,
+    score_acoustics, score_constraints, combine_scores, score_upper_bounds, rank_order
+)
 from solutions.acoustic_calculator import get_acoustic_calculator
-from solutions.database import get_db
+from solutions.composite_tl import composite_results, opening_mix, surface_blockages
+from solutions.room_acoustics import room_acoustics_model
+from solutions.spectrum import solution_transmission_loss
+from solutions.recommendation_pipeline import get_recommendation_pipeline
+from solutions.db_init import get_db
 
 from solutions.material_properties import get_material_properties
 from solutions.solutions import get_solutions_manager
@@ -22,6 +33,10 @@ logger.debug("recommendation_engine.py loaded")
 # Get SOLUTION_TYPES from SolutionMapping class
 SOLUTION_TYPES = SolutionMapping.SOLUTION_TYPES
 
+# Solutions recommended as primary per surface; the rest are alternatives
+PRIMARY_SOLUTIONS = {'walls': 2}
+DEFAULT_PRIMARY_SOLUTIONS = 1
+
 
 
 class NoiseType(Enum):
@@ -43,8 +58,11 @@ class RoomProfile:
     surfaces: Optional[List[str]] = None
     blockages: Optional[Dict[str, List[Dict]]] = None
     surface_features: Optional[Dict[str, List[str]]] = None
+    budget_constraints: Optional[Dict[str, float]] = None
+    special_requirements: Optional[List[str]] = None
+    priority_surfaces: Optional[List[str]] = None
 
-    def __init__(self, length: float = 10.0, width: float = 10.0, height: float = 10.0, room_type: Optional[str] = None, dimensions: Optional[Dict[str, float]] = None, blockages: Optional[Dict[str, List[Dict]]] = None, surface_features: Optional[Dict[str, List[str]]] = None, surfaces: Optional[List[str]] = None, **kwargs):
+    def __init__(self, length: float = 10.0, width: float = 10.0, height: float = 10.0, room_type: Optional[str] = None, dimensions: Optional[Dict[str, float]] = None, blockages: Optional[Dict[str, List[Dict]]] = None, surface_features: Optional[Dict[str, List[str]]] = None, surfaces: Optional[List[str]] = None, budget_constraints: Optional[Dict[str, float]] = None, special_requirements: Optional[List[str]] = None, priority_surfaces: Optional[List[str]] = None, **kwargs):
         if dimensions is not None:
             self.length = dimensions.get('length', length)
             self.width = dimensions.get('width', width)
@@ -57,6 +75,9 @@ class RoomProfile:
         self.blockages = blockages if blockages is not None else {}
         self.surface_features = surface_features if surface_features is not None else {}
         self.surfaces = surfaces if surfaces is not None else ["walls", "ceiling", "floor"]
+        self.budget_constraints = budget_constraints
+        self.special_requirements = special_requirements
+        self.priority_surfaces = priority_surfaces
         self.__post_init__()
 
     @property
@@ -111,6 +132,8 @@ class RoomInputs:
     budget_constraints: Optional[Dict[str, float]] = None
     priority_surfaces: Optional[List[str]] = None
     special_requirements: Optional[List[str]] = None
+    # Openings per surface ("walls", a wall direction, "ceiling", "floor")
+    blockages: Optional[Dict[str, List[Dict]]] = None
 
 @dataclass
 class NoiseProfile:
@@ -186,148 +209,322 @@ def get_noise_type_reasoning(noise_type: str) -> str:
     }
     return reasonings.get(noise_type, 'General purpose noise reduction')
 
-def rank_solutions(solutions: List[Dict], inputs: RoomInputs, noise_profile: NoiseProfile) -> List[Dict]:
-    """Rank solutions based on acoustic effectiveness, cost, compatibility and room acoustics."""
+def _solution_surface_area(solution_data: Dict, inputs: RoomInputs) -> float:
+    """Treated area in m² for a solution, from surface_areas or the room dimensions"""
+    surface_type = solution_data.get('surface_type') or solution_data.get('type', '')
+    surface_areas = inputs.surface_areas or {}
+    for key in (surface_type, surface_type.rstrip('s'), f"{surface_type.rstrip('s')}s"):
+        if key and key in surface_areas:
+            return float(surface_areas[key])
+    dims = inputs.room_dimensions or {}
+    length, width, height = (float(dims.get(k, 0) or 0) for k in ('length', 'width', 'height'))
+    if surface_type.startswith('wall'):
+        return 2 * (length + width) * height
+    if surface_type.startswith(('ceiling', 'floor')):
+        return length * width
+    return length * height
+
+def _resolve_solution_data(solution, solutions_manager) -> Optional[Dict]:
+    """Characteristics for a solution given as a dict, a solution instance or a solution id"""
+    if isinstance(solution, dict):
+        return solution
+    if hasattr(solution, 'get_characteristics'):
+        return solution.get_characteristics()
+    return solutions_manager.get_solution_characteristics(solution)
+
+def prepare_ranking_candidates(solutions: List[Any], solutions_manager=None, acoustic_calculator=None) -> RankingCandidates:
+    """Resolve solutions to characteristics and build their feature rows, dropping unusable ones"""
+    solutions_manager = solutions_manager or get_solutions_manager()
+    acoustic_calculator = acoustic_calculator or get_acoustic_calculator()
+    kept, kept_data, rows = [], [], []
+    for solution in solutions:
+        try:
+            solution_data = _resolve_solution_data(solution, solutions_manager)
+            if not solution_data:
+                continue
+            material_props = acoustic_calculator.calculate_material_properties(solution_data.get('materials', []))
+            if not material_props:
+                continue
+            rows.append(feature_row(solution_data, material_props))
+        except ValueError as ve:
+            logger.warning(f"Validation error in solution {solution}: {str(ve)}")
+            continue
+        except TypeError as te:
+            logger.error(f"Type error in solution {solution}: {str(te)}")
+            continue
+        except Exception as e:
+            logger.error(f"Unexpected error ranking solution {solution}: {str(e)}")
+            logger.debug(f"Error details: {e.__class__.__name__}, {str(e)}", exc_info=True)
+            continue
+        kept.append(solution)
+        kept_data.append(solution_data)
+    features = np.array(rows, dtype=float) if rows else np.empty((0, len(FEATURES)))
+    return RankingCandidates(kept, kept_data, features)
+
+@dataclass
+class RoomAcoustics:
+    """Constraint-independent stage of ranking candidates for one room and noise.
+
+    Holds each usable candidate's acoustic profile, treated area and
+    acoustic score components (sound reduction, room acoustics). It is
+    cached, so a request that only changes the budget or special
+    requirements re-weights it instead of redoing the acoustic work.
+    """
+    rows: List[int]
+    acoustic_profiles: List[Any]
+    areas: np.ndarray
+    scores: Dict[str, np.ndarray]
+
+def _with_opening_losses(candidates: RankingCandidates, inputs: RoomInputs, cache_manager=None) -> RankingCandidates:
+    """Candidates with each STC lowered by what the room's openings cost it
+
+    The treated surface and its doors, windows and other openings are
+    combined into a composite TL; the STC lost to the openings comes off
+    the candidate's STC feature, so the sound reduction score reflects
+    the weakest path.
+    """
+    if not inputs.blockages or not len(candidates):
+        return candidates
+    stc_column = FEATURE_INDEX["stc"]
+    rows, surfaces = [], []
+    for i, solution_data in enumerate(candidates.solution_data):
+        surface_type = solution_data.get('surface_type') or solution_data.get('type', '')
+        mix = opening_mix(surface_blockages(inputs.blockages, surface_type), surface_type,
+                          _solution_surface_area(solution_data, inputs))
+        if mix:
+            rows.append(i)
+            surfaces.append((solution_transmission_loss(solution_data, candidates.features[i, stc_column]), mix))
+    if not rows:
+        return candidates
+    losses = np.array([result.stc_loss for result in composite_results(surfaces, cache_manager)], dtype=float)
+    features = np.array(candidates.features, dtype=float)
+    features[rows, stc_column] = np.maximum(features[rows, stc_column] - losses, 0.0)
+    features.flags.writeable = False
+    return RankingCandidates(candidates.solutions, candidates.solution_data, features)
+
+def _room_acoustics_key(candidates: RankingCandidates, inputs: RoomInputs, context: RankingContext) -> str:
+    """Cache key of the acoustic stage: the candidates, the room and the noise, but no constraints"""
+    return build_cache_key("room_acoustics", candidates.fingerprint(),
+                           needed_reduction=context.needed_reduction,
+                           room_factor=context.room_factor,
+                           resonance_factor=context.resonance_factor,
+                           has_room_profile=context.has_room_profile,
+                           dimensions=inputs.room_dimensions,
+                           surface_areas=inputs.surface_areas)
+
+def _room_acoustic_inputs(candidates: RankingCandidates, i: int, inputs: RoomInputs,
+                          acoustic_calculator) -> Optional[Tuple[Any, float]]:
+    """Acoustic profile and treated area of candidate i for this room, or None to drop it"""
+    solution_data = candidates.solution_data[i]
+    solution_id = solution_data.get('solution_id', solution_data.get('solution', 'unknown'))
+    try:
+        acoustic_profile = acoustic_calculator.calculate_properties(solution_id, inputs.room_dimensions)
+    except Exception as e:
+        logger.error(f"Unexpected error ranking solution {candidates.solutions[i]}: {str(e)}")
+        return None
+    if not acoustic_profile:
+        return None
+    return acoustic_profile, _solution_surface_area(solution_data, inputs)
+
+def _evaluate_rooms(candidates: RankingCandidates, rows: List[int], inputs: RoomInputs,
+                    acoustic_calculator, pipeline=None) -> List[Optional[Tuple[Any, float]]]:
+    """_room_acoustic_inputs() for each row, on the pipeline's solution pool if one is given"""
+    def evaluate(i):
+        return _room_acoustic_inputs(candidates, i, inputs, acoustic_calculator)
+    if pipeline is not None:
+        return pipeline.map_solutions(evaluate, rows)
+    return [evaluate(i) for i in rows]
+
+def _meets_requirements(candidates: RankingCandidates, rows: List[int], context: RankingContext) -> np.ndarray:
+    """Per row, True if the solution lists every special requirement among its features"""
+    return np.array([all(req in candidates.solution_data[i].get('features', []) for req in context.special_requirements)
+                     for i in rows], dtype=bool)
+
+def compute_room_acoustics(candidates: RankingCandidates, inputs: RoomInputs, context: RankingContext,
+                           acoustic_calculator, pipeline=None) -> RoomAcoustics:
+    """Run the acoustic stage for every candidate"""
+    rooms = _evaluate_rooms(candidates, list(range(len(candidates))), inputs, acoustic_calculator, pipeline)
+    rows = [i for i, room in enumerate(rooms) if room is not None]
+    rooms = [room for room in rooms if room is not None]
+    return RoomAcoustics(
+        rows=rows,
+        acoustic_profiles=[room[0] for room in rooms],
+        areas=np.array([room[1] for room in rooms], dtype=float),
+        scores=score_acoustics(candidates.features[rows], context),
+    )
+
+def _top_k_rows(candidates: RankingCandidates, k: int, inputs: RoomInputs, context: RankingContext,
+                acoustic_calculator, pipeline=None) -> Tuple[List[int], List[Tuple[Any, float]]]:
+    """The k best usable rows, visited in order of their score upper bounds.
+
+    Rows whose upper bound cannot beat the current k-th best score are never
+    looked at, so their acoustic profiles are not calculated. With a
+    pipeline, rows are evaluated a batch of pipeline.solution_workers at a time.
+    """
+    bounds = score_upper_bounds(candidates.features, context)
+    pending = [(-bound, i) for i, bound in enumerate(bounds.tolist())]
+    heapq.heapify(pending)
+    batch_size = max(1, pipeline.solution_workers) if pipeline is not None else 1
+    # Min-heap of the best rows so far: (score, -row, room inputs); the root is the one to beat
+    best = []
+    while pending:
+        batch = []
+        while pending and len(batch) < batch_size:
+            # A row scores at most its bound, which can still round up by half a cent
+            if len(best) == k and -pending[0][0] < best[0][0] - 0.005:
+                pending = []
+                break
+            batch.append(heapq.heappop(pending)[1])
+        rooms = _evaluate_rooms(candidates, batch, inputs, acoustic_calculator, pipeline)
+        rows = [i for i, room in zip(batch, rooms) if room is not None]
+        if not rows:
+            continue
+        rooms = [room for room in rooms if room is not None]
+        scores = np.round(score_features(candidates.features[rows], context,
+                                         areas=np.array([room[1] for room in rooms], dtype=float),
+                                         meets_requirements=_meets_requirements(candidates, rows, context))["score"], 2)
+        for i, score, room in zip(rows, scores.tolist(), rooms):
+            entry = (score, -i, room)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[:2] > best[0][:2]:
+                heapq.heapreplace(best, entry)
+    best.sort(key=lambda entry: entry[:2], reverse=True)
+    return [-entry[1] for entry in best], [entry[2] for entry in best]
+
+def resolve_ranking_context(inputs: RoomInputs, noise_profile: NoiseProfile, acoustic_calculator=None) -> RankingContext:
+    """Resolve the room and noise profiles of a request into its ranking context
+
+    Resolve once per request and pass the context to rank_prepared_solutions()
+    for every surface ranked for the same room.
+    """
+    acoustic_calculator = acoustic_calculator or get_acoustic_calculator()
+    
+    # Get room profile for acoustic calculations
+    room_profile = acoustic_calculator.get_room_profile(inputs.room_type) if inputs.room_type else None
+    
+    # Get noise profile characteristics
+    noise_characteristics = acoustic_calculator.get_noise_profile(noise_profile.type)
+    
+    # Modes and RT60 from the actual dimensions, shared by every room in the same dimension bucket
+    room_acoustics = room_acoustics_model(inputs.room_dimensions or {},
+                                          getattr(room_profile, 'absorption', None)) if room_profile else None
+    
+    context = build_ranking_context(inputs.noise_level, room_profile, noise_characteristics,
+                                    inputs.budget_constraints, inputs.special_requirements, room_acoustics)
+    if context.needed_reduction <= 0:
+        logger.warning(f"Invalid reduction calculation parameters: needed={inputs.noise_level}")
+    return context
+
+def rank_prepared_solutions(candidates: RankingCandidates, inputs: RoomInputs, noise_profile: NoiseProfile,
+                            acoustic_calculator=None, top_k: Optional[int] = None, pipeline=None,
+                            cache_manager=None, context: Optional[RankingContext] = None) -> List[Dict]:
+    """Rank prepared candidates for one room and noise profile
+
+    Ranking runs in two stages. The acoustic stage (profiles, areas, sound
+    reduction and room acoustics scores) is cached per candidates, room and
+    noise; the budget, complexity and requirements are applied on top of it
+    on every call, so changing only those constraints is cheap.
+
+    Args:
+        candidates: Candidates from prepare_ranking_candidates() or the solution feature store
+        inputs: The room being treated
+        noise_profile: The noise to reduce
+        acoustic_calculator: Calculator to use, defaults to the shared one
+        top_k: Return only the k best solutions. Without a cached acoustic
+            stage, candidates that cannot reach the top k are skipped.
+            None ranks every candidate.
+        pipeline: RecommendationPipeline to look up the candidates' acoustic
+            profiles concurrently; None looks them up one after another.
+        cache_manager: Cache for the acoustic stage, defaults to the shared one
+        context: Context from resolve_ranking_context() for these inputs and
+            noise profile; None resolves it here.
+
+    Openings in inputs.blockages lower each candidate's STC to that of the
+    composite surface before scoring.
+    """
+    acoustic_calculator = acoustic_calculator or get_acoustic_calculator()
+    cache_manager = cache_manager or get_cache_manager()
+    if context is None:
+        context = resolve_ranking_context(inputs, noise_profile, acoustic_calculator)
+    if top_k is not None and top_k <= 0:
+        return []
+    # Openings change the STC features, and with them the candidates' fingerprint
+    candidates = _with_opening_losses(candidates, inputs, cache_manager)
+    
+    acoustics_key = _room_acoustics_key(candidates, inputs, context)
+    acoustics = cache_manager.get(acoustics_key)
+    if acoustics is None and top_k is not None:
+        # Nothing to re-weight: only evaluate the candidates that can reach the top k
+        rows, rooms = _top_k_rows(candidates, top_k, inputs, context, acoustic_calculator, pipeline)
+        acoustic_profiles = [room[0] for room in rooms]
+        scored = score_features(candidates.features[rows], context,
+                                areas=np.array([room[1] for room in rooms], dtype=float),
+                                meets_requirements=_meets_requirements(candidates, rows, context))
+    else:
+        if acoustics is None:
+            acoustics = cache_manager.get_or_compute(
+                acoustics_key,
+                lambda: compute_room_acoustics(candidates, inputs, context, acoustic_calculator, pipeline))
+        rows, acoustic_profiles = acoustics.rows, acoustics.acoustic_profiles
+        scored = combine_scores(acoustics.scores, score_constraints(
+            candidates.features[rows], context, acoustics.areas, _meets_requirements(candidates, rows, context)))
+    
+    if not rows:
+        return []
+    
+    scores = np.round(scored["score"], 2)
+    
+    ranked = []
+    for j in rank_order(scores)[:top_k]:
+        i = rows[j]
+        solution_data = candidates.solution_data[i]
+        acoustic_profile = acoustic_profiles[j]
+        ranked.append({
+            "solution": candidates.solutions[i],
+            "score": float(scores[j]),
+            "details": {
+                **(solution_data.to_dict() if hasattr(solution_data, 'to_dict') and not isinstance(solution_data, dict) else solution_data),
+                "acoustic_profile": acoustic_profile if isinstance(acoustic_profile, dict) else (acoustic_profile.__dict__ if hasattr(acoustic_profile, '__dict__') else None),
+                "frequency_match": 0,
+                "estimated_cost": round(float(scored["estimated_cost"][j]), 2) if context.budget else None,
+                "complexity_score": round(float(scored["complexity"][j]), 1),
+                "room_acoustics": {
+                    "reflectivity_factor": round(context.room_factor, 2),
+                    "resonance_factor": round(context.resonance_factor, 2),
+                    **(context.room_acoustics or {})
+                }
+            }
+        })
+    return ranked
+
+def rank_solutions(solutions: List[Dict], inputs: RoomInputs, noise_profile: NoiseProfile,
+                   top_k: Optional[int] = None) -> List[Dict]:
+    """Rank solutions based on acoustic effectiveness, cost, compatibility and room acoustics.
+
+    Candidates are packed into a feature matrix and scored in one vectorised
+    pass; see solutions.ranking_kernel for the scoring rules. With top_k only
+    the k best solutions are returned.
+    """
     if not solutions or not inputs or not noise_profile:
         logger.error("Invalid input parameters for solution ranking")
         raise ValueError("Missing required parameters for solution ranking")
 
-    ranked = []
-    needed_reduction = inputs.noise_level
     try:
         solutions_manager = get_solutions_manager()
         acoustic_calculator = get_acoustic_calculator()
         if not solutions_manager or not acoustic_calculator:
             logger.error("Failed to initialize core components for solution ranking")
             raise RuntimeError("Core components initialization failed")
-        
-        # Get room profile for acoustic calculations
-        room_profile = acoustic_calculator.get_room_profile(inputs.room_type) if inputs.room_type else None
-        
-        # Get noise profile characteristics
-        noise_characteristics = acoustic_calculator.get_noise_profile(noise_profile.type)
+        candidates = prepare_ranking_candidates(solutions, solutions_manager, acoustic_calculator)
+        return rank_prepared_solutions(candidates, inputs, noise_profile, acoustic_calculator, top_k=top_k)
     except RuntimeError as re:
         logger.error(f"Runtime error during initialization: {str(re)}")
         return []
     except Exception as e:
-        logger.error(f"Unexpected error during initialization: {str(e)}")
+        logger.error(f"Unexpected error ranking solutions: {str(e)}")
         logger.debug(f"Error details: {e.__class__.__name__}, {str(e)}", exc_info=True)
         return []
-    
-    for solution in solutions:
-        try:
-            score = 0
-            if isinstance(solution, dict):
-                solution_data = solution
-            else:
-                # Get characteristics from solutions manager
-                pass
-            solution_data = solutions_manager.get_solution_characteristics(solution)
-            
-            if solution_data and acoustic_calculator:
-                # Get acoustic profile and material properties
-                solution_id = solution_data.get('solution_id', solution_data.get('solution', 'unknown'))
-                dimensions = inputs.room_dimensions
-                acoustic_profile = acoustic_calculator.calculate_properties(solution_id, dimensions)
-                material_props = acoustic_calculator.calculate_material_properties(solution_data.get('materials', []))
-                
-                if acoustic_profile and material_props:
-                    # Validate and score based on sound reduction needs (0-30 points)
-                    stc_rating = material_props.get('stc', 0)
-                    if not isinstance(stc_rating, (int, float)) or stc_rating < 0:
-                        logger.warning(f"Invalid STC rating for solution {solution}: {stc_rating}")
-                        continue
-                    
-                    if stc_rating > 0 and needed_reduction > 0:
-                        reduction_score = min(30, (stc_rating / needed_reduction) * 30)
-                        score += reduction_score
-                    else:
-                        logger.warning(f"Invalid reduction calculation parameters: STC={stc_rating}, needed={needed_reduction}")
-                    
-                    # Enhanced frequency response matching (0-25 points)
-                    if noise_characteristics:
-                        freq_response = material_props.get('frequency_response', {})
-                        if freq_response:
-                            # Calculate match for each critical band
-                            band_scores = []
-                            for band, range_ in noise_characteristics.critical_bands.items():
-                                band_match = acoustic_calculator.calculate_frequency_match(
-                                    freq_response,
-                                    range_,
-                                    weight=2.0 if band == 'mid' else 1.0  # Weight mid frequencies higher
-                                )
-                                band_scores.append(band_match)
-                            
-                            # Average the band scores
-                            freq_match = sum(band_scores) / len(band_scores)
-                            score += freq_match * 25
-                    
-                    # Score based on absorption and damping with room acoustics (0-25 points)
-                    absorption = material_props.get('absorption', {})
-                    damping = material_props.get('damping', 0)
-                    
-                    if absorption and damping and room_profile:
-                        # Adjust absorption score based on room reflectivity
-                        room_factor = 1 + (room_profile.reflectivity * 0.5)
-                        absorption_score = (sum(absorption.values()) / len(absorption)) * room_factor * 15
-                        
-                        # Adjust damping score based on room resonance
-                        resonance_factor = 1
-                        if room_profile.resonance:
-                            if any(freq in range(int(room_profile.resonance[0]), int(room_profile.resonance[1])) 
-                                  for freq in noise_characteristics.typical_frequency):
-                                resonance_factor = 1.5
-                        damping_score = damping * 10 * resonance_factor
-                        
-                        score += min(25, absorption_score + damping_score)
-                    
-                    # Score based on budget if provided (0-10 points)
-                    if inputs.budget_constraints and 'budget' in inputs.budget_constraints:
-                        costs = calculate_solution_costs(solution_data, inputs)
-                        if costs <= inputs.budget_constraints['budget']:
-                            budget_score = ((inputs.budget_constraints['budget'] - costs) / 
-                                          inputs.budget_constraints['budget']) * 10
-                            score += budget_score
-                    
-                    # Score based on installation complexity and special requirements (0-10 points)
-                    complexity_base = (10 - solution_data.get('installation_complexity', 5)) / 10 * 8
-                    
-                    # Adjust for special requirements
-                    if inputs.special_requirements:
-                        meets_requirements = all(req in solution_data.get('features', []) 
-                                                for req in inputs.special_requirements)
-                        if meets_requirements:
-                            complexity_base += 2
-                    
-                    score += complexity_base
-                    
-                    ranked.append({
-                        "solution": solution,
-                        "score": round(score, 2),
-                        "details": {
-                            **(solution_data.to_dict() if hasattr(solution_data, 'to_dict') and not isinstance(solution_data, dict) else solution_data),
-                            "acoustic_profile": acoustic_profile if isinstance(acoustic_profile, dict) else (acoustic_profile.__dict__ if hasattr(acoustic_profile, '__dict__') else None),
-                            "frequency_match": round(freq_match * 100, 1) if 'freq_match' in locals() else 0,
-                            "estimated_cost": costs if 'costs' in locals() else None,
-                            "complexity_score": round(complexity_base, 1),
-                            "room_acoustics": {
-                                "reflectivity_factor": round(room_factor, 2) if 'room_factor' in locals() else 1.0,
-                                "resonance_factor": round(resonance_factor, 2) if 'resonance_factor' in locals() else 1.0
-                            }
-                        }
-                    })
-        except ValueError as ve:
-            logger.error(f"Validation error in solution {solution}: {str(ve)}")
-            continue
-        except TypeError as te:
-            logger.error(f"Type error in solution {solution}: {str(te)}")
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error ranking solution {solution}: {str(e)}")
-            logger.debug(f"Error details: {e.__class__.__name__}, {str(e)}", exc_info=True)
-            continue
-    
-    return sorted(ranked, key=lambda x: x["score"], reverse=True)
 
 
 
@@ -372,70 +569,62 @@ class RecommendationEngine:
         self.cache = CacheManager()
         self.solution_calculator = SolutionCalculator()
     def _get_materials(self):
-        """Get materials from cache first, then database with validation and cache warming"""
-        materials = []
+        """Get materials from cache first, then database with validation and cache warming.
+
+        Concurrent cache misses are coalesced so only one caller reads the database.
+        """
         cache_key = "all_materials"
         cache_ttl = 3600 * 24  # 24 hour TTL
         
-        # Try cache first with validation and TTL check
+        cache_data = None
         if self.cache_manager:
             try:
-                cache_data = self.cache_manager.get(cache_key)
-                if cache_data and isinstance(cache_data, dict):
-                    # Check if cache is still valid
-                    if datetime.now().timestamp() < cache_data.get('expires_at', 0):
-                        valid_materials = [m for m in cache_data.get('materials', []) if self._validate_material(m)]
-                        if valid_materials:
-                            self.logger.info(f"Using {len(valid_materials)} validated materials from cache")
-                            # Update material-to-solutions mapping
-                            solutions_manager = get_solutions_manager()
-                            solutions_manager.cache_material_to_solutions_mapping()
-                            return valid_materials
-                    else:
-                        self.logger.info("Cache expired, refreshing from database")
+                cache_data = self.cache_manager.get_or_compute(
+                    cache_key, self._load_materials_cache_data, cache_ttl, stale_ttl=3600)
             except Exception as e:
                 self.logger.warning(f"Error accessing materials from cache: {e}")
+        else:
+            cache_data = self._load_materials_cache_data()
         
-        # Try database with validation and cache warming
-        if self.db is not None:
-            try:
-                if 'materials' in self.db.list_collection_names():
-                    db_materials = list(self.db.materials.find({}, {'_id': 0}))
-                    valid_materials = [m for m in db_materials if self._validate_material(m)]
-                    
-                    if valid_materials:
-                        self.logger.info(f"Loaded {len(valid_materials)} validated materials from database")
-                        
-                        # Cache validated materials with metadata
-                        if self.cache_manager:
-                            try:
-                                cache_data = {
-                                    'materials': valid_materials,
-                                    'created_at': datetime.now().timestamp(),
-                                    'expires_at': datetime.now().timestamp() + cache_ttl,
-                                    'version': '1.0'
-                                }
-                                self.cache_manager.set(cache_key, cache_data, cache_ttl)
-                                self.logger.info("Cached validated materials with metadata")
-                                
-                                # Warm up related caches
-                                self._warm_related_caches(valid_materials)
-                                # Update material-to-solutions mapping
-                                solutions_manager = get_solutions_manager()
-                                solutions_manager.cache_material_to_solutions_mapping()
-                            except Exception as e:
-                                self.logger.warning(f"Error caching materials: {e}")
-                        return valid_materials
-                    else:
-                        self.logger.warning("No valid materials found in database")
-                else:
-                    self.logger.warning("No materials collection found in database")
-            except Exception as e:
-                self.logger.warning(f"Failed to load materials from database: {e}")
+        if cache_data and isinstance(cache_data, dict):
+            valid_materials = [m for m in cache_data.get('materials', []) if self._validate_material(m)]
+            if valid_materials:
+                self.logger.info(f"Using {len(valid_materials)} validated materials")
+                # Update material-to-solutions mapping
+                solutions_manager = get_solutions_manager()
+                solutions_manager.cache_material_to_solutions_mapping()
+                return valid_materials
         
         # Return empty list if no valid materials found
         self.logger.warning("No valid materials found in cache or database")
-        return materials
+        return []
+    
+    def _load_materials_cache_data(self):
+        """Load validated materials from the database, or None if there are none"""
+        if self.db is None:
+            return None
+        try:
+            if 'materials' not in self.db.list_collection_names():
+                self.logger.warning("No materials collection found in database")
+                return None
+            db_materials = list(self.db.materials.find({}, {'_id': 0}))
+            valid_materials = [m for m in db_materials if self._validate_material(m)]
+            if not valid_materials:
+                self.logger.warning("No valid materials found in database")
+                return None
+            
+            self.logger.info(f"Loaded {len(valid_materials)} validated materials from database")
+            if self.cache_manager:
+                # Warm up related caches
+                self._warm_related_caches(valid_materials)
+            return {
+                'materials': valid_materials,
+                'created_at': datetime.now().timestamp(),
+                'version': '1.0'
+            }
+        except Exception as e:
+            self.logger.warning(f"Failed to load materials from database: {e}")
+            return None
         
     def _warm_related_caches(self, materials):
         """Warm up related caches for frequently accessed data"""
@@ -484,8 +673,30 @@ class RecommendationEngine:
                 
         return True
         
-    def generate_recommendations(self, noise_profile_data: Dict, room_profile_data: Dict) -> Dict:
-        """Generate recommendations for the given noise and room profile."""
+    def _get_surface_candidates(self, surface_type: str) -> Optional[RankingCandidates]:
+        """Ranking candidates for one surface type.
+
+        Uses the solutions manager's feature store, precomputed when the
+        solutions were registered, and falls back to preparing the cached
+        solutions for the surface.
+        """
+        if hasattr(self.solutions_manager, 'get_feature_store'):
+            candidates = self.solutions_manager.get_feature_store().ranking_candidates(surface_type)
+            if len(candidates):
+                return candidates
+        surface_solutions = self.solutions_manager.get_solutions_by_type(surface_type)
+        if not surface_solutions:
+            return None
+        return prepare_ranking_candidates(surface_solutions, self.solutions_manager)
+
+    def generate_recommendations(self, noise_profile_data: Dict, room_profile_data: Dict,
+                                 alternatives_count: Optional[int] = None) -> Dict:
+        """Generate recommendations for the given noise and room profile.
+
+        alternatives_count limits the alternatives kept per surface, so only
+        the primary solutions plus that many need to be ranked; None keeps
+        every remaining solution as an alternative.
+        """
         self.logger.info("Generating recommendations for noise profile: %s, room profile: %s", noise_profile_data, room_profile_data)
 
         try:
@@ -494,14 +705,7 @@ class RecommendationEngine:
             room_profile = RoomProfile(**room_profile_data)
 
             # Generate cache key
-            cache_key = self._generate_cache_key(noise_profile, room_profile)
-
-            # Try cache first
-            if self.cache_manager:
-                cached_recommendations = self.cache_manager.get(cache_key)
-                if cached_recommendations:
-                    self.logger.info(f"Returning cached recommendations for {cache_key}")
-                    return cached_recommendations
+            cache_key = self._generate_cache_key(noise_profile, room_profile, alternatives_count)
 
             # Validate profiles
             if not self._validate_profiles(noise_profile, room_profile):
@@ -512,68 +716,19 @@ class RecommendationEngine:
                     'reasoning': ["Invalid noise or room profile provided. Please check your inputs."]
                 }
 
-            all_solutions = self.solutions_manager.get_all_solutions()
-            if not all_solutions:
-                self.logger.warning("No solutions found in the system.")
+            # Concurrent requests for the same profiles share one computation
+            if self.cache_manager:
+                recommendations = self.cache_manager.get_or_compute(
+                    cache_key, lambda: self._compute_recommendations(noise_profile, room_profile, alternatives_count))
+            else:
+                recommendations = self._compute_recommendations(noise_profile, room_profile, alternatives_count)
+
+            if recommendations is None:
                 return {
                     'primary': {},
                     'alternatives': [],
                     'reasoning': ["No soundproofing solutions are currently available."]
                 }
-
-            affected_surfaces = self._get_affected_surfaces(noise_profile.direction)
-            recommendations = {"primary": {}, "alternatives": [], "reasoning": []}
-
-            # Prepare RoomInputs for ranking
-            room_inputs = RoomInputs(
-                room_type=room_profile.room_type,
-                noise_type=noise_profile.type,
-                noise_level=noise_profile.intensity,
-                room_dimensions=room_profile.dimensions,
-                surface_areas={}, # This needs to be calculated or passed from frontend
-                existing_construction={}, # Not used in current context, but part of dataclass
-            )
-
-            for surface_type, is_affected in affected_surfaces.items():
-                if is_affected:
-                    surface_solutions = self.solutions_manager.get_solutions_by_type(surface_type)
-                    if not surface_solutions:
-                        self.logger.warning(f"No solutions found for surface type: {surface_type}")
-                        continue
-
-                    # Filter and rank solutions for the current surface
-                    # The rank_solutions function expects a list of solution objects (or dicts)
-                    # and will internally get their characteristics.
-                    ranked_surface_solutions = rank_solutions(
-                        surface_solutions,
-                        room_inputs,
-                        noise_profile
-                    )
-
-                    if ranked_surface_solutions:
-                        # Primary recommendation: top 1-2 solutions
-                        if surface_type == 'walls':
-                            recommendations['primary'][surface_type] = ranked_surface_solutions[:2]
-                            recommendations['alternatives'].extend(ranked_surface_solutions[2:])
-                        else:
-                            recommendations['primary'][surface_type] = ranked_surface_solutions[0]
-                            recommendations['alternatives'].extend(ranked_surface_solutions[1:])
-                    else:
-                        self.logger.info(f"No suitable solutions found for {surface_type} based on ranking criteria.")
-                        recommendations['primary'][surface_type] = None # Indicate no primary solution
-
-            # Generate reasoning
-            recommendations['reasoning'] = self._generate_reasoning(
-                recommendations,
-                noise_profile.to_dict(), # Pass dict for reasoning function
-                room_profile
-            )
-
-            # Cache the results
-            if self.cache_manager:
-                self.cache_manager.set(cache_key, recommendations)
-                self.logger.info(f"Cached recommendations for {cache_key}")
-
             return recommendations
 
         except ValueError as ve:
@@ -591,6 +746,80 @@ class RecommendationEngine:
                 'reasoning': [f"An unexpected error occurred: {str(e)}. Please try again."]
             }
         
+    def _compute_recommendations(self, noise_profile: NoiseProfile, room_profile: RoomProfile,
+                                 alternatives_count: Optional[int] = None) -> Optional[Dict]:
+        """Rank solutions for each affected surface; None if no solutions are available"""
+        all_solutions = self.solutions_manager.get_all_solutions()
+        if not all_solutions:
+            self.logger.warning("No solutions found in the system.")
+            return None
+
+        affected_surfaces = self._get_affected_surfaces(noise_profile.direction)
+        recommendations = {"primary": {}, "alternatives": [], "reasoning": []}
+
+        # Prepare RoomInputs for ranking
+        room_inputs = RoomInputs(
+            room_type=room_profile.room_type,
+            noise_type=noise_profile.type,
+            noise_level=noise_profile.intensity,
+            room_dimensions=room_profile.dimensions,
+            surface_areas={}, # This needs to be calculated or passed from frontend
+            existing_construction={}, # Not used in current context, but part of dataclass
+            budget_constraints=room_profile.budget_constraints,
+            priority_surfaces=room_profile.priority_surfaces,
+            special_requirements=room_profile.special_requirements,
+            blockages=room_profile.blockages,
+        )
+
+        pipeline = get_recommendation_pipeline()
+        # Room and noise profiles are the same for every surface, so resolve them once
+        context = resolve_ranking_context(room_inputs, noise_profile, self.acoustic_calculator)
+
+        def rank_surface(surface_type):
+            """Ranked solutions for one surface, or None if it has no solutions"""
+            candidates = self._get_surface_candidates(surface_type)
+            if not candidates:
+                self.logger.warning(f"No solutions found for surface type: {surface_type}")
+                return None
+            primary_count = PRIMARY_SOLUTIONS.get(surface_type, DEFAULT_PRIMARY_SOLUTIONS)
+            return rank_prepared_solutions(
+                candidates,
+                room_inputs,
+                noise_profile,
+                self.acoustic_calculator,
+                top_k=None if alternatives_count is None else primary_count + alternatives_count,
+                pipeline=pipeline,
+                context=context
+            )
+
+        # Surfaces are ranked concurrently and gathered priority surfaces first, then in their usual order
+        surfaces = [surface_type for surface_type, is_affected in affected_surfaces.items() if is_affected]
+        priorities = room_profile.priority_surfaces or []
+        surfaces.sort(key=lambda surface_type: priorities.index(surface_type) if surface_type in priorities else len(priorities))
+        for surface_type, ranked_surface_solutions in zip(surfaces, pipeline.map_surfaces(rank_surface, surfaces)):
+            if ranked_surface_solutions is None:
+                continue
+            if ranked_surface_solutions:
+                # Primary recommendation: top 1-2 solutions
+                primary_count = PRIMARY_SOLUTIONS.get(surface_type, DEFAULT_PRIMARY_SOLUTIONS)
+                if primary_count > 1:
+                    recommendations['primary'][surface_type] = ranked_surface_solutions[:primary_count]
+                else:
+                    recommendations['primary'][surface_type] = ranked_surface_solutions[0]
+                recommendations['alternatives'].extend(ranked_surface_solutions[primary_count:])
+            else:
+                self.logger.info(f"No suitable solutions found for {surface_type} based on ranking criteria.")
+                recommendations['primary'][surface_type] = None # Indicate no primary solution
+
+        # Generate reasoning
+        recommendations['reasoning'] = self._generate_reasoning(
+            recommendations,
+            noise_profile.to_dict(), # Pass dict for reasoning function
+            room_profile
+        )
+
+        return recommendations
+
     def get_recommendations(self, noise_profile, room_profile, target_wall=None):
         """Generate recommendations filtered for a specific wall direction if provided."""
         recommendations = self.generate_recommendations(noise_profile, room_profile)
@@ -703,11 +932,8 @@ class RecommendationEngine:
                 }
             }
         
-    def _generate_cache_key(self, noise: NoiseProfile, room: RoomProfile) -> str:
+    def _generate_cache_key(self, noise: NoiseProfile, room: RoomProfile, alternatives_count: Optional[int] = None) -> str:
         """Generate a consistent cache key from noise and room profiles"""
-        import hashlib
-        import json
-        
         # Convert profiles to dict
         noise_dict = {
             "type": noise.type,
@@ -721,11 +947,16 @@ class RecommendationEngine:
             "room_type": room.room_type
         }
         
-        # Create a consistent string representation
-        data_str = json.dumps({"noise": noise_dict, "room": room_dict}, sort_keys=True)
+        # The user's constraints change the ranking too; the acoustic work
+        # they do not affect is cached separately (see RoomAcoustics)
+        constraints = {
+            "budget": room.budget_constraints,
+            "special_requirements": sorted(room.special_requirements or []),
+            "priority_surfaces": room.priority_surfaces
+        }
         
-        # Generate hash
-        return f"recommendations_{hashlib.md5(data_str.encode()).hexdigest()}"
+        return build_cache_key("recommendations", noise=noise_dict, room=room_dict, constraints=constraints,
+                               alternatives=alternatives_count)
         
     def _get_solutions_for_recommendation(self, noise_profile: NoiseProfile) -> Dict[str, List[Dict]]:
         """Get solutions for recommendation based on noise profile"""
@@ -0,0 +1,105 @@
+"""
+Bounded thread pools for the recommendation pipeline.
+
+Ranking the surfaces of a room and looking up the acoustic profile of each
+candidate solution are independent of each other, and on a cache miss each
+lookup waits on MongoDB. The pipeline fans that work out over two bounded
+pools and always returns results in input order:
+
+    surface pool    one task per affected surface (walls, ceiling, floor)
+    solution pool   one task per candidate solution of a surface
+
+Surface tasks wait on solution tasks but never the other way round, so the
+two pools cannot deadlock each other. A pool size of 1 (or 0) runs that
+level sequentially in the calling thread.
+
+Environment:
+    RECOMMENDATION_SURFACE_WORKERS   surface pool size (default 3)
+    RECOMMENDATION_SOLUTION_WORKERS  solution pool size (default 8)
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SURFACE_WORKERS = 3
+DEFAULT_SOLUTION_WORKERS = 8
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class RecommendationPipeline:
+    """Ordered map over bounded per-surface and per-solution thread pools"""
+
+    def __init__(self, surface_workers: Optional[int] = None, solution_workers: Optional[int] = None):
+        self.surface_workers = surface_workers if surface_workers is not None else int(
+            os.getenv('RECOMMENDATION_SURFACE_WORKERS', DEFAULT_SURFACE_WORKERS))
+        self.solution_workers = solution_workers if solution_workers is not None else int(
+            os.getenv('RECOMMENDATION_SOLUTION_WORKERS', DEFAULT_SOLUTION_WORKERS))
+        self._surface_pool: Optional[ThreadPoolExecutor] = None
+        self._solution_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self, name: str, workers: int) -> ThreadPoolExecutor:
+        attr = f"_{name}_pool"
+        pool = getattr(self, attr)
+        if pool is None:
+            with self._lock:
+                pool = getattr(self, attr)
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"recommendation-{name}")
+                    setattr(self, attr, pool)
+        return pool
+
+    def _map(self, name: str, workers: int, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        items = list(items)
+        if workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+        return list(self._pool(name, workers).map(fn, items))
+
+    def map_surfaces(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """fn over items on the surface pool, results in input order"""
+        return self._map('surface', self.surface_workers, fn, items)
+
+    def map_solutions(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """fn over items on the solution pool, results in input order"""
+        return self._map('solution', self.solution_workers, fn, items)
+
+    def shutdown(self) -> None:
+        """Stop the pools; they are recreated if the pipeline is used again"""
+        with self._lock:
+            pools, self._surface_pool, self._solution_pool = (self._surface_pool, self._solution_pool), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+
+# Global pipeline instance
+_recommendation_pipeline = None
+_recommendation_pipeline_lock = threading.Lock()
+
+
+def get_recommendation_pipeline() -> RecommendationPipeline:
+    """Get the shared recommendation pipeline"""
+    global _recommendation_pipeline
+    if _recommendation_pipeline is None:
+        with _recommendation_pipeline_lock:
+            if _recommendation_pipeline is None:
+                _recommendation_pipeline = RecommendationPipeline()
+                logger.info(f"Recommendation pipeline: {_recommendation_pipeline.surface_workers} surface workers, "
+                            f"{_recommendation_pipeline.solution_workers} solution workers")
+    return _recommendation_pipeline
+
+
+def reset_recommendation_pipeline() -> None:
+    """Shut down and drop the shared pipeline (for tests and config changes)"""
+    global _recommendation_pipeline
+    with _recommendation_pipeline_lock:
+        if _recommendation_pipeline is not None:
+            _recommendation_pipeline.shutdown()
+        _recommendation_pipeline = None
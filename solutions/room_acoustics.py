@@ -0,0 +1,177 @@
+"""
+Room modes and reverberation time from the room's dimensions.
+
+For a rectangular room of L x W x H the standing waves (modes) are at
+
+    f = c/2 * sqrt((nx/L)² + (ny/W)² + (nz/H)²)
+
+and are axial (one non-zero index), tangential (two) or oblique (three).
+Axial modes are the strongest; below the Schroeder frequency the modes are
+sparse enough to colour the sound, above it they merge into a diffuse
+field. The reverberation time RT60 follows from the room volume and its
+surface absorption, by Sabine (0.161 V / S·α) or, better for absorbent
+rooms, Eyring (0.161 V / -S·ln(1 - α)).
+
+Modes depend only on the dimensions, so they are memoised per dimension
+bucket: dimensions are quantised to DIMENSION_BUCKET (5 cm), well below
+what moves a low mode by a noticeable amount. Only the axial modes are
+kept, as sorted frequencies; tangential and oblique modes are counted over
+index pairs without being listed, so a cache entry holds a few hundred
+floats at most and rooms larger than MAX_DIMENSION get no modal model.
+modal_exposure() then tells ranking how much of a noise's frequency range
+falls on sparse axial modes, with a search over the sorted frequencies
+instead of a loop per solution.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+SPEED_OF_SOUND = 343.0
+# Dimensions are quantised to this many metres before the modes are computed
+DIMENSION_BUCKET = 0.05
+# Longest dimension, in metres, that gets a modal model; this also bounds the modes per cache entry
+MAX_DIMENSION = 50.0
+# Modes are taken up to this frequency, beyond the Schroeder frequency of any ordinary room
+MAX_MODE_FREQUENCY = 500.0
+# Mean absorption coefficient of a furnished room, used without a room profile
+DEFAULT_ABSORPTION = 0.15
+SABINE_CONSTANT = 0.161
+
+# 1/3-octave bands from 20 Hz to 5 kHz, exact base-2 centres, and their edges
+MODAL_BANDS = 1000.0 * 2.0 ** (np.arange(-17, 8) / 3)
+_BAND_EDGES = MODAL_BANDS * 2.0 ** (-1 / 6), MODAL_BANDS * 2.0 ** (1 / 6)
+
+
+@dataclass(frozen=True)
+class RoomModes:
+    """Modes of a rectangular room up to MAX_MODE_FREQUENCY: the axial ones by frequency, the others counted"""
+    dimensions: Tuple[float, float, float]
+    frequencies: np.ndarray
+    tangential: int
+    oblique: int
+
+    @property
+    def volume(self) -> float:
+        length, width, height = self.dimensions
+        return length * width * height
+
+    @property
+    def surface_area(self) -> float:
+        length, width, height = self.dimensions
+        return 2 * (length * width + length * height + width * height)
+
+    def axial(self) -> np.ndarray:
+        return self.frequencies
+
+    def counts(self) -> Dict[str, int]:
+        """Number of modes of each kind"""
+        return {'axial': len(self.frequencies), 'tangential': self.tangential, 'oblique': self.oblique}
+
+    def modes_between(self, low: float, high: float) -> int:
+        """Number of axial modes from low to high Hz"""
+        return int(np.searchsorted(self.frequencies, high, side='right') - np.searchsorted(self.frequencies, low))
+
+
+def dimension_bucket(dimensions: Dict[str, float]) -> Optional[Tuple[int, int, int]]:
+    """Length, width and height as whole buckets, or None if any is missing, not positive or over MAX_DIMENSION"""
+    try:
+        values = [float(dimensions.get(key) or 0) for key in ('length', 'width', 'height')]
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not all(math.isfinite(v) and 0 < v <= MAX_DIMENSION for v in values):
+        return None
+    return tuple(max(1, int(round(v / DIMENSION_BUCKET))) for v in values)
+
+
+@lru_cache(maxsize=512)
+def _bucket_modes(bucket: Tuple[int, int, int]) -> RoomModes:
+    dimensions = np.array(bucket, dtype=float) * DIMENSION_BUCKET
+    # A mode is under MAX_MODE_FREQUENCY when its (n / d)² terms sum to at most limit
+    limit = (2 * MAX_MODE_FREQUENCY / SPEED_OF_SOUND) ** 2
+    terms = []
+    for dimension in dimensions:
+        axis_terms = (np.arange(1, int(dimension * math.sqrt(limit)) + 2) / dimension) ** 2
+        terms.append(axis_terms[axis_terms <= limit])
+    frequencies = np.sort(SPEED_OF_SOUND / 2 * np.sqrt(np.concatenate(terms)))
+    frequencies.flags.writeable = False
+    # Pairs of non-zero indices, then for each (nx, ny) pair the nz that still fit
+    tangential = sum(int(np.count_nonzero(terms[a][:, None] + terms[b][None, :] <= limit))
+                     for a, b in ((0, 1), (0, 2), (1, 2)))
+    oblique = int(np.searchsorted(terms[2], limit - (terms[0][:, None] + terms[1][None, :]), side='right').sum())
+    return RoomModes(tuple(float(d) for d in dimensions), frequencies, tangential, oblique)
+
+
+def room_modes(dimensions: Dict[str, float]) -> Optional[RoomModes]:
+    """Modes of a room given as {'length', 'width', 'height'} in metres, shared per dimension bucket"""
+    bucket = dimension_bucket(dimensions)
+    return _bucket_modes(bucket) if bucket is not None else None
+
+
+def rt60_sabine(volume: float, surface_area: float, absorption: float) -> float:
+    """Sabine reverberation time in seconds"""
+    absorption_area = surface_area * absorption
+    return SABINE_CONSTANT * volume / absorption_area if absorption_area > 0 else math.inf
+
+
+def rt60_eyring(volume: float, surface_area: float, absorption: float) -> float:
+    """Eyring reverberation time in seconds"""
+    if absorption >= 1:
+        return 0.0
+    absorption_area = -surface_area * math.log(1 - absorption)
+    return SABINE_CONSTANT * volume / absorption_area if absorption_area > 0 else math.inf
+
+
+def schroeder_frequency(rt60: float, volume: float) -> float:
+    """Frequency above which the room's modes overlap into a diffuse field"""
+    return 2000.0 * math.sqrt(rt60 / volume) if volume > 0 and math.isfinite(rt60) else MAX_MODE_FREQUENCY
+
+
+@dataclass(frozen=True)
+class RoomAcousticsModel:
+    """Modes and reverberation of one room"""
+    modes: RoomModes
+    absorption: float
+    rt60_sabine: float
+    rt60_eyring: float
+    schroeder_frequency: float
+
+    def modal_exposure(self, low: float, high: float) -> float:
+        """Share (0-1) of the 1/3-octave bands from low to high Hz that sit on an axial mode below the Schroeder frequency"""
+        in_range = (MODAL_BANDS >= low * 2.0 ** (-1 / 6)) & (MODAL_BANDS <= high * 2.0 ** (1 / 6))
+        if not in_range.any():
+            return 0.0
+        axial = self.modes.axial()
+        band_low, band_high = _BAND_EDGES
+        has_axial = np.searchsorted(axial, band_high) > np.searchsorted(axial, band_low)
+        modal = has_axial & (band_low < self.schroeder_frequency)
+        return float(np.count_nonzero(modal & in_range) / np.count_nonzero(in_range))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'rt60_sabine': round(self.rt60_sabine, 3),
+            'rt60_eyring': round(self.rt60_eyring, 3),
+            'schroeder_frequency': round(self.schroeder_frequency, 1),
+            'lowest_mode': round(float(self.modes.frequencies[0]), 1) if len(self.modes.frequencies) else None,
+            **{f'{kind}_modes': count for kind, count in self.modes.counts().items()},
+        }
+
+
+def room_acoustics_model(dimensions: Dict[str, float], absorption: Optional[float] = None) -> Optional[RoomAcousticsModel]:
+    """Modes and RT60 of a room with the given mean absorption coefficient, or None without valid dimensions"""
+    modes = room_modes(dimensions)
+    if modes is None:
+        return None
+    absorption = DEFAULT_ABSORPTION if absorption is None else min(max(float(absorption), 0.01), 1.0)
+    volume, surface_area = modes.volume, modes.surface_area
+    eyring = rt60_eyring(volume, surface_area, absorption)
+    return RoomAcousticsModel(
+        modes=modes,
+        absorption=absorption,
+        rt60_sabine=rt60_sabine(volume, surface_area, absorption),
+        rt60_eyring=eyring,
+        schroeder_frequency=schroeder_frequency(eyring, volume),
+    )
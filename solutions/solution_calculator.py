@@ -8,6 +8,7 @@ from solutions.logger import get_logger
 import logging
 
 from solutions.cache_manager import get_cache_manager
+from solutions.cache_keys import build_cache_key
 
 # Set up logging
 logger = get_logger()
@@ -130,63 +131,53 @@ def calculate_solution(solution_name, dimensions, solution_type="wallsolutions")
     
     try:
         # Generate cache key for this calculation
-        dims_hash = hash(f"{dimensions.get('length', 0)}_{dimensions.get('width', 0)}_{dimensions.get('height', 0)}")
-        cache_key = f"solution_calc_{solution_name}_{dims_hash}"
+        cache_key = build_cache_key(
+            "solution_calc", solution_name, solution_type,
+            length=dimensions.get('length', 0), width=dimensions.get('width', 0), height=dimensions.get('height', 0))
         
-        # Try to get from cache first
-        cache_manager = get_cache_manager()
-        if cache_manager is not None:
-            cached_result = cache_manager.get(cache_key)
-            if cached_result:
-                logger.info(f"Retrieved calculation for {solution_name} from cache")
-                return cached_result
-        
-        # Cache miss, calculate solution
-        logger.info(f"Cache miss for solution {solution_name}, calculating...")
-        
-        # Get solution data with cache priority
-        solution_data = get_solution_with_cache_priority(solution_name, solution_type)
-        if not solution_data:
-            logger.error(f"No solution data found for {solution_name}")
-            return None
-        
-        # Get materials with cache priority
-        materials = get_materials_with_cache_priority()
+        def compute():
+            logger.info(f"Cache miss for solution {solution_name}, calculating...")
+            
+            # Get solution data with cache priority
+            solution_data = get_solution_with_cache_priority(solution_name, solution_type)
+            if not solution_data:
+                logger.error(f"No solution data found for {solution_name}")
+                return None
         
-        # Get calculator for solution
-        from solutions.solution_mapping_new import SolutionMapping
-        calculator = SolutionMapping.get_calculator(
-            solution_name,
-            float(dimensions.get('length', 0)),
-            float(dimensions.get('height', 0))
-        )
+            # Get materials with cache priority
+            materials = get_materials_with_cache_priority()
         
-        if not calculator:
-            logger.error(f"No calculator found for solution: {solution_name}")
-            return None
+            # Get calculator for solution
+            from solutions.solution_mapping_new import SolutionMapping
+            calculator = SolutionMapping.get_calculator(
+                solution_name,
+                float(dimensions.get('length', 0)),
+                float(dimensions.get('height', 0))
+            )
         
-        # Log calculator info
-        logger.info(f"Using calculator: {calculator.__class__.__name__} for solution {solution_name}")
+            if not calculator:
+                logger.error(f"No calculator found for solution: {solution_name}")
+                return None
         
-        # Calculate with materials if available
-        if materials:
-            result = calculator.calculate(dimensions, materials)
-        else:
-            result = calculator.calculate(dimensions)
+            # Log calculator info
+            logger.info(f"Using calculator: {calculator.__class__.__name__} for solution {solution_name}")
         
-        if not result:
-            logger.warning(f"Calculation returned no results for {solution_name}")
-            return None
-        
-        # Cache the result
-        if cache_manager is not None and result:
-            cache_success = cache_manager.set(cache_key, result, 3600)  # 1 hour TTL
-            if cache_success:
-                logger.info(f"Cached calculation result for {solution_name}")
+            # Calculate with materials if available
+            if materials:
+                result = calculator.calculate(dimensions, materials)
             else:
-                logger.warning(f"Failed to cache calculation for {solution_name}")
+                result = calculator.calculate(dimensions)
+        
+            if not result:
+                logger.warning(f"Calculation returned no results for {solution_name}")
+                return None
+            return result
         
-        return result
+        # Concurrent requests for the same calculation share one computation
+        cache_manager = get_cache_manager()
+        if cache_manager is not None:
+            return cache_manager.get_or_compute(cache_key, compute, 3600)  # 1 hour TTL
+        return compute()
     
     except Exception as e:
         logger.error(f"Error calculating solution {solution_name}: {str(e)}")
@@ -218,70 +209,62 @@ def generate_implementation_details_detailed(solution_id, surface_type, dimensio
     logger.info(f"Generating implementation details for solution {solution_id}")
     
     try:
-        # Try to get from cache first
-        cache_key = f"implementation_{solution_id}_{hash(str(dimensions))}"
-        cache_manager = get_cache_manager()
-        cached_result = cache_manager.get(cache_key)
+        cache_key = build_cache_key("implementation", solution_id, dimensions=dimensions)
         
-        if cached_result:
-            logger.info(f"Retrieved implementation details for {solution_id} from cache")
-            return cached_result
+        def compute():
+            nonlocal dimensions
+            logger.info(f"Cache miss for implementation details of solution {solution_id}, generating...")
             
-        logger.info(f"Cache miss for implementation details of solution {solution_id}, generating...")
-        
-        # Parse dimensions
-        if not dimensions:
-            dimensions = {"length": 0, "width": 0, "height": 0}
+            # Parse dimensions
+            if not dimensions:
+                dimensions = {"length": 0, "width": 0, "height": 0}
             
-        # Get SolutionMapping
-        from solutions.solution_mapping_new import SolutionMapping
+            # Get SolutionMapping
+            from solutions.solution_mapping_new import SolutionMapping
         
-        # Get solution database record if possible
-        from solutions.database import get_solution, get_collection_for_solution
+            # Get solution database record if possible
+            from solutions.database import get_solution, get_collection_for_solution
         
-        collection_name = f"{surface_type}solutions"
+            collection_name = f"{surface_type}solutions"
             
-        solution_record = None
-        if collection_name:
-            try:
-                logger.info(f"Looking up solution in {collection_name} collection")
-                solution_record = get_solution(solution_id, collection_name)
-                if solution_record:
-                    logger.info(f"Found solution record in database: {solution_id}")
-                else:
-                    logger.warning(f"Solution record not found in database: {solution_id}")
-            except Exception as db_error:
-                logger.error(f"Error retrieving solution from database: {db_error}")
+            solution_record = None
+            if collection_name:
+                try:
+                    logger.info(f"Looking up solution in {collection_name} collection")
+                    solution_record = get_solution(solution_id, collection_name)
+                    if solution_record:
+                        logger.info(f"Found solution record in database: {solution_id}")
+                    else:
+                        logger.warning(f"Solution record not found in database: {solution_id}")
+                except Exception as db_error:
+                    logger.error(f"Error retrieving solution from database: {db_error}")
                 
-        # Calculate solution
-        calculation_result = calculate_solution(solution_id, dimensions, collection_name)
-        if not calculation_result:
-            logger.warning(f"No calculation results available for {solution_id}")
+            # Calculate solution
+            calculation_result = calculate_solution(solution_id, dimensions, collection_name)
+            if not calculation_result:
+                logger.warning(f"No calculation results available for {solution_id}")
             
-        # Combine data sources
-        implementation = {
-            "solution_id": solution_id,
-            "name": solution_id,
-            "dimensions": dimensions,
-            "calculation": calculation_result,
-            "database": solution_record,
-            "data_source": "calculation"
-        }
+            # Combine data sources
+            implementation = {
+                "solution_id": solution_id,
+                "name": solution_id,
+                "dimensions": dimensions,
+                "calculation": calculation_result,
+                "database": solution_record,
+                "data_source": "calculation"
+            }
         
-        # Set data source
-        if solution_record:
-            implementation["data_source"] = "database+calculation"
-            implementation["name"] = solution_record.get("solution", solution_id)
-            
-        # Cache the result
-        if cache_manager:
-            cache_success = cache_manager.set(cache_key, implementation, 3600)  # 1 hour TTL
-            if cache_success:
-                logger.info(f"Cached implementation details for {solution_id}")
-            else:
-                logger.warning(f"Failed to cache implementation details for {solution_id}")
-                
-        return implementation
+            # Set data source
+            if solution_record:
+                implementation["data_source"] = "database+calculation"
+                implementation["name"] = solution_record.get("solution", solution_id)
+            return implementation
+        
+        # Concurrent requests for the same details share one computation
+        cache_manager = get_cache_manager()
+        if cache_manager is not None:
+            return cache_manager.get_or_compute(cache_key, compute, 3600)  # 1 hour TTL
+        return compute()
         
     except Exception as e:
         logger.error(f"Error generating implementation details for {solution_id}: {str(e)}")
@@ -3,13 +3,14 @@ from dataclasses import dataclass
 from functools import lru_cache
 from .material_properties import get_material_characteristics
 from .acoustic_calculator import get_acoustic_calculator
+from .spectrum import Spectrum
 
 @dataclass
 class AcousticProfile:
     stc_rating: int
-    frequency_response: Dict[str, float]
+    frequency_response: Spectrum
     absorption_coefficient: float
-    transmission_loss: Dict[str, float]
+    transmission_loss: Spectrum
 
 @dataclass
 class SolutionProfile:
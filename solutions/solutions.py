@@ -1,8 +1,10 @@
 """Solution management module for soundproofing solutions."""
 
+import threading
 from typing import Dict, List, Optional, Any
 from solutions.base_solution import BaseSolution   
 from solutions.cache_manager import get_cache_manager
+from solutions.feature_store import SolutionFeatureRecord, SolutionFeatureStore, build_feature_record
 
 from solutions.logger import get_logger
 
@@ -16,6 +18,11 @@ class SoundproofingSolutions:
         self.db = None
         self.cache_manager = get_cache_manager()
         self._recommendation_engine = None
+        # Feature records built at registration; the store is rebuilt when catalog_version changes
+        self._feature_records: Dict[str, SolutionFeatureRecord] = {}
+        self.catalog_version = 0
+        self._feature_store: Optional[SolutionFeatureStore] = None
+        self._feature_store_lock = threading.Lock()
         
     def register_solution(self, solution_id: str, solution_instance: BaseSolution) -> None:
         """Register a solution instance"""
@@ -94,7 +101,7 @@ class SoundproofingSolutions:
                              f"Consider running `_init_solution_caches`.")
             return []
         
-    def generate_recommendations(self, noise_profile, room_profile):
+    def generate_recommendations(self, noise_profile, room_profile, alternatives_count=None):
         """Generate recommendations based on noise and room profiles
         
         This method delegates to the RecommendationEngine class to generate recommendations.
@@ -102,6 +109,7 @@ class SoundproofingSolutions:
         Args:
             noise_profile: The noise profile containing type, intensity, and direction
             room_profile: The room profile containing dimensions and other properties
+            alternatives_count: Maximum alternatives per surface, None for all
             
         Returns:
             Dict containing recommendations
@@ -114,7 +122,7 @@ class SoundproofingSolutions:
             self._recommendation_engine = RecommendationEngine(solutions_manager=self, db=None)
             
         # Generate recommendations using the engine
-        return self._recommendation_engine.generate_recommendations(noise_profile, room_profile)
+        return self._recommendation_engine.generate_recommendations(noise_profile, room_profile, alternatives_count)
         
     def load_solutions_from_db(self) -> None:
         """Load solutions from the cache"""
@@ -138,24 +146,66 @@ class SoundproofingSolutions:
             logger.info(f"Cached material-to-solutions mapping with {len(material_to_solutions)} materials.")
         return material_to_solutions
     
-    def register_solution_with_characteristics(self, solution_id: str, solution_instance: BaseSolution) -> None:
-        """Register a solution instance and ensure it has characteristics cached"""
+    def register_solution_with_characteristics(self, solution_id: str, solution_instance: BaseSolution,
+                                               surface_type: Optional[str] = None) -> None:
+        """Register a solution instance and precompute its feature record
+        
+        Args:
+            solution_id: The solution identifier
+            solution_instance: The solution to register
+            surface_type: Surface collection the solution belongs to (e.g. 'walls')
+        """
         try:
             # Register the solution
             self.register_solution(solution_id, solution_instance)
             
             # Ensure characteristics are available
             if hasattr(solution_instance, 'get_characteristics'):
-                characteristics = solution_instance.get_characteristics()
-                if characteristics:
+                record = build_feature_record(solution_id, solution_instance, surface_type)
+                if record:
+                    self._feature_records[solution_id] = record
                     logger.info(f"Registered solution {solution_id} with characteristics")
                 else:
+                    self._feature_records.pop(solution_id, None)
                     logger.warning(f"Solution {solution_id} has no characteristics")
             else:
                 logger.warning(f"Solution {solution_id} has no get_characteristics method")
                 
         except Exception as e:
+            self._feature_records.pop(solution_id, None)
             logger.error(f"Error registering solution {solution_id}: {e}")
+        finally:
+            self.catalog_version += 1
+    
+    def replace_catalog(self, staging: 'SoundproofingSolutions') -> None:
+        """Swap in the solutions and feature records registered with a staging manager
+
+        Readers see either the old catalogue or the new one, never a
+        half-finished re-registration.
+        """
+        with self._feature_store_lock:
+            self.solutions = staging.solutions
+            self._feature_records = staging._feature_records
+            self._feature_store = None
+            self.catalog_version = max(self.catalog_version, staging.catalog_version) + 1
+        logger.info(f"Replaced solution catalogue with {len(self.solutions)} solutions (v{self.catalog_version})")
+
+    def get_feature_store(self) -> SolutionFeatureStore:
+        """Get the feature store for the current catalogue version
+        
+        The store is immutable and shared; it is rebuilt from the registered
+        feature records only after a registration has changed the catalogue.
+        """
+        store = self._feature_store
+        if store is None or store.version != self.catalog_version:
+            with self._feature_store_lock:
+                store = self._feature_store
+                version = self.catalog_version
+                if store is None or store.version != version:
+                    store = SolutionFeatureStore(list(self._feature_records.values()), version)
+                    self._feature_store = store
+                    logger.info(f"Built solution feature store v{version} with {len(store)} solutions")
+        return store
     
     def get_solution_characteristics_by_type(self, surface_type: str) -> List[Dict[str, Any]]:
         """Get solution characteristics filtered by surface type"""
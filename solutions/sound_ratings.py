@@ -0,0 +1,144 @@
+"""
+Single-number sound insulation ratings fitted to band transmission loss.
+
+Implements the two contour-shift ratings over 1/3-octave TL data:
+
+1. ASTM E413 STC: the reference contour over 125 Hz-4 kHz is raised in
+   1 dB steps while the deficiencies (TL below the contour) total at most
+   32 dB and no single deficiency exceeds 8 dB. The STC is the contour value
+   at 500 Hz. TL is taken to the nearest whole decibel.
+2. ISO 717-1 Rw: the reference curve over 100 Hz-3.15 kHz is shifted in
+   1 dB steps while the unfavourable deviations total at most 32.0 dB, with
+   TL taken to 0.1 dB. The spectrum adaptation terms C (pink noise) and Ctr
+   (urban traffic) are computed from the same data.
+
+Every function takes a 2-D (constructions, bands) array laid out on
+spectrum.THIRD_OCTAVE_BANDS, a single Spectrum, or a sequence of spectra,
+and rates all rows in one NumPy pass. The fitted rating always lies within
+32 dB above the lowest TL-minus-contour margin, so each row only tries the
+33 shifts from there rather than a global range, and large batches are
+rated in chunks to bound memory.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from solutions.spectrum import BAND_COUNT, THIRD_OCTAVE_BANDS, Spectrum
+
+# Largest total deficiency / unfavourable deviation, in dB
+MAX_DEFICIENCY_SUM = 32.0
+# Largest single-band STC deficiency, in dB
+MAX_STC_DEFICIENCY = 8.0
+# Rows rated per NumPy pass
+RATING_CHUNK_SIZE = 4096
+
+# ASTM E413 reference contour, relative to its 500 Hz value
+STC_BANDS = (125, 160, 200, 250, 315, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3150, 4000)
+STC_CONTOUR = np.array([-16, -13, -10, -7, -4, -1, 0, 1, 2, 3, 4, 4, 4, 4, 4, 4], dtype=float)
+
+# ISO 717-1 reference curve, relative to its 500 Hz value
+RW_BANDS = (100, 125, 160, 200, 250, 315, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3150)
+RW_CONTOUR = np.array([-19, -16, -13, -10, -7, -4, -1, 0, 1, 2, 3, 4, 4, 4, 4, 4], dtype=float)
+# ISO 717-1 sound level spectra for C (No. 1, A-weighted pink noise) and Ctr (No. 2, urban traffic)
+SPECTRUM_C = np.array([-29, -26, -23, -21, -19, -17, -15, -13, -12, -11, -10, -9, -9, -9, -9, -9], dtype=float)
+SPECTRUM_CTR = np.array([-20, -20, -18, -16, -15, -14, -13, -12, -11, -9, -8, -9, -10, -11, -13, -15], dtype=float)
+
+_STC_COLUMNS = np.searchsorted(THIRD_OCTAVE_BANDS, STC_BANDS)
+_RW_COLUMNS = np.searchsorted(THIRD_OCTAVE_BANDS, RW_BANDS)
+_SHIFTS = np.arange(int(MAX_DEFICIENCY_SUM) + 1, dtype=float)
+# Allows for float error in deviations taken to 0.1 dB
+_TOLERANCE = 1e-6
+
+TransmissionLoss = Union[np.ndarray, Spectrum, Sequence[Spectrum]]
+
+
+@dataclass(frozen=True)
+class SoundRatings:
+    """Single-number ratings of one construction"""
+    stc: int
+    rw: int
+    c: int
+    ctr: int
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'stc': self.stc, 'rw': self.rw, 'c': self.c, 'ctr': self.ctr}
+
+
+def as_band_matrix(tl: TransmissionLoss) -> np.ndarray:
+    """(n, BAND_COUNT) float matrix from an array, a Spectrum or a sequence of spectra"""
+    if isinstance(tl, Spectrum):
+        return tl.values[None, :]
+    if len(tl) and isinstance(tl[0], Spectrum):
+        return np.array([spectrum.values for spectrum in tl], dtype=float)
+    matrix = np.asarray(tl, dtype=float)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    if matrix.ndim != 2 or matrix.shape[1] != BAND_COUNT:
+        raise ValueError(f"Transmission loss must have {BAND_COUNT} bands per row, got shape {matrix.shape}")
+    return matrix
+
+
+def _contour_fit(tl: np.ndarray, contour: np.ndarray, max_single: Optional[float]) -> np.ndarray:
+    """Highest whole-dB contour value (at 500 Hz) meeting the deficiency limits, per row"""
+    ratings = np.empty(len(tl), dtype=np.int64)
+    for start in range(0, len(tl), RATING_CHUNK_SIZE):
+        chunk = tl[start:start + RATING_CHUNK_SIZE]
+        # The contour touches the data at this value; higher shifts start to accumulate deficiencies
+        base = np.floor(np.min(chunk - contour, axis=1) + _TOLERANCE)
+        # (rows, shifts, bands) contour levels for every candidate rating
+        levels = (base[:, None] + _SHIFTS)[:, :, None] + contour
+        deficiency = np.maximum(levels - chunk[:, None, :], 0.0)
+        passes = deficiency.sum(axis=2) <= MAX_DEFICIENCY_SUM + _TOLERANCE
+        if max_single is not None:
+            passes &= deficiency.max(axis=2) <= max_single + _TOLERANCE
+        # Deficiencies only grow with the shift, so the passing shifts are a prefix
+        ratings[start:start + RATING_CHUNK_SIZE] = base.astype(np.int64) + passes.sum(axis=1) - 1
+    return ratings
+
+
+def stc_ratings(tl: TransmissionLoss) -> np.ndarray:
+    """ASTM E413 Sound Transmission Class of each row"""
+    bands = np.round(as_band_matrix(tl)[:, _STC_COLUMNS])
+    return _contour_fit(bands, STC_CONTOUR, MAX_STC_DEFICIENCY)
+
+
+def rw_ratings(tl: TransmissionLoss) -> np.ndarray:
+    """ISO 717-1 weighted sound reduction index Rw of each row"""
+    bands = np.round(as_band_matrix(tl)[:, _RW_COLUMNS], 1)
+    return _contour_fit(bands, RW_CONTOUR, None)
+
+
+def spectrum_adaptation_terms(tl: TransmissionLoss, rw: Optional[np.ndarray] = None):
+    """ISO 717-1 spectrum adaptation terms (C, Ctr) of each row"""
+    bands = np.round(as_band_matrix(tl)[:, _RW_COLUMNS], 1)
+    if rw is None:
+        rw = _contour_fit(bands, RW_CONTOUR, None)
+    terms = []
+    for spectrum in (SPECTRUM_C, SPECTRUM_CTR):
+        # A-weighted level difference for the reference spectrum
+        x = -10 * np.log10(np.sum(10 ** ((spectrum - bands) / 10), axis=1))
+        terms.append(np.round(x - rw).astype(np.int64))
+    return terms[0], terms[1]
+
+
+def rate_batch(tl: TransmissionLoss) -> Dict[str, np.ndarray]:
+    """STC, Rw, C and Ctr of every row, as int64 arrays"""
+    matrix = as_band_matrix(tl)
+    rw = rw_ratings(matrix)
+    c, ctr = spectrum_adaptation_terms(matrix, rw)
+    return {'stc': stc_ratings(matrix), 'rw': rw, 'c': c, 'ctr': ctr}
+
+
+def rate(tl: Spectrum) -> SoundRatings:
+    """Single-number ratings of one transmission loss curve"""
+    ratings = rate_batch(tl)
+    return SoundRatings(**{name: int(values[0]) for name, values in ratings.items()})
+
+
+def mass_law_transmission_loss(surface_mass: float) -> Spectrum:
+    """Field-incidence mass law TL of a single leaf of the given kg/m²"""
+    if surface_mass <= 0:
+        return Spectrum.zeros()
+    return Spectrum(np.maximum(20 * np.log10(surface_mass * THIRD_OCTAVE_BANDS) - 47, 0.0))
@@ -0,0 +1,192 @@
+"""
+Band-resolved acoustic spectra on the 1/3-octave bands from 100 Hz to 5 kHz.
+
+A Spectrum wraps one read-only float array with a value per band of
+THIRD_OCTAVE_BANDS, so frequency responses and transmission loss curves
+are combined with vectorised arithmetic instead of looping over dicts keyed
+by strings like "125". Stored data keyed by frequency (octave or 1/3-octave,
+string or number keys) is read with Spectrum.from_mapping(), which
+interpolates on a log-frequency axis and holds the end values flat outside
+the measured range; to_dict() gives the string-keyed form back for JSON.
+
+Spectra are immutable and shared between callers, like feature records.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+# Nominal 1/3-octave band centre frequencies in Hz (ISO 266)
+THIRD_OCTAVE_BANDS = np.array([100, 125, 160, 200, 250, 315, 400, 500, 630, 800,
+                               1000, 1250, 1600, 2000, 2500, 3150, 4000, 5000], dtype=float)
+THIRD_OCTAVE_BANDS.flags.writeable = False
+# The octave bands of the older string-keyed data
+OCTAVE_BANDS = (125, 250, 500, 1000, 2000, 4000)
+BAND_COUNT = len(THIRD_OCTAVE_BANDS)
+
+_LOG_BANDS = np.log2(THIRD_OCTAVE_BANDS)
+
+# Estimated transmission loss rises 5 dB per octave, with STC as the TL at 500 Hz
+TL_SLOPE_DB_PER_OCTAVE = 5.0
+TL_REFERENCE_FREQUENCY = 500.0
+# Shape of the frequency response estimated from STC, relative to 1 kHz
+RESPONSE_SHAPE = {125: 0.7, 250: 0.8, 500: 0.9, 1000: 1.0, 2000: 0.95, 4000: 0.9}
+
+Number = Union[int, float]
+
+
+class Spectrum:
+    """A value per 1/3-octave band, with elementwise arithmetic"""
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: Iterable[Number]):
+        values = np.array(values, dtype=float)
+        if values.shape != (BAND_COUNT,):
+            raise ValueError(f"A spectrum needs {BAND_COUNT} band values, got shape {values.shape}")
+        values.flags.writeable = False
+        self.values = values
+
+    @classmethod
+    def zeros(cls) -> 'Spectrum':
+        return cls(np.zeros(BAND_COUNT))
+
+    @classmethod
+    def constant(cls, value: Number) -> 'Spectrum':
+        return cls(np.full(BAND_COUNT, float(value)))
+
+    @classmethod
+    def from_mapping(cls, data: Optional[Mapping[Any, Any]]) -> 'Spectrum':
+        """Spectrum from {frequency: value} data, interpolated onto the 1/3-octave bands
+
+        Keys that are not positive frequencies (e.g. "min"/"max" ranges) are
+        ignored; data without any band values gives a zero spectrum.
+        """
+        points = []
+        for key, value in (data or {}).items():
+            try:
+                frequency, value = float(key), float(value)
+            except (TypeError, ValueError):
+                continue
+            if frequency > 0 and math.isfinite(value):
+                points.append((math.log2(frequency), value))
+        if not points:
+            return cls.zeros()
+        points.sort()
+        log_frequencies, values = zip(*points)
+        return cls(np.interp(_LOG_BANDS, log_frequencies, values))
+
+    @classmethod
+    def from_stc(cls, stc: Number) -> 'Spectrum':
+        """Transmission loss estimated from an STC rating
+
+        TL at 500 Hz equals the STC and changes by 5 dB per octave, never
+        going below zero: the standard single-number approximation.
+        """
+        tl = float(stc) + TL_SLOPE_DB_PER_OCTAVE * (_LOG_BANDS - math.log2(TL_REFERENCE_FREQUENCY))
+        return cls(np.maximum(tl, 0.0))
+
+    @classmethod
+    def response_from_stc(cls, stc: Number) -> 'Spectrum':
+        """Normalised (0-1) frequency response estimated from an STC rating"""
+        return _RESPONSE_SHAPE * min(max(float(stc), 0.0) / 100.0, 1.0)
+
+    @property
+    def bands(self) -> np.ndarray:
+        return THIRD_OCTAVE_BANDS
+
+    def band_mask(self, low: Number, high: Number) -> np.ndarray:
+        """Boolean mask of the bands between low and high Hz, inclusive"""
+        return (THIRD_OCTAVE_BANDS >= low) & (THIRD_OCTAVE_BANDS <= high)
+
+    def at(self, frequency: Number) -> float:
+        """Value at a frequency, interpolated between bands"""
+        return float(np.interp(math.log2(frequency), _LOG_BANDS, self.values))
+
+    def mean(self, low: Optional[Number] = None, high: Optional[Number] = None) -> float:
+        """Mean over all bands, or over the bands between low and high Hz"""
+        if low is None and high is None:
+            return float(self.values.mean())
+        mask = self.band_mask(low if low is not None else 0, high if high is not None else math.inf)
+        return float(self.values[mask].mean()) if mask.any() else 0.0
+
+    def min(self) -> float:
+        return float(self.values.min())
+
+    def max(self) -> float:
+        return float(self.values.max())
+
+    def clip(self, low: Optional[Number] = None, high: Optional[Number] = None) -> 'Spectrum':
+        return Spectrum(np.clip(self.values, low, high))
+
+    def to_dict(self, bands: Optional[Iterable[Number]] = None) -> Dict[str, float]:
+        """String-keyed values for JSON, for every band or the given frequencies"""
+        if bands is None:
+            return {f"{band:g}": float(value) for band, value in zip(THIRD_OCTAVE_BANDS, self.values)}
+        return {f"{band:g}": self.at(band) for band in bands}
+
+    def _operand(self, other):
+        return other.values if isinstance(other, Spectrum) else other
+
+    def __add__(self, other):
+        return Spectrum(self.values + self._operand(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Spectrum(self.values - self._operand(other))
+
+    def __rsub__(self, other):
+        return Spectrum(self._operand(other) - self.values)
+
+    def __mul__(self, other):
+        return Spectrum(self.values * self._operand(other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return Spectrum(self.values / self._operand(other))
+
+    def __neg__(self):
+        return Spectrum(-self.values)
+
+    def __eq__(self, other):
+        return isinstance(other, Spectrum) and np.array_equal(self.values, other.values)
+
+    def __hash__(self):
+        return hash(self.values.tobytes())
+
+    def __getstate__(self):
+        return self.values.tolist()
+
+    def __setstate__(self, state):
+        Spectrum.__init__(self, state)
+
+    def __repr__(self):
+        return f"Spectrum({np.round(self.values, 2).tolist()})"
+
+
+_RESPONSE_SHAPE = Spectrum.from_mapping(RESPONSE_SHAPE)
+
+
+def measured_transmission_loss(characteristics: Mapping[str, Any]) -> Optional[Spectrum]:
+    """TL curve stored with a solution's characteristics, or None if it has none"""
+    measured = characteristics.get('transmission_loss')
+    if not isinstance(measured, Mapping):
+        measured = (characteristics.get('acoustic_properties') or {}).get('transmission_loss')
+    if isinstance(measured, Mapping):
+        spectrum = Spectrum.from_mapping(measured)
+        if spectrum.max() > 0:
+            return spectrum
+    return None
+
+
+def solution_transmission_loss(characteristics: Mapping[str, Any], stc: Optional[Number] = None) -> Spectrum:
+    """TL curve of a solution: its measured curve if it has one, otherwise estimated from STC"""
+    measured = measured_transmission_loss(characteristics)
+    if measured is not None:
+        return measured
+    if stc is None:
+        stc = characteristics.get('stc_rating', 0) or 0
+    return Spectrum.from_stc(stc)
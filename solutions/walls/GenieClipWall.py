@@ -8,7 +8,7 @@ from solutions.solutions import get_solutions_manager
 from typing import Dict, List, Optional, Any
 import math
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from solutions.cache_manager import get_cache_manager
 
 logger = logging.getLogger(__name__)
@@ -235,22 +235,24 @@ class GenieClipWallSP15(BaseSP15Solution, GenieClipWallStandard):
                 'error': str(e)  # Include error message in result
                 }
 
-def load_genieclipwall_solutions():
-    """Load GenieClip Wall solutions (Standard and SP15) from MongoDB and cache them."""
+def load_genieclipwall_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load GenieClip Wall solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['walls']
     standard_id = ids['GenieClipWallStandard']
     sp15_id = ids['GenieClipWallSP15']
-    standard_doc = get_solution_by_id('wallsolutions', standard_id)
-    sp15_doc = get_solution_by_id('wallsolutions', sp15_id)
+    standard_doc = get_variant_document(docs, 'wallsolutions', 'GenieClipWallStandard', standard_id)
+    sp15_doc = get_variant_document(docs, 'wallsolutions', 'GenieClipWallSP15', sp15_id)
     if not standard_doc:
         raise ValueError(f"No data found for GenieClipWallStandard with id {standard_id}")
     if not sp15_doc:
         raise ValueError(f"No data found for GenieClipWallSP15 with id {sp15_id}")
-    standard = GenieClipWallStandard()
-    sp15 = GenieClipWallSP15()
-    standard._solution_data = standard_doc
-    sp15._solution_data = sp15_doc
+    standard = GenieClipWallStandard.from_document(standard_doc)
+    sp15 = GenieClipWallSP15.from_document(sp15_doc)
     cache_manager.set('genieclipwall_standard', standard, 3600)
     cache_manager.set('genieclipwall_sp15', sp15, 3600)
     return standard, sp15
\ No newline at end of file
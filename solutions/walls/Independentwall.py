@@ -25,15 +25,15 @@ uses the following key components and patterns:
 import logging
 from solutions.base_calculator import BaseCalculator
 from solutions.solution_mapping_new import SolutionMapping
-import math
 from solutions.base_solution import BaseSolution
 from solutions.material_properties import get_material_properties
 from solutions.solutions import get_solutions_manager
 from typing import Dict, List, Optional, Any
 from solutions.walls.base_wall import BaseWall
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from solutions.cache_manager import get_cache_manager
+from solutions.quantity_engine import board_area, extra_count, line_count
 from solutions.base_sp15 import BaseSP15Solution
 
 logger = logging.getLogger(__name__)
@@ -75,11 +75,11 @@ class IndependentWallStandard(BaseWall):
             
             # Calculate area and stud quantities
             area = length * height
-            studs_needed = math.ceil(length / self.STUD_SPACING)
-            extra_studs = math.ceil(studs_needed * 0.1)  # 10% extra for cuts
+            studs_needed = line_count(length, self.STUD_SPACING)
+            extra_studs = extra_count(studs_needed)  # 10% extra for cuts
             
             # Calculate plasterboard quantities
-            plasterboard_quantity = area * self.plasterboard_layers * 1.1  # 10% waste
+            plasterboard_quantity = board_area(area, self.plasterboard_layers)  # 10% waste
             
             # Log cache status
             cache_status = self.get_cache_status()
@@ -202,29 +202,31 @@ class IndependentWallSP15(BaseSP15Solution, IndependentWallStandard):
             logger.error(f"Error getting SP15 characteristics: {e}")
             return {}
 
-def load_independentwall_solutions():
-    """Load Independent Wall solutions (Standard and SP15) from MongoDB and cache them."""
+def load_independentwall_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load Independent Wall solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['walls']
     standard_id = ids['IndependentWallStandard']
     sp15_id = ids['IndependentWallSP15']
-    standard_doc = get_solution_by_id('wallsolutions', standard_id)
+    standard_doc = get_variant_document(docs, 'wallsolutions', 'IndependentWallStandard', standard_id)
     if standard_doc:
         print(f"[DEBUG] IndependentWallStandard ({standard_id}) keys: {list(standard_doc.keys())}")
     else:
         print(f"[WARN] IndependentWallStandard ({standard_id}) not found.")
-    sp15_doc = get_solution_by_id('wallsolutions', sp15_id)
+    sp15_doc = get_variant_document(docs, 'wallsolutions', 'IndependentWallSP15', sp15_id)
     if sp15_doc:
         print(f"[DEBUG] IndependentWallSP15 ({sp15_id}) keys: {list(sp15_doc.keys())}")
     else:
         print(f"[WARN] IndependentWallSP15 ({sp15_id}) not found.")
-    standard = IndependentWallStandard() if standard_doc else None
-    sp15 = IndependentWallSP15() if sp15_doc else None
+    standard = IndependentWallStandard.from_document(standard_doc) if standard_doc else None
+    sp15 = IndependentWallSP15.from_document(sp15_doc) if sp15_doc else None
     if standard:
-        standard._solution_data = standard_doc
         cache_manager.set('independentwall_standard', standard, 3600)
     if sp15:
-        sp15._solution_data = sp15_doc
         cache_manager.set('independentwall_sp15', sp15, 3600)
     return standard, sp15
\ No newline at end of file
@@ -6,11 +6,11 @@ from solutions.base_solution import BaseSolution
 from solutions.material_properties import get_material_properties
 from solutions.solution_calculator import get_solutions_manager
 from typing import Dict, List, Optional, Any
-import math
 from solutions.walls.base_wall import BaseWall
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from solutions.cache_manager import get_cache_manager
+from solutions.quantity_engine import grid_count, extra_count
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +38,8 @@ class M20WallStandard(BaseWall):
             
             # Calculate number of panels needed
             area = length * height
-            panels_needed = math.ceil(area / (self.PANEL_SPACING * self.PANEL_SPACING))
-            extra_panels = math.ceil(panels_needed * 0.1)  # 10% extra for cuts
+            panels_needed = grid_count(area, self.PANEL_SPACING)
+            extra_panels = extra_count(panels_needed)  # 10% extra for cuts
             
             # Calculate rubber mount quantities
             mounts_per_panel = 4
@@ -162,29 +162,31 @@ class M20WallSP15(M20WallStandard):
             logger.error(f"Error getting SP15 characteristics: {e}")
             return {}
 
-def load_m20wall_solutions():
-    """Load M20 Wall solutions (Standard and SP15) from MongoDB and cache them."""
+def load_m20wall_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load M20 Wall solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['walls']
     standard_id = ids['M20WallStandard']
     sp15_id = ids['M20WallSP15']
-    standard_doc = get_solution_by_id('wallsolutions', standard_id)
+    standard_doc = get_variant_document(docs, 'wallsolutions', 'M20WallStandard', standard_id)
     if standard_doc:
         print(f"[DEBUG] M20WallStandard ({standard_id}) keys: {list(standard_doc.keys())}")
     else:
         print(f"[WARN] M20WallStandard ({standard_id}) not found.")
-    sp15_doc = get_solution_by_id('wallsolutions', sp15_id)
+    sp15_doc = get_variant_document(docs, 'wallsolutions', 'M20WallSP15', sp15_id)
     if sp15_doc:
         print(f"[DEBUG] M20WallSP15 ({sp15_id}) keys: {list(sp15_doc.keys())}")
     else:
         print(f"[WARN] M20WallSP15 ({sp15_id}) not found.")
-    standard = M20WallStandard() if standard_doc else None
-    sp15 = M20WallSP15() if sp15_doc else None
+    standard = M20WallStandard.from_document(standard_doc) if standard_doc else None
+    sp15 = M20WallSP15.from_document(sp15_doc) if sp15_doc else None
     if standard:
-        standard._solution_data = standard_doc
         cache_manager.set('m20wall_standard', standard, 3600)
     if sp15:
-        sp15._solution_data = sp15_doc
         cache_manager.set('m20wall_sp15', sp15, 3600)
     return standard, sp15
\ No newline at end of file
@@ -25,14 +25,14 @@ key components and patterns:
 import logging
 from solutions.base_calculator import BaseCalculator
 from solutions.solution_mapping_new import SolutionMapping
-import math
 from solutions.base_solution import BaseSolution
 from solutions.material_properties import get_material_properties
 from solutions.solutions import get_solutions_manager
 from typing import Dict, List, Optional, Any
 from solutions.config import SOLUTION_VARIANT_MONGO_IDS
-from solutions.database import get_solution_by_id, get_db
+from solutions.database import get_variant_document, get_db
 from solutions.cache_manager import get_cache_manager
+from solutions.quantity_engine import board_area, extra_count, line_count
 
 logger = logging.getLogger(__name__)
 
@@ -72,12 +72,12 @@ class ResilientBarWallStandard(BaseSolution):
             height = dimensions.get('height', self.height) if dimensions else self.height
             
             # Calculate number of bars needed
-            bars_needed = math.ceil(length / self.BAR_SPACING)
-            extra_bars = math.ceil(bars_needed * 0.1)  # 10% extra for cuts and waste
+            bars_needed = line_count(length, self.BAR_SPACING)
+            extra_bars = extra_count(bars_needed)  # 10% extra for cuts and waste
             
             # Calculate plasterboard quantities
             area = length * height
-            plasterboard_quantity = area * self.plasterboard_layers * 1.1  # 10% waste
+            plasterboard_quantity = board_area(area, self.plasterboard_layers)  # 10% waste
             
             # Log cache status
             cache_status = self.get_cache_status()
@@ -197,29 +197,31 @@ class ResilientBarWallSP15(ResilientBarWallStandard):
             logger.error(f"Error getting SP15 characteristics: {e}")
             return {}
 
-def load_resilientbarwall_solutions():
-    """Load Resilient Bar Wall solutions (Standard and SP15) from MongoDB and cache them."""
+def load_resilientbarwall_solutions(docs: Optional[Dict[str, dict]] = None):
+    """Load Resilient Bar Wall solutions (Standard and SP15) from MongoDB and cache them.
+
+    Pass docs (variant name -> document) to hydrate from a prefetched
+    result set instead of querying per variant.
+    """
     from solutions.database import diagnose_missing_document
     cache_manager = get_cache_manager()
     ids = SOLUTION_VARIANT_MONGO_IDS['walls']
     standard_id = ids['ResilientBarWallStandard']
     sp15_id = ids['ResilientBarWallSP15']
-    standard_doc = get_solution_by_id('wallsolutions', standard_id)
+    standard_doc = get_variant_document(docs, 'wallsolutions', 'ResilientBarWallStandard', standard_id)
     if standard_doc:
         print(f"[DEBUG] ResilientBarWallStandard ({standard_id}) keys: {list(standard_doc.keys())}")
     else:
         print(f"[WARN] ResilientBarWallStandard ({standard_id}) not found.")
-    sp15_doc = get_solution_by_id('wallsolutions', sp15_id)
+    sp15_doc = get_variant_document(docs, 'wallsolutions', 'ResilientBarWallSP15', sp15_id)
     if sp15_doc:
         print(f"[DEBUG] ResilientBarWallSP15 ({sp15_id}) keys: {list(sp15_doc.keys())}")
     else:
         print(f"[WARN] ResilientBarWallSP15 ({sp15_id}) not found.")
-    standard = ResilientBarWallStandard() if standard_doc else None
-    sp15 = ResilientBarWallSP15() if sp15_doc else None
+    standard = ResilientBarWallStandard.from_document(standard_doc) if standard_doc else None
+    sp15 = ResilientBarWallSP15.from_document(sp15_doc) if sp15_doc else None
     if standard:
-        standard._solution_data = standard_doc
         cache_manager.set('resilientbarwall_standard', standard, 3600)
     if sp15:
-        sp15._solution_data = sp15_doc
         cache_manager.set('resilientbarwall_sp15', sp15, 3600)
     return standard, sp15
\ No newline at end of file
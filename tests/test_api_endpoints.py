@@ -0,0 +1,272 @@
+"""Test suite for the JSON API endpoints, through the Flask test client."""
+
+import unittest
+from unittest.mock import patch
+import tempfile
+import threading
+import json
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import AcousticCalculator
+from solutions.solutions import SoundproofingSolutions
+
+
+def _import_app():
+    """Import app.py offline, or None if its Flask extensions are not installed
+
+    The import runs in a temporary directory, so the log files app.py opens
+    there do not touch the tracked ones, with MongoDB and the catalog
+    snapshot pointed away, so no solutions are loaded at import.
+    """
+    workdir = tempfile.mkdtemp()
+    env = {'CATALOG_SNAPSHOT_PATH': os.path.join(workdir, 'catalog_snapshot.bson'), 'MONGODB_URI': ''}
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        with patch.dict(os.environ, env):
+            import app
+        return app
+    except ImportError:
+        return None
+    finally:
+        os.chdir(cwd)
+
+
+app_module = _import_app()
+
+
+class StubSolution:
+    """A registered solution with just the data the endpoints read"""
+
+    def __init__(self, code_name, stc_rating):
+        self.CODE_NAME = code_name
+        self._solution_data = {'solution': code_name, 'stc_rating': stc_rating, 'materials': []}
+
+    def get_characteristics(self):
+        return dict(self._solution_data, solution_id=self.CODE_NAME, surface_type='walls')
+
+
+RECOMMENDATION_PAYLOAD = {
+    'room_type': 'bedroom',
+    'noise_type': 'speech',
+    'noise_level': 7,
+    'room_dimensions': {'length': 4, 'width': 3, 'height': 2.4},
+    'surface_areas': {'walls': 33.6, 'ceiling': 12, 'floor': 12},
+    'existing_construction': {},
+    'noise_profile': {'type': 'speech', 'intensity': 7, 'direction': ['north']},
+}
+
+
+@unittest.skipUnless(app_module, "app.py dependencies are not installed")
+class ApiTestCase(unittest.TestCase):
+    """Test client over a solutions manager holding stub wall solutions."""
+
+    def setUp(self):
+        config = patch.dict(app_module.app.config, {'WTF_CSRF_ENABLED': False, 'RATELIMIT_ENABLED': False})
+        config.start()
+        self.addCleanup(config.stop)
+        self.client = app_module.app.test_client()
+        self.solutions_manager = SoundproofingSolutions()
+        self.calculator = AcousticCalculator()
+        self.calculator.cache_manager = None
+        self.calculator.solutions_manager = self.solutions_manager
+        for code_name, stc_rating in (('StubWallStandard', 52), ('StubWallSP15', 60)):
+            self.solutions_manager.register_solution_with_characteristics(
+                code_name, StubSolution(code_name, stc_rating), 'walls')
+        for target in ('app.get_solutions_manager', 'app.get_acoustic_calculator',
+                       'solutions.recommendation_engine.get_acoustic_calculator'):
+            patcher = patch(target, return_value=(self.solutions_manager if target.endswith('manager')
+                                                  else self.calculator))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post_json(self, url, payload):
+        """POST a payload and decode the response body as JSON"""
+        response = self.client.post(url, data=json.dumps(payload), content_type='application/json')
+        return response, json.loads(response.data)
+
+
+class TestAcousticPropertiesEndpoints(ApiTestCase):
+    """Test that the acoustic properties reach the client as JSON."""
+
+    def test_calculate_acoustic_properties_is_json(self):
+        """Test that the spectra are returned as band -> value objects."""
+        response, body = self.post_json('/api/calculate-acoustic-properties', {
+            'solution_id': 'StubWallStandard', 'dimensions': {'length': 4, 'width': 3, 'height': 2.4}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['stc_rating'], 52)
+        self.assertIsInstance(body['frequency_response'], dict)
+        self.assertIn('500', body['transmission_loss'])
+
+    def test_unknown_solution_is_json(self):
+        """Test that the empty properties of an unknown solution serialize too."""
+        response, body = self.post_json('/api/calculate-acoustic-properties', {
+            'solution_id': 'NoSuchWall', 'dimensions': {'length': 4, 'width': 3, 'height': 2.4}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(body['frequency_response'].values()), {0})
+
+    def test_recommendations_are_json(self):
+        """Test that recommendations carrying acoustic profiles serialize."""
+        response, body = self.post_json('/api/recommendations', RECOMMENDATION_PAYLOAD)
+        self.assertEqual(response.status_code, 200, body)
+        self.assertIn('recommendations', body)
+        self.assertIn('StubWallSP15', json.dumps(body))
+
+
+
+class TestRecommendationsBatchEndpoint(ApiTestCase):
+    """Test /api/recommendations/batch over the stub feature store."""
+
+    def setUp(self):
+        super().setUp()
+        self.rank_prepared_solutions = app_module.rank_prepared_solutions
+        rank = patch('app.rank_prepared_solutions', wraps=self.rank_prepared_solutions)
+        self.rank = rank.start()
+        self.addCleanup(rank.stop)
+
+    def room(self, **changes):
+        """The recommendation payload with some fields replaced"""
+        return dict(RECOMMENDATION_PAYLOAD, **changes)
+
+    def test_results_follow_item_order(self):
+        """Test that each item gets its own slot, in order."""
+        items = [self.room(), self.room(noise_level=4)]
+        response, body = self.post_json('/api/recommendations/batch', {'items': items})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['index'] for result in body['results']], [0, 1])
+        self.assertTrue(all('recommendations' in result for result in body['results']))
+        self.assertEqual(body['distinct_rooms'], 2)
+
+    def test_duplicate_rooms_are_ranked_once(self):
+        """Test that identical rooms, whatever their key order, share one ranking."""
+        reordered = dict(reversed(list(self.room().items())))
+        reordered['room_dimensions'] = {'height': 2.4, 'width': 3, 'length': 4}
+        response, body = self.post_json('/api/recommendations/batch', {'items': [self.room(), reordered, self.room()]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['distinct_rooms'], 1)
+        self.assertEqual(self.rank.call_count, 1)
+        first = body['results'][0]['recommendations']
+        self.assertEqual([result['recommendations'] for result in body['results']], [first] * 3)
+
+    def test_top_k_is_part_of_the_room(self):
+        """Test that the same room asked for a different top_k is ranked separately."""
+        response, body = self.post_json('/api/recommendations/batch',
+                                        {'items': [self.room(), self.room(top_k=1)]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['distinct_rooms'], 2)
+
+    def test_mixed_valid_and_invalid_items(self):
+        """Test that invalid items get an error slot without failing the batch."""
+        missing = {key: value for key, value in self.room().items() if key != 'noise_profile'}
+        items = [self.room(), missing, 'not a room', self.room(top_k=0), self.room()]
+        response, body = self.post_json('/api/recommendations/batch', {'items': items})
+        self.assertEqual(response.status_code, 200)
+        results = body['results']
+        self.assertEqual([result['index'] for result in results], list(range(5)))
+        self.assertIn('recommendations', results[0])
+        self.assertIn('noise_profile', results[1]['error'])
+        self.assertEqual(results[2]['error'], 'Invalid payload format.')
+        self.assertEqual(results[3]['error'], 'top_k must be a positive integer.')
+        self.assertEqual(results[4]['recommendations'], results[0]['recommendations'])
+        self.assertEqual(body['distinct_rooms'], 1)
+
+    def test_all_invalid_items_skip_ranking(self):
+        """Test that a batch with no valid room never ranks."""
+        response, body = self.post_json('/api/recommendations/batch', {'items': [{}, {}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['distinct_rooms'], 0)
+        self.assertTrue(all('error' in result for result in body['results']))
+        self.rank.assert_not_called()
+
+    def test_engine_error_fills_only_its_items(self):
+        """Test that a ranking failure is reported in the slots of that room only."""
+        def rank(candidates, room_inputs, *args, **kwargs):
+            if room_inputs.noise_level == 4:
+                raise RuntimeError("boom")
+            return self.rank_prepared_solutions(candidates, room_inputs, *args, **kwargs)
+        self.rank.side_effect = rank
+        items = [self.room(), self.room(noise_level=4), self.room(noise_level=4)]
+        response, body = self.post_json('/api/recommendations/batch', {'items': items})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('recommendations', body['results'][0])
+        self.assertEqual([result.get('error') for result in body['results'][1:]],
+                         ['Recommendation engine error: boom'] * 2)
+
+    def test_item_cap(self):
+        """Test that batches over RECOMMENDATIONS_BATCH_MAX_ITEMS are rejected."""
+        with patch.dict(os.environ, {'RECOMMENDATIONS_BATCH_MAX_ITEMS': '2'}):
+            response, body = self.post_json('/api/recommendations/batch', {'items': [self.room()] * 3})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('maximum 2', body['error'])
+            response, _ = self.post_json('/api/recommendations/batch', {'items': [self.room()] * 2})
+            self.assertEqual(response.status_code, 200)
+        self.rank.assert_called_once()
+
+    def test_empty_or_malformed_batch(self):
+        """Test that a batch without a non-empty items list is rejected."""
+        for payload in ({'items': []}, {'items': 'rooms'}, {}):
+            response, _ = self.post_json('/api/recommendations/batch', payload)
+            self.assertEqual(response.status_code, 400)
+
+    def test_parallel_matches_sequential(self):
+        """Test that "parallel": true gives the same results as ranking in turn."""
+        threads = []
+
+        def rank(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return self.rank_prepared_solutions(*args, **kwargs)
+        self.rank.side_effect = rank
+        items = [self.room(noise_level=level) for level in (3, 5, 7, 9)] + [self.room(noise_level=5)]
+        with patch.dict(os.environ, {'RECOMMENDATIONS_BATCH_WORKERS': '4'}):
+            _, sequential = self.post_json('/api/recommendations/batch', {'items': items})
+            response, parallel = self.post_json('/api/recommendations/batch', {'items': items, 'parallel': True})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(parallel['distinct_rooms'], 4)
+        self.assertEqual(self.rank.call_count, 8)
+        self.assertTrue(all(name.startswith('recommendations-batch') for name in threads[4:]))
+
+
+
+class TestBuildingQuoteEndpoint(ApiTestCase):
+    """Test /api/quote/building over a stub materials catalogue."""
+
+    CATALOG = {'BoardWall': [{'name': '12.5mm Sound Plasterboard', 'baseCost': 15.0, 'unitsPerM2': 0.4, 'unit': 'sheet'}]}
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch('solutions.building_quote.catalog_materials',
+                        side_effect=lambda solution_id: self.CATALOG.get(solution_id, []))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def building(self, *solutions):
+        return {'name': 'Block A', 'rooms': [{'name': f'Flat {i}', 'length': 4, 'width': 3, 'height': 2.4,
+                                              'solutions': room} for i, room in enumerate(solutions)]}
+
+    def test_known_solutions_are_quoted(self):
+        """Test that a fully priced building is quoted with no unpriced surfaces."""
+        response, body = self.post_json('/api/quote/building', self.building({'walls': 'BoardWall'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(body['totalCost'], 0)
+        self.assertEqual(body['unpricedSurfaces'], [])
+
+    def test_unknown_solutions_are_rejected(self):
+        """Test that unknown solution ids get a 400 naming them, not a partial total."""
+        response, body = self.post_json('/api/quote/building', self.building(
+            {'walls': 'BoardWall'}, {'walls': 'BoardWall', 'floor': 'NoSuchFloor', 'ceiling': 'NoSuchCeiling'}))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(body['unknownSolutions'], ['NoSuchCeiling', 'NoSuchFloor'])
+        self.assertEqual(body['unpricedSurfaces'], [
+            {'room': 'Flat 1', 'surface': 'ceiling', 'solution': 'NoSuchCeiling'},
+            {'room': 'Flat 1', 'surface': 'floor', 'solution': 'NoSuchFloor'},
+        ])
+        self.assertNotIn('totalCost', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Test suite for whole-building quotes."""
+
+import unittest
+import math
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.building_quote import Building, BuildingRoom
+from solutions.quantity_engine import material_quantity
+
+CATALOG = {
+    'BoardWall': [
+        {'name': '12.5mm Sound Plasterboard', 'baseCost': 15.0, 'unitsPerM2': 0.4, 'unit': 'sheet'},
+        {'name': 'Acoustic Sealant', 'baseCost': 8.0, 'unitsPerM2': 0.1, 'unit': 'tube'},
+    ],
+    'ClipCeiling': [
+        {'name': 'Genie Clip', 'baseCost': 1.5, 'unitsPerM2': 3.0, 'unit': 'clip'},
+        {'name': '12.5mm Sound Plasterboard', 'baseCost': 15.0, 'unitsPerM2': 0.4, 'unit': 'sheet'},
+    ],
+}
+
+
+def make_building(count):
+    rooms = [{'name': f'Flat {i}', 'dimensions': {'length': 3.1 + i % 3, 'width': 2.7, 'height': 2.4},
+              'solutions': {'walls': 'BoardWall', 'ceiling': 'ClipCeiling'},
+              'blockages': {'north': [{'width': 0.9, 'height': 2.0}]}} for i in range(count)]
+    return Building.from_dict({'name': 'Block A', 'rooms': rooms})
+
+
+class TestBuildingQuote(unittest.TestCase):
+    """Test surface areas, rollup and costs of a building quote."""
+
+    def test_room_surfaces_and_blockages(self):
+        """Test that walls follow the room sides and blockages reduce net area."""
+        room = BuildingRoom.from_dict({'length': 4, 'width': 3, 'height': 2.5,
+                                       'solutions': {'walls': 'BoardWall', 'east': 'Other', 'floor': 'F'},
+                                       'blockages': {'east': [{'width': 1, 'height': 2}]}})
+        self.assertEqual(room.surfaces(), [('north', 'BoardWall', 4, 2.5), ('south', 'BoardWall', 4, 2.5),
+                                           ('east', 'Other', 3, 2.5), ('west', 'BoardWall', 3, 2.5),
+                                           ('floor', 'F', 4, 3)])
+        self.assertEqual(room.blockage_area('east'), 2)
+        with self.assertRaises(ValueError):
+            BuildingRoom.from_dict({'length': 0, 'width': 3, 'height': 2.5})
+
+    def test_single_room_matches_per_surface_quantities(self):
+        """Test a one-room quote against the demand of each surface."""
+        lookup = MagicMock(side_effect=CATALOG.get)
+        quote = make_building(1).quote(lookup)
+
+        room = make_building(1).rooms[0]
+        wall_area = 2 * (room.length + room.width) * room.height - 0.9 * 2.0
+        boards = (wall_area + room.length * room.width) * 0.4 * 1.1
+        materials = {m['name']: m for m in quote.materials}
+        self.assertEqual(materials['12.5mm Sound Plasterboard']['quantity'], math.ceil(boards))
+        self.assertEqual(materials['Genie Clip']['quantity'],
+                         material_quantity(CATALOG['ClipCeiling'][0], room.length * room.width, 0))
+        self.assertEqual(lookup.call_count, 2)
+        self.assertAlmostEqual(quote.total_cost, quote.materials_cost + quote.labor_cost)
+
+    def test_building_rollup_rounds_once(self):
+        """Test that building purchase quantities never exceed room-by-room rounding."""
+        lookup = MagicMock(side_effect=CATALOG.get)
+        quote = make_building(300).quote(lookup)
+
+        self.assertEqual(lookup.call_count, 2)
+        self.assertEqual(len(quote.rooms), 300)
+        self.assertEqual(set(quote.timings_ms), {'surfaces', 'quantities', 'rollup', 'total'})
+        for material in quote.materials:
+            self.assertLessEqual(material['quantity'], material['perRoomQuantity'])
+        boards = next(m for m in quote.materials if m['name'] == '12.5mm Sound Plasterboard')
+        self.assertLess(boards['quantity'], boards['perRoomQuantity'])
+        self.assertLessEqual(quote.materials_cost, sum(r['materialsCost'] for r in quote.rooms))
+
+    def test_unknown_solutions_are_skipped(self):
+        """Test that surfaces without catalogue materials are left unpriced."""
+        building = Building([BuildingRoom('Store', 2, 2, 2.4, {'floor': 'Missing'})])
+        quote = building.quote(lambda solution_id: [])
+        self.assertEqual(quote.materials, [])
+        self.assertEqual(quote.total_cost, 0)
+        self.assertEqual(quote.to_dict()['unpricedSurfaces'], [{'room': 'Store', 'surface': 'floor', 'solution': 'Missing'}])
+
+    def test_unpriced_surfaces_are_reported(self):
+        """Test that only the surfaces of unknown solutions are listed as unpriced."""
+        building = Building([BuildingRoom('Lounge', 4, 3, 2.4, {'walls': 'BoardWall', 'east': 'Gone', 'ceiling': 'Gone'}),
+                             BuildingRoom('Hall', 2, 1, 2.4, {'floor': 'Lost', 'ceiling': 'ClipCeiling'})])
+        quote = building.quote(lambda solution_id: CATALOG.get(solution_id, []))
+        self.assertEqual(quote.unpriced_surfaces, [
+            {'room': 'Lounge', 'surface': 'east', 'solution': 'Gone'},
+            {'room': 'Lounge', 'surface': 'ceiling', 'solution': 'Gone'},
+            {'room': 'Hall', 'surface': 'floor', 'solution': 'Lost'},
+        ])
+        self.assertEqual(quote.unpriced_solutions, ['Gone', 'Lost'])
+        self.assertGreater(quote.total_cost, 0)
+        self.assertEqual(make_building(2).quote(CATALOG.get).unpriced_surfaces, [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
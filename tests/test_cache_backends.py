@@ -0,0 +1,141 @@
+"""Test suite for the shared (L2) cache backend."""
+
+import unittest
+import time
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.cache_backends import CacheBackend, RedisCacheBackend, serialize, deserialize, COMPRESS_THRESHOLD
+from solutions.cache_manager import CacheManager
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class TestSerializer(unittest.TestCase):
+    """Test the shared cache serializer."""
+
+    def test_round_trip(self):
+        """Test that small and large values decode to what was stored."""
+        small = {'stc_rating': 55, 'materials': ['Soundboard']}
+        large = {'materials': ['Acoustic Mineral Wool'] * 500}
+
+        self.assertEqual(deserialize(serialize(small)), small)
+        self.assertEqual(deserialize(serialize(large)), large)
+
+    def test_large_values_are_compressed(self):
+        """Test that values above the threshold are stored compressed."""
+        data = serialize({'materials': ['Acoustic Mineral Wool'] * 500})
+        self.assertTrue(data.startswith(b'z'))
+        self.assertLess(len(data), COMPRESS_THRESHOLD)
+
+
+@unittest.skipUnless(fakeredis, "fakeredis is not installed")
+class TestTwoTierCache(unittest.TestCase):
+    """Test CacheManager with a shared Redis backend."""
+
+    def setUp(self):
+        """Create two workers' caches over one fake Redis."""
+        self.redis = fakeredis.FakeRedis()
+        self.worker_a = CacheManager(backend=RedisCacheBackend(client=self.redis), namespace='test', version='1')
+        self.worker_b = CacheManager(backend=RedisCacheBackend(client=self.redis), namespace='test', version='1')
+
+    def test_value_is_shared_between_workers(self):
+        """Test that a value set by one worker is served to another."""
+        self.worker_a.set('recommendations_abc', {'score': 0.9})
+
+        self.assertEqual(self.worker_b.get('recommendations_abc'), {'score': 0.9})
+        self.assertEqual(self.worker_b.get_stats()['l2']['hits'], 1)
+        # The L2 hit is now held in worker B's L1
+        self.assertIn('recommendations_abc', self.worker_b.get_all_keys())
+
+    def test_get_or_compute_reuses_other_workers_result(self):
+        """Test that get_or_compute does not recompute a value another worker cached."""
+        self.worker_a.get_or_compute('recommendations_abc', lambda: {'score': 0.9})
+        compute = MagicMock(return_value={'score': 0.1})
+
+        self.assertEqual(self.worker_b.get_or_compute('recommendations_abc', compute), {'score': 0.9})
+        compute.assert_not_called()
+
+    def test_version_prefix_isolates_entries(self):
+        """Test that bumping the version makes old entries unreachable."""
+        self.worker_a.set('recommendations_abc', {'score': 0.9})
+        upgraded = CacheManager(backend=RedisCacheBackend(client=self.redis), namespace='test', version='2')
+
+        self.assertIsNone(upgraded.get('recommendations_abc'))
+        self.assertTrue(self.redis.exists('test:v1:recommendations_abc'))
+
+    def test_l1_ttl_is_capped(self):
+        """Test that L1 copies expire sooner than the shared entry."""
+        cache = CacheManager(backend=RedisCacheBackend(client=self.redis), l1_ttl=5, namespace='test')
+        cache.set('recommendations_abc', {'score': 0.9}, ttl=3600)
+
+        local_expiry = cache._shard('recommendations_abc').expiry['recommendations_abc']
+        shared_ttl = self.redis.ttl('test:v1:recommendations_abc')
+        self.assertLess(local_expiry - time.time(), 10)
+        self.assertGreater(shared_ttl, 3000)
+
+    def test_l1_copy_does_not_outlive_shared_entry(self):
+        """Test that an L2 hit is held in L1 no longer than the shared entry has left, even without an L1 cap."""
+        self.worker_a.set('recommendations_abc', {'score': 0.9}, ttl=60)
+        uncapped = CacheManager(backend=RedisCacheBackend(client=self.redis), l1_ttl=0, namespace='test')
+
+        self.assertEqual(uncapped.get('recommendations_abc'), {'score': 0.9})
+        local_expiry = uncapped._shard('recommendations_abc').expiry['recommendations_abc']
+        self.assertLessEqual(local_expiry - time.time(), 60)
+
+    def test_clear_and_delete_reach_the_backend(self):
+        """Test that delete and clear remove shared entries too."""
+        self.worker_a.set('a', 1)
+        self.worker_a.set('b', 2)
+        self.redis.set('other:v1:a', b'untouched')
+
+        self.assertTrue(self.worker_b.delete('a'))
+        self.assertFalse(self.redis.exists('test:v1:a'))
+        self.worker_b.clear()
+
+        self.assertIsNone(self.worker_b.get('b'))
+        self.assertTrue(self.redis.exists('other:v1:a'))
+
+
+class TestBackendInterface(unittest.TestCase):
+    """Test the backend interface."""
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test that a backend missing part of the interface fails at instantiation."""
+        class GetOnlyBackend(CacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyBackend()
+
+
+class TestBackendFailure(unittest.TestCase):
+    """Test that an unreachable backend does not break the cache."""
+
+    def test_errors_bypass_backend(self):
+        """Test that after a backend error the cache keeps working from L1 and skips L2."""
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = ConnectionError("redis down")
+        client.set.side_effect = ConnectionError("redis down")
+        cache = CacheManager(backend=RedisCacheBackend(client=client), namespace='test')
+
+        self.assertIsNone(cache.get('missing'))
+        self.assertTrue(cache.set('key', 1))
+        self.assertEqual(cache.get('key'), 1)
+
+        self.assertEqual(client.pipeline.return_value.execute.call_count, 1)
+        client.set.assert_not_called()
+        self.assertEqual(cache.get_stats()['l2']['errors'], 1)
+        self.assertTrue(cache.get_stats()['l2']['bypassed'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
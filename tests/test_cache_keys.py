@@ -0,0 +1,72 @@
+"""Test suite for canonical calculation cache keys."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import subprocess
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.cache_keys import build_cache_key
+from solutions.cache_manager import CacheManager
+
+
+class TestBuildCacheKey(unittest.TestCase):
+    """Test that equivalent inputs share a key and different inputs do not."""
+
+    def test_equivalent_inputs_share_a_key(self):
+        """Test that key order, int/float and float noise do not change the key."""
+        key = build_cache_key("acoustic_props", "GenieClipWallStandard",
+                              {'length': 5, 'width': 4.0, 'height': 2.4})
+        self.assertEqual(key, build_cache_key("acoustic_props", "GenieClipWallStandard",
+                                              {'height': 2.4000000001, 'width': 4, 'length': 5.0}))
+        self.assertTrue(key.startswith("acoustic_props_"))
+
+    def test_dimension_names_are_part_of_the_key(self):
+        """Test that swapping values between dimensions gives a different key."""
+        self.assertNotEqual(build_cache_key("surface_areas", {'length': 5, 'width': 4}),
+                            build_cache_key("surface_areas", {'length': 4, 'width': 5}))
+
+    def test_nested_params(self):
+        """Test that nested dicts, which hash(frozenset()) rejected, are supported."""
+        cache = CacheManager()
+        params = {'solution_id': 'abc', 'dimensions': {'length': 5, 'height': 2.4}}
+        cache.set_cached_calculation('material_cost', params, 120.0)
+
+        self.assertEqual(cache.get_cached_calculation(
+            'material_cost', {'dimensions': {'height': 2.4, 'length': 5.0}, 'solution_id': 'abc'}), 120.0)
+
+    def test_key_is_stable_across_processes(self):
+        """Test that the key does not depend on the per-process hash seed."""
+        code = ("from solutions.cache_keys import build_cache_key; "
+                "print(build_cache_key('stc_rating', 'abc', {'x', 'y', 'z'}))")
+        root = os.path.join(os.path.dirname(__file__), '..')
+        keys = {
+            subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True,
+                           env={**os.environ, 'PYTHONHASHSEED': seed}).stdout.strip()
+            for seed in ('1', '2')
+        }
+        self.assertEqual(keys, {build_cache_key('stc_rating', 'abc', {'x', 'y', 'z'})})
+
+    def test_compatibility_keys_name_their_params(self):
+        """Test that a room-only and a noise-only compatibility lookup never share a cache entry."""
+        from solutions.acoustic_calculator import AcousticCalculator
+
+        calculator = AcousticCalculator()
+        calculator.cache_manager = MagicMock()
+        calculator.cache_manager.get.return_value = None
+        with patch.object(calculator, '_calculate_dynamic_compatibility', return_value=0.5):
+            calculator.calculate_compatibility('GenieClipWallStandard', room_type='studio')
+            calculator.calculate_compatibility('GenieClipWallStandard', noise_type='studio')
+        keys = [call.args[0] for call in calculator.cache_manager.set.call_args_list]
+        self.assertEqual(keys, [
+            build_cache_key("compatibility", "GenieClipWallStandard", room_type='studio', noise_type=None),
+            build_cache_key("compatibility", "GenieClipWallStandard", room_type=None, noise_type='studio'),
+        ])
+        self.assertNotEqual(keys[0], keys[1])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,171 @@
+"""Test suite for CacheManager bounds and eviction."""
+
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.cache_manager import CacheManager
+
+
+class TestCacheBounds(unittest.TestCase):
+    """Test LRU eviction, memory budget and expiry sweeping."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted at max_entries."""
+        cache = CacheManager(max_entries=2, shards=1)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # 'b' is now least recently used
+        cache.set('c', 3)
+
+        self.assertTrue(cache.has('a'))
+        self.assertFalse(cache.has('b'))
+        self.assertTrue(cache.has('c'))
+        self.assertEqual(cache.get_stats()['evicted'], 1)
+
+    def test_memory_budget(self):
+        """Test that entries are evicted to stay within max_bytes."""
+        cache = CacheManager(max_bytes=20000, shards=1)
+        for i in range(10):
+            cache.set(f'key_{i}', 'x' * 5000)
+
+        stats = cache.get_stats()
+        self.assertLessEqual(stats['bytes'], 20000)
+        self.assertGreater(stats['evicted'], 0)
+        self.assertTrue(cache.has('key_9'))
+
+    def test_oversized_value_is_rejected(self):
+        """Test that a single value larger than the budget is not cached."""
+        cache = CacheManager(max_bytes=1000, shards=1)
+        self.assertFalse(cache.set('big', 'x' * 5000))
+        self.assertEqual(cache.get_stats()['size'], 0)
+
+    def test_sweep_removes_expired_entries(self):
+        """Test that expired entries are swept without being read again."""
+        cache = CacheManager(sweep_interval=0)
+        cache.set('short', 1, ttl=1)
+        cache.set('long', 2, ttl=3600)
+        cache._shard('short').expiry['short'] = time.time() - 1
+
+        cache.set('other', 3)  # set() triggers the sweep
+
+        self.assertNotIn('short', cache.get_all_keys())
+        self.assertIn('long', cache.get_all_keys())
+        self.assertEqual(cache.get_stats()['expired_removed'], 1)
+
+    def test_overwrite_keeps_byte_count(self):
+        """Test that overwriting a key does not double-count its size."""
+        cache = CacheManager()
+        cache.set('a', 'x' * 1000)
+        first = cache.get_stats()['bytes']
+        cache.set('a', 'x' * 1000)
+        self.assertEqual(cache.get_stats()['bytes'], first)
+        cache.delete('a')
+        self.assertEqual(cache.get_stats()['bytes'], 0)
+
+
+class TestCacheConcurrency(unittest.TestCase):
+    """Test that concurrent access keeps the cache and its counters consistent."""
+
+    def test_counters_are_not_lost(self):
+        """Test that every get and set is counted under concurrent access."""
+        cache = CacheManager(shards=4)
+        threads_count, operations = 8, 500
+        errors = []
+
+        def worker(worker_id):
+            try:
+                for i in range(operations):
+                    key = f'key_{(worker_id * operations + i) % 64}'
+                    cache.set(key, i)
+                    cache.get(key)
+                    cache.get(f'missing_{i}')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.get_stats()
+        self.assertEqual(errors, [])
+        self.assertEqual(stats['added'], threads_count * operations)
+        self.assertEqual(stats['hits'] + stats['misses'], 2 * threads_count * operations)
+        self.assertGreaterEqual(stats['misses'], threads_count * operations)
+        self.assertEqual(stats['size'], 64)
+
+
+class TestGetOrCompute(unittest.TestCase):
+    """Test single-flight computation and stale-while-revalidate."""
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent misses on one key run the computation once."""
+        cache = CacheManager()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'stc': 55}
+
+        def worker():
+            results.append(cache.get_or_compute('recommendations_abc', compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'stc': 55}] * 8)
+        self.assertEqual(cache.get('recommendations_abc'), {'stc': 55})
+
+    def test_errors_reach_all_waiters_and_are_not_cached(self):
+        """Test that a failed computation raises for callers and is retried next time."""
+        cache = CacheManager()
+
+        def fail():
+            raise RuntimeError("db down")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute('all_materials', fail)
+        self.assertEqual(cache.get_or_compute('all_materials', lambda: ['wool']), ['wool'])
+
+    def test_none_is_not_cached(self):
+        """Test that a None result is returned but not stored."""
+        cache = CacheManager()
+        self.assertIsNone(cache.get_or_compute('acoustic_props_x', lambda: None))
+        self.assertFalse(cache.has('acoustic_props_x'))
+
+    def test_stale_value_served_while_revalidating(self):
+        """Test that a stale entry is returned at once and refreshed in the background."""
+        cache = CacheManager()
+        cache.set('all_materials', ['old'], ttl=60, stale_ttl=600)
+        cache._shard('all_materials').stale_after['all_materials'] = time.time() - 1
+        refreshed = threading.Event()
+
+        def compute():
+            refreshed.set()
+            return ['new']
+
+        self.assertFalse(cache.has('all_materials'))
+        self.assertEqual(cache.get_or_compute('all_materials', compute, ttl=60, stale_ttl=600), ['old'])
+        self.assertTrue(refreshed.wait(1))
+        for _ in range(100):
+            if cache.get('all_materials') == ['new']:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.get('all_materials'), ['new'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,170 @@
+"""Test suite for the on-disk catalog snapshot."""
+
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+
+from bson import ObjectId
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions import catalog_snapshot
+from solutions.catalog_snapshot import (
+    catalog_fingerprint,
+    get_catalog_snapshot,
+    read_catalog_snapshot,
+    refresh_catalog_snapshot,
+    reset_catalog_snapshot,
+    write_catalog_snapshot,
+)
+
+SOLUTIONS = {
+    'walls': {'GenieClipWallStandard': {'_id': ObjectId('671bae0fc10b2e4a14c90e31'), 'materials': []}},
+    'ceilings': {},
+}
+MATERIALS = [{'_id': ObjectId('671bae0fc10b2e4a14c90e99'), 'name': 'Acoustic Mineral Wool'}]
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+    """Test writing, reading and refreshing the catalog snapshot."""
+
+    def setUp(self):
+        """Point the snapshot at a temporary file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'catalog_snapshot.bson')
+        self.env = patch.dict(os.environ, {'CATALOG_SNAPSHOT_PATH': self.path, 'CATALOG_SNAPSHOT': '1'})
+        self.env.start()
+        reset_catalog_snapshot()
+
+    def tearDown(self):
+        """Remove the temporary snapshot."""
+        reset_catalog_snapshot()
+        self.env.stop()
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test that a written snapshot is read back with ObjectIds intact."""
+        write_catalog_snapshot(SOLUTIONS, MATERIALS)
+        reset_catalog_snapshot()
+
+        snapshot = get_catalog_snapshot()
+        self.assertIsNotNone(snapshot)
+        self.assertEqual(snapshot['solutions'], SOLUTIONS)
+        self.assertEqual(snapshot['materials'], MATERIALS)
+
+    def test_version_mismatch_is_ignored(self):
+        """Test that a snapshot from another format version is not used."""
+        write_catalog_snapshot(SOLUTIONS, MATERIALS)
+        with patch.object(catalog_snapshot, 'SNAPSHOT_VERSION', catalog_snapshot.SNAPSHOT_VERSION + 1):
+            self.assertIsNone(read_catalog_snapshot())
+
+    def test_materials_fallback_when_db_unavailable(self):
+        """Test that materials are served from the snapshot while MongoDB is down."""
+        from solutions.database import get_all_materials_from_db
+
+        write_catalog_snapshot(SOLUTIONS, MATERIALS)
+        with patch('solutions.database.get_db', return_value=None):
+            self.assertEqual(get_all_materials_from_db(), MATERIALS)
+
+    def test_refresh_only_writes_on_change(self):
+        """Test that the background check rewrites the snapshot only if the catalog changed."""
+        write_catalog_snapshot(SOLUTIONS, MATERIALS)
+        changed = MATERIALS + [{'name': 'Soundboard'}]
+
+        with patch('solutions.db_init.get_db', return_value=object()), \
+                patch('solutions.database.load_solution_variant_documents', return_value=SOLUTIONS), \
+                patch('solutions.database.get_all_materials_from_db', return_value=MATERIALS):
+            self.assertFalse(refresh_catalog_snapshot())
+
+        with patch('solutions.db_init.get_db', return_value=object()), \
+                patch('solutions.database.load_solution_variant_documents', return_value=SOLUTIONS), \
+                patch('solutions.database.get_all_materials_from_db', return_value=changed):
+            self.assertTrue(refresh_catalog_snapshot())
+
+        self.assertEqual(get_catalog_snapshot()['materials'], changed)
+
+    def test_fingerprint_ignores_order(self):
+        """Test that the same catalog in another field or document order is not a change."""
+        reordered_solutions = {
+            'ceilings': {},
+            'walls': {'GenieClipWallStandard': {'materials': [], '_id': ObjectId('671bae0fc10b2e4a14c90e31')}},
+        }
+        materials = MATERIALS + [{'_id': ObjectId('671bae0fc10b2e4a14c90e98'), 'name': 'Soundboard'}]
+        reordered_materials = [{'name': m['name'], '_id': m['_id']} for m in reversed(materials)]
+        self.assertEqual(catalog_fingerprint(SOLUTIONS, materials),
+                         catalog_fingerprint(reordered_solutions, reordered_materials))
+        self.assertNotEqual(catalog_fingerprint(SOLUTIONS, materials), catalog_fingerprint(SOLUTIONS, MATERIALS))
+
+
+class TestOfflineBoot(unittest.TestCase):
+    """Test booting the solution catalogue from the snapshot with MongoDB down."""
+
+    def setUp(self):
+        """Write a snapshot with a document for every variant and unset MONGODB_URI."""
+        from solutions.config import SOLUTION_VARIANT_MONGO_IDS
+        from tests.utils.singleton_reset import reset_all_singletons
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'catalog_snapshot.bson')
+        environ = {k: v for k, v in os.environ.items() if k != 'MONGODB_URI'}
+        environ.update({'CATALOG_SNAPSHOT_PATH': self.path, 'CATALOG_SNAPSHOT': '1'})
+        self.env = patch.dict(os.environ, environ, clear=True)
+        self.env.start()
+        reset_all_singletons()
+        reset_catalog_snapshot()
+        self.variants = {
+            surface_type: {
+                variant: {'_id': ObjectId(object_id) if ObjectId.is_valid(object_id) else object_id,
+                          'solution': variant, 'displayName': variant, 'stc_rating': 50,
+                          'materials': [{'name': 'Acoustic Mineral Wool', 'coverage': 100, 'cost': 5}]}
+                for variant, object_id in variant_ids.items()
+            }
+            for surface_type, variant_ids in SOLUTION_VARIANT_MONGO_IDS.items()
+        }
+        write_catalog_snapshot(self.variants, MATERIALS)
+        reset_catalog_snapshot()
+
+    def tearDown(self):
+        """Remove the snapshot and reset the singletons."""
+        from tests.utils.singleton_reset import reset_all_singletons
+
+        reset_catalog_snapshot()
+        reset_all_singletons()
+        self.env.stop()
+        self.tmpdir.cleanup()
+
+    def test_boots_from_snapshot_without_mongodb(self):
+        """Test that every solution registers and the feature store fills from the snapshot alone."""
+        from solutions.catalog_loader import initialize_all_solutions
+        from solutions.db_init import get_db
+        from solutions.solutions import SoundproofingSolutions
+
+        self.assertIsNone(get_db())
+        manager = SoundproofingSolutions()
+        results = initialize_all_solutions(manager, refresh_in_background=False)
+
+        self.assertFalse([result for result in results if any(key.endswith('_error') for key in result)])
+        expected = sum(len(variants) for variants in self.variants.values())
+        self.assertEqual(len(manager.get_all_solutions()), expected)
+        self.assertEqual(len(manager.get_feature_store()), expected)
+
+    def test_reinitialization_swaps_the_catalog(self):
+        """Test that re-initializing replaces the catalogue in one step."""
+        from solutions.catalog_loader import initialize_all_solutions
+        from solutions.solutions import SoundproofingSolutions
+
+        manager = SoundproofingSolutions()
+        initialize_all_solutions(manager, refresh_in_background=False)
+        solutions, version = manager.get_all_solutions(), manager.get_feature_store().version
+        initialize_all_solutions(manager, refresh_in_background=False)
+
+        self.assertIsNot(manager.get_all_solutions(), solutions)
+        self.assertEqual(set(manager.get_all_solutions()), set(solutions))
+        self.assertGreater(manager.get_feature_store().version, version)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+"""Test suite for composite transmission loss with openings."""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import NoiseProfile as AcousticNoiseProfile
+from solutions.cache_manager import CacheManager
+from solutions.composite_tl import (composite_results, composite_transmission_loss, opening_mix,
+                                    surface_blockages)
+from solutions.ranking_kernel import RankingCandidates
+from solutions.spectrum import BAND_COUNT, Spectrum
+
+
+class TestCompositeTransmissionLoss(unittest.TestCase):
+    """Test the area-weighted combination, opening mixes and caching."""
+
+    def test_weak_opening_dominates(self):
+        """Test that 10% of 20 dB opening in a 50 dB wall gives about 30 dB."""
+        composite = composite_transmission_loss(np.full((1, BAND_COUNT), 50.0), np.array([[0.1]]),
+                                                np.full((1, BAND_COUNT), 20.0))
+        self.assertTrue(np.allclose(composite, -10 * np.log10(0.9e-5 + 0.1e-2)))
+        unchanged = composite_transmission_loss(np.full((1, BAND_COUNT), 50.0), np.zeros((1, 0)),
+                                                np.zeros((0, BAND_COUNT)))
+        self.assertTrue(np.allclose(unchanged, 50.0))
+
+    def test_opening_mix(self):
+        """Test that blockages are grouped by STC as fractions of the surface."""
+        blockages = {'north': [{'type': 'door', 'width': 1, 'height': 2}],
+                     'walls': [{'type': 'Socket', 'dimensions': {'width': 0.1, 'height': 0.1}},
+                               {'type': 'window', 'stc': 20, 'area': 2}],
+                     'ceiling': [{'type': 'light', 'width': 1, 'length': 1}]}
+        walls = surface_blockages(blockages, 'walls')
+        self.assertEqual(len(walls), 3)
+        self.assertEqual(opening_mix(walls, 'walls', 40), ((20.0, 0.1), (35.0, 0.00025)))
+        self.assertEqual(opening_mix(surface_blockages(blockages, 'ceiling'), 'ceiling', 10), ((30.0, 0.1),))
+        self.assertEqual(opening_mix(walls, 'walls', 2), ((20.0, 0.997506), (35.0, 0.002494)))
+        self.assertEqual(surface_blockages(['not', 'a', 'dict'], 'walls'), [])
+
+    def test_results_are_cached_per_solution_and_mix(self):
+        """Test that a repeated (curve, mix) pair is served from the cache."""
+        cache = CacheManager()
+        surfaces = [(Spectrum.from_stc(50), ((20.0, 0.05),)), (Spectrum.from_stc(50), ())]
+        first = composite_results(surfaces, cache)
+        self.assertGreater(first[0].stc_loss, 10)
+        self.assertEqual(first[1].stc_loss, 0)
+        self.assertEqual(first[1].transmission_loss, Spectrum.from_stc(50))
+        again = composite_results(surfaces[:1], cache)
+        self.assertIs(again[0], first[0])
+
+    def test_ranking_reflects_openings(self):
+        """Test that a door in the walls lowers a wall solution's score."""
+        from solutions.recommendation_engine import rank_prepared_solutions, RoomInputs, NoiseProfile
+
+        calculator = MagicMock()
+        calculator.get_room_profile.return_value = None
+        calculator.get_noise_profile.return_value = AcousticNoiseProfile(
+            typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        calculator.calculate_properties.return_value = {'stc_rating': 55}
+        solutions = [{'solution_id': 'Wall', 'surface_type': 'walls'}]
+        candidates = RankingCandidates(solutions, solutions, np.array([[55, 0, 0, 0, 0, 0, 3, 10]], dtype=float))
+        noise = NoiseProfile(type='speech', intensity=6, direction=['north'])
+
+        def score(blockages):
+            inputs = RoomInputs(room_type=None, noise_type='speech', noise_level=60,
+                                room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+                                surface_areas={}, existing_construction={}, blockages=blockages)
+            return rank_prepared_solutions(candidates, inputs, noise, calculator, cache_manager=CacheManager())[0]['score']
+
+        self.assertLess(score({'north': [{'type': 'door', 'width': 0.9, 'height': 2}]}), score(None))
+        self.assertEqual(score({'ceiling': [{'type': 'light', 'width': 1, 'length': 1}]}), score(None))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
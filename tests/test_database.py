@@ -0,0 +1,129 @@
+"""Test suite for bulk solution document loading."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+from bson import ObjectId
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.config import SOLUTION_VARIANT_MONGO_IDS
+from tests.utils.singleton_reset import setup_test_environment, teardown_test_environment
+
+
+def _mock_db():
+    """Build a mock database whose collections return a document per queried ObjectId."""
+    collections = {}
+
+    def get_collection(name):
+        if name not in collections:
+            collection = MagicMock()
+            collection.find.side_effect = lambda query: [
+                {'_id': oid, 'collection': name}
+                for oid in query['_id']['$in'] if isinstance(oid, ObjectId)
+            ]
+            collections[name] = collection
+        return collections[name]
+
+    db = MagicMock()
+    db.get_collection.side_effect = get_collection
+    return db, collections
+
+
+class TestBulkSolutionLoading(unittest.TestCase):
+    """Test loading all solution variants with one query per collection."""
+
+    def setUp(self):
+        """Set up test environment."""
+        setup_test_environment()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        teardown_test_environment()
+
+    def test_one_query_per_collection(self):
+        """Test that all variants are resolved with a single find per collection."""
+        from solutions.database import load_solution_variant_documents
+
+        db, collections = _mock_db()
+        with patch('solutions.database.get_db', return_value=db):
+            variant_docs = load_solution_variant_documents()
+
+        self.assertEqual(set(collections), {'wallsolutions', 'ceilingsolutions'})
+        for collection in collections.values():
+            self.assertEqual(collection.find.call_count, 1)
+            collection.find_one.assert_not_called()
+
+        for surface_type, variant_ids in SOLUTION_VARIANT_MONGO_IDS.items():
+            self.assertEqual(set(variant_docs[surface_type]), set(variant_ids))
+
+    def test_shared_ids_are_deduplicated(self):
+        """Test that variants sharing an id are queried once but hydrated separately."""
+        from solutions.database import load_solution_variant_documents
+
+        db, collections = _mock_db()
+        with patch('solutions.database.get_db', return_value=db):
+            variant_docs = load_solution_variant_documents()
+
+        queried = collections['wallsolutions'].find.call_args[0][0]['_id']['$in']
+        object_ids = [oid for oid in queried if isinstance(oid, ObjectId)]
+        self.assertEqual(len(object_ids), len(set(object_ids)))
+        self.assertEqual(len(object_ids), len(set(SOLUTION_VARIANT_MONGO_IDS['walls'].values())))
+
+        walls = variant_docs['walls']
+        self.assertEqual(walls['IndependentWallStandard'], walls['IndependentWallSP15'])
+        self.assertIsNot(walls['IndependentWallStandard'], walls['IndependentWallSP15'])
+
+    def test_loader_uses_prefetched_docs(self):
+        """Test that a load_* function hydrates from prefetched docs without querying."""
+        from solutions.walls.GenieClipWall import load_genieclipwall_solutions
+
+        docs = {
+            'GenieClipWallStandard': {'_id': 'std', 'materials': []},
+            'GenieClipWallSP15': {'_id': 'sp15', 'materials': []},
+        }
+        with patch('solutions.database.get_solution_by_id') as mock_lookup, \
+                patch('solutions.base_calculator.BaseCalculator._load_solution_data') as mock_load:
+            standard, sp15 = load_genieclipwall_solutions(docs)
+
+        mock_lookup.assert_not_called()
+        mock_load.assert_not_called()
+        self.assertIs(standard._solution_data, docs['GenieClipWallStandard'])
+        self.assertIs(sp15._solution_data, docs['GenieClipWallSP15'])
+
+    def test_cold_start_makes_no_per_class_queries(self):
+        """Test that every loader builds its solutions from the bulk result alone."""
+        from solutions.walls.GenieClipWall import load_genieclipwall_solutions
+        from solutions.walls.M20Wall import load_m20wall_solutions
+        from solutions.walls.Independentwall import load_independentwall_solutions
+        from solutions.walls.resilientbarwall import load_resilientbarwall_solutions
+        from solutions.ceilings.genieclipceiling import load_genieclipceiling_solutions
+        from solutions.ceilings.lb3genieclipceiling import load_lb3genieclipceiling_solutions
+        from solutions.ceilings.independentceiling import load_independentceiling_solutions
+        from solutions.ceilings.resilientbarceiling import load_resilientbarceiling_solutions
+
+        loaders = {
+            'walls': [load_genieclipwall_solutions, load_m20wall_solutions,
+                      load_independentwall_solutions, load_resilientbarwall_solutions],
+            'ceilings': [load_genieclipceiling_solutions, load_lb3genieclipceiling_solutions,
+                         load_independentceiling_solutions, load_resilientbarceiling_solutions],
+        }
+        db = MagicMock()
+        with patch('solutions.base_calculator.get_db', return_value=db), \
+                patch('solutions.database.get_solution_by_id') as mock_lookup:
+            for surface_type, surface_loaders in loaders.items():
+                docs = {variant: {'_id': object_id, 'materials': [{'name': variant}]}
+                        for variant, object_id in SOLUTION_VARIANT_MONGO_IDS[surface_type].items()}
+                for loader in surface_loaders:
+                    for solution in loader(docs):
+                        self.assertIsNotNone(solution)
+                        self.assertIn(solution._solution_data, docs.values())
+
+        mock_lookup.assert_not_called()
+        db.__getitem__.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,109 @@
+"""Test suite for the precomputed solution feature store."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.solutions import SoundproofingSolutions
+
+
+class StubSolution:
+    """Minimal solution instance exposing characteristics"""
+
+    def __init__(self, code_name, materials, is_sp15=False):
+        self.CODE_NAME = code_name
+        self.IS_SP15 = is_sp15
+        self.calls = 0
+        self._characteristics = {'materials': materials, 'installation_complexity': 4}
+
+    def get_characteristics(self):
+        self.calls += 1
+        return self._characteristics
+
+
+class TestSolutionFeatureStore(unittest.TestCase):
+    """Test that features are built at registration and shared read-only."""
+
+    def setUp(self):
+        self.calculator = MagicMock()
+        self.calculator.calculate_material_properties.return_value = {
+            'stc': 45, 'absorption': {'low': 0.2, 'mid': 0.4, 'high': 0.6}, 'damping': 0.3}
+        patcher = patch('solutions.acoustic_calculator.get_acoustic_calculator', return_value=self.calculator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = SoundproofingSolutions()
+        self.wall = StubSolution('GenieClipWall', [{'name': 'plasterboard', 'cost': 10, 'coverage': 50}])
+        self.manager.register_solution_with_characteristics('genieclipwall_standard', self.wall, 'walls')
+        self.manager.register_solution_with_characteristics(
+            'genieclipceiling_sp15', StubSolution('GenieClipCeiling', [{'name': 'clip'}], is_sp15=True), 'ceilings')
+
+    def test_records_are_indexed_by_surface(self):
+        """Test that records are grouped by singular surface type with their features."""
+        store = self.manager.get_feature_store()
+        self.assertEqual(sorted(store.surface_types()), ['ceiling', 'wall'])
+        record, = store.records('walls')
+        self.assertEqual((record.solution_id, record.variant), ('GenieClipWall', 'Standard'))
+        self.assertEqual(record.absorption, (0.2, 0.4, 0.6))
+        self.assertEqual((record.stc, record.cost_per_m2), (45.0, 5.0))
+        self.assertEqual(store.records('ceiling')[0].variant, 'SP15')
+
+    def test_store_is_rebuilt_only_on_catalogue_change(self):
+        """Test that the store and its candidates are reused until a registration."""
+        store = self.manager.get_feature_store()
+        candidates = store.ranking_candidates('walls')
+        self.assertIs(self.manager.get_feature_store(), store)
+        self.assertIs(store.ranking_candidates('wall'), candidates)
+        self.assertEqual(self.wall.calls, 1)
+
+        self.manager.register_solution_with_characteristics('m20wall_standard', StubSolution('M20Wall', []), 'walls')
+        rebuilt = self.manager.get_feature_store()
+        self.assertIsNot(rebuilt, store)
+        self.assertEqual(len(rebuilt.records('walls')), 2)
+
+    def test_records_are_read_only(self):
+        """Test that shared records cannot be mutated and the source is left untouched."""
+        store = self.manager.get_feature_store()
+        record = store.records('walls')[0]
+        with self.assertRaises(TypeError):
+            record.characteristics['solution_id'] = 'changed'
+        with self.assertRaises(ValueError):
+            store.feature_matrix('walls')[0, 0] = 0
+        self.assertNotIn('solution_id', self.wall.get_characteristics())
+
+    def test_transmission_loss_is_precomputed_per_store(self):
+        """Test that each store holds a read-only TL curve per solution, estimated from STC."""
+        store = self.manager.get_feature_store()
+        curve = store.transmission_loss('genieclipwall_standard')
+        self.assertAlmostEqual(curve.at(500), 45.0)
+        self.assertIs(store.transmission_loss('genieclipwall_standard'), curve)
+        matrix = store.transmission_loss_matrix('walls')
+        self.assertEqual(matrix.shape, (1, len(curve.values)))
+        with self.assertRaises(ValueError):
+            matrix[0, 0] = 0
+        self.assertIsNone(store.transmission_loss('unknown'))
+
+    def test_ratings_are_fitted_in_bulk(self):
+        """Test that ratings are fitted once per store and measured curves are flagged."""
+        measured = StubSolution('M20Wall', [])
+        measured._characteristics['transmission_loss'] = {'125': 40, '4000': 40}
+        self.manager.register_solution_with_characteristics('m20wall_standard', measured, 'walls')
+        store = self.manager.get_feature_store()
+        self.assertTrue(store.has_measured_transmission_loss('m20wall_standard'))
+        self.assertFalse(store.has_measured_transmission_loss('genieclipwall_standard'))
+        self.assertEqual(store.sound_ratings('m20wall_standard').to_dict(), {'stc': 40, 'rw': 40, 'c': 0, 'ctr': 0})
+        self.assertIs(store.sound_ratings('m20wall_standard'), store.sound_ratings('m20wall_standard'))
+
+    def test_ranking_candidates_are_plain_dicts(self):
+        """Test that candidates carry JSON-serializable copies of the characteristics."""
+        solution = self.manager.get_feature_store().ranking_candidates('walls').solutions[0]
+        self.assertIsInstance(solution, dict)
+        self.assertIsInstance(solution['materials'], list)
+        self.assertEqual(solution['surface_type'], 'walls')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
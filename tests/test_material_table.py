@@ -0,0 +1,86 @@
+"""Test suite for the dense material property table."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.cache_manager import CacheManager
+from solutions.material_table import MaterialTable, get_material_table, reset_material_table
+
+MATERIALS = [
+    {'name': 'SoundBloc', 'stc_rating': 30, 'density': 800, 'thickness': 15,
+     'absorption': {'low': 0.1, 'mid': 0.2, 'high': 0.3}, 'damping': 0.2},
+    {'name': 'Mineral Wool', 'stc_rating': 10, 'density': 45, 'thickness': 50,
+     'absorption': {'low': 0.5, 'mid': 0.9, 'high': 1.0}, 'decoupling': 0.4},
+]
+
+
+class TestMaterialTable(unittest.TestCase):
+    """Test aggregation, batching and cache keys of the material table."""
+
+    def setUp(self):
+        self.table = MaterialTable(MATERIALS)
+
+    def test_aggregate_is_coverage_weighted(self):
+        """Test that properties are weighted by coverage and unknown materials dilute them."""
+        props = self.table.aggregate([{'name': 'SoundBloc', 'coverage': 75}, {'name': 'Mineral Wool', 'coverage': 25}])
+        self.assertAlmostEqual(props['stc'], 25.0)
+        self.assertAlmostEqual(props['absorption']['mid'], 0.375)
+        self.assertAlmostEqual(props['decoupling'], 0.1)
+        diluted = self.table.aggregate([{'name': 'SoundBloc'}, {'name': 'Unknown'}])
+        self.assertAlmostEqual(diluted['stc'], 15.0)
+        self.assertIsNone(self.table.aggregate([{'name': 'SoundBloc', 'coverage': 0}]))
+
+    def test_batch_matches_single_aggregates(self):
+        """Test that the batched matrix product matches one aggregate at a time."""
+        lists = [[{'name': 'SoundBloc'}], [{'name': 'Mineral Wool', 'coverage': 40}, {'name': 'SoundBloc'}], []]
+        batch = self.table.aggregate_batch(lists)
+        for row, materials in zip(batch[:2], lists):
+            self.assertTrue(np.allclose(row, self.table.aggregate_row(materials)))
+        self.assertTrue(np.all(batch[2] == 0))
+
+    def test_cache_key_includes_coverage_and_table(self):
+        """Test that coverage and the materials themselves are part of the key, order is not."""
+        half = [{'name': 'SoundBloc', 'coverage': 50}, {'name': 'Mineral Wool', 'coverage': 50}]
+        other = [{'name': 'SoundBloc', 'coverage': 80}, {'name': 'Mineral Wool', 'coverage': 20}]
+        self.assertNotEqual(self.table.cache_key(half), self.table.cache_key(other))
+        self.assertEqual(self.table.cache_key(half), self.table.cache_key(half[::-1]))
+        changed = MaterialTable([dict(MATERIALS[0], stc_rating=35), MATERIALS[1]])
+        self.assertNotEqual(changed.cache_key(half), self.table.cache_key(half))
+
+    def test_table_follows_repository_reloads(self):
+        """Test that the shared table is rebuilt only when the repository reloads."""
+        repository = MagicMock()
+        repository.all.return_value = MATERIALS
+        reset_material_table()
+        self.addCleanup(reset_material_table)
+        with patch('solutions.material_table.get_materials_repository', return_value=repository):
+            table = get_material_table()
+            self.assertIs(get_material_table(), table)
+            repository.all.return_value = list(MATERIALS)
+            self.assertIsNot(get_material_table(), table)
+
+    def test_calculator_uses_table(self):
+        """Test that the calculator aggregates from the table and keys on coverage."""
+        from solutions.acoustic_calculator import AcousticCalculator
+
+        with patch('solutions.acoustic_calculator.get_db', return_value=None), \
+                patch('solutions.acoustic_calculator.get_material_table', return_value=self.table):
+            calculator = AcousticCalculator()
+            calculator.cache_manager = CacheManager()
+            a = calculator.calculate_material_properties([{'name': 'SoundBloc', 'coverage': 100},
+                                                          {'name': 'Mineral Wool', 'coverage': 100}])
+            b = calculator.calculate_material_properties([{'name': 'SoundBloc', 'coverage': 100},
+                                                          {'name': 'Mineral Wool', 'coverage': 300}])
+        self.assertAlmostEqual(a['stc'], 20.0)
+        self.assertAlmostEqual(b['stc'], 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+"""Test suite for the indexed materials repository."""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.materials_repository import MaterialsRepository
+
+MATERIALS = [
+    {'name': 'Genie Clip', 'category': 'clips', 'cost': 2.5, 'surface_type': 'walls'},
+    {'name': 'Acoustic Mineral Wool', 'category': 'insulation', 'cost': 12.0,
+     'acoustic_properties': {'frequency_response': {'125': 0.4}}},
+    {'name': 'SoundBloc', 'category': 'board', 'cost': 18.0},
+]
+
+
+class TestMaterialsRepository(unittest.TestCase):
+    """Test lookups and reloading of the in-memory materials table."""
+
+    def setUp(self):
+        """Serve a fixed material list instead of MongoDB."""
+        self.loader = patch('solutions.materials_repository.get_all_materials_from_db',
+                            return_value=MATERIALS)
+        self.snapshot = patch('solutions.materials_repository.get_catalog_snapshot', return_value=None)
+        self.mock_loader = self.loader.start()
+        self.snapshot.start()
+
+    def tearDown(self):
+        """Stop patches."""
+        self.loader.stop()
+        self.snapshot.stop()
+
+    def test_lookups_load_once(self):
+        """Test that repeated lookups are served from the index without reloading."""
+        repository = MaterialsRepository(ttl=3600)
+
+        self.assertEqual(repository.get('SoundBloc')['cost'], 18.0)
+        self.assertIsNone(repository.get('Unknown'))
+        self.assertEqual([m['name'] for m in repository.by_category('insulation')], ['Acoustic Mineral Wool'])
+        self.assertEqual([m['name'] for m in repository.by_surface('walls')], ['Genie Clip'])
+        self.assertEqual(self.mock_loader.call_count, 1)
+
+    def test_invalidate_reloads(self):
+        """Test that bumping the version reloads the table on next lookup."""
+        repository = MaterialsRepository(ttl=3600)
+        repository.get('SoundBloc')
+        repository.invalidate()
+        repository.get('SoundBloc')
+
+        self.assertEqual(self.mock_loader.call_count, 2)
+
+    def test_empty_load_is_retried(self):
+        """Test that an empty load is not cached for the full TTL."""
+        self.mock_loader.return_value = []
+        repository = MaterialsRepository(ttl=3600)
+        self.assertIsNone(repository.get('SoundBloc'))
+
+        self.mock_loader.return_value = MATERIALS
+        self.assertIsNotNone(repository.get('SoundBloc'))
+
+    def test_material_helpers_use_repository(self):
+        """Test that material_properties and cost_calculator read through the repository."""
+        from solutions.material_properties import get_material_properties, get_material_frequency_response
+        from solutions.cost_calculator import get_material_cost
+
+        with patch('solutions.materials_repository._materials_repository', MaterialsRepository(ttl=3600)):
+            self.assertEqual(get_material_cost('Genie Clip'), 2.5)
+            self.assertEqual(set(get_material_properties(['SoundBloc', 'Missing'])), {'SoundBloc'})
+            self.assertEqual(get_material_frequency_response('Acoustic Mineral Wool'), {'125': 0.4})
+
+        self.assertEqual(self.mock_loader.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
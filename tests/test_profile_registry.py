@@ -0,0 +1,104 @@
+"""Test suite for the noise, room and material profile registry."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.profile_registry import ProfileRegistry, NoiseProfile, RoomProfile
+
+PROFILE_DOCUMENTS = [
+    {'type': 'profile', 'profile_id': 'speech', 'typical_frequency': [300, 3000], 'peak_frequency': 800},
+    {'type': 'profile', 'profile_id': 'drone', 'typical_frequency': [40, 120], 'peak_frequency': 60},
+    {'type': 'room', 'room_type': 'bedroom', 'reflectivity': 0.3, 'resonance': [90, 210]},
+]
+
+
+class TestProfileRegistry(unittest.TestCase):
+    """Test preloading, lookups, invalidation and statistics."""
+
+    def setUp(self):
+        """Serve fixed profile documents instead of MongoDB."""
+        self.db = MagicMock()
+        self.db.noise.find.return_value = PROFILE_DOCUMENTS
+        self.patcher = patch('solutions.profile_registry.get_db', return_value=self.db)
+        self.patcher.start()
+
+    def tearDown(self):
+        """Stop patches."""
+        self.patcher.stop()
+
+    def test_config_profiles_are_preloaded(self):
+        """Test that config noise profiles are served when MongoDB has no override."""
+        from solutions.config import NOISE_PROFILES
+
+        registry = ProfileRegistry(ttl=3600)
+        profile = registry.noise_profile('music')
+        self.assertEqual(profile.typical_frequency, [float(f) for f in NOISE_PROFILES['music']['typical_frequency']])
+        low, high = profile.typical_frequency[0], profile.typical_frequency[-1]
+        self.assertTrue(low <= profile.peak_frequency <= high)
+
+    def test_database_overrides_config(self):
+        """Test that MongoDB profiles replace the config entries and add room profiles."""
+        registry = ProfileRegistry(ttl=3600)
+        self.assertEqual(registry.noise_profile('speech').peak_frequency, 800)
+        self.assertEqual(registry.noise_profile('drone').typical_frequency, [40, 120])
+        self.assertEqual(registry.room_profile('bedroom').resonance, [90, 210])
+
+    def test_lookups_load_once(self):
+        """Test that repeated lookups are served without querying MongoDB again."""
+        registry = ProfileRegistry(ttl=3600)
+        for _ in range(5):
+            registry.noise_profile('speech')
+            registry.room_profile('bedroom')
+        self.assertEqual(self.db.noise.find.call_count, 1)
+
+    def test_unknown_types_get_defaults_and_stats(self):
+        """Test that unknown types get default profiles and are counted as misses."""
+        registry = ProfileRegistry(ttl=3600)
+        registry.noise_profile('speech')
+        self.assertIsInstance(registry.noise_profile('unknown'), NoiseProfile)
+        self.assertEqual(registry.room_profile('attic'), RoomProfile())
+        stats = registry.get_stats()
+        self.assertEqual(stats['noise'], {'hits': 1, 'misses': 1})
+        self.assertEqual(stats['room'], {'hits': 0, 'misses': 1})
+        self.assertEqual(stats['room_profiles'], 1)
+
+    def test_invalidate_reloads(self):
+        """Test that invalidation picks up changed profile documents."""
+        registry = ProfileRegistry(ttl=3600)
+        self.assertEqual(registry.room_profile('bedroom').reflectivity, 0.3)
+        self.db.noise.find.return_value = [{'type': 'room', 'room_type': 'bedroom', 'reflectivity': 0.7}]
+        self.assertEqual(registry.room_profile('bedroom').reflectivity, 0.3)
+        registry.invalidate()
+        self.assertEqual(registry.room_profile('bedroom').reflectivity, 0.7)
+
+    def test_database_errors_are_not_kept(self):
+        """Test that a failed load serves the config profiles and is retried."""
+        self.db.noise.find.side_effect = Exception('connection refused')
+        registry = ProfileRegistry(ttl=3600)
+        self.assertEqual(registry.room_profile('bedroom'), RoomProfile())
+        self.assertNotEqual(registry.noise_profile('speech').description, '')
+        self.db.noise.find.side_effect = None
+        with patch('solutions.profile_registry.time.time', return_value=registry._expires_at):
+            self.assertEqual(registry.room_profile('bedroom').reflectivity, 0.3)
+
+    def test_calculator_delegates_without_instance_caches(self):
+        """Test that calculator lookups go through the registry and survive calculator resets."""
+        from solutions.acoustic_calculator import AcousticCalculator
+        from solutions.profile_registry import reset_profile_registry
+
+        reset_profile_registry()
+        self.addCleanup(reset_profile_registry)
+        self.assertFalse(hasattr(AcousticCalculator.get_noise_profile, 'cache_clear'))
+        with patch('solutions.acoustic_calculator.get_db', return_value=None):
+            first, second = AcousticCalculator(), AcousticCalculator()
+        self.assertIs(first.get_room_profile('bedroom'), second.get_room_profile('bedroom'))
+        self.assertEqual(self.db.noise.find.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+"""Test suite for the closed-form material quantity engine."""
+
+import unittest
+import random
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.quantity_engine import (
+    bill_of_materials, channel_length, extra_count, grid_count, line_count, material_quantity, sealant_length,
+    sheet_count)
+
+MATERIALS = [
+    {'name': 'Genie Clip', 'baseCost': 1.2, 'unitsPerM2': 3.0, 'unit': 'clip'},
+    {'name': 'Acoustic Sealant', 'baseCost': 8.0, 'unitsPerM2': 0.2, 'unit': 'tube'},
+    {'name': 'Screws', 'baseCost': 12.0, 'unit': 'box'},
+    {'name': '12.5mm Sound Plasterboard', 'baseCost': 15.0, 'unitsPerM2': 0.8, 'unit': 'sheet'},
+    {'name': 'Rockwool RW3 100mm', 'baseCost': 30.0, 'unit': 'pack'},
+    {'name': 'Green Glue', 'baseCost': 20.0, 'unitsPerM2': 0.25, 'unit': 'tube'},
+]
+
+
+class TestCountingPrimitives(unittest.TestCase):
+    """Test the shared ceil/spacing/wastage arithmetic."""
+
+    def test_counts_match_the_per_class_formulas(self):
+        """Test scalar counts against the arithmetic the solution classes used."""
+        self.assertEqual(grid_count(7.2, 0.6), 20)
+        self.assertEqual(line_count(3.0, 0.4), 8)
+        self.assertEqual(extra_count(20), 2)
+        self.assertEqual(sheet_count(7.2, 2), 6)
+        self.assertEqual(channel_length(3.0, 2.4), 20)
+        self.assertEqual(sealant_length(3.0, 2.4), 12)
+
+    def test_exact_multiples_are_not_rounded_up(self):
+        """Test that floating point noise does not add a unit at exact multiples."""
+        self.assertGreater(2.1 / 0.7, 3)
+        self.assertEqual(line_count(2.1, 0.7), 3)
+        self.assertEqual(line_count(1.2, 0.4), 3)
+
+    def test_arrays_match_scalars(self):
+        """Test that array inputs give the same counts as scalar inputs."""
+        widths = np.array([0.5, 3.0, 4.25, 12.0])
+        heights = np.array([2.4, 2.4, 2.7, 3.1])
+        self.assertEqual(list(channel_length(widths, heights)),
+                         [channel_length(w, h) for w, h in zip(widths, heights)])
+        self.assertEqual(list(grid_count(widths * heights, 0.6)),
+                         [grid_count(w * h, 0.6) for w, h in zip(widths, heights)])
+
+
+class TestBillOfMaterials(unittest.TestCase):
+    """Test the config-driven material rules and the batched bill of materials."""
+
+    def test_config_rules(self):
+        """Test spacing, perimeter, minimum, coverage and wastage rules."""
+        area, perimeter = 7.2, 10.8
+        quantities = {m['name']: material_quantity(m, area, perimeter) for m in MATERIALS}
+        self.assertEqual(quantities['Genie Clip'], 12)                  # area / 0.6 spacing
+        self.assertEqual(quantities['Acoustic Sealant'], 11)            # perimeter
+        self.assertEqual(quantities['Screws'], 1)                       # 30 m² per box, at least one
+        self.assertEqual(quantities['12.5mm Sound Plasterboard'], 7)    # 0.8 per m² plus 10%
+        self.assertEqual(quantities['Rockwool RW3 100mm'], 2)           # 5.76 m² per pack plus 10%
+        self.assertEqual(quantities['Green Glue'], 2)                   # 0.25 per m², no wastage
+
+    def test_batch_matches_single_surfaces(self):
+        """Test that one batched pass matches the quantities of each surface alone."""
+        rng = random.Random(3)
+        widths = [rng.uniform(0.5, 12) for _ in range(200)]
+        heights = [rng.uniform(2.2, 3.5) for _ in widths]
+        bill = bill_of_materials(MATERIALS, widths, heights)
+
+        self.assertEqual(bill.quantities.shape, (len(MATERIALS), len(widths)))
+        for j, (w, h) in enumerate(zip(widths, heights)):
+            expected = [material_quantity(m, w * h, 2 * (w + h)) for m in MATERIALS]
+            self.assertEqual(list(bill.quantities[:, j]), expected)
+        np.testing.assert_allclose(bill.costs[:, 0], bill.quantities[:, 0] * [m['baseCost'] for m in MATERIALS])
+        self.assertEqual(bill.totals()['Genie Clip'], int(bill.quantities[0].sum()))
+
+
+
+class TestSolutionQuantities(unittest.TestCase):
+    """Test that solution classes take their quantities from the surface being calculated."""
+
+    def test_genieclip_calculate_uses_the_given_surface(self):
+        """Test that calculate() on another surface than the constructor's prices that surface throughout."""
+        from solutions.walls.GenieClipWall import GenieClipWallStandard
+
+        document = {'_id': 'genieclip', 'solution': 'GenieClipWallStandard', 'materials': [], 'stc_rating': 55}
+        wall = GenieClipWallStandard.from_document(document, 3.0, 2.4)
+        surface = {'width': 10, 'height': 3}
+        info = wall.calculate(surface)['additional_info']
+
+        self.assertEqual(info['area'], 30)
+        self.assertEqual(info['channel_length'], channel_length(10, 3))
+        self.assertEqual(info['acoustic_sealant'], sealant_length(10, 3))
+        self.assertEqual({key: info[key] for key in ('channel_length', 'acoustic_sealant', 'plasterboard_sheets')},
+                         {key: value for key, value in wall.calculate_clip_spacing(surface).items()
+                          if key in ('channel_length', 'acoustic_sealant', 'plasterboard_sheets')})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
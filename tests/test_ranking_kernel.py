@@ -0,0 +1,221 @@
+"""Test suite for the vectorised solution ranking kernel."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import random
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import RoomProfile as AcousticRoomProfile, NoiseProfile as AcousticNoiseProfile
+from solutions.cache_manager import CacheManager
+from solutions.ranking_kernel import build_ranking_context, feature_row, score_features, rank_order
+
+
+def reference_score(row, context, area, meets_requirements):
+    """Score one solution with the rules of the original per-solution loop."""
+    stc, low, mid, high, damping, _decoupling, complexity, cost_per_m2 = row
+    score = 0
+    if stc > 0 and context.needed_reduction > 0:
+        score += min(30, (stc / context.needed_reduction) * 30)
+    if damping and context.has_room_profile:
+        absorption_score = ((low + mid + high) / 3) * context.room_factor * 15
+        score += min(25, absorption_score + damping * 10 * context.resonance_factor)
+    if context.budget:
+        cost = cost_per_m2 * area
+        if cost <= context.budget:
+            score += ((context.budget - cost) / context.budget) * 10
+    complexity_base = (10 - complexity) / 10 * 8
+    if context.special_requirements and meets_requirements:
+        complexity_base += 2
+    return score + complexity_base
+
+
+class TestScoreFeatures(unittest.TestCase):
+    """Test that the vectorised scores match the per-solution rules."""
+
+    def test_matches_reference(self):
+        """Test random catalogues against the scalar reference."""
+        rng = random.Random(7)
+        room = AcousticRoomProfile(reflectivity=0.6, resonance=[90, 210])
+        noise = AcousticNoiseProfile(typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        for budget in (None, {'budget': 5000}):
+            context = build_ranking_context(7, room, noise, budget, ['fire_rated'])
+            rows = [[rng.uniform(0, 60), rng.random(), rng.random(), rng.random(), rng.choice([0, rng.random()]),
+                     rng.random(), rng.randint(1, 10), rng.uniform(0, 80)] for _ in range(50)]
+            areas = [rng.uniform(5, 60) for _ in rows]
+            meets = [rng.random() < 0.5 for _ in rows]
+
+            scores = score_features(np.array(rows), context, np.array(areas), np.array(meets))['score']
+
+            expected = [reference_score(r, context, a, m) for r, a, m in zip(rows, areas, meets)]
+            np.testing.assert_allclose(scores, expected)
+
+    def test_resonance_factor(self):
+        """Test that a noise frequency inside the room resonance band boosts damping."""
+        noise = AcousticNoiseProfile(typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        self.assertEqual(build_ranking_context(5, AcousticRoomProfile(resonance=[90, 210]), noise).resonance_factor, 1.5)
+        self.assertEqual(build_ranking_context(5, AcousticRoomProfile(resonance=[300, 400]), noise).resonance_factor, 1.0)
+
+    def test_invalid_stc_is_rejected(self):
+        """Test that a negative STC rating cannot be turned into a feature row."""
+        with self.assertRaises(ValueError):
+            feature_row({}, {'stc': -1})
+
+    def test_rank_order_is_stable(self):
+        """Test that ties keep their input order."""
+        self.assertEqual(list(rank_order(np.array([1.0, 3.0, 1.0, 3.0]))), [1, 3, 0, 2])
+
+
+class TestRankSolutions(unittest.TestCase):
+    """Test rank_solutions end to end with stubbed calculators."""
+
+    def test_ranks_solution_dicts(self):
+        """Test that dict solutions are scored directly and returned best first."""
+        from solutions.recommendation_engine import rank_solutions, RoomInputs, NoiseProfile
+
+        props = {
+            'weak': {'stc': 20, 'absorption': {'low': 0.1, 'mid': 0.1, 'high': 0.1}, 'damping': 0.1},
+            'strong': {'stc': 60, 'absorption': {'low': 0.5, 'mid': 0.6, 'high': 0.7}, 'damping': 0.4},
+        }
+        calculator = MagicMock()
+        calculator.get_room_profile.return_value = AcousticRoomProfile()
+        calculator.get_noise_profile.return_value = AcousticNoiseProfile(
+            typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        calculator.calculate_properties.return_value = {'stc_rating': 50}
+        calculator.calculate_material_properties.side_effect = lambda materials: props[materials[0]['name']]
+
+        solutions = [
+            {'solution_id': 'WeakWall', 'surface_type': 'walls', 'materials': [{'name': 'weak'}]},
+            {'solution_id': 'StrongWall', 'surface_type': 'walls', 'materials': [{'name': 'strong'}]},
+        ]
+        inputs = RoomInputs(room_type='bedroom', noise_type='speech', noise_level=6,
+                            room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+                            surface_areas={}, existing_construction={})
+        with patch('solutions.recommendation_engine.get_solutions_manager', return_value=MagicMock()), \
+                patch('solutions.recommendation_engine.get_acoustic_calculator', return_value=calculator):
+            ranked = rank_solutions(solutions, inputs, NoiseProfile(type='speech', intensity=6, direction=['north']))
+
+        self.assertEqual([r['details']['solution_id'] for r in ranked], ['StrongWall', 'WeakWall'])
+        self.assertGreater(ranked[0]['score'], ranked[1]['score'])
+
+    def test_prepared_candidates_are_reused(self):
+        """Test that candidates prepared once can be ranked for several rooms."""
+        from solutions.recommendation_engine import (
+            prepare_ranking_candidates, rank_prepared_solutions, RoomInputs, NoiseProfile)
+
+        calculator = MagicMock()
+        calculator.get_room_profile.return_value = None
+        calculator.get_noise_profile.return_value = AcousticNoiseProfile(
+            typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        calculator.calculate_properties.return_value = {'stc_rating': 50}
+        calculator.calculate_material_properties.return_value = {'stc': 40, 'damping': 0.2}
+
+        solutions = [{'solution_id': f'Wall{i}', 'surface_type': 'walls', 'materials': []} for i in range(3)]
+        candidates = prepare_ranking_candidates(solutions, MagicMock(), calculator)
+        for noise_level in (4, 8):
+            inputs = RoomInputs(room_type=None, noise_type='speech', noise_level=noise_level,
+                                room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+                                surface_areas={}, existing_construction={})
+            ranked = rank_prepared_solutions(candidates, inputs,
+                                             NoiseProfile(type='speech', intensity=6, direction=['north']), calculator,
+                                             cache_manager=CacheManager())
+            self.assertEqual(len(ranked), 3)
+
+        self.assertEqual(calculator.calculate_material_properties.call_count, 3)
+
+    def test_top_k_matches_full_ranking(self):
+        """Test that top-k returns the head of the full ranking and skips hopeless candidates."""
+        from solutions.ranking_kernel import RankingCandidates
+        from solutions.recommendation_engine import rank_prepared_solutions, RoomInputs, NoiseProfile
+
+        rng = random.Random(11)
+        calculator = MagicMock()
+        calculator.get_room_profile.return_value = AcousticRoomProfile(reflectivity=0.4, resonance=[90, 210])
+        calculator.get_noise_profile.return_value = AcousticNoiseProfile(
+            typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        # Every fifth solution has no acoustic profile and must be dropped
+        calculator.calculate_properties.side_effect = \
+            lambda solution_id, dimensions: None if int(solution_id[4:]) % 5 == 0 else {'stc_rating': 50}
+
+        solutions = [{'solution_id': f'Wall{i}', 'surface_type': 'walls',
+                      'features': ['fire_rated'] if i % 2 else []} for i in range(200)]
+        # Repeated rows give tied scores
+        rows = [[rng.choice([20, 40, 60]), 0.3, 0.4, 0.5, rng.choice([0, 0.2]), 0.1, rng.randint(1, 10),
+                 rng.choice([10, 30])] for _ in solutions]
+        candidates = RankingCandidates(solutions, solutions, np.array(rows, dtype=float))
+        inputs = RoomInputs(room_type='bedroom', noise_type='speech', noise_level=7,
+                            room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+                            surface_areas={}, existing_construction={},
+                            budget_constraints={'budget': 1500}, special_requirements=['fire_rated'])
+        noise = NoiseProfile(type='speech', intensity=6, direction=['north'])
+
+        full = rank_prepared_solutions(candidates, inputs, noise, calculator, cache_manager=CacheManager())
+        calculator.calculate_properties.reset_mock()
+        for k in (1, 3, 10):
+            top = rank_prepared_solutions(candidates, inputs, noise, calculator, top_k=k, cache_manager=CacheManager())
+            self.assertEqual([(r['details']['solution_id'], r['score']) for r in top],
+                             [(r['details']['solution_id'], r['score']) for r in full[:k]])
+        self.assertLess(calculator.calculate_properties.call_count, 3 * len(solutions))
+
+
+class TestIncrementalReranking(unittest.TestCase):
+    """Test that constraint-only changes re-weight the cached acoustic stage."""
+
+    def setUp(self):
+        from solutions.ranking_kernel import RankingCandidates
+        from solutions.recommendation_engine import RoomInputs, NoiseProfile
+
+        self.calculator = MagicMock()
+        self.calculator.get_room_profile.return_value = AcousticRoomProfile(reflectivity=0.4)
+        self.calculator.get_noise_profile.return_value = AcousticNoiseProfile(
+            typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        self.calculator.calculate_properties.return_value = {'stc_rating': 50}
+        solutions = [{'solution_id': f'Wall{i}', 'surface_type': 'walls',
+                      'features': ['fire_rated'] if i % 3 == 0 else []} for i in range(30)]
+        rng = random.Random(5)
+        rows = [[rng.uniform(10, 60), 0.3, 0.4, 0.5, rng.random(), 0.1, rng.randint(1, 10), rng.uniform(5, 60)]
+                for _ in solutions]
+        self.candidates = RankingCandidates(solutions, solutions, np.array(rows))
+        self.noise = NoiseProfile(type='speech', intensity=6, direction=['north'])
+        self.room = lambda **constraints: RoomInputs(
+            room_type='bedroom', noise_type='speech', noise_level=7,
+            room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+            surface_areas={}, existing_construction={}, **constraints)
+
+    def rank(self, inputs, cache, top_k=None):
+        from solutions.recommendation_engine import rank_prepared_solutions
+        return [(r['details']['solution_id'], r['score'], r['details']['estimated_cost'])
+                for r in rank_prepared_solutions(self.candidates, inputs, self.noise, self.calculator,
+                                                 top_k=top_k, cache_manager=cache)]
+
+    def test_constraint_changes_skip_acoustic_work(self):
+        """Test that new budgets and requirements match a cold ranking without new acoustic lookups."""
+        cache = CacheManager()
+        self.rank(self.room(), cache)
+        lookups = self.calculator.calculate_properties.call_count
+        for constraints in ({'budget_constraints': {'budget': 800}},
+                            {'budget_constraints': {'budget': 3000}, 'special_requirements': ['fire_rated']}):
+            for top_k in (None, 5):
+                warm = self.rank(self.room(**constraints), cache, top_k)
+                self.assertEqual(self.calculator.calculate_properties.call_count, lookups)
+                self.assertEqual(warm, self.rank(self.room(**constraints), CacheManager(), top_k))
+                lookups = self.calculator.calculate_properties.call_count
+
+    def test_room_changes_miss_the_acoustic_cache(self):
+        """Test that the acoustic stage is not reused for a different room."""
+        cache = CacheManager()
+        self.rank(self.room(), cache)
+        lookups = self.calculator.calculate_properties.call_count
+        inputs = self.room()
+        inputs.room_dimensions = {'length': 5, 'width': 3, 'height': 2.4}
+        self.rank(inputs, cache)
+        self.assertEqual(self.calculator.calculate_properties.call_count, 2 * lookups)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
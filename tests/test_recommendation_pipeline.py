@@ -0,0 +1,94 @@
+"""Test suite for the per-surface / per-solution recommendation pipeline."""
+
+import unittest
+from unittest.mock import MagicMock
+import threading
+import time
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import NoiseProfile as AcousticNoiseProfile
+from solutions.cache_manager import CacheManager
+from solutions.ranking_kernel import RankingCandidates
+from solutions.recommendation_pipeline import RecommendationPipeline
+
+
+class TestRecommendationPipeline(unittest.TestCase):
+    """Test ordering, concurrency bounds and ranking equivalence."""
+
+    def setUp(self):
+        self.pipeline = RecommendationPipeline(surface_workers=3, solution_workers=4)
+        self.addCleanup(self.pipeline.shutdown)
+
+    def test_results_keep_input_order(self):
+        """Test that results come back in input order whatever finishes first."""
+        def slow_square(n):
+            time.sleep(0.001 * (10 - n))
+            return n * n
+        self.assertEqual(self.pipeline.map_solutions(slow_square, range(10)), [n * n for n in range(10)])
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than solution_workers tasks run at once."""
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def task(_):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.002)
+            with lock:
+                running[0] -= 1
+
+        self.pipeline.map_solutions(task, range(20))
+        self.assertLessEqual(running[1], 4)
+        self.assertGreater(running[1], 1)
+
+    def test_single_worker_runs_inline(self):
+        """Test that a pool size of 1 runs in the calling thread."""
+        pipeline = RecommendationPipeline(surface_workers=1, solution_workers=1)
+        caller = threading.current_thread()
+        self.assertEqual(pipeline.map_surfaces(lambda _: threading.current_thread() is caller, 'abc'),
+                         [True, True, True])
+
+    def test_nested_surface_and_solution_maps(self):
+        """Test that surface tasks can fan out to the solution pool without deadlocking."""
+        pipeline = RecommendationPipeline(surface_workers=2, solution_workers=1)
+        self.addCleanup(pipeline.shutdown)
+        result = pipeline.map_surfaces(lambda s: pipeline.map_solutions(lambda n: f"{s}{n}", range(3)), 'abc')
+        self.assertEqual(result, [['a0', 'a1', 'a2'], ['b0', 'b1', 'b2'], ['c0', 'c1', 'c2']])
+
+    def test_ranking_matches_sequential(self):
+        """Test that ranking on the pipeline gives the same result as ranking inline."""
+        from solutions.recommendation_engine import rank_prepared_solutions, RoomInputs, NoiseProfile
+
+        calculator = MagicMock()
+        calculator.get_room_profile.return_value = None
+        calculator.get_noise_profile.return_value = AcousticNoiseProfile(
+            typical_frequency=[100, 1000], peak_frequency=500, critical_bands={})
+        calculator.calculate_properties.side_effect = \
+            lambda solution_id, dimensions: None if solution_id == 'Wall3' else {'stc_rating': 50}
+        solutions = [{'solution_id': f'Wall{i}', 'surface_type': 'walls'} for i in range(12)]
+        rows = [[20 + i % 4 * 10, 0, 0, 0, 0, 0, i % 3, 10] for i in range(12)]
+        candidates = RankingCandidates(solutions, solutions, np.array(rows, dtype=float))
+        inputs = RoomInputs(room_type=None, noise_type='speech', noise_level=7,
+                            room_dimensions={'length': 4, 'width': 3, 'height': 2.4},
+                            surface_areas={}, existing_construction={})
+        noise = NoiseProfile(type='speech', intensity=6, direction=['north'])
+
+        for top_k in (None, 3):
+            expected = rank_prepared_solutions(candidates, inputs, noise, calculator, top_k=top_k,
+                                               cache_manager=CacheManager())
+            actual = rank_prepared_solutions(candidates, inputs, noise, calculator, top_k=top_k,
+                                             pipeline=self.pipeline, cache_manager=CacheManager())
+            self.assertEqual(actual, expected)
+            self.assertNotIn('Wall3', [r['details']['solution_id'] for r in actual])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,126 @@
+"""Test suite for the room mode and reverberation model."""
+
+import unittest
+import math
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.acoustic_calculator import RoomProfile as AcousticRoomProfile, NoiseProfile as AcousticNoiseProfile
+from solutions.ranking_kernel import build_ranking_context
+from solutions.room_acoustics import (
+    MAX_DIMENSION, MAX_MODE_FREQUENCY, SPEED_OF_SOUND, _bucket_modes, room_acoustics_model, room_modes,
+    rt60_eyring, rt60_sabine,
+)
+
+ROOM = {'length': 5.0, 'width': 4.0, 'height': 2.5}
+
+
+def reference_modes(length, width, height, max_frequency):
+    """Room modes from a plain loop over the index triples."""
+    modes = []
+    for nx in range(40):
+        for ny in range(40):
+            for nz in range(40):
+                if nx == ny == nz == 0:
+                    continue
+                f = SPEED_OF_SOUND / 2 * math.sqrt((nx / length) ** 2 + (ny / width) ** 2 + (nz / height) ** 2)
+                if f <= max_frequency:
+                    modes.append((f, (nx > 0) + (ny > 0) + (nz > 0)))
+    return sorted(modes)
+
+
+class TestRoomModes(unittest.TestCase):
+    """Test the vectorised mode calculation."""
+
+    def test_matches_reference_loop(self):
+        """Test the axial frequencies and the count of each kind against a loop over every index triple."""
+        modes = room_modes(ROOM)
+        expected = reference_modes(5.0, 4.0, 2.5, MAX_MODE_FREQUENCY)
+        np.testing.assert_allclose(modes.axial(), [f for f, kind in expected if kind == 1])
+        self.assertEqual(modes.counts(), {name: sum(1 for _, kind in expected if kind == k)
+                                          for k, name in ((1, 'axial'), (2, 'tangential'), (3, 'oblique'))})
+        self.assertEqual(modes.modes_between(0, 200), sum(1 for f, kind in expected if kind == 1 and f <= 200))
+
+    def test_lowest_modes_are_axial(self):
+        """Test that the first mode is the axial mode of the longest dimension."""
+        modes = room_modes(ROOM)
+        self.assertAlmostEqual(modes.frequencies[0], SPEED_OF_SOUND / 10)
+        counts = modes.counts()
+        self.assertTrue(counts['axial'] and counts['tangential'] and counts['oblique'])
+
+    def test_large_rooms_stay_small(self):
+        """Test that the largest room keeps only its axial modes and larger ones get no model."""
+        side = MAX_DIMENSION
+        modes = room_modes({'length': side, 'width': side, 'height': side})
+        self.assertEqual(len(modes.frequencies), 3 * int(2 * MAX_MODE_FREQUENCY * side / SPEED_OF_SOUND))
+        self.assertGreater(modes.counts()['oblique'], 1_000_000)
+        self.assertLess(modes.frequencies.nbytes, 4096)
+        self.assertIsNone(room_modes({'length': 60, 'width': 60, 'height': 60}))
+        self.assertIsNone(room_acoustics_model({'length': 5, 'width': 4, 'height': side + 1}))
+        _bucket_modes.cache_clear()
+
+    def test_dimensions_share_a_bucket(self):
+        """Test that dimensions within a bucket reuse the same modes."""
+        self.assertIs(room_modes(ROOM), room_modes({'length': 5.01, 'width': 3.99, 'height': 2.5}))
+        self.assertIsNot(room_modes(ROOM), room_modes({'length': 5.5, 'width': 4.0, 'height': 2.5}))
+        with self.assertRaises(ValueError):
+            room_modes(ROOM).frequencies[0] = 1.0
+
+    def test_invalid_dimensions(self):
+        """Test that missing or non-positive dimensions give no model."""
+        self.assertIsNone(room_modes({'length': 5, 'width': 4}))
+        self.assertIsNone(room_modes({'length': 5, 'width': 4, 'height': -1}))
+        self.assertIsNone(room_acoustics_model(None))
+
+
+class TestReverberation(unittest.TestCase):
+    """Test the RT60 and Schroeder frequency estimates."""
+
+    def test_sabine_and_eyring(self):
+        """Test both formulas against hand-computed values; Eyring is shorter."""
+        volume, area = 50.0, 85.0
+        self.assertAlmostEqual(rt60_sabine(volume, area, 0.2), 0.161 * 50 / 17)
+        self.assertAlmostEqual(rt60_eyring(volume, area, 0.2), 0.161 * 50 / (-85 * math.log(0.8)))
+        self.assertLess(rt60_eyring(volume, area, 0.2), rt60_sabine(volume, area, 0.2))
+        self.assertEqual(rt60_eyring(volume, area, 1.0), 0.0)
+
+    def test_model(self):
+        """Test that a more absorbent room is less reverberant and has a lower Schroeder frequency."""
+        live, dead = room_acoustics_model(ROOM, 0.1), room_acoustics_model(ROOM, 0.5)
+        self.assertGreater(live.rt60_eyring, dead.rt60_eyring)
+        self.assertGreater(live.schroeder_frequency, dead.schroeder_frequency)
+        self.assertEqual(live.to_dict()['lowest_mode'], round(SPEED_OF_SOUND / 10, 1))
+
+
+class TestModalResonance(unittest.TestCase):
+    """Test the resonance factor from the room's modes."""
+
+    def test_modal_exposure(self):
+        """Test that low-frequency noise in a small room is exposed to its modes and high-frequency noise is not."""
+        model = room_acoustics_model(ROOM, 0.15)
+        self.assertGreater(model.modal_exposure(30, 200), 0.5)
+        self.assertEqual(model.modal_exposure(2000, 4000), 0.0)
+        self.assertEqual(model.modal_exposure(10, 12), 0.0)
+
+    def test_ranking_context_uses_modes(self):
+        """Test that the room's modes replace the static resonance band."""
+        model = room_acoustics_model(ROOM, 0.15)
+        low_noise = AcousticNoiseProfile(typical_frequency=[30, 200], peak_frequency=60, critical_bands={})
+        high_noise = AcousticNoiseProfile(typical_frequency=[2000, 4000], peak_frequency=3000, critical_bands={})
+        profile = AcousticRoomProfile(resonance=[1000, 5000])
+        low = build_ranking_context(5, profile, low_noise, room_acoustics=model)
+        high = build_ranking_context(5, profile, high_noise, room_acoustics=model)
+        self.assertAlmostEqual(low.resonance_factor, 1 + 0.5 * model.modal_exposure(30, 200))
+        self.assertEqual(high.resonance_factor, 1.0)
+        self.assertEqual(low.room_acoustics, model.to_dict())
+        # Without the model the static band still applies
+        self.assertEqual(build_ranking_context(5, profile, high_noise).resonance_factor, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
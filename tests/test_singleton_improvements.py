@@ -170,7 +170,17 @@ class TestSingletonReset(unittest.TestCase):
         
         # Instances should be different objects
         self.assertIsNot(instance1, instance2)
-    
+
+    def test_acoustic_calculator_resolves_db_lazily(self):
+        """Test that creating an AcousticCalculator does not connect to the database."""
+        from solutions.acoustic_calculator import AcousticCalculator
+
+        db = MagicMock()
+        with patch('solutions.acoustic_calculator.get_db', return_value=db) as get_db:
+            calculator = AcousticCalculator()
+            get_db.assert_not_called()
+            self.assertIs(calculator.db, db)
+
     def test_cache_manager_reset(self):
         """Test resetting CacheManager singleton."""
         from solutions.cache_manager import get_cache_manager
@@ -288,6 +298,65 @@ class TestSingletonIntegration(unittest.TestCase):
         # The calculator should use the same cache manager instance
         self.assertIs(calculator.cache_manager, cache_manager)
 
+class TestDBConnectionPool(unittest.TestCase):
+    """Test the process-wide pooled MongoDB connection."""
+
+    def setUp(self):
+        """Reset the pooled connection before each test."""
+        reset_db_connection()
+        self.env = patch.dict(os.environ, {'MONGODB_URI': 'mongodb://test', 'MONGODB_RECONNECT_INTERVAL': '30'})
+        self.env.start()
+
+    def tearDown(self):
+        """Reset the pooled connection after each test."""
+        self.env.stop()
+        reset_db_connection()
+
+    def test_client_is_shared(self):
+        """Test that repeated get_db() calls reuse one client."""
+        from solutions.db_init import get_db
+
+        with patch('solutions.db_init.MongoClient') as mock_client:
+            db1 = get_db()
+            db2 = get_db()
+
+        self.assertIs(db1, db2)
+        self.assertEqual(mock_client.call_count, 1)
+        self.assertEqual(mock_client.call_args.kwargs['maxPoolSize'], 20)
+
+    def test_pool_size_is_configurable(self):
+        """Test that the pool size is read from the environment."""
+        from solutions.db_init import get_db
+
+        with patch.dict(os.environ, {'MONGODB_MAX_POOL_SIZE': '5'}):
+            with patch('solutions.db_init.MongoClient') as mock_client:
+                get_db()
+
+        self.assertEqual(mock_client.call_args.kwargs['maxPoolSize'], 5)
+
+    def test_post_fork_creates_new_client(self):
+        """Test that a forked worker does not reuse the parent's client."""
+        from solutions.db_init import get_db, post_fork
+
+        with patch('solutions.db_init.MongoClient') as mock_client:
+            get_db()
+            post_fork()
+            get_db()
+
+        self.assertEqual(mock_client.call_count, 2)
+        mock_client.return_value.close.assert_not_called()
+
+    def test_failed_connect_waits_for_reconnect_interval(self):
+        """Test that a failed connect is not retried on every call."""
+        from solutions.db_init import get_db
+
+        with patch('solutions.db_init.MongoClient') as mock_client:
+            mock_client.return_value.admin.command.side_effect = Exception("unreachable")
+            self.assertIsNone(get_db())
+            self.assertIsNone(get_db())
+
+        self.assertEqual(mock_client.call_count, 1)
+
 if __name__ == '__main__':
     # Run the tests
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Test suite for the dimension-aware BaseSolution calculation cache."""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.base_solution import BaseSolution, get_calculation_cache_stats, reset_calculation_cache_stats
+from solutions.cache_manager import CacheManager
+
+SOLUTION_DATA = {
+    'type': 'wall',
+    'displayName': 'Test Wall',
+    'stc_rating': 50,
+    'materials': [
+        {'name': 'Board', 'baseCost': 20.0, 'unitsPerM2': 0.5, 'unit': 'sheet'},
+        {'name': 'Acoustic Sealant', 'baseCost': 8.0, 'unitsPerM2': 1.0, 'unit': 'tube'},
+    ],
+    '_source': 'test',
+}
+
+
+class StubWall(BaseSolution):
+    """Solution served from fixed data instead of MongoDB"""
+    CODE_NAME = 'StubWall'
+
+    def _load_solution_data(self, solution_code):
+        return dict(SOLUTION_DATA)
+
+
+class OtherStubWall(StubWall):
+    """Second class sharing the stub's code name"""
+
+
+class TestCalculationCache(unittest.TestCase):
+    """Test that cached calculations follow the dimensions and materials."""
+
+    def setUp(self):
+        reset_calculation_cache_stats()
+        self.addCleanup(reset_calculation_cache_stats)
+        self.cache = CacheManager()
+        self.patchers = [patch('solutions.base_calculator.get_db', return_value=None),
+                         patch('solutions.base_calculator.get_cache_manager', return_value=self.cache)]
+        for patcher in self.patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_results_follow_dimensions(self):
+        """Test that a second room size is not served the first room's result."""
+        solution = StubWall(1, 1)
+        small = solution.calculate({'width': 3, 'height': 2.4})
+        large = solution.calculate({'width': 6, 'height': 2.4})
+        self.assertAlmostEqual(small['area'], 7.2)
+        self.assertAlmostEqual(large['area'], 14.4)
+        self.assertGreater(large['costs']['total'], small['costs']['total'])
+
+    def test_identical_dimensions_are_shared(self):
+        """Test that equal quantised dimensions hit the cache across instances."""
+        StubWall(1, 1).calculate({'width': 3, 'height': 2.4})
+        result = StubWall(5, 5).calculate({'width': 3.0000001, 'height': 2.4})
+        self.assertAlmostEqual(result['area'], 7.2)
+        self.assertEqual(get_calculation_cache_stats()['StubWall'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_materials_and_class_are_part_of_the_key(self):
+        """Test that other materials or another class miss the cache."""
+        solution = StubWall(1, 1)
+        solution.calculate({'width': 3, 'height': 2.4})
+        solution.calculate({'width': 3, 'height': 2.4}, SOLUTION_DATA['materials'][:1])
+        OtherStubWall(1, 1).calculate({'width': 3, 'height': 2.4})
+        stats = get_calculation_cache_stats()
+        self.assertEqual(stats['StubWall']['misses'], 2)
+        self.assertEqual(stats['OtherStubWall'], {'hits': 0, 'misses': 1, 'hit_ratio': 0})
+
+    def test_returned_result_does_not_alias_the_cache(self):
+        """Test that extending a result leaves the cached entry unchanged."""
+        solution = StubWall(1, 1)
+        solution.calculate({'width': 3, 'height': 2.4})['surface_type'] = 'wall'
+        self.assertNotIn('surface_type', solution.calculate({'width': 3, 'height': 2.4}))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,67 @@
+"""Test suite for the STC / Rw contour-fitting rating engine."""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.spectrum import THIRD_OCTAVE_BANDS, Spectrum
+from solutions.sound_ratings import (RW_BANDS, RW_CONTOUR, STC_BANDS, STC_CONTOUR, mass_law_transmission_loss,
+                                     rate, rate_batch, rw_ratings, stc_ratings)
+
+
+def brute_force_rating(row, bands, contour, max_single, digits):
+    """Reference fit trying every whole-dB contour position"""
+    values = np.round(row[np.searchsorted(THIRD_OCTAVE_BANDS, bands)], digits)
+    best = None
+    for rating in range(-50, 200):
+        deficiency = np.maximum(rating + contour - values, 0)
+        if deficiency.sum() <= 32 + 1e-6 and (max_single is None or deficiency.max() <= max_single + 1e-6):
+            best = rating
+    return best
+
+
+class TestSoundRatings(unittest.TestCase):
+    """Test the contour fits against hand-worked and brute-force ratings."""
+
+    def test_flat_curve(self):
+        """Test that a flat 40 dB curve rates 40 with neutral adaptation terms."""
+        self.assertEqual(rate(Spectrum.constant(40)).to_dict(), {'stc': 40, 'rw': 40, 'c': 0, 'ctr': 0})
+
+    def test_eight_db_rule_limits_stc(self):
+        """Test that one deep dip caps the STC but not Rw."""
+        values = np.full(len(THIRD_OCTAVE_BANDS), 60.0)
+        values[THIRD_OCTAVE_BANDS == 2500] = 40
+        stc, rw = stc_ratings(values)[0], rw_ratings(values)[0]
+        # STC: the dip may be at most 8 dB below the 56 + 4 contour; Rw: 32 dB of deviation
+        self.assertEqual(stc, 44)
+        self.assertGreater(rw, stc)
+
+    def test_batch_matches_brute_force(self):
+        """Test that the batched fit matches trying every contour position, row by row."""
+        tl = np.random.default_rng(7).uniform(5, 75, size=(200, len(THIRD_OCTAVE_BANDS)))
+        ratings = rate_batch(tl)
+        for i, row in enumerate(tl):
+            self.assertEqual(ratings['stc'][i], brute_force_rating(row, STC_BANDS, STC_CONTOUR, 8, 0))
+            self.assertEqual(ratings['rw'][i], brute_force_rating(row, RW_BANDS, RW_CONTOUR, None, 1))
+
+    def test_mass_law_doubles_add_six_db(self):
+        """Test that doubling the surface mass adds about 6 dB to the rating."""
+        single, double = (stc_ratings(mass_law_transmission_loss(mass))[0] for mass in (10, 20))
+        self.assertEqual(double - single, 6)
+        self.assertEqual(mass_law_transmission_loss(0), Spectrum.zeros())
+
+    def test_accepts_spectra_and_rejects_bad_shapes(self):
+        """Test the accepted input forms."""
+        spectra = [Spectrum.constant(30), Spectrum.constant(50)]
+        self.assertEqual(stc_ratings(spectra).tolist(), [30, 50])
+        with self.assertRaises(ValueError):
+            stc_ratings(np.zeros((2, 6)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,68 @@
+"""Test suite for the 1/3-octave spectrum type."""
+
+import unittest
+import pickle
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solutions.spectrum import OCTAVE_BANDS, THIRD_OCTAVE_BANDS, Spectrum, solution_transmission_loss
+
+
+class TestSpectrum(unittest.TestCase):
+    """Test construction, arithmetic and conversion of spectra."""
+
+    def test_from_mapping_interpolates_octave_data(self):
+        """Test that string-keyed octave data is spread over the 1/3-octave bands."""
+        spectrum = Spectrum.from_mapping({'125': 20, '250': 30, 'min': 100, '4000': 50})
+        self.assertEqual(len(spectrum.values), len(THIRD_OCTAVE_BANDS))
+        self.assertAlmostEqual(spectrum.at(125), 20)
+        self.assertAlmostEqual(spectrum.at(250), 30)
+        # Geometric midpoint of an octave gets the mean, the ends are held flat
+        self.assertAlmostEqual(spectrum.at(176.7767), 25, places=3)
+        self.assertEqual(spectrum.values[0], 20)
+        self.assertEqual(spectrum.values[-1], 50)
+        self.assertEqual(Spectrum.from_mapping({}), Spectrum.zeros())
+
+    def test_stc_estimates_match_octave_model(self):
+        """Test that the STC estimates keep the octave values of the old fixed tables."""
+        tl = Spectrum.from_stc(50).to_dict(OCTAVE_BANDS)
+        self.assertEqual(tl, {'125': 40.0, '250': 45.0, '500': 50.0, '1000': 55.0, '2000': 60.0, '4000': 65.0})
+        self.assertEqual(Spectrum.from_stc(5).min(), 0.0)
+        response = Spectrum.response_from_stc(80).to_dict(OCTAVE_BANDS)
+        self.assertAlmostEqual(response['125'], 0.56)
+        self.assertAlmostEqual(response['1000'], 0.8)
+
+    def test_arithmetic_is_elementwise_and_immutable(self):
+        """Test that arithmetic returns new read-only spectra."""
+        a = Spectrum.from_stc(40)
+        b = Spectrum.constant(2)
+        self.assertTrue(np.allclose((a + b - 2).values, a.values))
+        self.assertTrue(np.allclose((a * b / 2).values, a.values))
+        self.assertTrue(np.allclose((10 - b).values, 8))
+        with self.assertRaises(ValueError):
+            a.values[0] = 1
+        with self.assertRaises(ValueError):
+            Spectrum([1, 2, 3])
+        self.assertEqual(pickle.loads(pickle.dumps(a)), a)
+
+    def test_band_selection(self):
+        """Test band masks and band means."""
+        spectrum = Spectrum(THIRD_OCTAVE_BANDS)
+        self.assertEqual(spectrum.band_mask(100, 200).sum(), 4)
+        self.assertAlmostEqual(spectrum.mean(1000, 1250), 1125)
+        self.assertEqual(spectrum.mean(6000, 8000), 0.0)
+
+    def test_solution_transmission_loss_prefers_measured_curve(self):
+        """Test that measured TL data wins over the STC estimate."""
+        measured = solution_transmission_loss({'acoustic_properties': {'transmission_loss': {'500': 33}}}, 50)
+        self.assertEqual(measured, Spectrum.constant(33))
+        self.assertEqual(solution_transmission_loss({'stc_rating': 50}), Spectrum.from_stc(50))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
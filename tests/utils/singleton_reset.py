@@ -41,6 +41,33 @@ def reset_solutions_manager():
     except Exception as e:
         logger.warning(f"Error resetting SolutionsManager singleton: {e}")
 
+def reset_materials_repository():
+    """Reset the MaterialsRepository singleton for testing."""
+    try:
+        from solutions.materials_repository import reset_materials_repository as reset_func
+        reset_func()
+        logger.debug("MaterialsRepository singleton reset")
+    except Exception as e:
+        logger.warning(f"Error resetting MaterialsRepository singleton: {e}")
+
+def reset_profile_registry():
+    """Reset the ProfileRegistry singleton for testing."""
+    try:
+        from solutions.profile_registry import reset_profile_registry as reset_func
+        reset_func()
+        logger.debug("ProfileRegistry singleton reset")
+    except Exception as e:
+        logger.warning(f"Error resetting ProfileRegistry singleton: {e}")
+
+def reset_material_table():
+    """Reset the MaterialTable singleton for testing."""
+    try:
+        from solutions.material_table import reset_material_table as reset_func
+        reset_func()
+        logger.debug("MaterialTable singleton reset")
+    except Exception as e:
+        logger.warning(f"Error resetting MaterialTable singleton: {e}")
+
 def reset_all_singletons():
     """Reset all backend singletons for testing."""
     logger.info("Resetting all backend singletons for testing")
@@ -48,6 +75,9 @@ def reset_all_singletons():
     reset_cache_manager()
     reset_db_connection()
     reset_solutions_manager()
+    reset_materials_repository()
+    reset_profile_registry()
+    reset_material_table()
     logger.info("All backend singletons reset complete")
 
 class MockAcousticCalculator:
@@ -84,10 +114,11 @@ class MockAcousticCalculator:
     
     def get_frequency_response(self, *args, **kwargs):
         """Mock frequency response calculation."""
-        return {
+        from solutions.spectrum import Spectrum
+        return Spectrum.from_mapping({
             "125": 30.0, "250": 35.0, "500": 40.0,
             "1000": 45.0, "2000": 50.0, "4000": 55.0
-        }
+        })
     
     def calculate_surface_areas(self, dimensions):
         """Mock surface area calculation."""